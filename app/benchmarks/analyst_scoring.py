@@ -0,0 +1,171 @@
+"""
+Analyst performance of cron_analyst_db.py: the per-rating loop of
+process_analyst (a cached DataFrame per ticker filled by read_sql_query,
+up to five `df[df['date'] == ...]` scans for the entry close and one for
+the 12-month exit) against utils.analyst_scoring, which prices all ratings
+of all analysts with two searchsorted calls and reduces them per analyst.
+
+Runs on a synthetic stocks.db of --tickers tickers with daily closes since
+2015 (random missing days, a few tickers without a table) and --analysts
+analysts of --ratings ratings each. Both the price store and the sqlite
+fallback are checked; exits non-zero unless avgReturn and successRate of
+every analyst equal the legacy values.
+
+    python -m benchmarks.analyst_scoring --tickers 1000 --analysts 200 --ratings 40
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from utils.analyst_scoring import BUY_RATINGS, SELL_RATINGS, CloseIndex, analyst_returns, rating_table
+from utils.price_store import PriceStore, import_sqlite
+
+
+START_DATE = '2015-01-01'
+
+
+def legacy_scores(analysts, con, start_date, end_date):
+    # cron_analyst_db.process_analyst before utils.analyst_scoring
+    query_template = """
+        SELECT date, close
+        FROM "{ticker}"
+        WHERE date BETWEEN ? AND ?
+    """
+    ticker_price_cache = {}
+    result = []
+    for item in analysts:
+        total_return = 0
+        valid_ratings_count = 0
+        success_count = 0
+        for stock in item['ratingsList']:
+            try:
+                ticker = stock['ticker']
+                rating_date = stock['date']
+                rating_current = stock['rating_current']
+                if rating_current not in BUY_RATINGS and rating_current not in SELL_RATINGS:
+                    continue
+                if ticker not in ticker_price_cache:
+                    df = pd.read_sql_query(query_template.format(ticker=ticker), con, params=(start_date, end_date))
+                    ticker_price_cache[ticker] = df
+                else:
+                    df = ticker_price_cache[ticker]
+
+                rating_date_data = df[df['date'] == rating_date]
+                if rating_date_data.empty:
+                    for days_offset in range(1, 5):
+                        closest_date = (pd.to_datetime(rating_date) - pd.Timedelta(days=days_offset)).strftime('%Y-%m-%d')
+                        rating_date_data = df[df['date'] == closest_date]
+                        if not rating_date_data.empty:
+                            break
+                if rating_date_data.empty:
+                    continue
+                close_price_on_rating = rating_date_data['close'].values[0]
+
+                future_date = (pd.to_datetime(rating_date) + pd.DateOffset(months=12)).strftime('%Y-%m-%d')
+                future_date_data = df[df['date'] == future_date]
+                if future_date_data.empty:
+                    future_date_data = df.iloc[-1]
+                    if future_date_data.empty:
+                        continue
+                close_price_in_future = future_date_data['close'] if isinstance(future_date_data, pd.Series) else future_date_data['close'].values[0]
+
+                stock_return = (close_price_in_future - close_price_on_rating) / close_price_on_rating
+                total_return += stock_return
+                valid_ratings_count += 1
+                if rating_current in BUY_RATINGS:
+                    if close_price_in_future > close_price_on_rating:
+                        success_count += 1
+                elif rating_current in SELL_RATINGS:
+                    if close_price_in_future < close_price_on_rating:
+                        success_count += 1
+            except:
+                pass
+        avg_return = round(total_return / valid_ratings_count * 100, 2) if valid_ratings_count > 0 else 0
+        success_rate = round((success_count / valid_ratings_count) * 100, 2) if valid_ratings_count > 0 else 0
+        result.append((avg_return, success_rate))
+    return result
+
+
+def make_db(path, rng, tickers, end_date):
+    days = pd.bdate_range(START_DATE, end_date).strftime('%Y-%m-%d').tolist()
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE stocks (symbol TEXT)")
+    for n, ticker in enumerate(tickers):
+        con.execute("INSERT INTO stocks VALUES (?)", (ticker,))
+        if n % 50 == 49:
+            continue  # listed, but no price table
+        con.execute(f'CREATE TABLE "{ticker}" (date TEXT, open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume INT)')
+        listed = days[int(rng.integers(0, len(days) // 2)) if n % 3 == 0 else 0:]
+        keep = rng.random(len(listed)) > 0.03
+        closes = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, len(listed))))
+        con.executemany(f'INSERT INTO "{ticker}" (date, close) VALUES (?, ?)',
+                        [(day, round(float(close), 4)) for day, close, k in zip(listed, closes, keep) if k])
+    con.commit()
+    return con
+
+
+def make_analysts(rng, tickers, count, ratings, end_date):
+    span = (pd.Timestamp(end_date) - pd.Timestamp(START_DATE)).days
+    labels = BUY_RATINGS + SELL_RATINGS + ['Neutral', 'Hold', 'Equal-Weight']
+    analysts = []
+    for i in range(count):
+        days = sorted(rng.integers(0, span + 1, ratings).tolist(), reverse=True)
+        analysts.append({'analystId': f"A{i}", 'ratingsList': [{
+            'ticker': tickers[int(rng.integers(0, len(tickers)))] if rng.random() > 0.01 else 'NOTLISTED',
+            'date': (pd.Timestamp(START_DATE) + pd.Timedelta(days=day)).strftime('%Y-%m-%d'),
+            'rating_current': labels[int(rng.integers(0, len(labels)))],
+        } for day in days]})
+    return analysts
+
+
+def vectorized(analysts, closes):
+    avg_return, success_rate, _ = analyst_returns(analysts, closes)
+    return [(round(avg, 2), round(success, 2)) for avg, success in zip(avg_return.tolist(), success_rate.tolist())]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tickers', type=int, default=1000)
+    parser.add_argument('--analysts', type=int, default=200)
+    parser.add_argument('--ratings', type=int, default=40, help='Ratings per analyst')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    end_date = date.today().strftime('%Y-%m-%d')
+    directory = tempfile.mkdtemp()
+    tickers = [f"T{i}" for i in range(args.tickers)]
+    con = make_db(os.path.join(directory, 'stocks.db'), rng, tickers, end_date)
+    analysts = make_analysts(rng, tickers, args.analysts, args.ratings, end_date)
+    import_sqlite(os.path.join(directory, 'stocks.db'), 'stocks', os.path.join(directory, 'price_store'))
+    store = PriceStore(os.path.join(directory, 'price_store'))
+
+    start = time.perf_counter()
+    expected = legacy_scores(analysts, con, START_DATE, end_date)
+    elapsed_legacy = time.perf_counter() - start
+    print(f"legacy: {args.analysts * args.ratings} ratings of {args.analysts} analysts: {elapsed_legacy:.2f}s")
+
+    ok = True
+    for name, load in (('price store', lambda tickers: CloseIndex.from_store(store, tickers, START_DATE, end_date)),
+                       ('sqlite fallback', lambda tickers: CloseIndex.from_sqlite(con, tickers, START_DATE, end_date))):
+        start = time.perf_counter()
+        closes = load(sorted(set(rating_table(analysts)['ticker'])))
+        loaded = time.perf_counter() - start
+        actual = vectorized(analysts, closes)
+        elapsed = time.perf_counter() - start
+        mismatched = [analysts[i]['analystId'] for i, (a, b) in enumerate(zip(expected, actual)) if a != b]
+        ok &= not mismatched
+        print(f"vectorized from the {name}: {elapsed:.3f}s ({loaded:.3f}s loading closes, {elapsed_legacy / elapsed:.0f}x), "
+              f"{'ok' if not mismatched else f'FAIL {len(mismatched)} analysts differ: {mismatched[:5]}'}")
+    con.close()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Load test of the API read path: the previous handlers (sync redis client +
+blocking open()) against the async redis pool, file thread pool and
+pre-compressed file cache and two-tier cache now used by main.py.
+
+Both variants serve the same two endpoints over synthetic json files:
+/stock-quote (one file per request) and /indicator-data (one quote file per
+ticker of the list). Every concurrency level starts from an empty redis so
+the first wave of requests goes to disk. Prints p50/p99 latency and
+throughput per level.
+
+    python -m benchmarks.api_load --levels 1 10 100 --requests 2000
+    python -m benchmarks.api_load --redis-url redis://localhost:6379/15
+
+Without --redis-url an in-process fakeredis server is used.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import orjson
+from fastapi import FastAPI, Request
+from pydantic import BaseModel
+
+from utils.async_io import file_executor, load_json_many
+from utils.cache import TwoTierCache
+from utils.response_cache import FileResponseCache
+
+
+class TickerData(BaseModel):
+    ticker: str
+
+
+class IndicatorListData(BaseModel):
+    tickerList: list
+
+
+def build_files(num_symbols, seed=42):
+    rng = random.Random(seed)
+    os.makedirs('json/quote', exist_ok=True)
+    symbols = [f"SYM{i}" for i in range(num_symbols)]
+    for symbol in symbols:
+        quote = {
+            'symbol': symbol,
+            'name': f"{symbol} Inc.",
+            'price': round(rng.uniform(1, 500), 2),
+            'changesPercentage': round(rng.uniform(-10, 10), 2),
+            'marketCap': rng.randint(10**7, 10**12),
+            'volume': rng.randint(10**3, 10**8),
+            'history': [round(rng.uniform(1, 500), 2) for _ in range(500)],
+        }
+        with open(f"json/quote/{symbol}.json", 'wb') as file:
+            file.write(orjson.dumps(quote))
+    return symbols
+
+
+def make_redis(url):
+    if url:
+        import redis
+        import redis.asyncio as aioredis
+        return redis.Redis.from_url(url), aioredis.Redis.from_url(url)
+    import fakeredis
+    server = fakeredis.FakeServer()
+    return fakeredis.FakeRedis(server=server), fakeredis.aioredis.FakeRedis(server=server)
+
+
+def legacy_app(redis_client):
+    app = FastAPI()
+
+    async def load_json_async(file_path):
+        cached_data = redis_client.get(file_path)
+        if cached_data:
+            return orjson.loads(cached_data)
+        try:
+            with open(file_path, 'r') as f:
+                data = orjson.loads(f.read())
+                redis_client.set(file_path, orjson.dumps(data), ex=600)
+                return data
+        except Exception:
+            return None
+
+    @app.post("/stock-quote")
+    async def stock_quote(data: TickerData):
+        ticker = data.ticker.upper()
+        cache_key = f"get-quote-{ticker}"
+        cached_result = redis_client.get(cache_key)
+        if cached_result:
+            return orjson.loads(cached_result)
+        try:
+            with open(f"json/quote/{ticker}.json", 'rb') as file:
+                res = orjson.loads(file.read())
+        except:
+            res = {}
+        redis_client.set(cache_key, orjson.dumps(res))
+        redis_client.expire(cache_key, 60)
+        return res
+
+    @app.post("/indicator-data")
+    async def indicator_data(data: IndicatorListData):
+        ticker_list = [t.upper() for t in data.tickerList]
+        quote_data = await asyncio.gather(*[load_json_async(f"json/quote/{ticker}.json") for ticker in ticker_list])
+        return [{key: quote.get(key) for key in ['symbol', 'price', 'changesPercentage']} for quote in quote_data if quote]
+
+    return app
+
+
+def async_app(redis_client):
+    app = FastAPI()
+    cache = TwoTierCache(redis_client, {'json/': 600})
+    file_cache = FileResponseCache(executor=file_executor)
+
+    @app.post("/stock-quote")
+    async def stock_quote(data: TickerData, request: Request):
+        ticker = data.ticker.upper()
+        return await file_cache.response(request, f"json/quote/{ticker}.json", default={})
+
+    @app.post("/indicator-data")
+    async def indicator_data(data: IndicatorListData):
+        ticker_list = [t.upper() for t in data.tickerList]
+        quote_data = await load_json_many(cache, [f"json/quote/{ticker}.json" for ticker in ticker_list])
+        quotes = [quote_data[f"json/quote/{ticker}.json"] for ticker in ticker_list]
+        return [{key: quote.get(key) for key in ['symbol', 'price', 'changesPercentage']} for quote in quotes if quote]
+
+    return app
+
+
+async def run_level(app, symbols, concurrency, num_requests, list_size, seed=0):
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(num_requests):
+        if rng.random() < 0.8:
+            jobs.append(("/stock-quote", {'ticker': rng.choice(symbols)}))
+        else:
+            jobs.append(("/indicator-data", {'tickerList': rng.sample(symbols, list_size)}))
+
+    latencies = []
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                path, payload = queue.get_nowait()
+                start = time.perf_counter()
+                response = await client.post(path, json=payload, headers={'Accept-Encoding': 'gzip'})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), len(latencies) / elapsed
+
+
+async def run(args):
+    sync_redis, async_redis = make_redis(args.redis_url)
+    symbols = build_files(args.symbols)
+
+    print(f"symbols={args.symbols} requests={args.requests} list_size={args.list_size}")
+    print(f"{'variant':<8} {'clients':>7} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+    for concurrency in args.levels:
+        # Fresh apps per level so the in-process tiers start cold as well
+        for name, app in [('legacy', legacy_app(sync_redis)), ('async', async_app(async_redis))]:
+            sync_redis.flushdb()
+            p50, p99, throughput = await run_level(app, symbols, concurrency, args.requests, args.list_size)
+            print(f"{name:<8} {concurrency:>7} {p50:>9.2f} {p99:>9.2f} {throughput:>9.0f}")
+
+    await async_redis.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--list-size', type=int, default=50)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--redis-url', default=None)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            asyncio.run(run(args))
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Incremental intraday export of cron_export_price.py: the per-symbol JSON
+array (loaded whole, extended, re-sorted and rewritten on every update)
+against utils.bar_store (fixed-width binary records, new bars appended).
+
+--symbols symbols with --days days of 30min bars are loaded, then --updates
+daily updates of one day each are applied. The store is given the last
+stored day again on every update (the overlap it has to drop), and one
+update restates a bar already stored. Prints update time and bytes written
+of both, and the time of a range read. Exits non-zero unless the store's
+bars and its JSON and CSV exports match the JSON files.
+
+    python -m benchmarks.bar_store --symbols 300 --days 180
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import orjson
+import ujson
+
+from utils.bar_store import BarStore, records_to_bars
+
+
+INTERVAL = '30min'
+
+
+def day_bars(rng, day, price):
+    bars = []
+    moment = day.replace(hour=9, minute=30)
+    for _ in range(13):
+        price = round(max(1.0, price * (1 + rng.gauss(0, 0.004))), 2)
+        bars.append({'date': moment.strftime('%Y-%m-%d %H:%M:%S'), 'open': price,
+                     'low': round(price * 0.998, 2), 'high': round(price * 1.002, 2),
+                     'close': price, 'volume': rng.randint(1_000, 500_000)})
+        moment += timedelta(minutes=30)
+    return bars, price
+
+
+def trading_days(start, count):
+    days, day = [], start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def legacy_update(directory, symbol, new_data):
+    # cron_export_price.get_data before utils.bar_store: whole file in, whole file out
+    file_path = os.path.join(directory, f"{symbol}.json")
+    existing_data = []
+    if os.path.exists(file_path):
+        with open(file_path, 'r') as file:
+            existing_data = ujson.load(file)
+    existing_data.extend(new_data)
+    existing_data.sort(key=lambda x: x['date'])
+    with open(file_path, 'w') as file:
+        ujson.dump(existing_data, file)
+    return os.path.getsize(file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--updates', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    directory = tempfile.mkdtemp()
+    legacy_path = os.path.join(directory, 'legacy')
+    os.makedirs(legacy_path)
+    store = BarStore(os.path.join(directory, 'bars'))
+    symbols = [f"S{i}" for i in range(args.symbols)]
+    days = trading_days(datetime(2024, 1, 2), args.days + args.updates)
+    prices = {symbol: rng.uniform(5, 500) for symbol in symbols}
+    history = {symbol: [] for symbol in symbols}
+
+    for symbol in symbols:
+        bars = []
+        for day in days[:args.days]:
+            new, prices[symbol] = day_bars(rng, day, prices[symbol])
+            bars.extend(new)
+        history[symbol] = bars
+        legacy_update(legacy_path, symbol, bars)
+        store.append(INTERVAL, symbol, bars, save_index=False)
+    store.save_index(INTERVAL)
+
+    legacy_time = store_time = 0.0
+    legacy_bytes = store_bytes = 0
+    for n, day in enumerate(days[args.days:]):
+        for symbol in symbols:
+            new, prices[symbol] = day_bars(rng, day, prices[symbol])
+            if n == 0 and symbol == symbols[0]:
+                # A restated bar of the previous day
+                history[symbol][-1] = {**history[symbol][-1], 'close': 1.23}
+                overlap = history[symbol][-13:]
+                legacy_data = orjson.loads(open(os.path.join(legacy_path, f"{symbol}.json"), 'rb').read())[:-1] + [history[symbol][-1]]
+                with open(os.path.join(legacy_path, f"{symbol}.json"), 'wb') as file:
+                    file.write(orjson.dumps(legacy_data))
+            else:
+                overlap = history[symbol][-13:]
+            history[symbol].extend(new)
+
+            start = time.perf_counter()
+            legacy_bytes += legacy_update(legacy_path, symbol, new)
+            legacy_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            store_bytes += store.append(INTERVAL, symbol, overlap + new, save_index=False) * 48
+            store_time += time.perf_counter() - start
+        start = time.perf_counter()
+        store.save_index(INTERVAL)
+        store_time += time.perf_counter() - start
+
+    updates = args.updates * args.symbols
+    print(f"{updates} updates of {args.symbols} symbols with {args.days} days of {INTERVAL} bars:")
+    print(f"  json files: {legacy_time:.2f}s, {legacy_bytes / 1e6:.0f} MB written")
+    print(f"  bar store:  {store_time:.2f}s, {store_bytes / 1e6:.2f} MB written ({legacy_time / store_time:.0f}x)")
+
+    start = time.perf_counter()
+    for symbol in symbols:
+        store.read(INTERVAL, symbol, days[-3], days[-2])
+    print(f"  range read of {args.symbols} symbols: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    ok = True
+    fresh = BarStore(store.path)
+    for symbol in symbols:
+        with open(os.path.join(legacy_path, f"{symbol}.json"), 'rb') as file:
+            expected = orjson.loads(file.read())
+        bars = records_to_bars(fresh.read(INTERVAL, symbol))
+        exported = orjson.loads(b''.join(fresh.iter_json(INTERVAL, symbol, chunk=1000)))
+        rows = list(csv.DictReader(io.StringIO(b''.join(fresh.iter_csv(INTERVAL, symbol, chunk=1000)).decode())))
+        ranged = records_to_bars(fresh.read(INTERVAL, symbol, days[-3], days[-2]))
+        if (bars != expected or exported != expected or len(rows) != len(expected)
+                or [row['date'] for row in rows] != [bar['date'] for bar in expected]
+                or [float(row['close']) for row in rows] != [bar['close'] for bar in expected]
+                or ranged != [bar for bar in expected if days[-3] <= datetime.strptime(bar['date'], '%Y-%m-%d %H:%M:%S') <= days[-2]]):
+            ok = False
+            print(f"mismatch for {symbol}")
+            break
+    print(f"store matches the json files: {'ok' if ok else 'FAIL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Wall-time of the blocked correlation engine against the previous
+ProcessPoolExecutor implementation of cron_correlation_stock.py, on a
+synthetic stocks.db.
+
+    python -m benchmarks.correlation --symbols 500 --days 252
+"""
+import argparse
+import concurrent.futures
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.price_store import PriceStore, import_sqlite
+from utils.correlation import run_correlation
+
+
+def get_stock_prices(ticker, cursor, start_date, end_date):
+    query = f"""
+        SELECT date, close, volume
+        FROM "{ticker}"
+        WHERE date BETWEEN ? AND ?
+    """
+    cursor.execute(query, (start_date, end_date))
+    return pd.DataFrame(cursor.fetchall(), columns=['date', 'close', 'volume'])
+
+
+def legacy_process_symbol(op_symbol, symbols, start_date, end_date, query_fundamental):
+    with sqlite3.connect('stocks.db') as con:
+        cursor = con.cursor()
+        op_df = get_stock_prices(op_symbol, cursor, start_date, end_date)
+        avg_volume = op_df['volume'].mean() * 0.5
+        correlations = {}
+
+        for symbol in symbols:
+            if symbol != op_symbol:
+                try:
+                    stock_df = get_stock_prices(symbol, cursor, start_date, end_date)
+                    if stock_df['volume'].mean() > avg_volume:
+                        correlations[symbol] = np.corrcoef(op_df['close'], stock_df['close'])[0, 1]
+                except Exception:
+                    pass
+
+        sorted_correlations = sorted(correlations.items(), key=lambda x: x[1], reverse=True)
+        return op_symbol, sorted_correlations[:5] + sorted_correlations[-5:]
+
+
+def legacy(symbols, start_date, end_date, num_processes):
+    query_fundamental = "SELECT name, marketCap FROM stocks WHERE symbol = ?"
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_processes) as executor:
+        futures = [executor.submit(legacy_process_symbol, symbol, symbols, start_date, end_date, query_fundamental) for symbol in symbols]
+        return dict(future.result() for future in concurrent.futures.as_completed(futures))
+
+
+def build_db(path, num_symbols, num_days, seed=42):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=datetime.today(), periods=num_days).strftime('%Y-%m-%d')
+    factor = rng.normal(0, 0.01, num_days)
+
+    con = sqlite3.connect(path)
+    cursor = con.cursor()
+    cursor.execute("CREATE TABLE stocks (symbol TEXT PRIMARY KEY, name TEXT, marketCap INTEGER)")
+    symbols = [f"SYM{i}" for i in range(num_symbols)]
+    for symbol in symbols:
+        beta = rng.uniform(-1, 2)
+        close = 100 * np.exp(np.cumsum(beta * factor + rng.normal(0, 0.02, num_days)))
+        volume = rng.integers(1e5, 1e7, num_days)
+        cursor.execute(f'CREATE TABLE "{symbol}" (date TEXT UNIQUE, open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume INT, change_percent FLOAT)')
+        cursor.executemany(
+            f'INSERT INTO "{symbol}" VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(d, c, c, c, c, int(v), 0.0) for d, c, v in zip(dates, close, volume)]
+        )
+        cursor.execute("INSERT INTO stocks VALUES (?, ?, ?)", (symbol, symbol, int(rng.integers(1e8, 1e11))))
+    con.commit()
+    con.close()
+    return symbols
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--days', type=int, default=252)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            symbols = build_db('stocks.db', args.symbols, args.days)
+            end_date = datetime.today().strftime('%Y-%m-%d')
+            start_date = (datetime.today() - timedelta(days=365)).strftime('%Y-%m-%d')
+
+            start = time.perf_counter()
+            legacy_res = legacy(symbols, start_date, end_date, args.processes)
+            legacy_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            import_sqlite('stocks.db', 'stocks', 'price_store/stocks')
+            import_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with sqlite3.connect('stocks.db') as con:
+                res = run_correlation(PriceStore('price_store/stocks'), con, 'stocks', symbols, start_date, end_date)
+            engine_time = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    # The synthetic series have no gaps, so both implementations must pick the same peers
+    mismatches = sum(
+        1 for symbol in symbols
+        if symbol in res and {item['symbol'] for item in res[symbol]} != {peer for peer, _ in legacy_res[symbol]}
+    )
+
+    print(f"symbols={args.symbols} days={args.days}")
+    print(f"legacy ProcessPoolExecutor ({args.processes} processes): {legacy_time:.2f}s")
+    print(f"price store import: {import_time:.2f}s")
+    print(f"blocked engine: {engine_time:.2f}s ({legacy_time / engine_time:.1f}x)")
+    print(f"symbols with different peer sets: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
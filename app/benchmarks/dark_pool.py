@@ -0,0 +1,170 @@
+"""
+Price-level pages of cron_dark_pool_level.py: the per-symbol scan of all
+trades of the last three weekdays (a list comprehension and a pandas
+groupby per symbol) against utils.dark_pool, on synthetic historical-flow
+files with --trades trades per day over --symbols symbols.
+
+Times the legacy loop, a cold index build of the three days, a warm run from
+the snapshots and the incremental fold of --new trades into today's file as
+cron_dark_pool_flow.py does it. Checks that price levels, metrics and the
+hottest trades match the legacy output per symbol (the legacy function is
+given each symbol's trades oldest first, so its "current price" is the
+latest trade as in the index) and exits non-zero otherwise.
+
+    python -m benchmarks.dark_pool --symbols 3000 --trades 8000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import orjson
+import pandas as pd
+
+from utils.dark_pool import load_window, update_day
+
+
+def legacy_levels(trades, size_threshold=0.8, price_grouping=1.0):
+    # cron_dark_pool_level.analyze_dark_pool_levels before utils.dark_pool
+    df = pd.DataFrame(trades)
+    df['premium'] = df['premium'].apply(lambda x: float(str(x).replace(',', '')))
+    df['price_level'] = (df['price'] / price_grouping).round(1) * price_grouping
+    size_by_price = df.groupby('price_level').agg({'size': 'sum', 'premium': 'sum'}).reset_index()
+    min_size = size_by_price['size'].quantile(size_threshold)
+    significant_levels = size_by_price[size_by_price['size'] >= min_size].sort_values('size', ascending=False)
+    current_price = df['price'].iloc[-1]
+    support_levels = significant_levels[significant_levels['price_level'] < current_price].to_dict('records')
+    resistance_levels = significant_levels[significant_levels['price_level'] > current_price].to_dict('records')
+    metrics = {
+        'avgTradeSize': round(df['size'].mean(), 2),
+        'totalPrem': round(df['premium'].sum(), 2),
+        'avgPremTrade': round(df['premium'].mean(), 2)
+    }
+    return sorted(support_levels + resistance_levels, key=lambda x: float(x['price_level'])), metrics
+
+
+def legacy(data, symbols):
+    pages = {}
+    for symbol in symbols:
+        res_list = [item for item in data if isinstance(item, dict) and item['ticker'] == symbol]
+        if not res_list:
+            continue
+        price_level, metrics = legacy_levels(sorted(res_list, key=lambda item: item['date']))
+        if price_level:
+            hottest = [{k: v for k, v in item.items() if k not in ['ticker', 'sector', 'assetType']}
+                       for item in sorted(res_list, key=lambda x: float(x.get('premium', 0)), reverse=True)[:5]]
+            for rank, item in enumerate(hottest, 1):
+                item['rank'] = rank
+            pages[symbol] = {'hottestTrades': hottest, 'priceLevel': price_level, 'metrics': metrics}
+    return pages
+
+
+def indexed(index, symbols):
+    pages = {}
+    for symbol in symbols:
+        if symbol in index:
+            price_level = index.price_levels(symbol, size_threshold=0.8)
+            if price_level:
+                pages[symbol] = {'hottestTrades': index.hottest_trades(symbol), 'priceLevel': price_level, 'metrics': index.metrics(symbol)}
+    return pages
+
+
+def make_trades(rng, symbols, day, count, first_id):
+    trades = []
+    start = datetime.strptime(day, "%Y-%m-%d") + timedelta(hours=13, minutes=30)
+    for i in range(count):
+        symbol = symbols[min(int(rng.paretovariate(1.2)) - 1, len(symbols) - 1)]
+        base = 20 + int(symbol[1:]) % 400
+        price = round(base * (1 + rng.gauss(0, 0.01)), 2)
+        size = rng.choice([100, 200, 500, 1000, 2500, 10000])
+        trades.append({
+            'ticker': symbol,
+            'date': (start + timedelta(seconds=rng.uniform(0, 6.5 * 3600))).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            'price': price, 'size': size, 'volume': 1e6, 'premium': f"{price * size:.2f}",
+            'sector': '', 'assetType': 'Stock', 'sizeVolRatio': 0.1, 'sizeAvgVolRatio': 0.1,
+            'trackingID': first_id + i,
+        })
+    return sorted(trades, key=lambda trade: trade['date'], reverse=True)
+
+
+def close(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(close(a[key], b[key]) for key in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(close(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=0.011)
+    return a == b
+
+
+def compare(expected, actual):
+    if expected.keys() != actual.keys():
+        return [f"symbols differ: {len(expected)} legacy pages, {len(actual)} indexed"]
+    return [symbol for symbol in expected if not close(expected[symbol], actual[symbol])]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=3000)
+    parser.add_argument('--trades', type=int, default=8000, help='Trades per day')
+    parser.add_argument('--new', type=int, default=200, help='Trades appended to today by one flow run')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    directory = tempfile.mkdtemp()
+    flow_path, index_path = os.path.join(directory, 'historical-flow'), os.path.join(directory, 'index')
+    os.makedirs(flow_path)
+    symbols = [f"S{i}" for i in range(args.symbols)]
+    days = ['2024-12-06', '2024-12-05', '2024-12-04']
+    data = []
+    for n, day in enumerate(days):
+        trades = make_trades(rng, symbols, day, args.trades, n * 10 ** 6)
+        with open(os.path.join(flow_path, f"{day}.json"), 'wb') as file:
+            file.write(orjson.dumps(trades))
+        data += trades
+
+    start = time.perf_counter()
+    expected = legacy(data, symbols)
+    elapsed_legacy = time.perf_counter() - start
+    print(f"legacy scan per symbol: {elapsed_legacy:.2f}s, {len(expected)} pages")
+
+    start = time.perf_counter()
+    index = load_window(days, flow_path, index_path)
+    actual = indexed(index, symbols)
+    elapsed = time.perf_counter() - start
+    print(f"index, cold (parse and aggregate 3 days): {elapsed:.2f}s ({elapsed_legacy / elapsed:.0f}x)")
+    mismatched = compare(expected, actual)
+
+    start = time.perf_counter()
+    indexed(load_window(days, flow_path, index_path), symbols)
+    print(f"index, warm (from snapshots): {time.perf_counter() - start:.2f}s")
+
+    # One flow run: new trades appended to today's file, folded into its snapshot
+    today = os.path.join(flow_path, f"{days[0]}.json")
+    previous_mtime = os.path.getmtime(today)
+    new = make_trades(rng, symbols, days[0], args.new, 9 * 10 ** 6)
+    with open(today, 'rb') as file:
+        combined = sorted(orjson.loads(file.read()) + new, key=lambda trade: trade['date'], reverse=True)
+    time.sleep(0.01)
+    with open(today, 'wb') as file:
+        file.write(orjson.dumps(combined))
+    start = time.perf_counter()
+    update_day(f"{days[0]}.json", new, combined, previous_mtime, flow_path, index_path)
+    print(f"flow run: fold {len(new)} new trades into today's snapshot: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    data = combined + data[len(combined) - len(new):]
+    start = time.perf_counter()
+    actual = indexed(load_window(days, flow_path, index_path), symbols)
+    print(f"index after the flow run: {time.perf_counter() - start:.2f}s")
+    mismatched += compare(legacy(data, symbols), actual)
+
+    print(f"pages identical to the legacy output: {'ok' if not mismatched else 'FAIL ' + str(mismatched[:5])}")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Start-up overhead and hand-off latency of utils.job_runner against the
+previous `subprocess.run(["python3", "cron_x.py"])` per job.
+
+A throwaway job script imports what most cron scripts import (pandas, numpy,
+aiohttp, orjson, sqlite3), opens a SQLite database and exits. It is run
+--runs times both ways; then a quote -> market movers -> dashboard style
+chain of three such jobs is run through the DAG, where each job starts when
+its upstream finishes. Prints the per-run wall time and the job_runs
+history the runner recorded, and exits non-zero if a run did not succeed.
+
+    python -m benchmarks.job_runner --runs 20
+"""
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from utils.job_runner import Job, JobRunner
+
+
+JOB_SCRIPT = """
+import asyncio
+import sqlite3
+import aiohttp
+import numpy as np
+import orjson
+import pandas as pd
+
+con = sqlite3.connect('bench.db')
+con.execute('CREATE TABLE IF NOT EXISTS t (x)')
+con.close()
+print(pd.Series(np.arange(10)).sum())
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    script = os.path.join(directory, 'cron_bench.py')
+    with open(script, 'w') as file:
+        file.write(JOB_SCRIPT)
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script], cwd=directory, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    legacy = np.median(timings)
+    print(f"subprocess python3 per run: median {legacy * 1000:.0f} ms")
+
+    history = os.path.join(directory, 'job_history.db')
+    runner = JobRunner([
+        Job('bench', script),
+        Job('quote', script),
+        Job('market_movers', script, upstream=['quote']),
+        Job('dashboard', script, upstream=['market_movers']),
+    ], history_path=history)
+
+    # First start spawns the fork server and imports PRELOAD once
+    start = time.perf_counter()
+    runner.submit('bench')
+    runner.wait()
+    print(f"job runner warm-up (fork server start): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        runner.submit('bench')
+        runner.wait()
+        timings.append(time.perf_counter() - start)
+    warm = np.median(timings)
+    print(f"job runner per run: median {warm * 1000:.0f} ms ({legacy / warm:.1f}x)")
+
+    start = time.perf_counter()
+    runner.submit('quote')
+    runner.wait()
+    print(f"quote -> market_movers -> dashboard through the DAG: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    con = sqlite3.connect(history)
+    rows = con.execute("SELECT job, reason, status, COUNT(*), AVG(duration) FROM job_runs GROUP BY job, reason, status").fetchall()
+    for job, reason, status, count, duration in rows:
+        print(f"history: {job:<14} {reason:<20} {status:<8} runs={count} avg {duration * 1000:.0f} ms")
+    failed = con.execute("SELECT COUNT(*) FROM job_runs WHERE status != 'success'").fetchone()[0]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Wall-time of the batched Monte Carlo engine (utils.monte_carlo) against
+the previous per-symbol GeometricBrownianMotion of mc.py on synthetic close
+series, plus a statistical regression check of the bands.
+
+The two implementations draw different random numbers, so each band is
+compared as |log(new / old)| in units of the terminal log-price standard
+deviation (sigma * sqrt(dt * (days - 1))). The median of that distance
+across symbols must stay below the sampling noise expected for two
+independent 1000-trial runs: 0.15 for the median, 0.35 for the 1st and
+1.0 for the 99.99th percentile. The engine is also run under tracemalloc
+with a 64 MB memory budget, and its peak must stay within it.
+
+    python -m benchmarks.monte_carlo --symbols 300 --days 1000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from utils.monte_carlo import HORIZONS, log_return_stats, price_predictions
+
+
+class GeometricBrownianMotion:
+    def __init__(self, data, pred_ndays):
+        self.data = data
+        self.days = pred_ndays
+        self.num_sim = 1000
+        self.percentile = 0.01
+        np.random.seed(42)
+
+    def run(self):
+        self.data['date'] = pd.to_datetime(self.data['date'])
+        dt = self.days / self.num_sim
+        lr = np.log(1 + self.data['close'].pct_change())
+        u = lr.mean()
+        sigma = lr.std()
+        drift = u - sigma ** 2.0 / 2.0
+        Z = norm.ppf(np.random.rand(self.days, self.num_sim))
+        dr = np.exp(drift * dt + sigma * Z * np.sqrt(dt))
+
+        new_prediction = np.zeros_like(dr)
+        new_prediction[0] = self.data['close'].iloc[-1]
+        for t in range(1, self.days):
+            new_prediction[t] = new_prediction[t - 1] * dr[t]
+
+        new_prediction = pd.DataFrame(new_prediction)
+        percentile_price = pd.DataFrame()
+        for i in range(len(new_prediction)):
+            next_price = new_prediction.iloc[i, :]
+            next_price = sorted(next_price, key=int)
+            pp = np.percentile(next_price, [1, 50, 100 - self.percentile])
+            df_temp = pd.DataFrame({'min': pp[0], 'mean': pp[1], 'max': pp[2]}, index=[0])
+            percentile_price = pd.concat([percentile_price, df_temp], ignore_index=True)
+
+        return {
+            'min': percentile_price['min'].tolist()[-1],
+            'mean': percentile_price['mean'].tolist()[-1],
+            'max': percentile_price['max'].tolist()[-1]
+        }
+
+
+def legacy(frames):
+    res = {}
+    for symbol, df in frames.items():
+        res[symbol] = {label: GeometricBrownianMotion(df.copy(), days).run() for label, days in HORIZONS.items()}
+    return res
+
+
+def build_series(num_symbols, num_days, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end='2024-12-31', periods=num_days).strftime('%Y-%m-%d')
+    series = {}
+    for i in range(num_symbols):
+        vol = rng.uniform(0.005, 0.04)
+        close = rng.uniform(5, 500) * np.exp(np.cumsum(rng.normal(0.0003, vol, num_days)))
+        series[f"SYM{i}"] = close
+    frames = {symbol: pd.DataFrame({'date': dates, 'close': close}) for symbol, close in series.items()}
+    return series, frames
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=300)
+    parser.add_argument('--days', type=int, default=1000)
+    args = parser.parse_args()
+
+    series, frames = build_series(args.symbols, args.days)
+
+    start = time.perf_counter()
+    legacy_res = legacy(frames)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    res = price_predictions(series)
+    engine_time = time.perf_counter() - start
+
+    print(f"symbols={args.symbols} history={args.days} days")
+    print(f"legacy GeometricBrownianMotion: {legacy_time:.2f}s")
+    print(f"batched engine: {engine_time:.2f}s ({legacy_time / engine_time:.1f}x)")
+
+    sigma = np.array([log_return_stats(close)[1] for close in series.values()])
+    tolerance = {'min': 0.35, 'mean': 0.15, 'max': 1.0}
+    failed = False
+    for label, days in HORIZONS.items():
+        scale = sigma * np.sqrt(days / 1000 * (days - 1))
+        for key in ['min', 'mean', 'max']:
+            old = np.array([legacy_res[symbol][label][key] for symbol in series])
+            new = np.array([res[symbol][label][key] for symbol in series])
+            distance = float(np.median(np.abs(np.log(new / old)) / scale))
+            status = 'ok' if distance <= tolerance[key] else 'FAIL'
+            failed |= status == 'FAIL'
+            print(f"{label:>3} {key:<4} median distance {distance:.3f} (limit {tolerance[key]}) {status}")
+
+    budget = 64 * 1024 ** 2
+    tracemalloc.start()
+    price_predictions(series, memory_budget=budget)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    status = 'ok' if peak <= budget else 'FAIL'
+    failed |= status == 'FAIL'
+    print(f"peak memory with a {budget / 1024 ** 2:.0f} MB budget: {peak / 1024 ** 2:.1f} MB {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Nightly OHLC load of create_stock_db.py: full rebuild against the in-place
+delta load of utils.ohlc_ingest, on a local provider with --symbols symbols
+of daily history since 2015.
+
+- legacy: the database is deleted, the whole history of every symbol is
+  fetched and written with a SELECT and an INSERT per row
+- delta: the database of the previous night is kept, only the new day is
+  fetched and upserted; one symbol has a 2:1 split on the new day (its whole
+  history is restated) and one lost a window of rows (a gap to refill)
+
+Prints provider calls, rows transferred, rows written and wall time of both,
+and of a second delta run on the same day (nothing to do). Exits non-zero
+unless the delta database is identical to a fresh full build of the new day.
+
+    python -m benchmarks.ohlc_ingest --symbols 200
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.ohlc_ingest import OHLC_COLUMNS, sync_ohlc
+
+
+START_DATE = '2015-01-01'
+
+
+class LocalProvider:
+    """
+    historical-price-full of synthetic symbols, as of `today`. Splits divide
+    the prices before their date by the ratio, like the provider's adjusted
+    history.
+    """
+
+    def __init__(self, symbols, last_day, seed=5):
+        self.days = pd.bdate_range(START_DATE, last_day).strftime('%Y-%m-%d').tolist()
+        rng = np.random.default_rng(seed)
+        self.prices = {symbol: 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(self.days)))) for symbol in symbols}
+        self.volumes = {symbol: rng.integers(1_000, 1_000_000, len(self.days)) for symbol in symbols}
+        self.splits = {}
+        self.today = self.days[-2]
+        self.calls = 0
+        self.rows = 0
+
+    def reset(self):
+        self.calls = 0
+        self.rows = 0
+
+    async def fetch(self, symbol, start, end):
+        self.calls += 1
+        end = min(end, self.today)
+        first, last = np.searchsorted(self.days, start), np.searchsorted(self.days, end, side='right')
+        close = self.prices[symbol][:last].copy()
+        split = self.splits.get(symbol)
+        if split is not None:
+            day, ratio = split
+            close[:np.searchsorted(self.days, day)] /= ratio
+        historical = [{
+            'date': self.days[i], 'open': round(close[i] * 0.99, 4), 'high': round(close[i] * 1.01, 4),
+            'low': round(close[i] * 0.98, 4), 'close': round(close[i], 4), 'volume': int(self.volumes[symbol][i]),
+            'changePercent': round((close[i] / close[i - 1] - 1) * 100, 4) if i else 0.0,
+        } for i in range(first, last)]
+        self.rows += len(historical)
+        await asyncio.sleep(0)
+        return {'symbol': symbol, 'historical': historical[::-1]}
+
+
+async def legacy(provider, path, symbols):
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    writes = 0
+    for symbol in symbols:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS '{symbol}' (date TEXT UNIQUE, open FLOAT, high FLOAT, low FLOAT, close FLOAT, volume INT, change_percent FLOAT)")
+        data = await provider.fetch(symbol, START_DATE, provider.today)
+        for entry in data['historical'][::-1]:
+            if conn.execute(f"SELECT date FROM '{symbol}' WHERE date = ?", (entry['date'],)).fetchone() is None:
+                conn.execute(f"INSERT INTO '{symbol}' (date, open, high, low, close, volume, change_percent) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (entry['date'], entry['open'], entry['high'], entry['low'], entry['close'], entry['volume'], entry['changePercent']))
+                writes += 1
+        conn.commit()
+    conn.close()
+    return writes
+
+
+async def delta(provider, path, symbols):
+    conn = sqlite3.connect(path)
+    totals = {}
+    for symbol in symbols:
+        stats = await sync_ohlc(conn, symbol, lambda start, end, symbol=symbol: provider.fetch(symbol, start, end), START_DATE, provider.today)
+        for key in ('rows', 'gaps'):
+            totals[key] = totals.get(key, 0) + stats[key]
+        totals[stats['mode']] = totals.get(stats['mode'], 0) + 1
+    conn.close()
+    return totals
+
+
+def dump(path, symbols):
+    conn = sqlite3.connect(path)
+    tables = {symbol: conn.execute(f"SELECT {', '.join(OHLC_COLUMNS)} FROM '{symbol}' ORDER BY date").fetchall() for symbol in symbols}
+    conn.close()
+    return tables
+
+
+async def run(args):
+    directory = tempfile.mkdtemp()
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    provider = LocalProvider(symbols, pd.Timestamp.today().normalize())
+    delta_path = os.path.join(directory, 'delta.db')
+    legacy_path = os.path.join(directory, 'legacy.db')
+
+    # Previous night: the kept database
+    await delta(provider, delta_path, symbols)
+    split_symbol, gap_symbol = symbols[0], symbols[1]
+    conn = sqlite3.connect(delta_path)
+    with conn:
+        conn.execute(f"DELETE FROM '{gap_symbol}' WHERE date BETWEEN ? AND ?", (provider.days[100], provider.days[130]))
+    conn.close()
+
+    # New day, with a split
+    provider.today = provider.days[-1]
+    provider.splits[split_symbol] = (provider.today, 2.0)
+
+    provider.reset()
+    start = time.perf_counter()
+    writes = await legacy(provider, legacy_path, symbols)
+    elapsed = time.perf_counter() - start
+    print(f"legacy full rebuild: {provider.calls} calls, {provider.rows} rows transferred, {writes} rows written, {elapsed:.2f}s")
+
+    provider.reset()
+    start = time.perf_counter()
+    totals = await delta(provider, delta_path, symbols)
+    elapsed_delta = time.perf_counter() - start
+    print(f"delta load: {provider.calls} calls, {provider.rows} rows transferred, {totals['rows']} rows written, "
+          f"{elapsed_delta:.2f}s ({elapsed / elapsed_delta:.0f}x), modes {({k: v for k, v in totals.items() if k not in ('rows', 'gaps')})}, "
+          f"{totals['gaps']} gaps refilled")
+
+    provider.reset()
+    start = time.perf_counter()
+    totals = await delta(provider, delta_path, symbols)
+    print(f"delta load again the same day: {provider.calls} calls, {totals['rows']} rows written, {time.perf_counter() - start:.2f}s")
+
+    same = dump(delta_path, symbols) == dump(legacy_path, symbols)
+    print(f"delta database identical to a full build: {'ok' if same else 'FAIL'}")
+    return not same
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=200)
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(run(args)) else 0)
+
+
+if __name__ == "__main__":
+    main()
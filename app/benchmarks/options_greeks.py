@@ -0,0 +1,185 @@
+"""
+Vectorized greeks and exposure profiles of utils.options_greeks against the
+scalar Black-Scholes code they replace (calculate_option_greeks of
+support.py, extended with vanna and charm, one contract at a time, then
+nested loops per strike and expiry).
+
+- golden: greeks of a fixed set of contracts (deep ITM/OTM, expiring today,
+  zero IV) as computed by the scalar code, stored in
+  benchmarks/golden/options_greeks.json; the vectorized output must match
+  it to 1e-9 relative. --write-golden regenerates the file.
+- a synthetic --contracts chain: scalar vs vectorized greeks and per-strike
+  and per-expiry profiles, compared and timed
+- --tickers chains of --per-ticker contracts (every optionable ticker):
+  profiles of all of them in one pass
+
+Exits non-zero on any mismatch.
+
+    python -m benchmarks.options_greeks --contracts 10000 --tickers 3000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import orjson
+from scipy.stats import norm
+
+from utils.options_greeks import RISK_FREE_RATE, concat_chains, exposure_profiles, exposures, option_greeks
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'golden', 'options_greeks.json')
+AS_OF = date(2024, 12, 2)
+
+
+def calculate_option_greeks(S, K, T, r, sigma, option_type='CALL'):
+    # support.py before utils.options_greeks, plus vanna and charm
+    if T <= 0 or sigma <= 0 or S <= 0:
+        return 0, 0, 0, 0
+    try:
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+        d2 = d1 - sigma * np.sqrt(T)
+        if option_type == 'CALL':
+            delta = norm.cdf(d1)
+            gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
+        else:  # PUT
+            delta = -norm.cdf(-d1)
+            gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
+        vanna = -norm.pdf(d1) * d2 / sigma
+        charm = -norm.pdf(d1) * (2 * r * T - d2 * sigma * np.sqrt(T)) / (2 * T * sigma * np.sqrt(T))
+        return delta, gamma, vanna, charm
+    except:
+        return 0, 0, 0, 0
+
+
+def scalar_profiles(contracts, by):
+    rows = {}
+    for contract in contracts:
+        years = (contract['expiry'] - AS_OF).days / 365.0
+        delta, gamma, vanna, charm = calculate_option_greeks(contract['spot'], contract['strike'], years, RISK_FREE_RATE,
+                                                             contract['iv'], 'CALL' if contract['is_call'] else 'PUT')
+        notional = contract['oi'] * 100 * contract['spot']
+        side = 'call' if contract['is_call'] else 'put'
+        key = contract['strike'] if by == 'strike' else contract['expiry'].isoformat()
+        row = rows.setdefault(key, {by: key})
+        for name, value in (('delta', delta * notional),
+                            ('gamma', (1 if contract['is_call'] else -1) * gamma * notional * contract['spot'] * 0.01),
+                            ('vanna', vanna * notional * 0.01), ('charm', charm * notional / 365)):
+            for other in ('call', 'put'):
+                row.setdefault(f"{other}_{name}", 0.0)
+            row[f"{side}_{name}"] += value
+    return [{k: round(v, 2) if k != by else v for k, v in rows[key].items()} for key in sorted(rows)]
+
+
+def golden_contracts():
+    contracts = []
+    for spot in (5.0, 100.0, 450.0):
+        for moneyness in (0.5, 0.9, 1.0, 1.1, 2.0):
+            for days in (0, 1, 7, 30, 365, 730):
+                for iv in (0.0, 0.15, 0.6, 2.5):
+                    for is_call in (True, False):
+                        contracts.append({'spot': spot, 'strike': round(spot * moneyness, 2), 'years': days / 365.0, 'iv': iv, 'is_call': is_call})
+    return contracts
+
+
+def scalar_golden(contracts):
+    return [dict(zip(['delta', 'gamma', 'vanna', 'charm'], map(float, calculate_option_greeks(
+        c['spot'], c['strike'], c['years'], RISK_FREE_RATE, c['iv'], 'CALL' if c['is_call'] else 'PUT')))) for c in contracts]
+
+
+def check_golden(write):
+    contracts = golden_contracts()
+    if write:
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, 'wb') as file:
+            file.write(orjson.dumps({'contracts': contracts, 'greeks': scalar_golden(contracts)}, option=orjson.OPT_INDENT_2))
+    with open(GOLDEN_PATH, 'rb') as file:
+        golden = orjson.loads(file.read())
+    columns = {key: np.array([c[key] for c in golden['contracts']]) for key in ('spot', 'strike', 'years', 'iv', 'is_call')}
+    greeks = option_greeks(columns['spot'], columns['strike'], columns['years'], columns['iv'], columns['is_call'])
+    bad = 0
+    for name in ('delta', 'gamma', 'vanna', 'charm'):
+        expected = np.array([row[name] for row in golden['greeks']])
+        bad += int((~np.isclose(greeks[name], expected, rtol=1e-9, atol=1e-12)).sum())
+    print(f"golden file ({len(golden['contracts'])} contracts from the scalar code): {'ok' if not bad else f'FAIL, {bad} values differ'}")
+    return bad == 0
+
+
+def make_chain(rng, count, spot, ticker='SYN'):
+    strikes = np.round(spot * rng.uniform(0.5, 1.5, count) / 2.5) * 2.5
+    expiries = np.datetime64(AS_OF) + rng.choice([0, 3, 10, 17, 31, 59, 94, 185, 367, 731], count)
+    return {
+        'ticker': np.full(count, ticker, dtype=object),
+        'strike': strikes,
+        'expiry': expiries.astype('datetime64[D]'),
+        'is_call': rng.random(count) < 0.5,
+        'iv': rng.uniform(0.1, 1.2, count) * (rng.random(count) > 0.01),
+        'oi': rng.integers(0, 20_000, count).astype(float),
+        'spot': np.full(count, spot),
+    }
+
+
+def close(expected, actual):
+    if len(expected) != len(actual):
+        return False
+    for a, b in zip(expected, actual):
+        if a.keys() != b.keys():
+            return False
+        for key in a:
+            if isinstance(a[key], float) and not math.isclose(a[key], b[key], rel_tol=1e-9, abs_tol=0.011):
+                return False
+            if not isinstance(a[key], float) and a[key] != b[key]:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--contracts', type=int, default=10_000)
+    parser.add_argument('--tickers', type=int, default=3000)
+    parser.add_argument('--per-ticker', type=int, default=1000, help='Contracts per ticker of the all-tickers run')
+    parser.add_argument('--write-golden', action='store_true')
+    args = parser.parse_args()
+    ok = check_golden(args.write_golden)
+
+    rng = np.random.default_rng(1)
+    chain = make_chain(rng, args.contracts, 187.3)
+    contracts = [{'strike': float(chain['strike'][i]), 'expiry': chain['expiry'][i].astype(object), 'is_call': bool(chain['is_call'][i]),
+                  'iv': float(chain['iv'][i]), 'oi': float(chain['oi'][i]), 'spot': float(chain['spot'][i])} for i in range(args.contracts)]
+
+    for by in ('strike', 'expiry'):
+        start = time.perf_counter()
+        expected = scalar_profiles(contracts, by)
+        elapsed_scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = exposure_profiles(chain, by, AS_OF)['SYN']
+        elapsed = time.perf_counter() - start
+        same = close(expected, actual)
+        ok &= same
+        print(f"{args.contracts} contracts per {by}: scalar {elapsed_scalar * 1000:.0f} ms, vectorized {elapsed * 1000:.1f} ms "
+              f"({elapsed_scalar / elapsed:.0f}x), {len(actual)} rows, {'ok' if same else 'FAIL'}")
+
+    start = time.perf_counter()
+    values = exposures(chain, AS_OF)
+    print(f"greeks and exposures of {args.contracts} contracts: {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"net gamma {values['gamma'].sum() / 1e6:.1f}M")
+
+    chains = [make_chain(rng, args.per_ticker, float(rng.uniform(5, 800)), f"T{i}") for i in range(args.tickers)]
+    start = time.perf_counter()
+    everything = concat_chains(chains)
+    by_strike = exposure_profiles(everything, 'strike', AS_OF)
+    by_expiry = exposure_profiles(everything, 'expiry', AS_OF)
+    elapsed = time.perf_counter() - start
+    print(f"all tickers: {args.tickers} x {args.per_ticker} contracts, per strike and per expiry in {elapsed:.2f}s "
+          f"({len(by_strike)} tickers, {sum(map(len, by_strike.values()))} strike rows, {sum(map(len, by_expiry.values()))} expiry rows)")
+    same = close(exposure_profiles(chains[7], 'strike', AS_OF)['T7'], by_strike['T7'])
+    ok &= same
+    print(f"one ticker alone equals its slice of the all-tickers run: {'ok' if same else 'FAIL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Paper-trading portfolio update of cron_portfolio.py: the previous loop (the
+whole trading history replayed per portfolio, one update call per
+portfolio and a second one for its rank) against utils.portfolio_engine,
+on a local in-memory PocketBase stand-in that charges a fixed latency per
+HTTP call (a page of get_full_list or a batch counts as one).
+
+Three runs over --portfolios portfolios: a cold one (no stored positions),
+one after new trades in 1% of the portfolios and price moves in 10% of the
+symbols, and one with nothing new. Prints time and HTTP calls of both and
+exits non-zero unless the records end up identical after every run.
+
+    python -m benchmarks.portfolio_engine --portfolios 100000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+import orjson
+from pocketbase.models import Record
+
+from utils.portfolio_engine import PortfolioEngine
+
+
+INITIAL_BUDGET = 100000
+PAGE_SIZE = 500
+
+
+class LocalCollection:
+    def __init__(self, pb, name):
+        self.pb = pb
+        self.name = name
+
+    def get_full_list(self, query_params=None):
+        records = [r for r in self.pb.records.values() if r['created'] >= (query_params or {}).get('filter', '"').split('"')[1]]
+        for _ in range(max(1, math.ceil(len(records) / PAGE_SIZE))):
+            self.pb.call()
+        # As the client returns them: a fresh copy, snake_case attributes
+        return [Record(orjson.loads(orjson.dumps(r))) for r in records]
+
+    def update(self, record_id, body):
+        self.pb.call()
+        self.pb.apply(record_id, body)
+
+
+class LocalPocketBase:
+    """
+    The PocketBase calls cron_portfolio.py uses, backed by a dict. Every
+    call sleeps `latency` seconds.
+    """
+
+    def __init__(self, records, latency):
+        self.records = {r['id']: orjson.loads(orjson.dumps(r)) for r in records}
+        self.latency = latency
+        self.calls = 0
+
+    def call(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def collection(self, name):
+        return LocalCollection(self, name)
+
+    def apply(self, record_id, body):
+        self.records[record_id].update(orjson.loads(orjson.dumps(body)))
+
+    def send(self, path, options):
+        self.call()
+        for request in options['body']['requests']:
+            self.apply(request['url'].rsplit('/', 1)[1], request['body'])
+
+
+def legacy_update(pb, since, quotes):
+    # cron_portfolio.update_portfolio before utils.portfolio_engine
+    def check_number_of_shares(holdings, trading_history):
+        share_count = {}
+        for transaction in trading_history:
+            symbol = transaction["symbol"]
+            num_shares = transaction["numberOfShares"]
+            if transaction["type"] == "buy":
+                share_count[symbol] = share_count.get(symbol, 0) + num_shares
+            elif transaction["type"] == "sell":
+                share_count[symbol] = share_count.get(symbol, 0) - num_shares
+        for holding in holdings:
+            if holding["symbol"] in share_count:
+                holding["numberOfShares"] = share_count[holding["symbol"]]
+        return holdings
+
+    def compute_available_cash(transactions):
+        available_cash = 100000
+        for transaction in transactions:
+            if transaction['type'] == 'buy':
+                available_cash -= transaction['numberOfShares'] * transaction['price']
+            elif transaction['type'] == 'sell':
+                available_cash += transaction['numberOfShares'] * transaction['price']
+        return available_cash
+
+    def compute_overall_return(initial_budget, transactions):
+        current_budget = initial_budget
+        for transaction in transactions:
+            if transaction["type"] == "buy":
+                current_budget -= transaction["numberOfShares"] * transaction["price"]
+            elif transaction["type"] == "sell":
+                current_budget += transaction["numberOfShares"] * transaction["price"]
+        return (current_budget - initial_budget) / initial_budget * 100
+
+    result = pb.collection("portfolios").get_full_list(query_params={"filter": f'created >= "{since}"'})
+    data = [{'symbol': symbol, 'price': price} for symbol, price in quotes.items()]
+    ranking_list = []
+    for x in result:
+        if len(x.trading_history) > 0:
+            try:
+                if len(x.holdings) != 0:
+                    x.available_cash = compute_available_cash(x.trading_history)
+                    account_value = x.available_cash
+                    quote_data_dict = {dd['symbol']: dd for dd in data}
+                    x.holdings = check_number_of_shares(x.holdings, x.trading_history)
+                    for item in x.holdings:
+                        dd = quote_data_dict.get(item['symbol'])
+                        if dd:
+                            current_price = dd['price']
+                            since_bought_change = round((current_price / item['boughtPrice'] - 1) * 100, 2)
+                            account_value += current_price * item['numberOfShares']
+                            item['currentPrice'] = current_price
+                            item['sinceBoughtChange'] = since_bought_change
+                    overall_return = round((account_value / INITIAL_BUDGET - 1) * 100, 2)
+                    pb.collection("portfolios").update(x.id, {"accountValue": account_value, "overallReturn": overall_return,
+                                                              "availableCash": x.available_cash, "holdings": x.holdings})
+                else:
+                    overall_return = compute_overall_return(INITIAL_BUDGET, x.trading_history)
+                    account_value = round(INITIAL_BUDGET * (1 + overall_return / 100), 2)
+                    pb.collection("portfolios").update(x.id, {"accountValue": account_value, "overallReturn": overall_return,
+                                                              "availableCash": account_value})
+                ranking_list.append({'userId': x.id, 'overallReturn': overall_return})
+            except Exception as e:
+                print(e)
+    for rank, item in enumerate(sorted(ranking_list, key=lambda x: x['overallReturn'], reverse=True)):
+        pb.collection("portfolios").update(item['userId'], {"rank": rank + 1})
+
+
+def trade(rng, record, prices, count):
+    held = {}
+    for transaction in record['tradingHistory']:
+        sign = 1 if transaction['type'] == 'buy' else -1
+        held[transaction['symbol']] = held.get(transaction['symbol'], 0) + sign * transaction['numberOfShares']
+    for _ in range(count):
+        owned = [symbol for symbol, shares in held.items() if shares > 0]
+        if owned and rng.random() < 0.3:
+            symbol = rng.choice(owned)
+            shares = rng.randint(1, held[symbol])
+            kind = 'sell'
+        else:
+            symbol = rng.choice(list(prices))
+            shares = rng.randint(1, 50)
+            kind = 'buy'
+        price = round(prices[symbol] * rng.uniform(0.9, 1.1), 2)
+        record['tradingHistory'].append({'symbol': symbol, 'type': kind, 'numberOfShares': shares, 'price': price})
+        held[symbol] = held.get(symbol, 0) + (shares if kind == 'buy' else -shares)
+        if kind == 'buy' and not any(h['symbol'] == symbol for h in record['holdings']):
+            record['holdings'].append({'symbol': symbol, 'numberOfShares': shares, 'boughtPrice': price})
+
+
+def make_portfolios(rng, count, prices):
+    records = []
+    for i in range(count):
+        record = {'id': f"p{i:07d}", 'created': '2024-12-02 10:00:00.000Z', 'updated': '2024-12-02 10:00:00.000Z',
+                  'tradingHistory': [], 'holdings': [], 'accountValue': INITIAL_BUDGET, 'overallReturn': 0,
+                  'availableCash': INITIAL_BUDGET, 'rank': 0}
+        trade(rng, record, prices, rng.choice([0, 1, 3, 10, 40]))
+        if record['holdings'] and rng.random() < 0.1:
+            record['holdings'] = []  # sold out, history kept
+        records.append(record)
+    # Two that can't be valued
+    for record in records[:50]:
+        if record['holdings']:
+            record['holdings'][0]['boughtPrice'] = 0
+            break
+    return records
+
+
+def run(name, pb, step):
+    calls = pb.calls
+    start = time.perf_counter()
+    step()
+    return time.perf_counter() - start, pb.calls - calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--portfolios', type=int, default=20000)
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0005, help='Seconds per PocketBase call')
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    prices = {f"SYM{i}": round(rng.uniform(5, 500), 2) for i in range(args.symbols)}
+    records = make_portfolios(rng, args.portfolios, prices)
+    legacy_pb = LocalPocketBase(records, args.latency)
+    engine_pb = LocalPocketBase(records, args.latency)
+    engine = PortfolioEngine(engine_pb, state_path=os.path.join(tempfile.mkdtemp(), 'positions.json'))
+    since = '2024-12-01'
+
+    def engine_step():
+        engine.update(engine.load_portfolios(since), prices)
+
+    ok = True
+    for label in ('cold', 'new trades and prices', 'nothing new'):
+        if label == 'new trades and prices':
+            for symbol in rng.sample(list(prices), len(prices) // 10):
+                prices[symbol] = round(prices[symbol] * rng.uniform(0.95, 1.05), 2)
+            for portfolio_id in rng.sample(sorted(legacy_pb.records), len(records) // 100):
+                trade(rng, legacy_pb.records[portfolio_id], prices, rng.randint(1, 3))
+                engine_pb.records[portfolio_id]['tradingHistory'] = orjson.loads(orjson.dumps(legacy_pb.records[portfolio_id]['tradingHistory']))
+                engine_pb.records[portfolio_id]['holdings'] = orjson.loads(orjson.dumps(legacy_pb.records[portfolio_id]['holdings']))
+
+        elapsed_legacy, calls_legacy = run('legacy', legacy_pb, lambda: legacy_update(legacy_pb, since, prices))
+        before = dict(engine.stats)
+        elapsed, calls = run('engine', engine_pb, engine_step)
+        same = legacy_pb.records == engine_pb.records
+        ok &= same
+        print(f"{label}: legacy {elapsed_legacy:.2f}s, {calls_legacy} calls; engine {elapsed:.2f}s, {calls} calls "
+              f"({elapsed_legacy / elapsed:.0f}x), {engine.stats['transactions'] - before['transactions']} transactions applied, "
+              f"{engine.stats['changed'] - before['changed']} portfolios written; records identical: {'ok' if same else 'FAIL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
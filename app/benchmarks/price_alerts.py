@@ -0,0 +1,266 @@
+"""
+Price-alert engine (utils.price_alerts) against the previous cron_price_alert.py
+cycle, on a local in-memory PocketBase stand-in that charges a fixed latency
+per HTTP call.
+
+The old cycle ran once a minute: fetch every untriggered alert, compare each
+one against its symbol's quote, and write each hit with two calls. The
+engine resolves every price update with a bisect on the symbol's sorted
+thresholds and flushes hits in batch transactions.
+
+Prints the alert latency (price crossing -> record written) of both, the
+cost of one price update for growing alert counts, and the HTTP calls used.
+Exits non-zero when the engine fires a different set of alerts, or at a
+different price, than the old comparison applied to every update.
+
+    python -m benchmarks.price_alerts --alerts 100000 --symbols 2000 --updates 50000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from utils.price_alerts import PriceAlertEngine, pb_timestamp
+
+
+class LocalCollection:
+    def __init__(self, pb, name):
+        self.pb = pb
+        self.name = name
+
+    def get_full_list(self, query_params=None):
+        self.pb.call()
+        records = self.pb.records.values()
+        query = (query_params or {}).get('filter', '')
+        if query == 'triggered=false':
+            return [SimpleNamespace(**r) for r in records if not r['triggered']]
+        if query.startswith('updated >= '):
+            since = query.split('"')[1]
+            return [SimpleNamespace(**r) for r in records if r['updated'] >= since]
+        return [SimpleNamespace(**r) for r in records]
+
+    def update(self, record_id, body):
+        self.pb.call()
+        self.pb.apply('PATCH', f"/api/collections/{self.name}/records/{record_id}", body)
+
+    def create(self, body):
+        self.pb.call()
+        self.pb.apply('POST', f"/api/collections/{self.name}/records", body)
+
+
+class LocalPocketBase:
+    """
+    The PocketBase calls cron_price_alert.py uses, backed by a dict. Every
+    call (a batch counts as one) sleeps `latency` seconds.
+    """
+
+    def __init__(self, records, latency=0.002):
+        self.records = {r['id']: r for r in records}
+        self.notifications = []
+        self.latency = latency
+        self.calls = 0
+        self.clock = datetime(2024, 1, 2, 15, 30)
+
+    def call(self):
+        self.calls += 1
+        time.sleep(self.latency)
+
+    def collection(self, name):
+        return LocalCollection(self, name)
+
+    def apply(self, method, url, body):
+        if method == 'PATCH':
+            record = self.records[url.rsplit('/', 1)[1]]
+            record.update(body)
+            self.clock += timedelta(milliseconds=1)
+            record['updated'] = pb_timestamp(self.clock)
+        else:
+            self.notifications.append(body)
+
+    def send(self, path, options):
+        self.call()
+        for request in options['body']['requests']:
+            self.apply(request['method'], request['url'], request['body'])
+
+
+def build_alerts(num_alerts, prices, seed=3):
+    rng = random.Random(seed)
+    symbols = list(prices)
+    updated = pb_timestamp(datetime(2024, 1, 2, 15, 0))
+    alerts = []
+    for i in range(num_alerts):
+        symbol = rng.choice(symbols)
+        condition = rng.choice(['above', 'below'])
+        move = rng.uniform(0.002, 0.05)
+        target = prices[symbol] * (1 + move if condition == 'above' else 1 - move)
+        alerts.append({'id': f"a{i:07d}", 'symbol': symbol, 'condition': condition, 'target_price': round(target, 2),
+                       'user': f"u{i % 5000}", 'asset_type': 'stock', 'triggered': False, 'updated': updated})
+    return alerts
+
+
+def price_path(prices, num_updates, duration, seed=5):
+    rng = random.Random(seed)
+    prices = dict(prices)
+    symbols = list(prices)
+    updates = []
+    for i in range(num_updates):
+        symbol = rng.choice(symbols)
+        prices[symbol] *= 1 + rng.gauss(0, 0.004)
+        updates.append((i * duration / num_updates, symbol, round(prices[symbol], 2)))
+    return updates
+
+
+def legacy_cycle(pb, quotes):
+    """
+    The former cron_price_alert.run(), with quotes from a dict.
+    """
+    fired = []
+    for item in pb.collection("priceAlert").get_full_list(query_params={"filter": 'triggered=false'}):
+        current_price = round(quotes[item.symbol], 2)
+        target_price = round(item.target_price, 2)
+        if (item.condition == 'below' and target_price >= current_price) or \
+                (item.condition == 'above' and target_price <= current_price):
+            pb.collection("priceAlert").update(item.id, {"triggered": True})
+            pb.collection('notifications').create({'priceAlert': item.id, 'liveResults': {'currentPrice': current_price}})
+            fired.append(item.id)
+    return fired
+
+
+def run_legacy(alerts, prices, updates, cycle):
+    """
+    Replays `updates` in simulated time with the old cycle every `cycle` seconds.
+    """
+    pb = LocalPocketBase([dict(a) for a in alerts])
+    quotes = dict(prices)
+    crossed_at = {}
+    by_symbol = {}
+    for alert in alerts:
+        by_symbol.setdefault(alert['symbol'], []).append(alert)
+    latencies = []
+    cycle_times = []
+    next_cycle = cycle
+    for t, symbol, price in updates + [(updates[-1][0] + cycle, None, None)]:
+        while t >= next_cycle:
+            start = time.perf_counter()
+            fired = legacy_cycle(pb, quotes)
+            spent = time.perf_counter() - start
+            cycle_times.append(spent)
+            latencies += [next_cycle - crossed_at.get(i, next_cycle) + spent for i in fired]
+            next_cycle += cycle
+        if symbol is None:
+            break
+        quotes[symbol] = price
+        # First time each alert became due, for the latency of the next cycle
+        for alert in by_symbol.get(symbol, []):
+            if alert['id'] not in crossed_at and (
+                    (alert['condition'] == 'above' and alert['target_price'] <= price) or
+                    (alert['condition'] == 'below' and alert['target_price'] >= price)):
+                crossed_at[alert['id']] = t
+    return latencies, cycle_times, pb.calls
+
+
+def run_engine(alerts, updates, flush_interval):
+    """
+    Same updates through PriceAlertEngine, flushing every `flush_interval`
+    seconds of simulated time. Returns latencies, per-update cost and calls.
+    """
+    pb = LocalPocketBase([dict(a) for a in alerts])
+    engine = PriceAlertEngine(pb)
+    engine.apply_full(engine.load_all())
+    latencies = []
+    per_update = []
+    pending_since = {}
+    next_flush = flush_interval
+    for t, symbol, price in updates + [(updates[-1][0] + flush_interval, None, None)]:
+        if t >= next_flush:
+            pending = engine.take_pending()
+            start = time.perf_counter()
+            engine.write_triggered(pending)
+            spent = time.perf_counter() - start
+            latencies += [next_flush - pending_since.pop(a['id']) + spent for a in pending]
+            next_flush = t + flush_interval
+        if symbol is None:
+            break
+        start = time.perf_counter()
+        fired = engine.on_price(symbol, price)
+        per_update.append(time.perf_counter() - start)
+        for alert in fired:
+            pending_since[alert['id']] = t
+    return latencies, per_update, pb.calls, pb
+
+
+def check_equivalence(alerts, prices, updates):
+    """
+    The old comparison applied after every update against the engine: same
+    alerts, fired at the same price.
+    """
+    expected = {}
+    active = {a['id']: a for a in alerts}
+    by_symbol = {}
+    for alert in alerts:
+        by_symbol.setdefault(alert['symbol'], []).append(alert)
+    for _, symbol, price in updates:
+        current_price = round(price, 2)
+        for alert in by_symbol.get(symbol, []):
+            if alert['id'] not in active:
+                continue
+            target_price = round(alert['target_price'], 2)
+            if (alert['condition'] == 'below' and target_price >= current_price) or \
+                    (alert['condition'] == 'above' and target_price <= current_price):
+                expected[alert['id']] = current_price
+                del active[alert['id']]
+
+    _, _, _, pb = run_engine(alerts, updates, flush_interval=0.5)
+    got = {n['priceAlert']: n['liveResults']['currentPrice'] for n in pb.notifications}
+    triggered = {i for i, r in pb.records.items() if r['triggered']}
+    return got == expected and triggered == set(expected), len(expected)
+
+
+def ms(values):
+    values = np.array(values) * 1000
+    return f"p50 {np.percentile(values, 50):.2f} ms, p99 {np.percentile(values, 99):.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--alerts', type=int, default=20000)
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--updates', type=int, default=50000)
+    parser.add_argument('--duration', type=float, default=600, help='Simulated seconds covered by the updates')
+    parser.add_argument('--latency', type=float, default=0.002, help='Seconds per PocketBase call')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    prices = {f"SYM{i}": rng.uniform(5, 500) for i in range(args.symbols)}
+    updates = price_path(prices, args.updates, args.duration)
+
+    ok, fired = check_equivalence(build_alerts(min(args.alerts, 20000), prices), prices, updates)
+    print(f"equivalence with the per-update linear check: {'ok' if ok else 'FAIL'} ({fired} alerts fired)")
+
+    alerts = build_alerts(args.alerts, prices)
+    print(f"alerts={args.alerts} symbols={args.symbols} updates={args.updates} over {args.duration:.0f}s, "
+          f"{args.latency * 1000:.0f} ms per PocketBase call")
+
+    start = time.perf_counter()
+    latencies, cycle_times, calls = run_legacy(alerts, prices, updates, cycle=60)
+    print(f"legacy 1-minute cycle: alert latency {ms(latencies)}, {len(latencies)} fired, "
+          f"{np.mean(cycle_times) * 1000:.0f} ms per cycle, {calls} calls ({time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    latencies, per_update, calls, _ = run_engine(alerts, updates, flush_interval=0.5)
+    print(f"engine: alert latency {ms(latencies)}, {len(latencies)} fired, {calls} calls "
+          f"({time.perf_counter() - start:.1f}s)")
+
+    for count in [1000, 10000, 100000, 1000000]:
+        _, per_update, _, _ = run_engine(build_alerts(count, prices), updates[:20000], flush_interval=0.5)
+        print(f"engine per price update with {count:>7} alerts: {np.mean(per_update) * 1e6:.2f} us")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Shared provider client (data_providers.client) against the previous request
+pattern of the crons, on a local aiohttp server that enforces a quota.
+
+The server allows --quota requests per --per seconds (sliding window) and
+answers 429 beyond it, fails --error-rate of the requests with 503 and keeps
+each response --latency seconds. The request list repeats --duplicates of
+its URLs, as when several tasks ask for the same quote or profile.
+
+- legacy: a new aiohttp.ClientSession per request (fetcher.real_fetch_data
+  before), chunks sized to the quota and a sleep of --per seconds after each
+  chunk (create_stock_db.py, cron_options_stats.py)
+- client: ProviderClient with the server's quota; no sleeps
+
+Prints wall time, achieved request rate, 429/5xx seen, requests that still
+failed, TCP connections opened and the client counters. Also checks that
+MOCK_API=true still returns the mock fetchers from get_fetcher. Exits
+non-zero if the client lost a request or more than 1% of its requests hit
+the quota (the odd 429 comes from arrival jitter at the window edge and is
+retried).
+
+    python -m benchmarks.provider_client --requests 4000 --quota 1500 --per 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import deque
+
+import aiohttp
+from aiohttp import web
+
+from data_providers.client import ProviderClient
+
+
+class QuotaServer:
+    def __init__(self, quota, per, error_rate, latency, seed=11):
+        self.quota = quota
+        self.per = per
+        self.error_rate = error_rate
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.window = deque()
+        self.connections = set()
+        self.stats = {'requests': 0, '429': 0, '503': 0}
+
+    async def handle(self, request):
+        self.connections.add(id(request.transport))
+        self.stats['requests'] += 1
+        now = time.monotonic()
+        while self.window and now - self.window[0] >= self.per:
+            self.window.popleft()
+        if len(self.window) >= self.quota:
+            self.stats['429'] += 1
+            return web.json_response({'Error Message': 'Limit Reach'}, status=429)
+        self.window.append(now)
+        await asyncio.sleep(self.latency)
+        if self.rng.random() < self.error_rate:
+            self.stats['503'] += 1
+            return web.json_response({'error': 'unavailable'}, status=503)
+        return web.json_response([{'symbol': request.match_info['symbol'], 'price': 1.0}])
+
+    def reset(self):
+        self.window.clear()
+        self.connections = set()
+        self.stats = {'requests': 0, '429': 0, '503': 0}
+
+
+async def legacy(urls, quota, per):
+    async def fetch(url):
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                return response.status, await response.json(content_type=None)
+
+    results = []
+    for i in range(0, len(urls), quota):
+        results += await asyncio.gather(*[fetch(url) for url in urls[i:i + quota]])
+        if i + quota < len(urls):
+            await asyncio.sleep(per)
+    return [status for status, _ in results]
+
+
+async def pooled(client, urls):
+    responses = await asyncio.gather(*[client.fetch(url) for url in urls])
+    return [response.status_code for response in responses]
+
+
+def check_mock_fetcher():
+    from data_providers import fetcher
+    from data_providers.mocks.mock_fetcher import mock_fetch_data_json, mock_fetch_data_response
+    os.environ['MOCK_API'] = 'true'
+    try:
+        return fetcher.get_fetcher(True) is mock_fetch_data_json and fetcher.get_fetcher(False) is mock_fetch_data_response
+    finally:
+        os.environ.pop('MOCK_API')
+
+
+async def run(args):
+    server = QuotaServer(args.quota, args.per, args.error_rate, args.latency)
+    app = web.Application()
+    app.router.add_get('/api/v3/quote/{symbol}', server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    rng = random.Random(3)
+    symbols = [f"SYM{i}" for i in range(int(args.requests * (1 - args.duplicates)))]
+    urls = [f"http://127.0.0.1:{port}/api/v3/quote/{rng.choice(symbols)}" for _ in range(args.requests)]
+    print(f"requests={len(urls)} unique={len(set(urls))} quota={args.quota}/{args.per:g}s "
+          f"error rate={args.error_rate:.0%} latency={args.latency * 1000:.0f} ms")
+    failed = False
+
+    start = time.perf_counter()
+    statuses = await legacy(urls, args.quota, args.per)
+    elapsed = time.perf_counter() - start
+    lost = sum(status != 200 for status in statuses)
+    print(f"legacy session per request + sleep: {elapsed:.1f}s, {server.stats['requests'] / elapsed:.0f} req/s sent, "
+          f"{server.stats['429']} x 429, {server.stats['503']} x 503, {lost} failed, {len(server.connections)} connections")
+
+    server.reset()
+    await asyncio.sleep(args.per)
+    client = ProviderClient('127.0.0.1', rate=args.quota, per=args.per, burst=max(1, args.quota // 20),
+                            connections=50, backoff=0.05, max_backoff=1.0)
+    start = time.perf_counter()
+    statuses = await pooled(client, urls)
+    elapsed = time.perf_counter() - start
+    lost = sum(status != 200 for status in statuses)
+    allowed = args.quota / args.per
+    print(f"provider client: {elapsed:.1f}s, {server.stats['requests'] / elapsed:.0f} req/s sent (quota {allowed:.0f}/s), "
+          f"{server.stats['429']} x 429, {server.stats['503']} x 503, {lost} failed, {len(server.connections)} connections")
+    print(client.summary())
+    failed |= server.stats['429'] > 0.01 * server.stats['requests'] or lost > 0
+    await client.close()
+    await runner.cleanup()
+
+    mock_ok = check_mock_fetcher()
+    print(f"MOCK_API=true still selects the mock fetchers: {'ok' if mock_ok else 'FAIL'}")
+    failed |= not mock_ok
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--quota', type=int, default=1500)
+    parser.add_argument('--per', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.02)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--duplicates', type=float, default=0.2, help='Share of repeated URLs')
+    args = parser.parse_args()
+    sys.exit(1 if asyncio.run(run(args)) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark of /searchbar: the previous linear scan + full sort against
+utils.search_index.SearchIndex on the stock + ETF list built the same way
+main.py builds it. Also checks that both return identical results.
+
+    python -m benchmarks.searchbar --queries 2000
+"""
+import argparse
+import random
+import re
+import sqlite3
+import time
+
+import orjson
+
+from utils.search_index import SearchIndex, calculate_score
+
+
+def load_searchbar_data():
+    con = sqlite3.connect('stocks.db')
+    cursor = con.cursor()
+    cursor.execute("SELECT symbol, name, type, marketCap FROM stocks")
+    stock_list_data = [{
+        'symbol': row[0],
+        'name': row[1],
+        'type': row[2].capitalize(),
+        'marketCap': row[3],
+    } for row in cursor.fetchall() if row[3] is not None]
+    con.close()
+
+    con = sqlite3.connect('etf.db')
+    cursor = con.cursor()
+    cursor.execute("SELECT symbol, name, type FROM etfs")
+    etf_list_data = [{
+        'symbol': row[0],
+        'name': row[1],
+        'type': row[2].upper(),
+    } for row in cursor.fetchall()]
+    con.close()
+
+    try:
+        with open("json/stock-screener/data.json", 'rb') as file:
+            isin = {item['symbol']: item.get('isin') for item in orjson.loads(file.read())}
+    except FileNotFoundError:
+        isin = {}
+
+    searchbar_data = stock_list_data + etf_list_data
+    for item in searchbar_data:
+        item['isin'] = isin.get(item['symbol'])
+    return searchbar_data
+
+
+def legacy_search(searchbar_data, query):
+    exact_match = next((item for item in searchbar_data if item.get("isin",None) == query), None)
+    if exact_match:
+        return [exact_match]
+
+    search_pattern = re.compile(re.escape(query.lower()), re.IGNORECASE)
+    filtered_data = [
+        item for item in searchbar_data
+        if search_pattern.search(item['name']) or search_pattern.search(item['symbol'])
+    ]
+    return sorted(
+        filtered_data,
+        key=lambda item: (
+            calculate_score(item, query),
+            0 if item.get('marketCap') is None else -item['marketCap']
+        )
+    )[:5]
+
+
+def make_queries(searchbar_data, count, seed=42):
+    """
+    Keystroke-like queries: growing prefixes of symbols and names, plus ISINs.
+    """
+    rng = random.Random(seed)
+    queries = []
+    while len(queries) < count:
+        item = rng.choice(searchbar_data)
+        text = item['symbol'] if rng.random() < 0.6 else (item['name'] or '')
+        for k in range(1, min(len(text), 8) + 1):
+            queries.append(text[:k])
+        if item.get('isin') and rng.random() < 0.05:
+            queries.append(item['isin'])
+    return queries[:count]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_timed(fn, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    searchbar_data = load_searchbar_data()
+    queries = make_queries(searchbar_data, args.queries)
+
+    start = time.perf_counter()
+    index = SearchIndex(searchbar_data)
+    build_time = time.perf_counter() - start
+
+    mismatches = [q for q in queries if legacy_search(searchbar_data, q) != index.search(q)]
+
+    legacy = run_timed(lambda q: legacy_search(searchbar_data, q), queries)
+    indexed = run_timed(index.search, queries)
+
+    print(f"items={len(searchbar_data)} queries={len(queries)} index build={build_time * 1000:.1f}ms")
+    for name, timings in [('linear scan', legacy), ('search index', indexed)]:
+        print(f"{name:<13} mean={sum(timings) / len(timings) * 1e6:8.1f}us  p50={percentile(timings, 0.5) * 1e6:8.1f}us  p99={percentile(timings, 0.99) * 1e6:8.1f}us")
+    print(f"speedup: {sum(legacy) / sum(indexed):.1f}x, mismatching queries: {len(mismatches)}")
+    for query in mismatches[:10]:
+        print(f"  mismatch: {query!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+DTCC swap ingestion of cron_swap.py on fixture report zips: the rebuild
+(every zip rewritten to CSV, json/swap/companies deleted and the latest 100
+CSVs re-read chunk by chunk, appending to each company's JSON) against
+utils.swap_store (each zip parsed once into a ticker-partitioned columnar
+store, per-company JSON emitted from it).
+
+--reports fixture zips with --rows rows each over --tickers underliers, in
+both header layouts (Dissemintation ID / Underlying Asset ID before,
+Dissemination Identifier / Underlier ID-Leg 1 after), with modifications
+referencing earlier rows (a few under another ticker), error cancellations
+and capped notionals ("25,000,000+"). Times a cold build and a daily run
+with one new report, and exits non-zero unless every company file matches a
+plain-Python reference of the supersede/cancel rules after both.
+
+    python -m benchmarks.swap_store --reports 105 --rows 3000
+"""
+import argparse
+import contextlib
+import csv
+import glob
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import orjson
+import pandas as pd
+import ujson
+
+from utils.swap_store import SwapStore, report_date
+
+
+OLD_HEADER = ["Dissemintation ID", "Original Dissemintation ID", "Action Type", "Effective Date", "Expiration Date",
+              "Primary Asset Class", "Underlying Asset ID", "Notional amount-Leg 1", "Total notional quantity-Leg 1", "Other"]
+NEW_HEADER = ["Dissemination Identifier", "Original Dissemination Identifier", "Action type", "Effective Date",
+              "Expiration Date", "Underlier ID-Leg 1", "Notional amount-Leg 1", "Total notional quantity-Leg 1", "Other"]
+
+
+def make_reports(rng, directory, count, rows, tickers):
+    names = []
+    day = datetime(2024, 1, 2)
+    next_id = 1
+    issued = []
+    for r in range(count):
+        while day.weekday() >= 5:
+            day += timedelta(days=1)
+        name = f"SEC_CUMULATIVE_EQUITIES_{day.strftime('%Y_%m_%d')}.zip"
+        header = OLD_HEADER if r < count // 2 else NEW_HEADER
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(header)
+        for _ in range(rows):
+            ticker = rng.choice(tickers)
+            action, original = 'NEWT', ''
+            draw = rng.random()
+            if issued and draw < 0.10:
+                original_id, original_ticker = rng.choice(issued[-5000:])
+                action, original = rng.choice(['MODI', 'CORR', 'TERM']), str(original_id)
+                ticker = original_ticker if rng.random() < 0.95 else ticker
+            elif issued and draw < 0.12:
+                original_id, ticker = rng.choice(issued[-5000:])
+                action, original = 'EROR', str(original_id)
+            notional = rng.choice([f"{rng.randint(1, 10 ** 7):,}", "25,000,000+", str(rng.randint(1, 10 ** 6)), ''])
+            quantity = rng.choice([f"{rng.randint(1, 10 ** 5):,}", '', f"{rng.randint(1, 100)}.0"])
+            effective = (day - timedelta(days=rng.randint(0, 30))).strftime('%Y-%m-%d')
+            expiration = rng.choice([(day + timedelta(days=rng.randint(30, 900))).strftime('%Y-%m-%d'), ''])
+            underlier = ticker + rng.choice(['.OQ', '.N', '']) if ticker else ''
+            values = {
+                'id': str(next_id), 'original': original, 'action': action, 'effective': effective,
+                'expiration': expiration, 'class': 'EQ', 'underlier': underlier,
+                'notional': notional, 'quantity': quantity, 'other': 'x',
+            }
+            if header is OLD_HEADER:
+                writer.writerow([values[key] for key in ['id', 'original', 'action', 'effective', 'expiration',
+                                                          'class', 'underlier', 'notional', 'quantity', 'other']])
+            else:
+                writer.writerow([values[key] for key in ['id', 'original', 'action', 'effective', 'expiration',
+                                                          'underlier', 'notional', 'quantity', 'other']])
+            issued.append((next_id, ticker))
+            next_id += 1
+        with ZipFile(os.path.join(directory, name), 'w', ZIP_DEFLATED) as archive:
+            archive.writestr(name.replace('.zip', '.csv'), out.getvalue())
+        names.append(name)
+        day += timedelta(days=1)
+    return names
+
+
+def legacy_rebuild(zips, output_path, companies_path, stock_symbols, chunk_size=5000):
+    # cron_swap.py before utils.swap_store, minus the HTTP download
+    shutil.rmtree(companies_path, ignore_errors=True)
+    os.makedirs(companies_path, exist_ok=True)
+
+    def clean_and_convert(series):
+        return pd.to_numeric(series.replace({',': ''}, regex=True).str.extract(r'(\d+)', expand=False), errors='coerce').fillna(0).astype(int)
+
+    columns_to_keep = ["Underlying Asset ID", "Underlier ID-Leg 1", "Effective Date", "Notional amount-Leg 1",
+                       "Expiration Date", "Total notional quantity-Leg 1", "Dissemination Identifier",
+                       "Original Dissemination Identifier", "Dissemintation ID", "Original Dissemintation ID",
+                       "Primary Asset Class", "Action Type"]
+    for zip_path in zips:
+        csv_output_filename = os.path.join(output_path, os.path.basename(zip_path).replace('.zip', '.csv'))
+        if os.path.exists(csv_output_filename):
+            continue
+        with ZipFile(zip_path, "r") as zip_ref:
+            csv_filename = zip_ref.namelist()[0]
+            zip_ref.extractall()
+        chunk_list = []
+        for chunk in pd.read_csv(csv_filename, chunksize=chunk_size, low_memory=False, on_bad_lines="skip", usecols=lambda x: x in columns_to_keep):
+            if "Dissemination Identifier" not in chunk.columns:
+                chunk.rename(columns={"Dissemintation ID": "Dissemination Identifier",
+                                      "Original Dissemintation ID": "Original Dissemination Identifier"}, inplace=True)
+            chunk_list.append(chunk)
+        pd.concat(chunk_list, ignore_index=True).to_csv(csv_output_filename, index=False)
+        os.remove(csv_filename)
+
+    csv_files = glob.glob(os.path.join(output_path, "*.csv"))
+    latest_csv_files = sorted(csv_files, key=report_date, reverse=True)[:100]
+    stock_symbols_set = set(stock_symbols)
+    for file in latest_csv_files:
+        try:
+            for chunk in pd.read_csv(file, chunksize=chunk_size, low_memory=False, on_bad_lines="skip"):
+                filter_column = "Underlying Asset ID" if "Primary Asset Class" in chunk.columns or "Action Type" in chunk.columns else "Underlier ID-Leg 1"
+                chunk['symbol'] = chunk[filter_column].str.split('.').str[0]
+                filtered_chunk = chunk[chunk['symbol'].isin(stock_symbols_set)]
+                if not filtered_chunk.empty:
+                    filtered_chunk = filtered_chunk[["symbol", "Effective Date", "Notional amount-Leg 1", "Expiration Date", "Total notional quantity-Leg 1"]]
+                    filtered_chunk['Notional amount-Leg 1'] = clean_and_convert(filtered_chunk['Notional amount-Leg 1'])
+                    filtered_chunk['Total notional quantity-Leg 1'] = clean_and_convert(filtered_chunk['Total notional quantity-Leg 1'])
+                    for symbol, group in filtered_chunk.groupby('symbol'):
+                        output_file = os.path.join(companies_path, f"{symbol}.json")
+                        records = group.drop(columns=['symbol']).to_dict('records')
+                        if os.path.exists(output_file):
+                            with open(output_file, 'r+') as f:
+                                data = ujson.load(f)
+                                data.extend(records)
+                                f.seek(0)
+                                ujson.dump(data, f)
+                        else:
+                            with open(output_file, 'w') as f:
+                                ujson.dump(records, f)
+        except Exception as e:
+            print(f"Error processing file {file}: {str(e)}")
+
+
+def reference(zips, stock_symbols, window=100):
+    # The supersede/cancel rules row by row, over the latest `window` reports
+    def amount(text):
+        try:
+            return int(float(text.replace(',', '').rstrip('+')))
+        except ValueError:
+            return 0
+
+    rows = []
+    for zip_path in sorted(zips, key=report_date, reverse=True)[:window]:
+        with ZipFile(zip_path) as archive:
+            reader = csv.DictReader(io.TextIOWrapper(archive.open(archive.namelist()[0])))
+            for row in reader:
+                old = "Dissemintation ID" in row
+                rows.append({
+                    'ticker': (row["Underlying Asset ID"] if old else row["Underlier ID-Leg 1"]).split('.')[0],
+                    'id': int(row["Dissemintation ID" if old else "Dissemination Identifier"] or 0),
+                    'original': int(row["Original Dissemintation ID" if old else "Original Dissemination Identifier"] or 0),
+                    'action': row["Action Type" if old else "Action type"],
+                    'item': {"Effective Date": row["Effective Date"] or None,
+                             "Notional amount-Leg 1": amount(row["Notional amount-Leg 1"]),
+                             "Expiration Date": row["Expiration Date"] or None,
+                             "Total notional quantity-Leg 1": amount(row["Total notional quantity-Leg 1"])},
+                })
+    superseded = {row['original'] for row in rows if row['original']}
+    result = {}
+    for row in rows:
+        if row['ticker'] in stock_symbols and row['id'] not in superseded and row['action'] != 'EROR':
+            result.setdefault(row['ticker'], []).append(row['item'])
+    return result
+
+
+def check(companies_path, expected):
+    files = {os.path.splitext(name)[0] for name in os.listdir(companies_path)}
+    if files != set(expected):
+        return False
+    for symbol, rows in expected.items():
+        with open(os.path.join(companies_path, f"{symbol}.json"), 'rb') as file:
+            if orjson.loads(file.read()) != rows:
+                return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--reports', type=int, default=105)
+    parser.add_argument('--rows', type=int, default=3000)
+    parser.add_argument('--tickers', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    tickers = [f"T{i}" for i in range(args.tickers)] + ['']
+    stock_symbols = set(rng.sample(tickers[:-1], args.tickers // 3))
+    directory = tempfile.mkdtemp()
+    os.chdir(directory)
+    os.makedirs('zips')
+    names = make_reports(rng, 'zips', args.reports + 1, args.rows, tickers)
+    zips = [os.path.join('zips', name) for name in names]
+    print(f"{args.reports + 1} fixture reports of {args.rows} rows, {len(stock_symbols)} symbols")
+
+    ok = True
+    store = SwapStore('store')
+    os.makedirs('legacy', exist_ok=True)
+    for label, available in (('cold', zips[:-1]), ('daily, one new report', zips)):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy_rebuild(available, 'legacy', 'legacy/companies', stock_symbols)
+        elapsed_legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parsed = 0
+        for zip_path in available:
+            if not store.has(zip_path):
+                store.add_report(zip_path, zip_path)
+                parsed += 1
+        written = store.emit(stock_symbols, 'companies')
+        elapsed = time.perf_counter() - start
+
+        same = check('companies', reference(available, stock_symbols))
+        ok &= same
+        print(f"{label}: rebuild {elapsed_legacy:.2f}s; store {elapsed:.2f}s ({elapsed_legacy / elapsed:.0f}x), "
+              f"{parsed} reports parsed, {written} company files written; matches reference: {'ok' if same else 'FAIL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
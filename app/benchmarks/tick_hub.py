@@ -0,0 +1,199 @@
+"""
+Tick-to-client latency of the in-process hub (utils.tick_hub) against the
+previous pipeline: cron_websocket.py writing every tick to
+json/websocket/companies/{symbol}.json and fastify's /price-data polling
+those files once per second for each client.
+
+Both variants get the same tick stream (synthetic, or a file recorded with
+cron_websocket.py --record) and the same clients, each subscribed to a random
+set of symbols. Prints p50/p99 tick-to-client latency, file writes/reads and
+the hub counters. One extra client stalls on every send to show it being
+dropped instead of holding the feed back.
+
+    python -m benchmarks.tick_hub --symbols 500 --rate 5000 --duration 5 --clients 200
+    python -m benchmarks.tick_hub --replay ticks.jsonl --speed 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import orjson
+
+from utils.tick_hub import Subscriber, TickHub, price_update, replay_ticks
+
+
+def synthetic_ticks(num_symbols, rate, duration, seed=42):
+    rng = random.Random(seed)
+    symbols = [f"SYM{i}" for i in range(num_symbols)]
+    prices = {symbol: rng.uniform(5, 500) for symbol in symbols}
+    ticks = []
+    for i in range(int(rate * duration)):
+        symbol = rng.choice(symbols)
+        prices[symbol] *= 1 + rng.gauss(0, 0.0005)
+        price = round(prices[symbol], 2)
+        ticks.append({
+            's': symbol.lower(), 'type': 'Q', 't': time.time_ns(),
+            'lp': price, 'ap': round(price + 0.01, 2), 'bp': round(price - 0.01, 2),
+            '_recv': i / rate,
+        })
+    return symbols, ticks
+
+
+def write_ticks(ticks, path):
+    with open(path, 'wb') as file:
+        for tick in ticks:
+            file.write(orjson.dumps(tick) + b"\n")
+
+
+def read_ticks(path):
+    with open(path, 'rb') as file:
+        return [orjson.loads(line) for line in file if line.strip()]
+
+
+async def run_legacy(ticks, subscriptions, poll_interval):
+    out_dir = os.path.join(tempfile.mkdtemp(), 'companies')
+    os.makedirs(out_dir)
+    written = {}
+    latencies = []
+    counters = {'writes': 0, 'reads': 0}
+    done = asyncio.Event()
+
+    async def feed():
+        start = time.monotonic()
+        for tick in ticks:
+            tick = dict(tick)
+            delay = tick.pop('_recv', 0) - (time.monotonic() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            symbol = tick['s'].upper()
+            with open(os.path.join(out_dir, f"{symbol}.json"), 'wb') as file:
+                file.write(orjson.dumps(tick))
+            counters['writes'] += 1
+            update = price_update(symbol, tick)
+            if update is not None:
+                written[(symbol, update['avgPrice'])] = time.monotonic()
+        await asyncio.sleep(poll_interval)
+        done.set()
+
+    async def client(symbols):
+        last_sent = {}
+        while not done.is_set():
+            await asyncio.sleep(poll_interval)
+            for symbol in symbols:
+                try:
+                    with open(os.path.join(out_dir, f"{symbol}.json"), 'rb') as file:
+                        tick = orjson.loads(file.read())
+                    counters['reads'] += 1
+                except (OSError, orjson.JSONDecodeError):
+                    continue
+                update = price_update(symbol, tick)
+                if update is not None and last_sent.get(symbol) != update['avgPrice']:
+                    last_sent[symbol] = update['avgPrice']
+                    sent_at = written.get((symbol, update['avgPrice']))
+                    if sent_at is not None:
+                        latencies.append(time.monotonic() - sent_at)
+
+    await asyncio.gather(feed(), *[client(symbols) for symbols in subscriptions])
+    return latencies, counters
+
+
+async def run_hub(ticks, subscriptions, replay_path, speed):
+    hub = TickHub()
+    published = {}
+    latencies = []
+    original_publish = hub.publish
+
+    def publish(tick):
+        count = hub.stats['published']
+        original_publish(tick)
+        if hub.stats['published'] > count:
+            update = hub.prices[tick['s'].upper()]
+            published[(update['symbol'], update['avgPrice'])] = time.monotonic()
+
+    hub.publish = publish
+
+    async def receive(frame):
+        now = time.monotonic()
+        for update in orjson.loads(frame):
+            sent_at = published.get((update['symbol'], update['avgPrice']))
+            if sent_at is not None:
+                latencies.append(now - sent_at)
+
+    async def stall(frame):
+        await asyncio.sleep(3600)
+
+    writers = []
+    for symbols in subscriptions:
+        subscriber = Subscriber(receive)
+        hub.subscribe(subscriber, symbols)
+        writers.append(asyncio.create_task(hub.serve(subscriber)))
+
+    slow = Subscriber(stall, max_lag=1.0, send_timeout=2.0)
+    hub.subscribe(slow, subscriptions[0])
+    writers.append(asyncio.create_task(hub.serve(slow)))
+
+    if replay_path:
+        await replay_ticks(hub, replay_path, speed=speed)
+    else:
+        with tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False) as file:
+            path = file.name
+        write_ticks(ticks, path)
+        await replay_ticks(hub, path, speed=speed)
+        os.remove(path)
+
+    await asyncio.sleep(0.1)
+    for writer in writers:
+        writer.cancel()
+    await asyncio.gather(*writers, return_exceptions=True)
+    return latencies, hub.stats, slow.closed
+
+
+def summary(latencies):
+    if not latencies:
+        return "no updates delivered"
+    ms = np.array(latencies) * 1000
+    return f"p50 {np.percentile(ms, 50):.2f} ms, p99 {np.percentile(ms, 99):.2f} ms, {len(ms)} updates"
+
+
+async def run(args):
+    if args.replay:
+        ticks = read_ticks(args.replay)
+        symbols = sorted({tick['s'].upper() for tick in ticks if tick.get('s')})
+    else:
+        symbols, ticks = synthetic_ticks(args.symbols, args.rate, args.duration)
+    rng = random.Random(0)
+    subscriptions = [rng.sample(symbols, min(args.per_client, len(symbols))) for _ in range(args.clients)]
+
+    print(f"ticks={len(ticks)} symbols={len(symbols)} clients={args.clients} symbols/client={args.per_client}")
+
+    start = time.perf_counter()
+    latencies, counters = await run_legacy(ticks, subscriptions, args.poll_interval)
+    print(f"legacy files+poll: {summary(latencies)}, {counters['writes']} file writes, "
+          f"{counters['reads']} file reads in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    latencies, stats, slow_dropped = await run_hub(ticks, subscriptions, args.replay, args.speed)
+    print(f"tick hub: {summary(latencies)}, 0 file writes in {time.perf_counter() - start:.1f}s")
+    print(f"hub stats {stats}, stalled client dropped: {slow_dropped}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--rate', type=float, default=5000, help='Synthetic ticks per second')
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--per-client', type=int, default=20)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--replay', default=None, help='Tick file recorded with cron_websocket.py --record')
+    parser.add_argument('--speed', type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,9 @@ from tqdm import tqdm
 from datetime import datetime
 from dotenv import load_dotenv
 from data_providers.impl.fmp import FinancialModelingPrep
+from data_providers.client import close_clients
 from data_providers.fetcher import get_fetcher
+from utils.ohlc_ingest import prune_symbols, sync_ohlc, update_row, upsert_symbols
 
 load_dotenv()
 
@@ -141,8 +143,8 @@ CRYPTO_DATA = {
 # Filter out the specific RuntimeWarning
 warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value encountered in scalar divide")
 
-if os.path.exists("backup_db/crypto.db"):
-    os.remove('backup_db/crypto.db')
+# crypto.db is updated in place: each run only fetches and writes the days
+# missing since the last one (see utils/ohlc_ingest.py)
 
 def get_jsonparsed_data(data):
     try:
@@ -167,6 +169,7 @@ class CryptoDatabase:
         self.cursor.execute("PRAGMA journal_mode = wal")
         self.conn.commit()
         self._create_table()
+        self.ohlc_stats = {}
 
     def close_connection(self):
         self.cursor.close()
@@ -264,24 +267,9 @@ class CryptoDatabase:
                         pass
 
 
-            # Check if columns already exist in the table
-            self.cursor.execute("PRAGMA table_info(cryptos)")
-            columns = {column[1]: column[2] for column in self.cursor.fetchall()}
-
-            # Update column definitions with keys from fundamental_data
-            column_definitions = {
-                key: (self.get_column_type(fundamental_data.get(key, None)), self.remove_null(fundamental_data.get(key, None)))
-                for key in fundamental_data
-            }
-
-           
-            for column, (column_type, value) in column_definitions.items():
-                if column not in columns and column_type:
-                    self.cursor.execute(f"ALTER TABLE cryptos ADD COLUMN {column} {column_type}")
-
-                self.cursor.execute(f"UPDATE cryptos SET {column} = ? WHERE symbol = ?", (value, symbol))
-
-            self.conn.commit()
+            # One UPDATE for all fields, missing columns are added first
+            values = {key: self.remove_null(value) for key, value in fundamental_data.items()}
+            update_row(self.conn, 'cryptos', symbol, values, self.get_column_type)
 
         except Exception as e:
             print(f"Failed to fetch fundamental data for symbol {symbol}: {str(e)}")
@@ -305,22 +293,10 @@ class CryptoDatabase:
                 ticker_data.append((symbol, name, exchange, ticker_type))
         
 
-        self.cursor.execute("BEGIN TRANSACTION")  # Begin a transaction
-
-        for data in ticker_data:
-            symbol, name, exchange, ticker_type = data
-
-            self.cursor.execute("""
-            INSERT OR IGNORE INTO cryptos (symbol, name, exchange, type)
-            VALUES (?, ?, ?, ?)
-            """, (symbol, name, exchange, ticker_type))
-            self.cursor.execute("""
-            UPDATE cryptos SET name = ?, exchange = ?, type= ?
-            WHERE symbol = ?
-            """, (name, exchange, ticker_type, symbol))
-
-        self.cursor.execute("COMMIT")  # Commit the transaction
-        self.conn.commit()
+        upsert_symbols(self.conn, 'cryptos', ['symbol', 'name', 'exchange', 'type'], ticker_data)
+        removed = prune_symbols(self.conn, 'cryptos', symbols)
+        if removed:
+            print(f"Removed {len(removed)} cryptos that are no longer listed")
 
     
 
@@ -335,58 +311,37 @@ class CryptoDatabase:
                 tasks.append(self.save_fundamental_data(session, symbol))
 
                 i += 1
+                # Requests are paced at the FMP quota by the shared provider client
                 if i % 150 == 0:
                     await asyncio.gather(*tasks)
                     tasks = []
-                    print('sleeping mode: ', i)
-                    await asyncio.sleep(60)  # Pause for 60 seconds
 
             #tasks.append(self.save_ohlc_data(session, "%5EGSPC"))
             
             if tasks:
                 await asyncio.gather(*tasks)
 
-
-    def _create_ticker_table(self, symbol):
-        #cleaned_symbol = re.sub(r'[^a-zA-Z0-9_]', '_', symbol)
-        # Check if table exists
-        self.cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{symbol}'")
-        table_exists = self.cursor.fetchone() is not None
-
-        if not table_exists:
-            query = f"""
-            CREATE TABLE '{cleaned_symbol}' (
-                date TEXT,
-                open FLOAT,
-                high FLOAT,
-                low FLOAT,
-                close FLOAT,
-                volume INT,
-                change_percent FLOAT,
-            );
-            """
-            self.cursor.execute(query)
+        print(f"OHLC: {self.ohlc_stats}")
 
     async def save_ohlc_data(self, session, symbol):
         try:
-            #self._create_ticker_table(symbol)  # Create table for the symbol
-            ohlc_data = await fmp.get_historical_price_full(symbol, START_DATE, END_DATE)
-            if 'historical' in ohlc_data:
-                ohlc_values = [(item['date'], item['open'], item['high'], item['low'], item['close'], item['volume'], item['changePercent']) for item in ohlc_data['historical'][::-1]]
-
-                df = pd.DataFrame(ohlc_values, columns=['date', 'open', 'high', 'low', 'close', 'volume', 'change_percent'])
-            
-                # Perform bulk insert
-                df.to_sql(symbol, self.conn, if_exists='append', index=False)
-
+            # Crypto trades every day, gaps are counted in calendar days
+            stats = await sync_ohlc(self.conn, symbol, lambda start, end: fmp.get_historical_price_full(symbol, start, end), START_DATE, END_DATE, business_days=False)
+            for key in ('calls', 'rows', 'gaps'):
+                self.ohlc_stats[key] = self.ohlc_stats.get(key, 0) + stats[key]
+            self.ohlc_stats[stats['mode']] = self.ohlc_stats.get(stats['mode'], 0) + 1
         except Exception as e:
             print(f"Failed to create table for symbol {symbol}: {str(e)}")
 
 
 
+
 db = CryptoDatabase('backup_db/crypto.db')
 loop = asyncio.get_event_loop()
-all_tickers = [item for item in loop.run_until_complete(fmp.list_available_cryptocurrencies()) if item['symbol'] in ['DASHUSD','ETCUSD','LINKUSD','USDCUSD','SHIBUSD','BNBUSD','BTCUSD', 'ETHUSD', 'LTCUSD', 'SOLUSD','DOGEUSD','XRPUSD','XMRUSD','USDTUSD','ADAUSD','AVAXUSD','BCHUSD','TRXUSD','DOTUSD','ALGOUSD']]
+try:
+    all_tickers = [item for item in loop.run_until_complete(fmp.list_available_cryptocurrencies()) if item['symbol'] in ['DASHUSD','ETCUSD','LINKUSD','USDCUSD','SHIBUSD','BNBUSD','BTCUSD', 'ETHUSD', 'LTCUSD', 'SOLUSD','DOGEUSD','XRPUSD','XMRUSD','USDTUSD','ADAUSD','AVAXUSD','BCHUSD','TRXUSD','DOTUSD','ALGOUSD']]
 
-loop.run_until_complete(db.save_cryptos(all_tickers))
-db.close_connection()
\ No newline at end of file
+    loop.run_until_complete(db.save_cryptos(all_tickers))
+    db.close_connection()
+finally:
+    loop.run_until_complete(close_clients())
\ No newline at end of file
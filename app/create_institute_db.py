@@ -14,6 +14,7 @@ import warnings
 from dotenv import load_dotenv
 import os
 import re
+from data_providers.client import close_clients
 from data_providers.fetcher import get_fetcher
 from data_providers.impl.fmp import FinancialModelingPrep
 
@@ -261,11 +262,10 @@ class InstituteDatabase:
                 tasks.append(self.save_portfolio_data(session, cik))
 
                 i += 1
+                # Requests are paced at the FMP quota by the shared provider client
                 if i % 300 == 0:
                     await asyncio.gather(*tasks)
                     tasks = []
-                    print('sleeping mode: ', i)
-                    await asyncio.sleep(60)  # Pause for 60 seconds
 
             
             if tasks:
@@ -275,7 +275,10 @@ class InstituteDatabase:
 
 db = InstituteDatabase('backup_db/institute.db')
 loop = asyncio.get_event_loop()
-all_tickers = loop.run_until_complete(fmp.list_institutional_ownership())
-#all_tickers = [{'cik': '0001364742', 'name': "GARDA CAPITAL PARTNERS LP"}]
-loop.run_until_complete(db.save_insitute(all_tickers))
-db.close_connection()
+try:
+    all_tickers = loop.run_until_complete(fmp.list_institutional_ownership())
+    #all_tickers = [{'cik': '0001364742', 'name': "GARDA CAPITAL PARTNERS LP"}]
+    loop.run_until_complete(db.save_insitute(all_tickers))
+    db.close_connection()
+finally:
+    loop.run_until_complete(close_clients())
@@ -17,8 +17,10 @@ import warnings
 
 from dotenv import load_dotenv
 import os
+from data_providers.client import close_clients
 from data_providers.fetcher import get_fetcher
 from data_providers.impl.fmp import FinancialModelingPrep
+from utils.ohlc_ingest import prune_symbols, sync_ohlc, update_row, upsert_symbols
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
@@ -33,9 +35,8 @@ end_date = datetime.today().strftime("%Y-%m-%d")
 
 quarter_date = '2024-06-30'
 
-
-if os.path.exists("backup_db/stocks.db"):
-    os.remove('backup_db/stocks.db')
+# stocks.db is updated in place: each run only fetches and writes the days
+# missing since the last one (see utils/ohlc_ingest.py)
 
 
 def get_jsonparsed_data(data):
@@ -53,6 +54,7 @@ class StockDatabase:
         self.cursor.execute("PRAGMA journal_mode = wal")
         self.conn.commit()
         self._create_table()
+        self.ohlc_stats = {}
 
     def close_connection(self):
         self.cursor.close()
@@ -212,24 +214,9 @@ class StockDatabase:
                     pass
 
 
-            # Check if columns already exist in the table
-            self.cursor.execute("PRAGMA table_info(stocks)")
-            columns = {column[1]: column[2] for column in self.cursor.fetchall()}
-
-            # Update column definitions with keys from fundamental_data
-            column_definitions = {
-                key: (self.get_column_type(fundamental_data.get(key, None)), self.remove_null(fundamental_data.get(key, None)))
-                for key in fundamental_data
-            }
-
-
-            for column, (column_type, value) in column_definitions.items():
-                if column not in columns and column_type:
-                    self.cursor.execute(f"ALTER TABLE stocks ADD COLUMN {column} {column_type}")
-
-                self.cursor.execute(f"UPDATE stocks SET {column} = ? WHERE symbol = ?", (value, symbol))
-
-            self.conn.commit()
+            # One UPDATE for all fields, missing columns are added first
+            values = {key: self.remove_null(value) for key, value in fundamental_data.items()}
+            update_row(self.conn, 'stocks', symbol, values, self.get_column_type)
         except Exception as e:
             print(f"Failed to fetch fundamental data for symbol {symbol}: {str(e)}")
 
@@ -260,30 +247,10 @@ class StockDatabase:
                         ticker_data.append((symbol, name, exchange, exchange_short_name, ticker_type))
         
 
-        self.cursor.execute("BEGIN TRANSACTION")  # Begin a transaction
-
-        for data in ticker_data:
-            symbol, name, exchange, exchange_short_name, ticker_type = data
-
-            # Check if the symbol already exists
-            self.cursor.execute("SELECT symbol FROM stocks WHERE symbol = ?", (symbol,))
-            exists = self.cursor.fetchone()
-
-            # If it doesn't exist, insert it
-            if not exists:
-                self.cursor.execute("""
-                INSERT INTO stocks (symbol, name, exchange, exchangeShortName, type)
-                VALUES (?, ?, ?, ?, ?)
-                """, (symbol, name, exchange, exchange_short_name, ticker_type))
-
-            # Update the existing row
-            else:
-                self.cursor.execute("""
-                UPDATE stocks SET name = ?, exchange = ?, exchangeShortName = ?, type = ?
-                WHERE symbol = ?
-                """, (name, exchange, exchange_short_name, ticker_type, symbol))
-
-        self.conn.commit()
+        upsert_symbols(self.conn, 'stocks', ['symbol', 'name', 'exchange', 'exchangeShortName', 'type'], ticker_data)
+        removed = prune_symbols(self.conn, 'stocks', symbols)
+        if removed:
+            print(f"Removed {len(removed)} symbols that are no longer listed")
 
         # Save OHLC data for each ticker using aiohttp
         async with aiohttp.ClientSession() as session:
@@ -296,66 +263,23 @@ class StockDatabase:
                 tasks.append(self.save_fundamental_data(session, symbol))
 
                 i += 1
+                # Requests are paced at the FMP quota by the shared provider client
                 if i % 60 == 0:
                     await asyncio.gather(*tasks)
                     tasks = []
-                    print('sleeping mode 30 seconds')
-                    await asyncio.sleep(30)  # Pause for 60 seconds
 
             
             if tasks:
                 await asyncio.gather(*tasks)
 
-
-    def _create_ticker_table(self, symbol):
-        cleaned_symbol = symbol  # Ensure this is a safe string to use as a table name
-        self.cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS '{cleaned_symbol}' (
-                date TEXT UNIQUE,
-                open FLOAT,
-                high FLOAT,
-                low FLOAT,
-                close FLOAT,
-                volume INT,
-                change_percent FLOAT
-            );
-        """)
-        self.conn.commit()
+        print(f"OHLC: {self.ohlc_stats}")
 
     async def save_ohlc_data(self, session, symbol):
         try:
-            self._create_ticker_table(symbol)  # Ensure the table exists
-
-            # Fetch OHLC data from the API
-            ohlc_data = await fmp.get_historical_price_full(symbol, start_date, end_date)
-
-            if 'historical' in ohlc_data:
-                historical_data = ohlc_data['historical'][::-1]
-
-                for entry in historical_data:
-                    # Prepare the data for each entry
-                    date = entry.get('date')
-                    open_price = entry.get('open')
-                    high = entry.get('high')
-                    low = entry.get('low')
-                    close = entry.get('close')
-                    volume = entry.get('volume')
-                    change_percent = entry.get('changePercent')
-
-                    # Check if this date's data already exists
-                    self.cursor.execute(f"SELECT date FROM '{symbol}' WHERE date = ?", (date,))
-                    exists = self.cursor.fetchone()
-
-                    # If it doesn't exist, insert the new data
-                    if not exists:
-                        self.cursor.execute(f"""
-                            INSERT INTO '{symbol}' (date, open, high, low, close, volume, change_percent)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (date, open_price, high, low, close, volume, change_percent))
-                
-                # Commit all changes to the database
-                self.conn.commit()
-
+            stats = await sync_ohlc(self.conn, symbol, lambda start, end: fmp.get_historical_price_full(symbol, start, end), start_date, end_date)
+            for key in ('calls', 'rows', 'gaps'):
+                self.ohlc_stats[key] = self.ohlc_stats.get(key, 0) + stats[key]
+            self.ohlc_stats[stats['mode']] = self.ohlc_stats.get(stats['mode'], 0) + 1
         except Exception as e:
             print(f"Failed to fetch or insert OHLC data for symbol {symbol}: {str(e)}")
 
@@ -363,9 +287,12 @@ class StockDatabase:
 
 db = StockDatabase('backup_db/stocks.db')
 loop = asyncio.get_event_loop()
-all_tickers = loop.run_until_complete(fmp.list_available_traded())
-all_tickers = [item for item in all_tickers if '-' not in item['symbol'] or item['symbol'] in ['BRK-A', 'BRK-B']]
+try:
+    all_tickers = loop.run_until_complete(fmp.list_available_traded())
+    all_tickers = [item for item in all_tickers if '-' not in item['symbol'] or item['symbol'] in ['BRK-A', 'BRK-B']]
 
 
-loop.run_until_complete(db.save_stocks(all_tickers))
-db.close_connection()
\ No newline at end of file
+    loop.run_until_complete(db.save_stocks(all_tickers))
+    db.close_connection()
+finally:
+    loop.run_until_complete(close_clients())
\ No newline at end of file
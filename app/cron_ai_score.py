@@ -15,6 +15,7 @@ from itertools import combinations
 from dotenv import load_dotenv
 import os
 from utils.feature_engineering import *
+from utils.feature_store import open_feature_stores, align_features, feature_start
 
 import gc
 #Enable automatic garbage collection
@@ -22,6 +23,7 @@ gc.enable()
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
+feature_stores = open_feature_stores()
 
 
 async def save_json(symbol, data):
@@ -38,8 +40,8 @@ def delete_files_in_directory(directory):
         except Exception as e:
             print(f"Failed to delete {file_path}. Reason: {e}")
 
-async def fetch_historical_price(ticker):
-    url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{ticker}?from=1995-10-10&apikey={api_key}"
+async def fetch_historical_price(ticker, start_date='1995-10-10'):
+    url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{ticker}?from={start_date}&apikey={api_key}"
     async with aiohttp.ClientSession() as session:
         async with session.get(url) as response:
             # Check if the request was successful
@@ -116,11 +118,13 @@ async def download_data(ticker, con, start_date, end_date, skip_downloading, sav
             combined_data = list(combined_data.values())
 
             # Download historical stock data using yfinance
-            df = await fetch_historical_price(ticker)
+            # Start at the feature store's first bar so its indicators can be reused as is
+            df = await fetch_historical_price(ticker, feature_start(feature_stores, ticker) or '1995-10-10')
             # Get the list of columns in df
             df_columns = df.columns
             df_stats = generate_statistical_features(df)
-            df_ta = generate_ta_features(df)
+            # Reuse the indicators of the daily feature store when it covers every bar
+            df_ta = generate_ta_features(df, align_features(feature_stores, ticker, df['date'], TA_FEATURE_INPUTS, df['close']))
 
             # Filter columns in df_stats and df_ta that are not in df
             # Drop unnecessary columns from df_stats and df_ta
@@ -287,38 +291,37 @@ async def warm_start_training(tickers, con, skip_downloading, save_data):
     predictor.evaluate_model(df_test[selected_features], df_test['Target'])
     return predictor
 
-async def fine_tune_and_evaluate(ticker, con, start_date, end_date, skip_downloading, save_data):
-    try:
-        df = await download_data(ticker, con, start_date, end_date, skip_downloading, save_data)
-        if df is None or len(df) == 0:
-            print(f"No data available for {ticker}")
-            return
-        
-        test_size = 0.2
-        split_size = int(len(df) * (1-test_size))
-        train_data = df.iloc[:split_size]
-        test_data = df.iloc[split_size:]
-        
-        selected_features = [col for col in df.columns if col not in ['date','price','Target']]
-        # Fine-tune the model
-        predictor = ScorePredictor()
-        #predictor.fine_tune_model(train_data[selected_features], train_data['Target'])
-        
-        print(f"Evaluating fine-tuned model for {ticker}")
-        data = predictor.evaluate_model(test_data[selected_features], test_data['Target'])
-        
-        if (data['precision'] >= 50 and data['accuracy'] >= 50 and
+def split_test_set(df, test_size=0.2):
+    split_size = int(len(df) * (1-test_size))
+    test_data = df.iloc[split_size:]
+    selected_features = [col for col in df.columns if col not in ['date','price','Target']]
+    return test_data[selected_features], test_data['Target']
+
+def passes_quality_filter(data):
+    return (data['precision'] >= 50 and data['accuracy'] >= 50 and
         data['accuracy'] < 100 and data['precision'] < 100 and
         data['f1_score'] >= 50 and data['recall_score'] >= 50 and
-        data['roc_auc_score'] >= 50):
-            await save_json(ticker, data)
-            print(f"Saved results for {ticker}")
-        
-    except Exception as e:
-        print(f"Error processing {ticker}: {e}")
+        data['roc_auc_score'] >= 50)
 
-    finally:
-        gc.collect()  # Force the garbage collector to release unreferenced memory
+async def evaluate_universe(predictor, tickers, con, start_date, end_date, skip_downloading, save_data):
+    # Stack the test slices of all tickers so the model runs once for the universe
+    dfs = await chunked_gather(tickers, con, start_date, end_date, skip_downloading, save_data, chunk_size=100)
+    test_sets = {}
+    for ticker, df in zip(tickers, dfs):
+        if df is None or len(df) == 0:
+            print(f"No data available for {ticker}")
+            continue
+        test_sets[ticker] = split_test_set(df)
+    del dfs
+    gc.collect()
+
+    results = predictor.evaluate_batch(test_sets)
+    saved = 0
+    for ticker, data in results.items():
+        if passes_quality_filter(data):
+            await save_json(ticker, data)
+            saved += 1
+    print(f"Saved results for {saved} of {len(test_sets)} tickers")
 
 async def run():
     train_mode = True  # Set this to False for fine-tuning and evaluation
@@ -344,11 +347,10 @@ async def run():
         #cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE marketCap >= 500E6 AND symbol NOT LIKE '%.%'")
         #stock_symbols = [row[0] for row in cursor.fetchall()]
         
-        print(f"Total tickers for fine-tuning: {len(stock_symbols)}")
+        print(f"Total tickers for evaluation: {len(stock_symbols)}")
         start_date = datetime(1995, 1, 1).strftime("%Y-%m-%d")
         end_date = datetime.today().strftime("%Y-%m-%d")
-        for ticker in tqdm(stock_symbols):
-            await fine_tune_and_evaluate(ticker, con, start_date, end_date, skip_downloading, save_data)
+        await evaluate_universe(predictor, stock_symbols, con, start_date, end_date, skip_downloading, save_data)
         
     
     con.close()
@@ -8,12 +8,13 @@ import orjson
 import os
 from dotenv import load_dotenv
 from tqdm import tqdm 
-import pandas as pd
 from collections import Counter
 import aiohttp
 import asyncio
 import statistics
 import math
+from utils.analyst_scoring import CloseIndex, analyst_returns, rating_table
+from utils.price_store import open_stores
 
 load_dotenv()
 api_key = os.getenv('BENZINGA_API_KEY')
@@ -25,17 +26,6 @@ with open(f"json/stock-screener/data.json", 'rb') as file:
     stock_screener_data = orjson.loads(file.read())
 stock_screener_data_dict = {item['symbol']: item for item in stock_screener_data}
 
-query_template = """
-    SELECT date, close
-    FROM "{ticker}"
-    WHERE date BETWEEN ? AND ?
-"""
-buy_ratings = ['Outperform', 'Overweight', 'Market Outperform', 'Buy', 'Positive', 'Sector Outperform']
-
-sell_ratings = ['Negative', 'Underperform', 'Underweight', 'Reduce', 'Sell']
-
-ticker_price_cache = {} # Dictionary to store cached price data for tickers
-
 # Define a function to remove duplicates based on a key
 def remove_duplicates(data, key):
     seen = set()
@@ -367,7 +357,7 @@ async def get_all_analyst_stats():
 
     return final_list
 
-async def process_analyst(item, con, session, start_date, end_date):
+async def process_analyst(item, session):
     # Fetch analyst ratings
     data = await get_analyst_ratings(item['analystId'], session)
     item['ratingsList'] = data
@@ -375,107 +365,44 @@ async def process_analyst(item, con, session, start_date, end_date):
     item['lastRating'] = data[0]['date'] if data else None
     item['numOfStocks'] = len({d['ticker'] for d in data})
 
-    total_return = 0
-    valid_ratings_count = 0
-    success_count = 0  # To track successful ratings for success rate calculation
-
-    for stock in data:
-        try:
-            ticker = stock['ticker']
-            rating_date = stock['date']
-            rating_current = stock['rating_current']
-
-            # Skip neutral or undefined ratings
-            if rating_current not in buy_ratings and rating_current not in sell_ratings:
-                continue
-
-            # Check if the ticker data is already cached
-            if ticker not in ticker_price_cache:
-                # If not cached, query the stock data and cache it
-                query = query_template.format(ticker=ticker)
-                df = pd.read_sql_query(query, con, params=(start_date, end_date))
-                ticker_price_cache[ticker] = df
-            else:
-                # Use cached data
-                df = ticker_price_cache[ticker]
-
-            # Ensure we have data for the rating date
-            rating_date_data = df[df['date'] == rating_date]
-            if rating_date_data.empty:
-                # Try finding the closest date within a few days if exact date is missing
-                for days_offset in range(1, 5):
-                    closest_date = (pd.to_datetime(rating_date) - pd.Timedelta(days=days_offset)).strftime('%Y-%m-%d')
-                    rating_date_data = df[df['date'] == closest_date]
-                    if not rating_date_data.empty:
-                        break
-
-            if rating_date_data.empty:
-                continue  # Skip if no close price data found
-
-            # Get close price on rating date
-            close_price_on_rating = rating_date_data['close'].values[0]
-
-            # Calculate the date 12 months later
-            future_date = (pd.to_datetime(rating_date) + pd.DateOffset(months=12)).strftime('%Y-%m-%d')
-
-            # Try to find the close price 12 months later
-            future_date_data = df[df['date'] == future_date]
-            if future_date_data.empty:
-                # If 12 months price isn't available, use the latest available price
-                future_date_data = df.iloc[-1]  # Use the last available price
-                if future_date_data.empty:
-                    continue  # If no future data, skip this rating
-
-            close_price_in_future = future_date_data['close'] if isinstance(future_date_data, pd.Series) else future_date_data['close'].values[0]
-
-            # Calculate return
-            stock_return = (close_price_in_future - close_price_on_rating) / close_price_on_rating
-            total_return += stock_return
-            valid_ratings_count += 1
-
-            # Determine if the rating was successful
-            if rating_current in buy_ratings:
-                if close_price_in_future > close_price_on_rating:
-                    success_count += 1  # Success for buy ratings
-            elif rating_current in sell_ratings:
-                if close_price_in_future < close_price_on_rating:
-                    success_count += 1  # Success for sell ratings
-        except:
-            pass
-
-    # Calculate average return if there are valid ratings
-    if valid_ratings_count > 0:
-        item['avgReturn'] = round(total_return / valid_ratings_count * 100, 2)  # Percentage format
+def score_analysts(analyst_list, con, start_date, end_date):
+    # Price every buy/sell rating of every analyst at once: close on the
+    # rating date and 12 months later (see utils.analyst_scoring)
+    table = rating_table(analyst_list)
+    tickers = sorted(set(table['ticker']))
+    stores = open_stores()
+    if 'stocks.db' in stores:
+        closes = CloseIndex.from_store(stores['stocks.db'], tickers, start_date, end_date)
     else:
-        item['avgReturn'] = 0
+        closes = CloseIndex.from_sqlite(con, tickers, start_date, end_date)
+    avg_return, success_rate, scored = analyst_returns(analyst_list, closes, table)
+    print(f"Scored {int(scored.sum())} of {len(table['ticker'])} buy/sell ratings over {len(tickers)} tickers")
 
-    # Calculate success rate
-    if valid_ratings_count > 0:
-        item['successRate'] = round((success_count / valid_ratings_count) * 100, 2)  # Success rate in percentage
-    else:
-        item['successRate'] = 0
-
-    # Populate other stats and score
-    stats_dict = {
-        'avgReturn': item.get('avgReturn', 0),
-        'successRate': item.get('successRate', 0),
-        'totalRatings': item['totalRatings'],
-        'lastRating': item['lastRating'],
-        'totalRatingsPercentile': item['totalRatingsPercentile'],
-        'avgReturnPercentile': item['avgReturnPercentile']
-    }
+    for item, avg, success in zip(analyst_list, avg_return.tolist(), success_rate.tolist()):
+        item['avgReturn'] = round(avg, 2)  # Percentage format
+        item['successRate'] = round(success, 2)
 
-    item['analystScore'] = calculate_rating(stats_dict)
+        stats_dict = {
+            'avgReturn': item['avgReturn'],
+            'successRate': item['successRate'],
+            'totalRatings': item['totalRatings'],
+            'lastRating': item['lastRating'],
+            'totalRatingsPercentile': item['totalRatingsPercentile'],
+            'avgReturnPercentile': item['avgReturnPercentile']
+        }
+        item['analystScore'] = calculate_rating(stats_dict)
 
 async def get_single_analyst_data(analyst_list, con):
     start_date = '2015-01-01'
     end_date = datetime.today().strftime("%Y-%m-%d")
 
     async with aiohttp.ClientSession() as session:
-        tasks = [process_analyst(item, con, session, start_date, end_date) for item in analyst_list]
+        tasks = [process_analyst(item, session) for item in analyst_list]
         for task in tqdm(asyncio.as_completed(tasks), total=len(analyst_list)):
             await task
 
+    score_analysts(analyst_list, con, start_date, end_date)
+
 async def run():
     # Step1: Get all analyst id's and stats
     con = sqlite3.connect('stocks.db')
@@ -1,6 +1,7 @@
 import os
 import pandas as pd
 import orjson
+from utils.quote_store import open_quote_store, read_quote
 from dotenv import load_dotenv
 import sqlite3
 from datetime import datetime, timezone
@@ -8,6 +9,7 @@ import pytz
 import requests  # Add missing import
 from dateutil.parser import isoparse
 from utils.helper import load_latest_json
+from utils.dark_pool import update_day
 
 
 load_dotenv()
@@ -24,19 +26,11 @@ with open(f"json/stock-screener/data.json", 'rb') as file:
     stock_screener_data = orjson.loads(file.read())
 stock_screener_data_dict = {item['symbol']: item for item in stock_screener_data}
 
-quote_cache = {}
+quote_store = open_quote_store()
 
 def get_quote_data(symbol):
-    """Get quote data for a symbol from JSON file"""
-    if symbol in quote_cache:
-        return quote_cache[symbol]
-    try:
-        with open(f"json/quote/{symbol}.json") as file:
-            quote_data = orjson.loads(file.read())
-            quote_cache[symbol] = quote_data  # Cache the loaded data
-            return quote_data
-    except FileNotFoundError:
-        return None
+    """Get quote data for a symbol from the quote store"""
+    return read_quote(symbol, quote_store)
 
 
 def save_to_daily_file(data, directory):
@@ -61,6 +55,7 @@ def save_to_daily_file(data, directory):
             first_date = datetime.now().strftime('%Y-%m-%d')  # Fallback in case data is empty
 
         json_file_path = os.path.join(directory, f"{first_date}.json")
+        previous_mtime = os.path.getmtime(json_file_path) if os.path.exists(json_file_path) else None
 
         # Ensure the directory exists
         os.makedirs(directory, exist_ok=True)
@@ -70,8 +65,10 @@ def save_to_daily_file(data, directory):
             file.write(orjson.dumps(latest_data))
 
         print(f"Saved {len(latest_data)} unique and latest ratings to {json_file_path}.")
+        return f"{first_date}.json", previous_mtime, latest_data
     except Exception as e:
         print(f"An error occurred while saving data: {e}")
+        return None
 
 
 
@@ -132,7 +129,16 @@ def main():
     combined_data = existing_data + res
     if combined_data:
         # Save the combined data to a daily file
-        save_to_daily_file(combined_data, historical_directory)
+        saved = save_to_daily_file(combined_data, historical_directory)
+
+        # Fold the new trades into the day's per-ticker index used by
+        # cron_dark_pool_level.py
+        if saved:
+            name, previous_mtime, latest_data = saved
+            try:
+                update_day(name, res, latest_data, previous_mtime, directory=historical_directory)
+            except Exception as e:
+                print(f"Error updating the dark pool index: {e}")
 
 if __name__ == '__main__':
     main()
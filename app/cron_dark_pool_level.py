@@ -1,5 +1,4 @@
 import os
-import pandas as pd
 import numpy as np
 import orjson
 from dotenv import load_dotenv
@@ -9,6 +8,7 @@ import pytz
 from typing import List, Dict
 import sqlite3
 from tqdm import tqdm
+from utils.dark_pool import load_window
 
 
 def save_json(data, symbol):
@@ -35,56 +35,6 @@ def get_last_N_weekdays():
     return weekdays
 
 
-def analyze_dark_pool_levels(trades: List[Dict], 
-                             size_threshold: float = 0.8, 
-                             price_grouping: float = 1.0) -> Dict:
-    if not trades or not isinstance(trades, list):
-        return {}
-    try:
-        df = pd.DataFrame(trades)
-        if df.empty:
-            return {}
-
-        # Ensure necessary columns exist
-        if 'premium' not in df or 'price' not in df or 'size' not in df:
-            return {}
-
-        # Convert premium strings to float values
-        df['premium'] = df['premium'].apply(lambda x: float(str(x).replace(',', '')))
-        df['price_level'] = (df['price'] / price_grouping).round(1) * price_grouping
-
-        size_by_price = df.groupby('price_level').agg({
-            'size': 'sum',
-            'premium': 'sum'
-        }).reset_index()
-
-        min_size = size_by_price['size'].quantile(size_threshold)
-        significant_levels = size_by_price[size_by_price['size'] >= min_size]
-        significant_levels = significant_levels.sort_values('size', ascending=False)
-
-        current_price = df['price'].iloc[-1]
-        support_levels = significant_levels[significant_levels['price_level'] < current_price].to_dict('records')
-        resistance_levels = significant_levels[significant_levels['price_level'] > current_price].to_dict('records')
-
-        metrics = {
-            'avgTradeSize': round(df['size'].mean(), 2),
-            'totalPrem': round(df['premium'].sum(), 2),
-            'avgPremTrade': round(df['premium'].mean(), 2)
-        }
-
-        price_level = support_levels + resistance_levels
-        price_level = sorted(price_level, key=lambda x: float(x['price_level']))
-
-        return {
-            'price_level': price_level,
-            'metrics': metrics,
-        }
-    except Exception as e:
-        print(f"Error analyzing dark pool levels: {e}")
-        return {}
-
-
-
 def run():
     con = sqlite3.connect('stocks.db')
     etf_con = sqlite3.connect('etf.db')
@@ -103,38 +53,18 @@ def run():
     etf_con.close()
 
     total_symbols = stocks_symbols+ etf_symbols
-    data = []
-    weekdays = get_last_N_weekdays()
-    for date in weekdays:
-        try:
-            with open(f"json/dark-pool/historical-flow/{date}.json", "r") as file:
-                raw_data = orjson.loads(file.read())
-            data +=raw_data
-        except:
-            pass
-    for symbol in tqdm(total_symbols):
-        try:
-            res_list = [item for item in data if isinstance(item, dict) and item['ticker'] == symbol]
-            dark_pool_levels = analyze_dark_pool_levels(
-                trades=res_list,
-                size_threshold=0.8,  # Look for levels with volume in top 20%
-                price_grouping=1.0   # Group prices within $1.00
-            )
-
-            if dark_pool_levels.get('price_level'):  # Ensure there are valid levels
-                top_5_elements = [
-                    {k: v for k, v in item.items() if k not in ['ticker', 'sector', 'assetType']}
-                    for item in sorted(res_list, key=lambda x: float(x.get('premium', 0)), reverse=True)[:5]
-                ]
-
-                # Add rank to each item
-                for rank, item in enumerate(top_5_elements, 1):
-                    item['rank'] = rank
 
+    # Trades of the last 3 weekdays aggregated per ticker in one pass; days
+    # already indexed are read from their snapshot
+    index = load_window(get_last_N_weekdays(), price_grouping=1.0)  # Group prices within $1.00
+    for symbol in tqdm([symbol for symbol in total_symbols if symbol in index]):
+        try:
+            price_level = index.price_levels(symbol, size_threshold=0.8)  # Look for levels with volume in top 20%
+            if price_level:  # Ensure there are valid levels
                 data_to_save = {
-                    'hottestTrades': top_5_elements,
-                    'priceLevel': dark_pool_levels['price_level'],
-                    'metrics': dark_pool_levels['metrics']
+                    'hottestTrades': index.hottest_trades(symbol),
+                    'priceLevel': price_level,
+                    'metrics': index.metrics(symbol)
                 }
 
                 save_json(data_to_save, symbol)
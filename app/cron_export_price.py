@@ -9,6 +9,8 @@ from dotenv import load_dotenv
 from aiohttp import TCPConnector
 import gc
 
+from utils.bar_store import BarStore
+
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
 
@@ -16,6 +18,8 @@ api_key = os.getenv('FMP_API_KEY')
 MAX_REQUESTS_PER_MINUTE = 500
 request_semaphore = asyncio.Semaphore(MAX_REQUESTS_PER_MINUTE)
 
+bar_store = BarStore()
+
 async def fetch_data(session, url):
     async with request_semaphore:
         try:
@@ -37,65 +41,55 @@ def get_existing_data(symbol, interval):
     return []
 
 async def get_data(session, symbol, time_period):
-    existing_data = get_existing_data(symbol, time_period)
-    if not existing_data:
+    last_date = bar_store.last_date(time_period, symbol)
+    if last_date is None:
+        # Move bars of the previous json export into the store once
+        existing_data = get_existing_data(symbol, time_period)
+        if existing_data:
+            bar_store.append(time_period, symbol, existing_data, save_index=False)
+            last_date = bar_store.last_date(time_period, symbol)
+    if last_date is None:
         # If no existing data, fetch all data
         return await fetch_all_data(session, symbol, time_period)
-    
-    last_date = datetime.strptime(existing_data[-1]['date'], "%Y-%m-%d %H:%M:%S")
+
     current_date = datetime.utcnow()
     
     # If data is up to date, skip fetching
     if (current_date - last_date).days < 1:
         return  # Data is recent, skip further fetch
     
-    # Fetch missing data only from the last saved date to the current date
-    start_date = (last_date + timedelta(days=1)).strftime("%Y-%m-%d")
+    # Fetch from the day of the last saved bar, the store drops the overlap
+    start_date = last_date.strftime("%Y-%m-%d")
     end_date = current_date.strftime("%Y-%m-%d")
-    print(start_date, end_date)
     url = f"https://financialmodelingprep.com/api/v3/historical-chart/{time_period}/{symbol}?serietype=bar&extend=false&from={start_date}&to={end_date}&apikey={api_key}"
     
     new_data = await fetch_data(session, url)
     if new_data:
-        existing_data.extend(new_data)
-        existing_data.sort(key=lambda x: x['date'])  # Sort by date
-        await save_json(symbol, existing_data, time_period)
+        bar_store.append(time_period, symbol, new_data, save_index=False)
 
 async def fetch_all_data(session, symbol, time_period):
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=180)
     
     step = timedelta(days=5)  # Step of 5 days
+    windows = []
     current_start_date = start_date
-    
-    all_data = []  # To accumulate all the data
     while current_start_date < end_date:
         current_end_date = min(current_start_date + step, end_date)
-        
-        url = f"https://financialmodelingprep.com/api/v3/historical-chart/{time_period}/{symbol}?serietype=bar&extend=false&from={current_start_date.strftime('%Y-%m-%d')}&to={current_end_date.strftime('%Y-%m-%d')}&apikey={api_key}"
-        
-        data = await fetch_data(session, url)
-        print("api endpoint called")
-        
-        if data:
-            all_data.extend(data)  # Accumulate the fetched data
-            print(f"Fetched {len(data)} records from {current_start_date.strftime('%Y-%m-%d')} to {current_end_date.strftime('%Y-%m-%d')}")
-        
-        # Move the window forward by 5 days
+        windows.append((current_start_date.strftime('%Y-%m-%d'), current_end_date.strftime('%Y-%m-%d')))
         current_start_date = current_end_date
 
-    if all_data:
-        # Sort the data by date before saving
-        all_data.sort(key=lambda x: x['date'])
-        await save_json(symbol, all_data, time_period)
-        gc.collect()
+    # All windows at once, bounded by the request semaphore
+    results = await asyncio.gather(*[
+        fetch_data(session, f"https://financialmodelingprep.com/api/v3/historical-chart/{time_period}/{symbol}?serietype=bar&extend=false&from={start}&to={end}&apikey={api_key}")
+        for start, end in windows
+    ])
+    all_data = [item for data in results if data for item in data]
 
+    if all_data:
+        bar_store.append(time_period, symbol, all_data, save_index=False)
+        print(f"Fetched {len(all_data)} {time_period} bars of {symbol}")
 
-async def save_json(symbol, data, interval):
-    os.makedirs(f"json/export/price/{interval}", exist_ok=True)
-    file_path = f"json/export/price/{interval}/{symbol}.json"
-    with open(file_path, 'w') as file:
-        ujson.dump(data, file)
 
 async def process_symbol(session, symbol):
     await get_data(session, symbol, '1hour')
@@ -137,6 +131,9 @@ async def run():
                     gc.collect()
                     await asyncio.sleep(30)  # Pause for 60 seconds to avoid hitting rate limits
 
+        # One index write per interval and chunk instead of per symbol
+        bar_store.save_index('1hour')
+        bar_store.save_index('30min')
         gc.collect()
         await asyncio.sleep(30)
 
@@ -0,0 +1,18 @@
+import time
+from utils.price_store import DEFAULT_STORES
+from utils.feature_store import DEFAULT_FEATURE_STORES, build_feature_store
+
+
+def run():
+    for db_path, (_, store_path) in DEFAULT_STORES.items():
+        start = time.time()
+        out_path = DEFAULT_FEATURE_STORES[store_path]
+        try:
+            num_symbols, num_reused = build_feature_store(store_path, out_path)
+            print(f"{store_path} -> {out_path}: {num_symbols} symbols ({num_reused} extended) in {time.time() - start:.1f}s")
+        except Exception as e:
+            print(f"Error building features for {db_path}: {e}")
+
+
+if __name__ == "__main__":
+    run()
@@ -5,6 +5,8 @@ import aiohttp
 import sqlite3
 from tqdm import tqdm
 from dotenv import load_dotenv
+from data_providers.client import close_clients, get_client
+from data_providers.impl.constants import FMP_BASE_URL
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
@@ -13,38 +15,14 @@ api_key = os.getenv('FMP_API_KEY')
 include_current_quarter = False
 max_concurrent_requests = 100
 
-class RateLimiter:
-    def __init__(self, max_requests, time_window):
-        self.max_requests = max_requests
-        self.time_window = time_window
-        self.requests = 0
-        self.last_reset = asyncio.get_event_loop().time()
-
-    async def acquire(self):
-        current_time = asyncio.get_event_loop().time()
-        if current_time - self.last_reset >= self.time_window:
-            self.requests = 0
-            self.last_reset = current_time
-
-        if self.requests >= self.max_requests:
-            wait_time = self.time_window - (current_time - self.last_reset)
-            if wait_time > 0:
-                print(f"\nRate limit reached. Waiting {wait_time:.2f} seconds...")
-                await asyncio.sleep(wait_time)
-                self.requests = 0
-                self.last_reset = asyncio.get_event_loop().time()
-
-        self.requests += 1
-
-async def fetch_data(session, url, symbol, rate_limiter):
-    await rate_limiter.acquire()
+async def fetch_data(client, url, symbol):
     try:
-        async with session.get(url) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                print(f"Error fetching data for {symbol}: HTTP {response.status}")
-                return None
+        response = await client.fetch(url)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Error fetching data for {symbol}: HTTP {response.status_code}")
+            return None
     except Exception as e:
         print(f"Exception during fetching data for {symbol}: {e}")
         return None
@@ -99,7 +77,7 @@ async def calculate_margins(symbol):
         except Exception as e:
             print(f"Error calculating margins for {symbol}: {e}")
 
-async def get_financial_statements(session, symbol, semaphore, rate_limiter):
+async def get_financial_statements(client, symbol, semaphore):
     base_url = "https://financialmodelingprep.com/api/v3"
     periods = ['quarter', 'annual']
     financial_data_types = ['key-metrics', 'income-statement', 'balance-sheet-statement', 'cash-flow-statement', 'ratios']
@@ -110,26 +88,26 @@ async def get_financial_statements(session, symbol, semaphore, rate_limiter):
             # Fetch regular financial statements
             for data_type in financial_data_types:
                 url = f"{base_url}/{data_type}/{symbol}?period={period}&apikey={api_key}"
-                data = await fetch_data(session, url, symbol, rate_limiter)
+                data = await fetch_data(client, url, symbol)
                 if data:
                     await save_json(symbol, period, data_type, data)
             
             # Fetch financial statement growth data
             for growth_type in growth_data_types:
                 growth_url = f"{base_url}/{growth_type}/{symbol}?period={period}&apikey={api_key}"
-                growth_data = await fetch_data(session, growth_url, symbol, rate_limiter)
+                growth_data = await fetch_data(client, growth_url, symbol)
                 if growth_data:
                     await save_json(symbol, period, growth_type, growth_data)
 
         # Fetch TTM metrics
         url = f"https://financialmodelingprep.com/api/v3/key-metrics-ttm/{symbol}?apikey={api_key}"
-        data = await fetch_data(session, url, symbol, rate_limiter)
+        data = await fetch_data(client, url, symbol)
         if data:
             await save_json(symbol, 'ttm', 'key-metrics', data)
 
         # Fetch owner earnings data
         owner_earnings_url = f"https://financialmodelingprep.com/api/v4/owner_earnings?symbol={symbol}&apikey={api_key}"
-        owner_earnings_data = await fetch_data(session, owner_earnings_url, symbol, rate_limiter)
+        owner_earnings_data = await fetch_data(client, owner_earnings_url, symbol)
         if owner_earnings_data:
             await save_json(symbol, 'quarter', 'owner-earnings', owner_earnings_data)
 
@@ -143,16 +121,20 @@ async def run():
     symbols = [row[0] for row in cursor.fetchall()]
     con.close()
 
-    rate_limiter = RateLimiter(max_requests=500, time_window=60)
+    # Pooled and paced at the FMP quota by the shared provider client
+    client = get_client(FMP_BASE_URL)
     semaphore = asyncio.Semaphore(max_concurrent_requests)
 
-    async with aiohttp.ClientSession() as session:
+    try:
         tasks = []
         for symbol in tqdm(symbols):
-            task = asyncio.create_task(get_financial_statements(session, symbol, semaphore, rate_limiter))
+            task = asyncio.create_task(get_financial_statements(client, symbol, semaphore))
             tasks.append(task)
-        
+
         await asyncio.gather(*tasks)
+        print(client.summary())
+    finally:
+        await close_clients()
 
 if __name__ == "__main__":
     asyncio.run(run())
\ No newline at end of file
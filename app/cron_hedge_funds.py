@@ -1,6 +1,7 @@
 import sqlite3
 import os
 import orjson
+from utils.quote_store import open_quote_store, read_quote
 import time
 from datetime import datetime
 from collections import Counter
@@ -18,22 +19,13 @@ keys_to_keep = [
     "marketValue", "avgPricePaid", "putCallShare"
 ]
 
-quote_cache = {}
+quote_store = open_quote_store()
 
 cutoff_date = datetime.strptime("2015-01-01", "%Y-%m-%d")
 
 def get_quote_data(symbol):
-    """Get quote data for a symbol from JSON file"""
-    if symbol in quote_cache:
-        return quote_cache[symbol]
-    else:
-        try:
-            with open(f"json/quote/{symbol}.json") as file:
-                quote_data = orjson.loads(file.read())
-                quote_cache[symbol] = quote_data  # Cache the loaded data
-                return quote_data
-        except:
-            return None
+    """Get quote data for a symbol from the quote store"""
+    return read_quote(symbol, quote_store)
 
 def format_company_name(company_name):
     remove_strings = [', LLC','LLC', ',', 'LP', 'LTD', 'LTD.', 'INC.', 'INC', '.', '/DE/','/MD/','PLC']
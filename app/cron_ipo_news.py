@@ -87,7 +87,7 @@ def main():
         df = pd.DataFrame(news_data)
 
         # Save the DataFrame to a JSON file
-        df.to_json(json_file_path, orient='records', indent=2)
+        df.to_json(json_file_path, orient='records')
 
     finally:
         # Ensure the WebDriver is closed
@@ -6,6 +6,8 @@ import pandas as pd
 from tqdm import tqdm
 from dotenv import load_dotenv
 import os
+from utils.quote_store import open_quote_store, read_quote
+from utils.list_engine import ListFrame, build_lists
 
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
@@ -18,24 +20,15 @@ stock_screener_data_dict = {item['symbol']: item for item in stock_screener_data
 
 
 query_etf_holding = f"SELECT holding from etfs WHERE symbol = ?"
-quote_cache = {}
+quote_store = open_quote_store()
 
 async def save_json(category, data, category_type='market-cap'):
     with open(f"json/{category_type}/list/{category}.json", 'wb') as file:
         file.write(orjson.dumps(data))
 
 async def get_quote_data(symbol):
-    """Get quote data for a symbol from JSON file"""
-    if symbol in quote_cache:
-        return quote_cache[symbol]
-    else:
-        try:
-            with open(f"json/quote/{symbol}.json") as file:
-                quote_data = orjson.loads(file.read())
-                quote_cache[symbol] = quote_data  # Cache the loaded data
-                return quote_data
-        except:
-            return None
+    """Get quote data for a symbol from the quote store"""
+    return read_quote(symbol, quote_store)
 
 async def process_category(cursor, category, condition, category_type='market-cap'):
     base_query = """
@@ -168,8 +161,9 @@ async def get_etf_provider():
             for item in res:
                 try:
                     symbol = item['symbol']
-                    with open(f"json/quote/{symbol}.json") as file:
-                        quote_data = orjson.loads(file.read())
+                    quote_data = read_quote(symbol, quote_store)
+                    if quote_data is None:
+                        continue
                     # Assign price and changesPercentage if available, otherwise set to None
                     item['price'] = round(quote_data.get('price'), 2) if quote_data else None
                     item['changesPercentage'] = round(quote_data.get('changesPercentage'), 2) if quote_data else None
@@ -207,11 +201,7 @@ async def generate_stock_list(symbol_list, output_file):
             revenue = stock_screener_data_dict.get(symbol, {}).get('revenue', None)
 
             # Load quote data from file
-            try:
-                with open(f"json/quote/{symbol}.json") as file:
-                    quote_data = orjson.loads(file.read())
-            except FileNotFoundError:
-                quote_data = None
+            quote_data = read_quote(symbol, quote_store)
 
             # Extract data from quote_data
             price = round(quote_data.get('price', None), 2) if quote_data else None
@@ -375,605 +365,100 @@ async def get_faang():
 
 
 
-async def get_penny_stocks():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-
-            # Load quote data from JSON file
-            quote_data = await get_quote_data(symbol)
-
-            # Assign price and volume, and check if they meet the penny stock criteria
-            if quote_data:
-                price = round(quote_data.get('price',None), 2)
-                volume = quote_data.get('volume',None)
-                
-                if price < 5 and volume > 10000:
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
+# Screener-based lists of json/stocks-list/list, evaluated together by
+# utils.list_engine over one load of the quotes and screener fields.
+# Screener fields missing from a row take these values.
+SCREENER_DEFAULTS = {
+    'analystCounter': 0,
+    'dividendYield': 0,
+    'payoutRatio': 100,
+    'incomeTaxExpense': 0,
+    'ivRank': 0,
+    'totalPrem': 0,
+    'totalOI': 0,
+    'changeOI': 0,
+}
 
-                    # Append stock data to res_list if it meets the criteria
-                    res_list.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'price': price,
-                        'changesPercentage': changesPercentage,
-                        'marketCap': marketCap,
-                        'volume': volume
-                    })
+OPTIONS_FIELDS = ['ivRank', 'totalPrem', 'totalOI', 'changeOI']
 
-        except Exception as e:
-            print(e)
 
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['volume'], reverse=True)
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
+def us_company(f):
+    return f.text('country') == 'United States'
 
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/penny-stocks.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
 
-async def get_oversold_stocks():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
+def no_dash(f):
+    return ~f.symbol_contains('-')
 
-    res_list = []
-    for symbol in symbols:
-        try:
 
-            # Load quote data from JSON file
-            rsi = stock_screener_data_dict[symbol].get('rsi',None)
+def is_moving(f):
+    return f.quote('changesPercentage', 2) != 0
 
-            if rsi < 30 and rsi > 0:
-                quote_data = await get_quote_data(symbol)
 
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
-                    volume = quote_data.get('volume')
-                    if marketCap > 100_000 and changesPercentage != 0 and volume > 10_000:
-                        # Append stock data to res_list if it meets the criteria
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'marketCap': marketCap,
-                            'rsi': rsi
-                        })
+def oversold_rsi(f):
+    rsi = f.screener('rsi')
+    return no_dash(f) & (rsi < 30) & (rsi > 0) & (f.quote('marketCap') > 100_000) & is_moving(f) & (f.quote('volume') > 10_000)
 
-        except Exception as e:
-            print(e)
 
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['rsi'])
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
+def overbought_rsi(f):
+    rsi = f.screener('rsi')
+    return no_dash(f) & (rsi > 70) & (rsi < 100) & (f.quote('marketCap') > 100_000) & is_moving(f) & (f.quote('volume') > 10_000)
 
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/oversold-stocks.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
 
-async def get_overbought_stocks():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
+def top_rated_dividend(f):
+    return (us_company(f) & f.isin('analystRating', ['Buy', 'Strong Buy']) & (f.screener('analystCounter') >= 10)
+            & (f.screener('dividendYield') >= 2) & (f.screener('payoutRatio') < 60))
 
-    res_list = []
-    for symbol in symbols:
-        try:
 
-            # Load quote data from JSON file
-            rsi = stock_screener_data_dict[symbol].get('rsi',None)
+def most_ftd(f):
+    return (no_dash(f) & (f.screener('relativeFTD') > 10) & (f.screener('failToDeliver') > 10_000) & us_company(f)
+            & is_moving(f) & (f.quote('volume', 2) > 10_000) & (f.quote('marketCap', 2) > 50E6))
 
-            if rsi > 70 and rsi < 100:
-                quote_data = await get_quote_data(symbol)
 
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
-                    volume = quote_data.get('volume')
-
-                    if marketCap > 100_000 and changesPercentage != 0 and volume > 10_000:
-                        # Append stock data to res_list if it meets the criteria
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'marketCap': marketCap,
-                            'rsi': rsi
-                        })
+def open_interest_change(f):
+    return no_dash(f) & (f.screener('changeOI') > 0) & (f.screener('totalOI') > 0) & is_moving(f)
 
-        except Exception as e:
-            print(e)
 
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['rsi'], reverse=True)
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
+STOCK_LIST_SPECS = [
+    {'name': 'penny-stocks', 'where': lambda f: (f.quote('price', 2) < 5) & (f.quote('volume') > 10000),
+     'sort': 'volume', 'quote': ['marketCap', 'volume']},
+    {'name': 'oversold-stocks', 'where': oversold_rsi, 'sort': 'rsi', 'descending': False,
+     'quote': ['marketCap'], 'screener': ['rsi']},
+    {'name': 'overbought-stocks', 'where': overbought_rsi, 'sort': 'rsi',
+     'quote': ['marketCap'], 'screener': ['rsi']},
+    {'name': 'top-rated-dividend-stocks', 'where': top_rated_dividend, 'sort': 'marketCap',
+     'quote': ['marketCap'], 'screener': ['dividendYield']},
+    # Some companies have a wrong revenue above 1T
+    {'name': 'highest-revenue', 'where': lambda f: no_dash(f) & (f.screener('revenue') > 1E9) & (f.screener('revenue') < 1E12) & us_company(f),
+     'sort': 'revenue', 'limit': 500, 'quote': ['marketCap'], 'screener': ['revenue']},
+    {'name': 'highest-income-tax', 'where': lambda f: no_dash(f) & (f.screener('incomeTaxExpense') > 10E6) & us_company(f),
+     'sort': 'incomeTaxExpense', 'limit': 100, 'quote': ['marketCap'], 'screener': ['incomeTaxExpense']},
+    {'name': 'most-employees', 'where': lambda f: no_dash(f) & (f.screener('employees') > 10_000) & us_company(f),
+     'sort': 'employees', 'limit': 100, 'quote': ['marketCap'], 'screener': ['employees']},
+    {'name': 'most-ftd-shares', 'where': most_ftd, 'sort': 'relativeFTD', 'limit': 50,
+     'screener': ['relativeFTD', 'failToDeliver']},
+    {'name': 'most-shorted-stocks', 'where': lambda f: no_dash(f) & (f.screener('shortFloatPercent') > 10) & is_moving(f),
+     'sort': 'shortFloatPercent', 'limit': 100, 'require': ['marketCap'], 'screener': ['shortFloatPercent']},
+    {'name': 'highest-open-interest-change', 'where': open_interest_change, 'sort': 'changeOI', 'limit': 100,
+     'require': ['marketCap'], 'screener': OPTIONS_FIELDS},
+    {'name': 'highest-open-interest', 'where': open_interest_change, 'sort': 'totalOI', 'limit': 100,
+     'require': ['marketCap'], 'screener': OPTIONS_FIELDS},
+    {'name': 'highest-option-iv-rank', 'where': lambda f: no_dash(f) & (f.screener('totalOI') > 1E6) & (f.screener('ivRank') > 0) & is_moving(f),
+     'sort': 'ivRank', 'limit': 50, 'require': ['marketCap'], 'screener': OPTIONS_FIELDS},
+    {'name': 'highest-option-premium', 'where': lambda f: no_dash(f) & (f.screener('totalPrem') > 0) & (f.screener('ivRank') > 0) & is_moving(f),
+     'sort': 'totalPrem', 'limit': 50, 'require': ['marketCap'], 'screener': OPTIONS_FIELDS},
+]
 
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/overbought-stocks.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
 
-async def get_top_dividend_stocks():
+async def get_screener_lists():
     with sqlite3.connect('stocks.db') as con:
         cursor = con.cursor()
         cursor.execute("PRAGMA journal_mode = wal")
         cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%'")
         symbols = [row[0] for row in cursor.fetchall()]
 
-    res_list = []
-    for symbol in symbols:
-        try:
-
-            # Load quote data from JSON file
-            analyst_rating = stock_screener_data_dict[symbol].get('analystRating',None)
-            analyst_counter = stock_screener_data_dict[symbol].get('analystCounter',0)
-            dividend_yield = stock_screener_data_dict[symbol].get('dividendYield',0)
-            payout_ratio = stock_screener_data_dict[symbol].get('payoutRatio',100)
-            country = stock_screener_data_dict[symbol].get('country',None)
-            if country == 'United States' and analyst_rating in ['Buy','Strong Buy'] and analyst_counter >= 10 and dividend_yield >=2 and payout_ratio < 60:
-                quote_data = await get_quote_data(symbol)
-
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    res_list.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'price': price,
-                        'changesPercentage': changesPercentage,
-                        'marketCap': marketCap,
-                        'dividendYield': dividend_yield
-                    })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['marketCap'], reverse=True)
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/top-rated-dividend-stocks.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-async def get_highest_revenue():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            revenue = stock_screener_data_dict[symbol].get('revenue',None)
-            country = stock_screener_data_dict[symbol].get('country',None)
-            if revenue > 1E9 and revenue < 1E12 and country == 'United States': #bug where some companies have wrong revenue
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    res_list.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'price': price,
-                        'changesPercentage': changesPercentage,
-                        'marketCap': marketCap,
-                        'revenue': revenue
-                    })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['revenue'], reverse=True)[:500]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/highest-revenue.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-async def get_highest_income_tax():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            income_tax = stock_screener_data_dict[symbol].get('incomeTaxExpense',0)
-            country = stock_screener_data_dict[symbol].get('country',None)
-            if income_tax > 10E6 and country == 'United States':
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    res_list.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'price': price,
-                        'changesPercentage': changesPercentage,
-                        'marketCap': marketCap,
-                        'incomeTaxExpense': income_tax
-                    })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['incomeTaxExpense'], reverse=True)[:100]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/highest-income-tax.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-async def get_most_employees():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            employees = stock_screener_data_dict[symbol].get('employees',None)
-            country = stock_screener_data_dict[symbol].get('country',None)
-            if employees > 10_000 and country == 'United States':
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    marketCap = quote_data.get('marketCap')
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    res_list.append({
-                        'symbol': symbol,
-                        'name': name,
-                        'price': price,
-                        'changesPercentage': changesPercentage,
-                        'marketCap': marketCap,
-                        'employees': employees
-                    })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['employees'], reverse=True)[:100]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/most-employees.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-
-async def get_most_ftd_shares():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            relative_ftd = stock_screener_data_dict[symbol].get('relativeFTD',None)
-            ftd_shares = stock_screener_data_dict[symbol].get('failToDeliver',None)
-            country = stock_screener_data_dict[symbol].get('country',None)
-            if relative_ftd > 10 and ftd_shares > 10_000 and country == 'United States':
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    volume = round(quote_data.get('volume',None), 2)
-                    market_cap = round(quote_data.get('marketCap',None), 2)
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    if changesPercentage != 0 and volume > 10_000 and market_cap > 50E6:
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'relativeFTD': relative_ftd,
-                            'failToDeliver': ftd_shares
-                        })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['relativeFTD'], reverse=True)[:50]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/most-ftd-shares.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-async def get_most_shorted_stocks():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            short_percent_float = stock_screener_data_dict[symbol].get('shortFloatPercent',None)
-            if short_percent_float > 10:
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    market_cap = round(quote_data.get('marketCap',None), 2)
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    if changesPercentage != 0:
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'shortFloatPercent': short_percent_float,
-                        })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['shortFloatPercent'], reverse=True)[:100]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/most-shorted-stocks.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-
-async def get_highest_oi_change():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            iv_rank = stock_screener_data_dict[symbol].get('ivRank',0)
-            total_prem = stock_screener_data_dict[symbol].get('totalPrem',0)
-            total_oi = stock_screener_data_dict[symbol].get('totalOI',0)
-            change_oi = stock_screener_data_dict[symbol].get('changeOI',0)
-
-            if change_oi > 0 and total_oi > 0:
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    market_cap = round(quote_data.get('marketCap',None), 2)
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    if changesPercentage != 0:
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'ivRank': iv_rank,
-                            'totalPrem': total_prem,
-                            'totalOI': total_oi,
-                            'changeOI': change_oi,
-                        })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        highest_oi_change = sorted(res_list, key=lambda x: x['changeOI'], reverse=True)[:100]
-        highest_oi = sorted(res_list, key=lambda x: x['totalOI'], reverse=True)[:100]
-        
-        # Create independent lists with ranks
-        highest_oi_change_ranks = [
-            {**item, "rank": rank} for rank, item in enumerate(highest_oi_change, start=1)
-        ]
-        highest_oi_ranks = [
-            {**item, "rank": rank} for rank, item in enumerate(highest_oi, start=1)
-        ]
-
-        # Write the filtered and ranked stocks to JSON files
-        with open("json/stocks-list/list/highest-open-interest-change.json", 'wb') as file:
-            file.write(orjson.dumps(highest_oi_change_ranks))
-
-        with open("json/stocks-list/list/highest-open-interest.json", 'wb') as file:
-            file.write(orjson.dumps(highest_oi_ranks))
-
-
-async def get_highest_option_iv_rank():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            iv_rank = stock_screener_data_dict[symbol].get('ivRank',0)
-            total_prem = stock_screener_data_dict[symbol].get('totalPrem',0)
-            total_oi = stock_screener_data_dict[symbol].get('totalOI',0)
-            change_oi = stock_screener_data_dict[symbol].get('changeOI',0)
-
-            if total_oi > 1E6 and iv_rank > 0:
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    market_cap = round(quote_data.get('marketCap',None), 2)
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    if changesPercentage != 0:
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'ivRank': iv_rank,
-                            'totalPrem': total_prem,
-                            'totalOI': total_oi,
-                            'changeOI': change_oi,
-                        })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['ivRank'], reverse=True)[:50]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/highest-option-iv-rank.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
-
-async def get_highest_option_premium():
-    with sqlite3.connect('stocks.db') as con:
-        cursor = con.cursor()
-        cursor.execute("PRAGMA journal_mode = wal")
-        cursor.execute("SELECT DISTINCT symbol FROM stocks WHERE symbol NOT LIKE '%.%' AND symbol NOT LIKE '%-%'")
-        symbols = [row[0] for row in cursor.fetchall()]
-
-    res_list = []
-    for symbol in symbols:
-        try:
-            # Load quote data from JSON file
-            iv_rank = stock_screener_data_dict[symbol].get('ivRank',0)
-            total_prem = stock_screener_data_dict[symbol].get('totalPrem',0)
-            total_oi = stock_screener_data_dict[symbol].get('totalOI',0)
-            change_oi = stock_screener_data_dict[symbol].get('changeOI',0)
-
-            if total_prem > 0 and iv_rank > 0:
-                quote_data = await get_quote_data(symbol)
-                # Assign price and volume, and check if they meet the penny stock criteria
-                if quote_data:
-                    price = round(quote_data.get('price',None), 2)
-                    changesPercentage = round(quote_data.get('changesPercentage'), 2)
-                    market_cap = round(quote_data.get('marketCap',None), 2)
-                    name = quote_data.get('name')
-
-                    # Append stock data to res_list if it meets the criteria
-                    if changesPercentage != 0:
-                        res_list.append({
-                            'symbol': symbol,
-                            'name': name,
-                            'price': price,
-                            'changesPercentage': changesPercentage,
-                            'ivRank': iv_rank,
-                            'totalPrem': total_prem,
-                            'totalOI': total_oi,
-                            'changeOI': change_oi,
-                        })
-        except:
-            pass
-
-    if res_list:
-        # Sort by market cap in descending order
-        res_list = sorted(res_list, key=lambda x: x['totalPrem'], reverse=True)[:50]
-        
-        # Assign rank to each stock
-        for rank, item in enumerate(res_list, start=1):
-            item['rank'] = rank
-
-        # Write the filtered and ranked penny stocks to a JSON file
-        with open("json/stocks-list/list/highest-option-premium.json", 'wb') as file:
-            file.write(orjson.dumps(res_list))
+    frame = ListFrame(symbols, quote_store, stock_screener_data_dict, SCREENER_DEFAULTS)
+    counts = build_lists(frame, STOCK_LIST_SPECS)
+    print(f"Saved {len(counts)} screener lists: {counts}")
 
 
 async def etf_bitcoin_list():
@@ -1003,11 +488,7 @@ async def etf_bitcoin_list():
                         expense_ratio = round(float(data['expenseRatio'].iloc[0]), 2)
                         total_assets = int(data['totalAssets'].iloc[0])
                         
-                        try:
-                            with open(f"json/quote/{symbol}.json", "rb") as file:
-                                quote_data = orjson.loads(file.read())
-                        except (FileNotFoundError, orjson.JSONDecodeError):
-                            quote_data = None
+                        quote_data = read_quote(symbol, quote_store)
 
                         price = round(quote_data.get('price'), 2) if quote_data else None
                         changesPercentage = round(quote_data.get('changesPercentage'), 2) if quote_data else None
@@ -1161,11 +642,7 @@ async def get_all_stock_tickers():
         for symbol in stock_symbols:
             try:
                 
-                try:
-                    with open(f"json/quote/{symbol}.json", "rb") as file:
-                        quote_data = orjson.loads(file.read())
-                except (FileNotFoundError, orjson.JSONDecodeError):
-                    quote_data = None
+                quote_data = read_quote(symbol, quote_store)
 
                 if quote_data:
                     item = {
@@ -1216,11 +693,7 @@ async def get_all_etf_tickers():
         for symbol in etf_symbols:
             try:
                 
-                try:
-                    with open(f"json/quote/{symbol}.json", "rb") as file:
-                        quote_data = orjson.loads(file.read())
-                except (FileNotFoundError, orjson.JSONDecodeError):
-                    quote_data = None
+                quote_data = read_quote(symbol, quote_store)
 
                 if quote_data:
                     item = {
@@ -1271,18 +744,7 @@ async def run():
         etf_bitcoin_list(),
         get_magnificent_seven(),
         get_faang(),
-        get_penny_stocks(),
-        get_oversold_stocks(),
-        get_overbought_stocks(),
-        get_top_dividend_stocks(),
-        get_highest_revenue(),
-        get_highest_income_tax(),
-        get_most_employees(),
-        get_most_ftd_shares(),
-        get_most_shorted_stocks(),
-        get_highest_oi_change(),
-        get_highest_option_iv_rank(),
-        get_highest_option_premium(),
+        get_screener_lists(),
         get_etf_holding(),
         get_etf_provider(),
     )
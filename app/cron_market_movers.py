@@ -15,6 +15,7 @@ berlin_tz = pytz.timezone('Europe/Berlin')
 
 from dotenv import load_dotenv
 import os
+from utils.quote_store import open_quote_store, read_quote
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
 
@@ -22,6 +23,17 @@ api_key = os.getenv('FMP_API_KEY')
 market_cap_threshold = 10E9
 volume_threshold = 50_000
 
+quote_store = open_quote_store()
+
+
+def filter_market_cap(symbols):
+    # One vectorized comparison on the quote store instead of opening every
+    # quote file; symbols missing from the store are kept for the file fallback
+    if quote_store is None:
+        return symbols
+    market_caps = quote_store.take(symbols, 'marketCap')
+    return [symbol for symbol, market_cap in zip(symbols, market_caps) if not market_cap < market_cap_threshold]
+
 def check_market_hours():
 
     holidays = ['2025-01-01', '2025-01-09','2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26', '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25']
@@ -55,12 +67,9 @@ market_status = check_market_hours()
 async def get_quote_of_stocks(ticker_list):
     res_list = []
     for symbol in ticker_list:
-        try:
-            with open(f"json/quote/{symbol}.json") as file:
-                data = orjson.loads(file.read())
-                res_list.append(data)
-        except:
-            pass
+        data = read_quote(symbol, quote_store)
+        if data:
+            res_list.append(data)
 
     return res_list
 
@@ -77,33 +86,32 @@ def deep_copy(data):
 async def get_gainer_loser_active_stocks(symbols):
     res_list = []
 
-    for symbol in symbols:
+    for symbol in filter_market_cap(symbols):
         try:
             # Load the main quote JSON file
-            with open(f"json/quote/{symbol}.json", "r") as file:
-                data = orjson.loads(file.read())
-                market_cap = int(data.get('marketCap', 0))
-                name = data.get('name', None)
-                volume = data.get('volume', 0)
-                changes_percentage = data.get("changesPercentage", None)
-                price = data.get("price", None)
-
-                # Ensure the stock meets criteria
-                if market_cap >= market_cap_threshold:
-                    with open(f"json/one-day-price/{symbol}.json", 'rb') as file:
-                        one_day_price = orjson.loads(file.read())
-                        # Filter out entries with None 'close'
-                        filtered_prices = [p for p in one_day_price if p['close'] is not None]
-
-                    if price and changes_percentage and len(filtered_prices) > 100:
-                        res_list.append({
-                            "symbol": symbol,
-                            "name": name,
-                            "price": price,
-                            "volume": volume,
-                            "changesPercentage": changes_percentage,
-                            "marketCap": market_cap
-                        })
+            data = read_quote(symbol, quote_store)
+            market_cap = int(data.get('marketCap', 0))
+            name = data.get('name', None)
+            volume = data.get('volume', 0)
+            changes_percentage = data.get("changesPercentage", None)
+            price = data.get("price", None)
+
+            # Ensure the stock meets criteria
+            if market_cap >= market_cap_threshold:
+                with open(f"json/one-day-price/{symbol}.json", 'rb') as file:
+                    one_day_price = orjson.loads(file.read())
+                    # Filter out entries with None 'close'
+                    filtered_prices = [p for p in one_day_price if p['close'] is not None]
+
+                if price and changes_percentage and len(filtered_prices) > 100:
+                    res_list.append({
+                        "symbol": symbol,
+                        "name": name,
+                        "price": price,
+                        "volume": volume,
+                        "changesPercentage": changes_percentage,
+                        "marketCap": market_cap
+                    })
         except Exception as e:
             print(f"Error processing symbol {symbol}: {e}")
             continue
@@ -189,13 +197,12 @@ async def get_pre_after_market_movers(symbols):
     res_list = []
 
     # Loop through the symbols and load the corresponding JSON files
-    for symbol in symbols:
+    for symbol in filter_market_cap(symbols):
         try:
             # Load the main quote JSON file
-            with open(f"json/quote/{symbol}.json", "r") as file:
-                data = orjson.loads(file.read())
-                market_cap = int(data.get('marketCap', 0))
-                name = data.get('name',None)
+            data = read_quote(symbol, quote_store)
+            market_cap = int(data.get('marketCap', 0))
+            name = data.get('name',None)
 
             if market_cap >= market_cap_threshold:
                 with open(f"json/pre-post-quote/{symbol}.json", "r") as file:
@@ -8,10 +8,14 @@ import sqlite3
 import pandas as pd
 import time
 from tqdm import tqdm
+from data_providers.client import close_clients_sync, get_client
+from data_providers.impl.constants import UNUSUAL_WHALES_BASE_URL
 
 load_dotenv()
 
 api_key = os.getenv('UNUSUAL_WHALES_API_KEY')
+# Pooled and paced at the Unusual Whales quota
+uw_client = get_client(UNUSUAL_WHALES_BASE_URL)
 
 # Connect to the databases
 con = sqlite3.connect('stocks.db')
@@ -167,28 +171,21 @@ headers = {
 
 total_symbols = ['NVDA']
 
-counter = 0
 for symbol in tqdm(total_symbols):
     try:
         
         url = f"https://api.unusualwhales.com/api/stock/{symbol}/options-volume"
         
-        response = requests.get(url, headers=headers, params=querystring)
+        response = uw_client.get(url, headers=headers, params=querystring)
 
         if response.status_code == 200:
             data = response.json()['data']
             prepare_data(data, symbol)
         
-        counter +=1
-        # If 50 chunks have been processed, sleep for 60 seconds
-        if counter == 260:
-            print("Sleeping...")
-            time.sleep(60)  # Sleep for 60 seconds
-            counter = 0
-        
     except Exception as e:
         print(f"Error for {symbol}:{e}")
 
+close_clients_sync()
 
 con.close()
 etf_con.close()
\ No newline at end of file
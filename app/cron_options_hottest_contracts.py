@@ -11,7 +11,9 @@ from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 import asyncio
 import aiohttp
+from data_providers.client import close_clients, get_client
 from data_providers.fetcher import get_fetcher
+from data_providers.impl.constants import UNUSUAL_WHALES_BASE_URL
 from data_providers.impl.unusual_whales import UnusualWhales
 
 today = datetime.today().date()
@@ -129,28 +131,28 @@ def prepare_data(data, symbol):
         save_json(res_dict, symbol,"json/hottest-contracts/companies")
 
 
-def get_hottest_contracts():
-    counter = 0
-    for symbol in tqdm(total_symbols):
-        try:
-            response = uw.get_option_contracts(symbol)
-            if response.status_code == 200:
-                data = response.json()['data']
+async def get_contracts(symbol):
+    try:
+        response = await uw.get_option_contracts(symbol)
+        if response.status_code == 200:
+            data = response.json()['data']
+
+            prepare_data(data, symbol)
+    except Exception as e:
+        print(f"Error for {symbol}:{e}")
+
 
-                prepare_data(data, symbol)
-            
-            counter +=1
-            
-            # If 50 chunks have been processed, sleep for 60 seconds
-            if counter == 260:
-                print("Sleeping...")
-                time.sleep(60)
-                counter = 0
-            
-        except Exception as e:
-            print(f"Error for {symbol}:{e}")
+async def get_hottest_contracts():
+    # The provider client paces requests at the Unusual Whales quota
+    chunk_size = 100
+    try:
+        for i in tqdm(range(0, len(total_symbols), chunk_size)):
+            await asyncio.gather(*[get_contracts(symbol) for symbol in total_symbols[i:i + chunk_size]])
+        print(get_client(UNUSUAL_WHALES_BASE_URL).summary())
+    finally:
+        await close_clients()
 
 
 
 if __name__ == '__main__':
-    get_hottest_contracts()
\ No newline at end of file
+    asyncio.run(get_hottest_contracts())
\ No newline at end of file
@@ -7,10 +7,14 @@ import os
 import sqlite3
 import time
 from tqdm import tqdm
+from data_providers.client import close_clients_sync, get_client
+from data_providers.impl.constants import UNUSUAL_WHALES_BASE_URL
 
 load_dotenv()
 
 api_key = os.getenv('UNUSUAL_WHALES_API_KEY')
+# Pooled and paced at the Unusual Whales quota
+uw_client = get_client(UNUSUAL_WHALES_BASE_URL)
 headers = {"Accept": "application/json, text/plain", "Authorization": api_key}
 
 # Connect to the databases
@@ -87,25 +91,17 @@ def get_strike_data():
     if len(total_symbols) < 100:
         total_symbols = stocks_symbols+etf_symbols
 
-    counter = 0
     #Test mode
     #total_symbols = ['GME','SPY']
     for symbol in tqdm(total_symbols):
         try:
             url = f"https://api.unusualwhales.com/api/stock/{symbol}/oi-per-strike"
             
-            response = requests.get(url, headers=headers)
+            response = uw_client.get(url, headers=headers)
             if response.status_code == 200:
                 data = response.json()['data']
                 prepare_data(data, symbol, directory_path, sort_by = 'strike')
             
-            counter +=1
-            
-            # If 50 chunks have been processed, sleep for 60 seconds
-            if counter == 260:
-                print("Sleeping...")
-                time.sleep(60)
-                counter = 0
             
         except Exception as e:
             print(f"Error for {symbol}:{e}")
@@ -117,31 +113,26 @@ def get_expiry_data():
     if len(total_symbols) < 100:
         total_symbols = stocks_symbols+etf_symbols
 
-    counter = 0
 
     for symbol in tqdm(total_symbols):
         try:
             url = f"https://api.unusualwhales.com/api/stock/{symbol}/oi-per-expiry"
             
-            response = requests.get(url, headers=headers)
+            response = uw_client.get(url, headers=headers)
             if response.status_code == 200:
                 data = response.json()['data']
                 prepare_data(data, symbol, directory_path)
             
-            counter +=1
-            
-            # If 50 chunks have been processed, sleep for 60 seconds
-            if counter == 260:
-                print("Sleeping...")
-                time.sleep(60)
-                counter = 0
             
         except Exception as e:
             print(f"Error for {symbol}:{e}")
 
 
 if __name__ == '__main__':
-    get_strike_data()
-    #time.sleep(60)
-    get_expiry_data()
+    try:
+        get_strike_data()
+        get_expiry_data()
+        print(uw_client.summary())
+    finally:
+        close_clients_sync()
 
@@ -8,6 +8,8 @@ import time
 import asyncio
 import aiohttp
 from tqdm import tqdm
+from data_providers.client import close_clients_sync, get_client
+from data_providers.impl.constants import UNUSUAL_WHALES_BASE_URL
 
 today = datetime.today()
 
@@ -15,6 +17,8 @@ load_dotenv()
 
 api_key = os.getenv('UNUSUAL_WHALES_API_KEY')
 headers = {"Accept": "application/json, text/plain", "Authorization": api_key}
+# Pooled and paced at the Unusual Whales quota
+uw_client = get_client(UNUSUAL_WHALES_BASE_URL)
 keys_to_remove = {'high_price', 'low_price', 'iv_low', 'iv_high', 'last_tape_time'}
 
 def save_json(data, filename, directory):
@@ -43,7 +47,7 @@ def get_single_contract_historical_data(contract_id):
     keys_to_remove = {'high_price', 'low_price', 'iv_low', 'iv_high', 'last_tape_time'}
 
     url = f"https://api.unusualwhales.com/api/option-contract/{contract_id}/historic"
-    response = requests.get(url, headers=headers)
+    response = uw_client.get(url, headers=headers)
     data = response.json()['chains']
     data = sorted(data, key=lambda x: datetime.strptime(x.get('date', ''), '%Y-%m-%d'))
     res_list = []
@@ -112,15 +116,12 @@ if __name__ == '__main__':
     
     print("Number of contract chains:", len(contract_id_list))
     
-    counter = 0
-    for item in tqdm(contract_id_list):
-        try:
-            get_single_contract_historical_data(item)
-        except:
-            pass
-        # If 50 chunks have been processed, sleep for 60 seconds
-        counter +=1
-        if counter == 260:
-            print("Sleeping...")
-            time.sleep(60)
-            counter = 0
\ No newline at end of file
+    try:
+        for item in tqdm(contract_id_list):
+            try:
+                get_single_contract_historical_data(item)
+            except:
+                pass
+        print(uw_client.summary())
+    finally:
+        close_clients_sync()
\ No newline at end of file
@@ -4,6 +4,8 @@ import orjson
 from dotenv import load_dotenv
 import os
 import sqlite3
+from data_providers.client import close_clients, get_client
+from data_providers.impl.constants import UNUSUAL_WHALES_BASE_URL
 
 load_dotenv()
 
@@ -98,7 +100,7 @@ def prepare_data(data):
             pass
 
 
-async def fetch_data(session, chunk):
+async def fetch_data(client, chunk):
     chunk_str = ",".join(chunk)
     url = "https://api.unusualwhales.com/api/screener/stocks"
     params = {"ticker": chunk_str}
@@ -108,11 +110,10 @@ async def fetch_data(session, chunk):
     }
 
     try:
-        async with session.get(url, headers=headers, params=params) as response:
-            json_data = await response.json()
-            data = json_data.get('data', [])
-            prepare_data(data)
-            print(f"Processed chunk with {len(data)} results.")
+        json_data = await client.fetch_json(url, headers=headers, params=params)
+        data = json_data.get('data', [])
+        prepare_data(data)
+        print(f"Processed chunk with {len(data)} results.")
     except Exception as e:
         print(f"Exception fetching chunk {chunk_str}: {e}")
 
@@ -125,15 +126,18 @@ async def main():
     chunk_size = 50
     chunks = [total_symbols[i:i + chunk_size] for i in range(0, len(total_symbols), chunk_size)]
 
-    async with aiohttp.ClientSession() as session:
+    # The provider client paces requests at the Unusual Whales quota
+    client = get_client(UNUSUAL_WHALES_BASE_URL)
+    try:
         for i in range(0, len(chunks), 100):  # Process 100 chunks at a time
             try:
-                tasks = [fetch_data(session, chunk) for chunk in chunks[i:i + 100]]
+                tasks = [fetch_data(client, chunk) for chunk in chunks[i:i + 100]]
                 await asyncio.gather(*tasks)
-                print("Processed 100 chunks. Sleeping for 60 seconds...")
-                await asyncio.sleep(60)  # Avoid API rate limits
             except:
                 pass
+        print(client.summary())
+    finally:
+        await close_clients()
 
 
 if __name__ == "__main__":
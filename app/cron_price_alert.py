@@ -9,6 +9,10 @@ import time
 import subprocess
 from pocketbase import PocketBase  # Client also works the same
 import asyncio
+import orjson
+import websockets
+from utils.quote_store import open_quote_store, read_quote
+from utils.price_alerts import PriceAlertEngine
 import aiohttp
 import pytz
 import pandas as pd
@@ -33,6 +37,11 @@ aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID')
 aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY')
 
 berlin_tz = pytz.timezone('Europe/Berlin')
+TICK_HUB_URI = f"ws://{os.getenv('TICK_HUB_HOST', '127.0.0.1')}:{os.getenv('TICK_HUB_PORT', '2001')}/price-data"
+SYNC_INTERVAL = 5  # seconds between incremental PocketBase syncs
+FULL_SYNC_INTERVAL = 600
+SWEEP_INTERVAL = 15
+FLUSH_INTERVAL = 0.5
 pb = PocketBase('http://127.0.0.1:8090')
 admin_data = pb.collection('_superusers').auth_with_password(pb_admin_email, pb_password)
 
@@ -109,47 +118,103 @@ def send_email(recipient, symbol, asset_type, current_price,target_price, condit
         print(f"Error sending email: {e}")
 
 
+async def sync_alerts(engine, symbols_changed):
+    """
+    Incremental re-sync by `updated` timestamp, with a periodic full reload
+    that also drops deleted alerts.
+    """
+    last_full = 0
+    while True:
+        try:
+            symbols = engine.index.symbols()
+            if time.monotonic() - last_full > FULL_SYNC_INTERVAL or engine.since is None:
+                engine.apply_full(await asyncio.to_thread(engine.load_all))
+                last_full = time.monotonic()
+            else:
+                engine.apply_changed(await asyncio.to_thread(engine.load_changed))
+            if engine.index.symbols() != symbols:
+                symbols_changed.set()
+        except Exception as e:
+            print(f"Price alert sync failed: {e}")
+        await asyncio.sleep(SYNC_INTERVAL)
+
+
+async def listen_ticks(engine, symbols_changed):
+    """
+    Resolve alerts on every price pushed by the tick hub (cron_websocket.py)
+    for the symbols that have active alerts.
+    """
+    while True:
+        try:
+            async with websockets.connect(TICK_HUB_URI, ping_interval=30) as websocket:
+                async def subscribe():
+                    while True:
+                        symbols_changed.clear()
+                        await websocket.send(orjson.dumps(sorted(engine.index.symbols())).decode())
+                        await symbols_changed.wait()
+
+                subscriber = asyncio.create_task(subscribe())
+                try:
+                    async for message in websocket:
+                        for update in orjson.loads(message):
+                            engine.on_price(update['symbol'], update['avgPrice'])
+                finally:
+                    subscriber.cancel()
+        except Exception as e:
+            print(f"Tick hub connection lost: {e}")
+        await asyncio.sleep(5)
+
+
+async def sweep_quotes(engine):
+    """
+    Check the quote snapshot of cron_quote.py as well, for symbols without
+    ticks (outside market hours, crypto) and while the hub is down.
+    """
+    while True:
+        try:
+            # Alerts are checked on weekdays only, as before
+            if datetime.now(berlin_tz).weekday() > 4:
+                await asyncio.sleep(SWEEP_INTERVAL)
+                continue
+            symbols = sorted(engine.index.symbols())
+            quote_store = open_quote_store()
+            prices = quote_store.take(symbols, 'price') if quote_store is not None else [np.nan] * len(symbols)
+            for symbol, price in zip(symbols, prices):
+                if np.isnan(price):
+                    data = read_quote(symbol, quote_store)
+                    price = data.get('price') if data else None
+                if price is not None:
+                    engine.on_price(symbol, price)
+        except Exception as e:
+            print(f"Quote sweep failed: {e}")
+        await asyncio.sleep(SWEEP_INTERVAL)
+
+
+async def flush_alerts(engine):
+    """
+    Write triggered alerts back in PocketBase batch transactions.
+    """
+    while True:
+        pending = engine.take_pending()
+        if pending:
+            await asyncio.to_thread(engine.write_triggered, pending)
+            print(f"{len(pending)} price alerts triggered, {engine.stats}")
+        await asyncio.sleep(FLUSH_INTERVAL)
+
+
 async def run():
-    result =  pb.collection("priceAlert").get_full_list(query_params={"filter": 'triggered=false'})
-    if len(result) != 0:
-        for item in result:
-            symbol = item.symbol
-            with open(f"json/quote/{symbol}.json", 'r') as file:
-                data = ujson.load(file)
-                current_price = round(data['price'],2)
-                target_price = round(item.target_price,2)
-                if (item.condition == 'below') and target_price >= current_price:
-                    #print('below true', symbol, target_price)
-                    pb.collection("priceAlert").update(item.id, {"triggered": True})
-                    
-                    newNotification = {
-                    'opUser': item.user,
-                    'user': '9ncz4wunmhk0k52', #stocknear bot id
-                    'notifyType': 'priceAlert',
-                    'priceAlert': item.id,
-                    'liveResults': {'symbol': symbol, 'assetType': item.asset_type, 'condition': item.condition, 'targetPrice': target_price, 'currentPrice': current_price},
-                    }
-                    pb.collection('notifications').create(newNotification)
-                    #send alert via email
-                    #recipient = (pb.collection('users').get_one(item.user)).email
-                    #send_email(recipient, symbol, item.asset_type, current_price, target_price, item.condition)
-
-                elif (item.condition == 'above') and target_price <= current_price:
-                    #print('above true', symbol, target_price)
-                    pb.collection("priceAlert").update(item.id, {"triggered": True})
-                    
-                    newNotification = {
-                    'opUser': item.user,
-                    'user': '9ncz4wunmhk0k52', #stocknear bot id
-                    'notifyType': 'priceAlert',
-                    'priceAlert': item.id,
-                    'liveResults': {'symbol': symbol, 'assetType': item.asset_type, 'condition': item.condition, 'targetPrice': target_price, 'currentPrice': current_price},
-                    }
-                    pb.collection('notifications').create(newNotification)
-                    #send alert via email
-                    #recipient = (pb.collection('users').get_one(item.user)).email
-                    #send_email(recipient, symbol, item.asset_type, current_price, target_price, item.condition)
+    engine = PriceAlertEngine(pb)
+    symbols_changed = asyncio.Event()
+    engine.apply_full(await asyncio.to_thread(engine.load_all))
+    print(f"Loaded {len(engine.index)} active price alerts")
+    await asyncio.gather(
+        sync_alerts(engine, symbols_changed),
+        listen_ticks(engine, symbols_changed),
+        sweep_quotes(engine),
+        flush_alerts(engine),
+    )
+
 try:
     asyncio.run(run())
 except Exception as e:
-    print(e)
\ No newline at end of file
+    print(e)
@@ -0,0 +1,16 @@
+import time
+from utils.price_store import DEFAULT_STORES, import_sqlite
+
+
+def run():
+    for db_path, (table, store_path) in DEFAULT_STORES.items():
+        start = time.time()
+        try:
+            num_symbols, num_rows = import_sqlite(db_path, table, store_path)
+            print(f"{db_path} -> {store_path}: {num_symbols} symbols, {num_rows} rows in {time.time() - start:.1f}s")
+        except Exception as e:
+            print(f"Error importing {db_path}: {e}")
+
+
+if __name__ == "__main__":
+    run()
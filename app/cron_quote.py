@@ -7,6 +7,7 @@ import pytz
 
 from dotenv import load_dotenv
 import os
+from utils.quote_store import open_quote_store, read_quote, write_quote_store
 load_dotenv()
 api_key = os.getenv('FMP_API_KEY')
 
@@ -58,6 +59,7 @@ async def get_bid_ask_quote_of_stocks(ticker_list):
 async def save_quote_as_json(symbol, data):
     with open(f"json/quote/{symbol}.json", 'w') as file:
         file.write(orjson.dumps(data).decode())
+    return data
 
 async def save_pre_post_quote_as_json(symbol, data):
     try:
@@ -90,8 +92,25 @@ async def save_bid_ask_as_json(symbol, data):
         # Save the updated quote data back to the same JSON file
         with open(f"json/quote/{symbol}.json", 'w') as file:
             file.write(orjson.dumps(quote_data).decode())
+        return quote_data
     except Exception as e:
         print(f"An error occurred: {e}")  # Print the error for debugging
+        return None
+
+
+def save_quote_store(symbols, quotes):
+    # Symbols this run did not refresh keep their previous quote
+    previous = open_quote_store()
+    snapshot = {}
+    for symbol in symbols:
+        quote = quotes.get(symbol) or read_quote(symbol, previous)
+        if quote:
+            snapshot[symbol] = quote
+    try:
+        count = write_quote_store(snapshot)
+        print(f"Quote store: {count} symbols")
+    except Exception as e:
+        print(f"Failed to write quote store: {e}")
 
 
 async def run():
@@ -125,12 +144,14 @@ async def run():
                   current_time_new_york.hour >= 16)
 
 
+    quotes = {}
+
     #Crypto Quotes
     latest_quote = await get_quote_of_stocks(crypto_symbols)
     for item in latest_quote:
         symbol = item['symbol']
 
-        await save_quote_as_json(symbol, item)
+        quotes[symbol] = await save_quote_as_json(symbol, item)
 
     # Stock and ETF Quotes
     
@@ -144,7 +165,7 @@ async def run():
             latest_quote = await get_quote_of_stocks(chunk)
             for item in latest_quote:
                 symbol = item['symbol']
-                await save_quote_as_json(symbol, item)
+                quotes[symbol] = await save_quote_as_json(symbol, item)
                 #print(f"Saved data for {symbol}.")
 
         if is_market_closed == True:
@@ -157,7 +178,11 @@ async def run():
         bid_ask_quote = await get_bid_ask_quote_of_stocks(chunk)
         for item in bid_ask_quote:
             symbol = item['symbol']
-            await save_bid_ask_as_json(symbol, item)
+            quote_data = await save_bid_ask_as_json(symbol, item)
+            if quote_data:
+                quotes[symbol] = quote_data
+
+    save_quote_store(crypto_symbols + total_symbols, quotes)
 
 try:
     asyncio.run(run())
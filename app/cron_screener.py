@@ -0,0 +1,23 @@
+import sqlite3
+import time
+from utils.screener import build_screener_table, load_screener_table, save_screener_table, update_screener_table
+
+
+def run():
+    start = time.time()
+    con = sqlite3.connect('stocks.db')
+
+    table = load_screener_table()
+    if table is None:
+        print("No previous screener table found, running a full build")
+        table = build_screener_table(con)
+    else:
+        table = update_screener_table(con, table)
+
+    con.close()
+    save_screener_table(table)
+    print(f"Screener refreshed in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    run()
@@ -6,6 +6,8 @@ from datetime import datetime
 from rating import rating_model
 import pandas as pd
 from tqdm import tqdm
+from utils.price_store import open_stores
+from utils.feature_store import open_feature_stores
 
 async def save_ta_rating(symbol, data):
     with open(f"json/ta-rating/{symbol}.json", 'w') as file:
@@ -37,30 +39,44 @@ async def run():
 
     total_symbols = stocks_symbols + etf_symbols + crypto_symbols
 
+    # OHLCV and indicators of the daily price/feature stores, sqlite is the fallback
+    price_stores = open_stores()
+    feature_stores = open_feature_stores()
+
     for symbol in tqdm(total_symbols):
         try:
             table_name = None
             if symbol in etf_symbols:  # Fixed variable name from symbols to symbol
                 query_con = etf_con
+                db_path = 'etf.db'
             elif symbol in crypto_symbols:
                 query_con = crypto_con
+                db_path = 'crypto.db'
             elif symbol in stocks_symbols:
                 query_con = con
+                db_path = 'stocks.db'
+
+            price_store = price_stores.get(db_path)
+            if price_store is not None and symbol in price_store:
+                df = price_store.frame(symbol, start_date, end_date)
+            else:
+                query_template = """
+                        SELECT
+                            date, open, high, low, close, volume
+                        FROM
+                            "{symbol}"
+                        WHERE
+                            date BETWEEN ? AND ?
+                    """
+                query = query_template.format(symbol=symbol)
+                df = pd.read_sql_query(query,query_con, params=(start_date, end_date))
 
-            query_template = """
-                    SELECT
-                        date, open, high, low, close, volume
-                    FROM
-                        "{symbol}"
-                    WHERE
-                        date BETWEEN ? AND ?
-                """
-            query = query_template.format(symbol=symbol)
-            df = pd.read_sql_query(query,query_con, params=(start_date, end_date))
+            feature_store = feature_stores.get(db_path)
+            features = feature_store.align(symbol, df['date'], rating_model.FEATURES, df['close']) if feature_store else None
 
             try:
                 # Assuming rating_model and save_quote_as_json are defined elsewhere
-                res_dict = rating_model(df).ta_rating()
+                res_dict = rating_model(df, features).ta_rating()
                 await save_ta_rating(symbol, res_dict)
             except Exception as e:
                 print(e)
@@ -3,9 +3,9 @@ from datetime import datetime
 import numpy as np
 import ujson
 import asyncio
-import sqlite3
 import os
 from tqdm import tqdm
+from utils.price_store import open_stores
 
 async def save_json(symbol, data):
     os.makedirs("json/var", exist_ok=True)  # Ensure directory exists
@@ -53,48 +53,13 @@ async def run():
     start_date = "2015-01-01"
     end_date = datetime.today().strftime("%Y-%m-%d")
 
-    con = sqlite3.connect('stocks.db')
-    etf_con = sqlite3.connect('etf.db')
-    crypto_con = sqlite3.connect('crypto.db')
+    # One mmap per database instead of a SQL query + DataFrame per symbol
+    stores = open_stores()
+    total_symbols = [(symbol, store) for store in stores.values() for symbol in store.symbols]
 
-    cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
-    cursor.execute("SELECT DISTINCT symbol FROM stocks")
-    stocks_symbols = [row[0] for row in cursor.fetchall()]
-
-    etf_cursor = etf_con.cursor()
-    etf_cursor.execute("PRAGMA journal_mode = wal")
-    etf_cursor.execute("SELECT DISTINCT symbol FROM etfs")
-    etf_symbols = [row[0] for row in etf_cursor.fetchall()]
-
-    crypto_cursor = crypto_con.cursor()
-    crypto_cursor.execute("PRAGMA journal_mode = wal")
-    crypto_cursor.execute("SELECT DISTINCT symbol FROM cryptos")
-    crypto_symbols = [row[0] for row in crypto_cursor.fetchall()]
-
-    total_symbols = stocks_symbols + etf_symbols + crypto_symbols
-
-    for symbol in tqdm(total_symbols):
+    for symbol, store in tqdm(total_symbols):
         try:
-            if symbol in etf_symbols:  
-                query_con = etf_con
-            elif symbol in crypto_symbols:  
-                query_con = crypto_con
-            elif symbol in stocks_symbols:  
-                query_con = con
-            else:
-                continue
-
-            query_template = """
-                    SELECT
-                        date, open, high, low, close, volume
-                    FROM
-                        "{symbol}"
-                    WHERE
-                        date BETWEEN ? AND ?
-                """
-            query = query_template.format(symbol=symbol)
-            df = pd.read_sql_query(query, query_con, params=(start_date, end_date))
+            df = store.frame(symbol, start_date, end_date, fields=['date', 'close'])
 
             # Convert date to datetime
             df['date'] = pd.to_datetime(df['date'])
@@ -121,10 +86,6 @@ async def run():
         except Exception as e:
             print(f"Error processing {symbol}: {e}")
 
-    con.close()
-    etf_con.close()
-    crypto_con.close()
-
 try:
     asyncio.run(run())
 except Exception as e:
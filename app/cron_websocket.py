@@ -3,13 +3,15 @@ import websockets
 import orjson
 import os
 import logging
-from pathlib import Path
-from typing import Dict, Any
 from dotenv import load_dotenv
 from datetime import datetime, time
 import zoneinfo
-import aiofiles
 import functools
+import argparse
+import time as pytime
+from typing import Optional
+
+from utils.tick_hub import TickHub, Subscriber, replay_ticks
 
 # Use uvloop for faster event loop if available
 try:
@@ -27,6 +29,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+load_dotenv()
+
+# Client side of the hub, relayed by fastify's /price-data route
+HUB_HOST = os.getenv('TICK_HUB_HOST', '127.0.0.1')
+HUB_PORT = int(os.getenv('TICK_HUB_PORT', 2001))
+# Clients that fall this many seconds behind, or block a send this long, are dropped
+CLIENT_MAX_LAG = float(os.getenv('TICK_HUB_MAX_LAG', 5))
+CLIENT_SEND_TIMEOUT = float(os.getenv('TICK_HUB_SEND_TIMEOUT', 5))
+
 # Precompute holidays and use a set for faster lookups
 US_HOLIDAYS = {
     "2024-01-01", "2024-01-15", "2024-02-19", 
@@ -60,14 +71,16 @@ def check_market_hours() -> bool:
     return time(9, 30) <= current_time < time(16, 0)
 
 class WebSocketStockTicker:
-    def __init__(self, api_key: str, uri: str = "wss://websockets.financialmodelingprep.com"):
+    def __init__(self, api_key: str, hub: TickHub, uri: str = "wss://websockets.financialmodelingprep.com", record_path: Optional[str] = None):
         # Use slots to reduce memory overhead
-        __slots__ = ['api_key', 'uri', 'output_dir', 'login_payload', 'subscribe_payload']
+        __slots__ = ['api_key', 'uri', 'hub', 'record_file', 'login_payload', 'subscribe_payload']
         
         self.api_key = api_key
         self.uri = uri
-        self.output_dir = Path('json/websocket/companies')
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Ticks go to the in-memory hub instead of one json file per symbol
+        self.hub = hub
+        # Optional raw feed recording, replayable with --replay
+        self.record_file = open(record_path, 'ab') if record_path else None
         
         # Precompute payloads to avoid repeated dictionary creation
         self.login_payload = orjson.dumps({
@@ -80,26 +93,15 @@ class WebSocketStockTicker:
             "data": {"ticker": ["*"]}
         })
 
-    async def _safe_write(self, file_path: Path, data: Dict[str, Any]) -> None:
-        """Safely write data to file using aiofiles for non-blocking I/O."""
-        try:
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(orjson.dumps(data))
-        except IOError as e:
-            logger.error(f"File write error for {file_path}: {e}")
-
-    async def _process_message(self, message: str) -> None:
-        """Optimized message processing with minimal allocation."""
+    def _process_message(self, message: str) -> None:
+        """Publish one upstream tick to the hub."""
         try:
             data = orjson.loads(message)
             
-            # Fast symbol extraction and sanitization
             if 's' in data:
-                symbol = data['s'].upper()
-                safe_symbol = ''.join(c for c in symbol if c.isalnum() or c in ['-', '_'])
-                file_path = self.output_dir / f"{safe_symbol}.json"
-                
-                await self._safe_write(file_path, data)
+                self.hub.publish(data)
+                if self.record_file is not None:
+                    self.record_file.write(orjson.dumps({**data, '_recv': pytime.time()}) + b"\n")
         
         except orjson.JSONDecodeError:
             logger.warning(f"Invalid JSON received: {message}")
@@ -128,14 +130,13 @@ class WebSocketStockTicker:
                     await asyncio.sleep(2)
                     await websocket.send(self.subscribe_payload)
                     
-                    # Handle incoming messages with timeout
+                    # Publishing is a dict update plus queue offers, so it runs inline
                     async for message in websocket:
                         if not check_market_hours():
                             logger.info("Market closed during connection. Disconnecting.")
                             break
                         
-                        # Use asyncio.create_task for concurrent message processing
-                        asyncio.create_task(self._process_message(message))
+                        self._process_message(message)
             
             except (websockets.exceptions.ConnectionClosedError, 
                     websockets.exceptions.WebSocketException) as e:
@@ -148,16 +149,72 @@ class WebSocketStockTicker:
                 await asyncio.sleep(reconnect_delay)
                 reconnect_delay = min(reconnect_delay * 2, max_reconnect_delay)
 
+
+async def handle_client(hub: TickHub, websocket, path=None) -> None:
+    """
+    /price-data protocol of the former fastify poller: the client sends a
+    JSON list of tickers (replacing its subscription) and receives JSON lists
+    of price updates for those tickers.
+    """
+    subscriber = Subscriber(websocket.send, close=websocket.close, max_lag=CLIENT_MAX_LAG, send_timeout=CLIENT_SEND_TIMEOUT)
+    writer = asyncio.create_task(hub.serve(subscriber))
+    try:
+        async for message in websocket:
+            try:
+                tickers = orjson.loads(message)
+            except orjson.JSONDecodeError:
+                logger.warning("Failed to parse tickers from client message")
+                continue
+            if isinstance(tickers, list):
+                hub.subscribe(subscriber, tickers)
+    except websockets.exceptions.WebSocketException:
+        pass
+    finally:
+        subscriber.closed = True
+        subscriber.wakeup.set()
+        hub.remove(subscriber)
+        await writer
+
+
+async def log_stats(hub: TickHub, interval: int = 60) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        logger.info(f"Hub: {len(hub.subscribers)} clients, {len(hub.topics)} topics, {hub.stats}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='FMP tick feed fan-out hub.')
+    parser.add_argument('--replay', default=None, help='Drive the hub from a recorded tick file instead of FMP')
+    parser.add_argument('--speed', type=float, default=1.0, help='Replay speed factor, 0 for as fast as possible')
+    parser.add_argument('--record', default=None, help='Append the raw upstream ticks to this file')
+    return parser.parse_args()
+
+
 async def main():
+    args = parse_args()
     load_dotenv()
     api_key = os.getenv('FMP_API_KEY')
     
-    if not api_key:
-        logger.error("API Key not found. Please set FMP_API_KEY in .env file.")
-        return
-    
-    ticker = WebSocketStockTicker(api_key)
-    await ticker.connect()
+    hub = TickHub()
+    server = await websockets.serve(functools.partial(handle_client, hub), HUB_HOST, HUB_PORT, ping_interval=30)
+    logger.info(f"Tick hub listening on ws://{HUB_HOST}:{HUB_PORT}")
+    stats_task = asyncio.create_task(log_stats(hub))
+
+    try:
+        if args.replay:
+            count = await replay_ticks(hub, args.replay, speed=args.speed)
+            logger.info(f"Replayed {count} ticks from {args.replay}")
+            await asyncio.Future()
+        else:
+            if not api_key:
+                logger.error("API Key not found. Please set FMP_API_KEY in .env file.")
+                return
+            ticker = WebSocketStockTicker(api_key, hub, record_path=args.record)
+            await ticker.connect()
+    finally:
+        stats_task.cancel()
+        server.close()
+        await server.wait_closed()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
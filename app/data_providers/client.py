@@ -0,0 +1,267 @@
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import aiohttp
+import orjson
+import requests
+
+
+# Provider quotas: at most `rate` requests in any `per` seconds. `burst` is
+# taken out of the quota, so a full burst plus the steady rate still fits.
+# FMP is paced at the 500 requests per minute the crons always kept to.
+PROVIDERS = {
+    'financialmodelingprep.com': {'rate': int(os.getenv('FMP_RATE_LIMIT', 500)), 'per': 60, 'burst': 50, 'connections': 100},
+    'api.unusualwhales.com': {'rate': int(os.getenv('UNUSUAL_WHALES_RATE_LIMIT', 260)), 'per': 60, 'burst': 5, 'connections': 20},
+}
+DEFAULT_PROVIDER = {'rate': 600, 'per': 60, 'burst': 10, 'connections': 20}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by the async and the blocking path of a client. A
+    request reserves a token and sleeps until its slot, so concurrent callers
+    are spaced out evenly instead of waking up together.
+    """
+
+    def __init__(self, rate, per=60.0, burst=1):
+        burst = max(1, min(burst, rate - 1)) if rate > 1 else 1
+        self.rate = (rate - burst) / per if rate > 1 else rate / per
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take one token; returns how long the caller has to wait for it.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def wait(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class ProviderResponse:
+    """
+    Status and body of a finished request; `json()` parses a fresh copy for
+    every caller, so coalesced callers can't see each other's changes.
+    """
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return orjson.loads(self.body)
+
+
+def endpoint_of(url):
+    """
+    Path of `url` with symbol-like segments (no lowercase letters: tickers,
+    dates, CIKs, contract ids) replaced by {}, as the key of the counters.
+    """
+    path = urlparse(url).path
+    return '/'.join('{}' if segment and not re.search('[a-z]', segment) else segment for segment in path.split('/'))
+
+
+class ProviderClient:
+    """
+    HTTP client of one provider host: a long-lived connection pool (one
+    aiohttp session per event loop, one requests session per thread), a
+    token bucket for the provider quota, retries with jittered exponential
+    backoff on 429/5xx and connection errors, coalescing of identical
+    in-flight GETs and per-endpoint request/error/latency counters.
+    """
+
+    def __init__(self, host, rate, per=60, burst=1, connections=20, retries=4, backoff=1.0, max_backoff=30.0, timeout=60):
+        self.host = host
+        self.limiter = TokenBucket(rate, per, burst)
+        self.connections = connections
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.sessions = {}
+        self.local = threading.local()
+        self.inflight = {}
+        self.counters = defaultdict(lambda: {'requests': 0, 'errors': 0, 'retries': 0, 'coalesced': 0, 'latency': 0.0, 'max_latency': 0.0})
+
+    def _session(self):
+        loop = asyncio.get_running_loop()
+        session = self.sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connections, ttl_dns_cache=300)
+            session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self.sessions[loop] = session
+        return session
+
+    def _sync_session(self):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.connections)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self.local.session = session
+        return session
+
+    def _delay(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        try:
+            return max(delay, float(retry_after))
+        except (TypeError, ValueError):
+            return delay
+
+    def _count(self, endpoint, start, error):
+        latency = time.perf_counter() - start
+        counter = self.counters[endpoint]
+        counter['requests'] += 1
+        counter['errors'] += int(error)
+        counter['latency'] += latency
+        counter['max_latency'] = max(counter['max_latency'], latency)
+
+    async def fetch(self, url, headers=None, params=None):
+        """
+        GET `url` and return a ProviderResponse. Identical requests already in
+        flight are awaited instead of sent again.
+        """
+        key = (asyncio.get_running_loop(), url, tuple(sorted((headers or {}).items())), tuple(sorted((params or {}).items())))
+        task = self.inflight.get(key)
+        if task is not None:
+            self.counters[endpoint_of(url)]['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(self._fetch(url, headers, params))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(task)
+
+    async def fetch_json(self, url, headers=None, params=None):
+        return (await self.fetch(url, headers, params)).json()
+
+    async def _fetch(self, url, headers, params):
+        endpoint = endpoint_of(url)
+        session = self._session()
+        for attempt in range(self.retries + 1):
+            await self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                async with session.get(url, headers=headers, params=params) as response:
+                    body = await response.read()
+                    status, retry_after = response.status, response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self._count(endpoint, start, error=True)
+                if attempt == self.retries:
+                    raise
+                self.counters[endpoint]['retries'] += 1
+                await asyncio.sleep(self._delay(attempt))
+                continue
+            self._count(endpoint, start, error=status >= 400)
+            if status in RETRY_STATUS and attempt < self.retries:
+                self.counters[endpoint]['retries'] += 1
+                await asyncio.sleep(self._delay(attempt, retry_after))
+                continue
+            return ProviderResponse(status, body)
+
+    def get(self, url, headers=None, params=None):
+        """
+        Blocking GET for the requests based scripts, returns a requests.Response.
+        Same quota, retries and counters as `fetch`.
+        """
+        endpoint = endpoint_of(url)
+        session = self._sync_session()
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            start = time.perf_counter()
+            try:
+                response = session.get(url, headers=headers, params=params, timeout=self.timeout)
+            except requests.RequestException:
+                self._count(endpoint, start, error=True)
+                if attempt == self.retries:
+                    raise
+                self.counters[endpoint]['retries'] += 1
+                time.sleep(self._delay(attempt))
+                continue
+            self._count(endpoint, start, error=response.status_code >= 400)
+            if response.status_code in RETRY_STATUS and attempt < self.retries:
+                self.counters[endpoint]['retries'] += 1
+                time.sleep(self._delay(attempt, response.headers.get('Retry-After')))
+                continue
+            return response
+
+    def summary(self):
+        lines = []
+        for endpoint, counter in sorted(self.counters.items()):
+            average = counter['latency'] / counter['requests'] * 1000 if counter['requests'] else 0
+            lines.append(f"{self.host}{endpoint}: {counter['requests']} requests, {counter['errors']} errors, "
+                         f"{counter['retries']} retries, {counter['coalesced']} coalesced, "
+                         f"avg {average:.0f} ms, max {counter['max_latency'] * 1000:.0f} ms")
+        return '\n'.join(lines)
+
+    async def close(self):
+        """
+        Close the aiohttp session of the running loop and the requests
+        session of this thread.
+        """
+        session = self.sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+        self.close_sync()
+
+    def close_sync(self):
+        session = getattr(self.local, 'session', None)
+        if session is not None:
+            session.close()
+            self.local.session = None
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(url):
+    """
+    Shared client of the provider host of `url` (a full URL or a base URL).
+    """
+    host = urlparse(url).netloc or url
+    with _clients_lock:
+        client = _clients.get(host)
+        if client is None:
+            client = _clients[host] = ProviderClient(host, **PROVIDERS.get(host, DEFAULT_PROVIDER))
+        return client
+
+
+async def close_clients():
+    """
+    Close the sessions the shared clients opened on the running loop (and
+    on this thread). Scripts call it before exiting, also on errors.
+    """
+    for client in list(_clients.values()):
+        await client.close()
+
+
+def close_clients_sync():
+    """
+    Close the requests sessions the shared clients opened on this thread.
+    """
+    for client in list(_clients.values()):
+        client.close_sync()
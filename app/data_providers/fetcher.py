@@ -1,12 +1,15 @@
 import os
-import aiohttp
+from data_providers.client import get_client
 from data_providers.mocks.mock_fetcher import mock_fetch_data_json, mock_fetch_data_response
 
 async def real_fetch_data(url, headers={}):
-    """Function to fetch real API responses."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            return await response.json()
+    """Function to fetch real API responses through the shared provider client."""
+    return await get_client(url).fetch_json(url, headers)
+
+
+async def real_fetch_response(url, headers={}):
+    """Like real_fetch_data, but returns the response (status_code, json())."""
+    return await get_client(url).fetch(url, headers)
 
 
 def get_fetcher(json_mode: bool):
@@ -16,4 +19,4 @@ def get_fetcher(json_mode: bool):
     if mock_mode:
         return mock_fetch_data_json if json_mode else mock_fetch_data_response
     else:
-        return real_fetch_data
\ No newline at end of file
+        return real_fetch_data if json_mode else real_fetch_response
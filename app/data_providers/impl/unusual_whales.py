@@ -9,6 +9,6 @@ class UnusualWhales:
             "Authorization": f"Bearer {api_key}"
         }   
 
-    def get_option_contracts(self, symbol: str) -> dict:
+    async def get_option_contracts(self, symbol: str) -> dict:
         url = f"{UNUSUAL_WHALES_BASE_URL}/api/stock/{symbol}/option-contracts"
-        return self.fetcher(url, self.headers)
+        return (await self.fetcher(url, self.headers))
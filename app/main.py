@@ -13,7 +13,7 @@ import pandas as pd
 import orjson
 import aiohttp
 import aiofiles
-import redis
+import redis.asyncio as aioredis
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 import requests
@@ -40,6 +40,12 @@ from slowapi.errors import RateLimitExceeded
 from functools import partial
 from datetime import datetime
 from utils.helper import load_latest_json
+from utils.screener_query import ScreenerIndex
+from utils.search_index import SearchIndex
+from utils.response_cache import FileResponseCache
+from utils.cache import TwoTierCache
+from utils.async_io import file_executor, read_bytes, read_json, load_json_cached, load_json_many
+from utils.bar_store import BarStore
 import uvicorn
 
 # DB constants & context manager
@@ -51,48 +57,6 @@ INSTITUTE_DB = 'institute'
 
 OPTIONS_WATCHLIST_DIR = Path("json/options-historical-data/watchlist")
 
-# Prioritization strategy dictionary
-PRIORITY_STRATEGIES = {
-    'exact_symbol_match': 0,
-    'symbol_prefix_match': 1,
-    'exact_name_match': 2,
-    'name_prefix_match': 3,
-    'symbol_contains': 4,
-    'name_contains': 5
-}
-
-def calculate_score(item: Dict, search_query: str) -> int:
-    name_lower = item['name'].lower()
-    symbol_lower = item['symbol'].lower()
-    query_lower = search_query.lower()
-
-    if len(query_lower) == 1:
-        if symbol_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
-        elif name_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_name_match']
-        else:
-            base_score = len(PRIORITY_STRATEGIES)
-    else:
-        if symbol_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
-        elif symbol_lower.startswith(query_lower):
-            base_score = PRIORITY_STRATEGIES['symbol_prefix_match']
-        elif name_lower == query_lower:
-            base_score = PRIORITY_STRATEGIES['exact_name_match']
-        elif name_lower.startswith(query_lower):
-            base_score = PRIORITY_STRATEGIES['name_prefix_match']
-        elif query_lower in symbol_lower:
-            base_score = PRIORITY_STRATEGIES['symbol_contains']
-        elif query_lower in name_lower:
-            base_score = PRIORITY_STRATEGIES['name_contains']
-        else:
-            base_score = len(PRIORITY_STRATEGIES)
-
-    dot_penalty = 1 if '.' in symbol_lower else 0
-    return base_score + dot_penalty
-
-
 @contextmanager
 def db_connection(db_name):
   conn = sqlite3.connect(f'{db_name}.db')
@@ -106,39 +70,181 @@ def db_connection(db_name):
     conn.close()
 
 ################# Redis #################
-redis_client = redis.Redis(host='redis', port=6379, db=0)
-redis_client.flushdb() # TECH DEBT
+redis_pool = aioredis.ConnectionPool(host='redis', port=6379, db=0, max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 100)))
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+# Key prefix -> TTL in seconds. Entries that used to be cached forever (and
+# only refreshed by the flushdb on restart) now expire after a day.
+CACHE_NAMESPACES = {
+    'json/': 600,
+    'export-price-data': 3600*24,
+    'hover-stock-chart': 60*3,
+    'similar-etfs': 3600*24,
+    'stock-news': 60*30,
+    'press-releases': 60*60,
+    'stock-dividend': 3600*24,
+    'history-employees': 3600*24,
+    'stock-income': 3600*24,
+    'stock-balance-sheet': 3600*24,
+    'stock-ratios': 3600*24,
+    'stock-cash-flow': 3600*24,
+    'options-watchlist': 60*30,
+    'price-prediction': 3600*24,
+    'stock-screener-data': 3600*24,
+    'get-quant-stats': 3600*24,
+    'shareholders': 3600*24,
+    'full-searchbar': 3600*24,
+    'revenue-segmentation': 3600*24,
+    'crypto-profile': 3600*24,
+    'etf-profile': 3600*24,
+    'history-price-sector': 60*60,
+    'earnings-call-transcripts': 3600*24,
+    'popular-etfs': 60*5,
+    'etf-new-launches': 3600*24,
+    'insider-trading-statistics': 3600*24,
+    'ipo-calendar': 3600*24,
+    'heatmap': 60*5,
+    'options-gex-dex': 3600*60,
+    'options-oi': 3600*60,
+    'raw-options-flow': 60,
+    'options-flow': 60*5,
+    'options-gex': 3600*24,
+    'options-historical-data': 3600*24,
+    'options-historical-flow': 3600*24,
+    'dark-pooll-flow-feed': 60,
+    'wiim': 60*5,
+    'implied-volatility': 60*60,
+    'reddit-tracker': 60*15,
+    'info-text': 3600*24,
+    'filter-list': 60*10,
+    'pre-after-market-movers': 60*15,
+    # Keys of the handlers now served by file_cache, with the TTL each one
+    # had, so a warmed or still shared key doesn't fall back to the default
+    'all-crypto-tickers': 3600*24,
+    'all-etf-tickers': 3600*24,
+    'all-hedge-funds': 3600*24,
+    'all-politician': 3600*24,
+    'analyst-insight': 3600*24,
+    'analyst-stats': 3600*2,
+    'analyst-summary-rating': 60*60,
+    'analyst-ticker-history': 60*60,
+    'business-metrics': 3600*24,
+    'clinical-trial': 3600*24,
+    'congress-rss-feed': 60*15,
+    'corporate-lobbying': 3600*24,
+    'corporate-lobbying-tracker': 60*15,
+    'correlation': 3600*24,
+    'cramer-tracker': 3600*24,
+    'dark-pool-level': 60*5,
+    'dashboard-info': 60*5,
+    'dividends-calendar': 3600*24,
+    'earnings-calendar': 3600*24,
+    'earnings-surprise': 60*15,
+    'economic-calendar': 3600*24,
+    'economic-indicator': 3600*24,
+    'enterprise-values': 3600*24,
+    'etf-holdings': 60*10,
+    'etf-provider': 60*10,
+    'etf-sector-weighting': 3600*24,
+    'fail-to-deliver': 3600*24,
+    'fda-calendar': 60*15,
+    'fomc-impact': 3600*24,
+    'fundamental-predictor-analysis': 3600*24,
+    'get-all-etf-providers': 3600*24,
+    'get-analyst-estimates': 3600*24,
+    'get-congress-trading': 60*15,
+    'get-etf-bitcoin-list': 3600*24,
+    'get-executives': 3600*24,
+    'get-mini-plots-index': 60*5,
+    'get-pre-post-quote': 60,
+    'get-quote': 60,
+    'get-sec-filings': 3600*24,
+    'get-ticker-mentioning': 3600*24,
+    'get-trending': 60*15,
+    'government-contract': 3600*24,
+    'historical-dark-pool': 3600*60,
+    'historical-market-cap': 3600*24,
+    'historical-price': 3600*24,
+    'hottest-contracts': 60*10,
+    'industry-overview': 3600*24,
+    'industry-stocks': 60*15,
+    'insider-tracker': 60*5,
+    'insider-trading': 3600*24,
+    'market-flow': 60*2,
+    'market-maker': 3600*24,
+    'market-movers': 60*5,
+    'market-news': 60*5,
+    'most-shorted-stocks': 3600*24,
+    'next-earnings': 60*15,
+    'one-day-price': 60*3,
+    'options-bubble': 3600*24,
+    'options-contract-history': 3600*60,
+    'options-stats': 60*5,
+    'politician-stats': 3600*24,
+    'price-action-earnings': 3600*60,
+    'price-analysis': 3600*24,
+    'profile': 3600*24,
+    'sector-industry-overview': 3600*24,
+    'sector-overview': 3600*24,
+    'sentiment-analysis': 3600*24,
+    'sentiment-tracker': 60*5,
+    'share-statistics': 3600*24,
+    'similar-stocks': 3600*24,
+    'statistics': 60*60,
+    'stock-quote': 60,
+    'stock-rating': 3600*24,
+    'stock-splits-calendar': 3600*24,
+    'stockdeck': 3600*24,
+    'top-analysts': 3600*2,
+    'top-analysts-stocks': 3600*2,
+    'top-etf': 3600*24,
+    'trend-analysis': 3600*24,
+    'value-at-risk': 3600*24,
+}
+
+# Namespaces built from data loaded at startup; they are dropped on every
+# start instead of flushing the whole database.
+STARTUP_NAMESPACES = ['full-searchbar', 'stock-screener-data']
+
+# Hot keys preloaded into the in-process tier on startup
+CACHE_WARM_KEYS = [key for key in os.getenv('CACHE_WARM_KEYS', 'heatmap,reddit-tracker,popular-etfs,etf-new-launches,dark-pooll-flow-feed').split(',') if key]
+
+cache = TwoTierCache(redis_client, CACHE_NAMESPACES, default_ttl=600, max_bytes=int(os.getenv('CACHE_MAX_BYTES', 256 * 1024 ** 2)))
 caching_time = 3600*12 #Cache data for 12 hours
 
 #########################################
 
-#------Start Stocks DB------------#
-with db_connection(STOCK_DB) as cursor:
-  cursor.execute("SELECT DISTINCT symbol FROM stocks")
-  symbols = [row[0] for row in cursor.fetchall()]
-
+def read_stock_list(cursor):
   cursor.execute("SELECT symbol, name, type, marketCap FROM stocks")
   raw_data = cursor.fetchall()
-  stock_list_data = [{
+  return [{
     'symbol': row[0],
     'name': row[1],
     'type': row[2].capitalize(),
     'marketCap': row[3],
   } for row in raw_data if row[3] is not None]
-#------End Stocks DB------------#
-
-#------Start ETF DB------------#
-with db_connection(ETF_DB) as cursor:
-  cursor.execute("SELECT DISTINCT symbol FROM etfs")
-  etf_symbols = [row[0] for row in cursor.fetchall()]
 
+def read_etf_list(cursor):
   cursor.execute("SELECT symbol, name, type FROM etfs")
   raw_data = cursor.fetchall()
-  etf_list_data = [{
+  return [{
     'symbol': row[0],
     'name': row[1],
     'type': row[2].upper(),
   } for row in raw_data]
+
+#------Start Stocks DB------------#
+with db_connection(STOCK_DB) as cursor:
+  cursor.execute("SELECT DISTINCT symbol FROM stocks")
+  symbols = [row[0] for row in cursor.fetchall()]
+  stock_list_data = read_stock_list(cursor)
+#------End Stocks DB------------#
+
+#------Start ETF DB------------#
+with db_connection(ETF_DB) as cursor:
+  cursor.execute("SELECT DISTINCT symbol FROM etfs")
+  etf_symbols = [row[0] for row in cursor.fetchall()]
+  etf_list_data = read_etf_list(cursor)
 #------End ETF DB------------#
 
 #------Start Crypto DB------------#
@@ -167,19 +273,96 @@ with open(f"json/stock-screener/data.json", 'rb') as file:
 
 # Convert stock_screener_data into a dictionary keyed by symbol
 stock_screener_data_dict = {item['symbol']: item for item in stock_screener_data}
+
+# Columnar index for server-side screener queries
+screener_index = ScreenerIndex.from_path("json/stock-screener")
+screener_index_lock = asyncio.Lock()
+
+async def refresh_screener_index():
+    """
+    Pick up the table rewritten by cron_screener.py without a restart. The
+    reload runs in the file executor, one at a time.
+    """
+    global screener_index
+    if not screener_index.is_stale():
+        return
+    async with screener_index_lock:
+        if not screener_index.is_stale():
+            return
+        try:
+            screener_index = await asyncio.get_running_loop().run_in_executor(file_executor, ScreenerIndex.from_path, "json/stock-screener")
+        except Exception as e:
+            # Keep serving the current table, e.g. while the file is rewritten
+            print(f"Error reloading screener index: {e}")
 #------End Stock Screener--------#
 
 #------Init Searchbar Data------------#
-searchbar_data = stock_list_data + etf_list_data
+# Inputs of the searchbar list; when one of them changes, the list and its
+# SearchIndex are rebuilt together on the next search
+SEARCHBAR_SOURCES = [f"{STOCK_DB}.db", f"{ETF_DB}.db", "json/stock-screener/data.json"]
 
-for item in searchbar_data:
-    try:
-        # Look up the symbol in the stock_screener_data_dict
-        symbol = item['symbol']
-        item['isin'] = stock_screener_data_dict[symbol]['isin']
-    except Exception as e:
-        item['isin'] = None
+def searchbar_signature():
+    signature = []
+    for path in SEARCHBAR_SOURCES:
+        try:
+            signature.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            signature.append(None)
+    return signature
+
+def build_searchbar(stock_list_data, etf_list_data, stock_screener_data_dict):
+    searchbar_data = stock_list_data + etf_list_data
+
+    for item in searchbar_data:
+        try:
+            # Look up the symbol in the stock_screener_data_dict
+            symbol = item['symbol']
+            item['isin'] = stock_screener_data_dict[symbol]['isin']
+        except Exception as e:
+            item['isin'] = None
 
+    return searchbar_data, SearchIndex(searchbar_data)
+
+def reload_searchbar():
+    signature = searchbar_signature()
+    with db_connection(STOCK_DB) as cursor:
+        stock_list_data = read_stock_list(cursor)
+    with db_connection(ETF_DB) as cursor:
+        etf_list_data = read_etf_list(cursor)
+    with open(f"json/stock-screener/data.json", 'rb') as file:
+        screener_data_dict = {item['symbol']: item for item in orjson.loads(file.read())}
+    return (signature, *build_searchbar(stock_list_data, etf_list_data, screener_data_dict))
+
+searchbar_loaded = searchbar_signature()
+searchbar_data, search_index = build_searchbar(stock_list_data, etf_list_data, stock_screener_data_dict)
+searchbar_lock = asyncio.Lock()
+
+async def refresh_searchbar():
+    """
+    Swap in a rebuilt searchbar list and index when a source changed since
+    they were built. The rebuild runs in the file executor.
+    """
+    global searchbar_loaded, searchbar_data, search_index
+    if searchbar_signature() == searchbar_loaded:
+        return
+    async with searchbar_lock:
+        if searchbar_signature() == searchbar_loaded:
+            return
+        try:
+            loaded, data, index = await asyncio.get_running_loop().run_in_executor(file_executor, reload_searchbar)
+        except Exception as e:
+            # Keep serving the current list; retried once a source changes again
+            print(f"Error reloading searchbar data: {e}")
+            searchbar_loaded = searchbar_signature()
+            return
+        searchbar_loaded, searchbar_data, search_index = loaded, data, index
+        await cache.invalidate_namespace('full-searchbar')
+
+#------Init File Response Cache------------#
+# Per-ticker json files served pre-compressed with ETag/304 support
+file_cache = FileResponseCache(max_bytes=int(os.getenv('FILE_CACHE_MAX_BYTES', 512 * 1024 ** 2)), executor=file_executor)
+# Intraday bars written by cron_export_price.py
+bar_store = BarStore()
 
 etf_set, crypto_set = set(etf_symbols), set(crypto_symbols)
 
@@ -213,6 +396,20 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def startup_redis():
+    for namespace in STARTUP_NAMESPACES:
+        await cache.invalidate_namespace(namespace)
+    await cache.warm(CACHE_WARM_KEYS)
+
+
+@app.on_event("shutdown")
+async def shutdown_redis():
+    await redis_client.aclose()
+    await redis_pool.disconnect()
+    file_executor.shutdown(wait=False)
+
+
 
 security = HTTPBasic()
 
@@ -266,6 +463,11 @@ async def openapi(username: str = Depends(get_current_username)):
     return get_openapi(title = "FastAPI", version="0.1.0", routes=app.routes)
 
 
+@app.get("/cache-stats")
+async def get_cache_stats(username: str = Depends(get_current_username)):
+    return {'cache': cache.stats(), 'file_cache': file_cache.stats()}
+
+
 class TickerData(BaseModel):
     ticker: str
 
@@ -290,6 +492,9 @@ class HistoricalPrice(BaseModel):
     ticker: str
     timePeriod: str
 
+class ExportPriceData(HistoricalPrice):
+    format: str = 'json'
+
 class AnalystId(BaseModel):
     analystId: str
 
@@ -373,6 +578,14 @@ class HeatMapData(BaseModel):
 class StockScreenerData(BaseModel):
     ruleOfList: List[str]
 
+class StockScreenerQuery(BaseModel):
+    filters: List[Dict] = Field(default=[])
+    sortBy: str = Field(default='marketCap')
+    sortOrder: str = Field(default='desc')
+    limit: int = Field(default=50)
+    offset: int = Field(default=0)
+    fields: List[str] = Field(default=[])
+
 class IndicatorListData(BaseModel):
     ruleOfList: list
     tickerList: list
@@ -409,19 +622,7 @@ def load_json(file_path):
         return None
 
 async def load_json_async(file_path):
-    # Check if the data is cached in Redis
-    cached_data = redis_client.get(file_path)
-    if cached_data:
-        return orjson.loads(cached_data)
-
-    try:
-        with open(file_path, 'r') as f:
-            data = orjson.loads(f.read())
-            # Cache the data in Redis for 10 minutes
-            redis_client.set(file_path, orjson.dumps(data), ex=600)
-            return data
-    except Exception:
-        return None
+    return await load_json_cached(cache, file_path)
 
 
 @app.get("/")
@@ -431,83 +632,39 @@ async def hello_world():
 
 
 @app.post("/correlation-ticker")
-async def rating_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def rating_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-
-    cache_key = f"correlation-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/correlation/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to 12 hour
-
-    return res
+    return await file_cache.response(request, f"json/correlation/companies/{ticker}.json", default=[])
 
 
 
 @app.post("/stock-rating")
-async def rating_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def rating_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"stock-rating-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/ta-rating/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/ta-rating/{ticker}.json", default={})
 
 @app.post("/historical-price")
-async def get_stock(data: HistoricalPrice, api_key: str = Security(get_api_key)):
+async def get_stock(data: HistoricalPrice, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     time_period = data.timePeriod
-
-    cache_key = f"historical-price-{ticker}-{time_period}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/historical-price/{time_period}/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res_json = orjson.dumps(res)
-    compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to Infinity
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-    
+    return await file_cache.response(request, f"json/historical-price/{time_period}/{ticker}.json", default=[])
 @app.post("/export-price-data")
-async def get_stock(data: HistoricalPrice, api_key: str = Security(get_api_key)):
+async def get_stock(data: ExportPriceData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     time_period = data.timePeriod
+    if data.format == 'csv':
+        # Streamed straight from the intraday bar store, chunk by chunk
+        if (time_period, ticker) not in bar_store:
+            raise HTTPException(status_code=404, detail="No intraday bars for this ticker and period")
+        return StreamingResponse(
+            bar_store.iter_csv(time_period, ticker),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{ticker}-{time_period}.csv"'}
+        )
+
     cache_key = f"export-price-data-{ticker}-{time_period}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -517,21 +674,22 @@ async def get_stock(data: HistoricalPrice, api_key: str = Security(get_api_key))
 
     if time_period == 'max':
         try:
-            with open(f"json/historical-price/max/{ticker}.json", 'rb') as file:
-                res = orjson.loads(file.read())
+            res = await read_json(f"json/historical-price/max/{ticker}.json")
         except:
             res = []
+        res_json = orjson.dumps(res)
+    elif (time_period, ticker) in bar_store:
+        loop = asyncio.get_running_loop()
+        res_json = await loop.run_in_executor(file_executor, lambda: b''.join(bar_store.iter_json(time_period, ticker)))
     else:
         try:
-            with open(f"json/export/price/{time_period}/{ticker}.json", 'rb') as file:
-                res = orjson.loads(file.read())
+            res = await read_json(f"json/export/price/{time_period}/{ticker}.json")
         except:
             res = []
+        res_json = orjson.dumps(res)
 
-    res_json = orjson.dumps(res)
     compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to Infinity
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -540,34 +698,10 @@ async def get_stock(data: HistoricalPrice, api_key: str = Security(get_api_key))
     )
 
 @app.post("/one-day-price")
-async def get_stock(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-    cache_key = f"one-day-price-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/one-day-price/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res_json = orjson.dumps(res)
-    compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*3)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/one-day-price/{ticker}.json", default=[])
 
 
 @app.post("/hover-stock-chart")
@@ -575,7 +709,7 @@ async def get_hover_stock_chart(data: TickerData, api_key: str = Security(get_ap
     data = data.dict()
     ticker = data['ticker'].upper()
     cache_key = f"hover-stock-chart-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -584,17 +718,14 @@ async def get_hover_stock_chart(data: TickerData, api_key: str = Security(get_ap
         )
 
     try:
-        with open(f"json/one-day-price/{ticker}.json", 'rb') as file:
-            price_data = orjson.loads(file.read())
-        with open(f"json/quote/{ticker}.json", 'rb') as file:
-            quote_data = orjson.loads(file.read())
+        price_data = await read_json(f"json/one-day-price/{ticker}.json")
+        quote_data = await read_json(f"json/quote/{ticker}.json")
         res = {**quote_data, 'history': price_data}
     except:
         res = {}
     res_json = orjson.dumps(res)
     compressed_data = gzip.compress(res_json)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*3)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -613,21 +744,9 @@ def shuffle_list(lst):
 
 
 @app.post("/similar-stocks")
-async def similar_stocks(data: TickerData, api_key: str = Security(get_api_key)):
+async def similar_stocks(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"similar-stocks-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/similar-stocks/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/similar-stocks/{ticker}.json", default=[])
 
 
 @app.post("/similar-etfs")
@@ -635,7 +754,7 @@ async def get_similar_etfs(data: TickerData, api_key: str = Security(get_api_key
     ticker = data.ticker.upper()
 
     cache_key = f"similar-etfs-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -670,87 +789,25 @@ async def get_similar_etfs(data: TickerData, api_key: str = Security(get_api_key
     except:
         result = []
 
-    redis_client.set(cache_key, orjson.dumps(result))
-    redis_client.expire(cache_key, 3600*3600)
+    await cache.set(cache_key, orjson.dumps(result))
     return result
 
 
 @app.post("/market-movers")
-async def get_market_movers(data: GeneralData, api_key: str = Security(get_api_key)):
+async def get_market_movers(data: GeneralData, request: Request, api_key: str = Security(get_api_key)):
     params = data.params
-    cache_key = f"market-movers-{params}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/market-movers/markethours/{params}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 5*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/market-movers/markethours/{params}.json", default=[])
 
 @app.get("/mini-plots-index")
-async def get_market_movers(api_key: str = Security(get_api_key)):
-    cache_key = f"get-mini-plots-index"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/mini-plots-index/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 5*60)
-
-    return res
+async def get_market_movers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/mini-plots-index/data.json", default=[])
 
 
 
 @app.post("/market-news")
-async def get_market_news(data: MarketNews, api_key: str = Security(get_api_key)):
+async def get_market_news(data: MarketNews, request: Request, api_key: str = Security(get_api_key)):
     news_type = data.newsType
-
-    cache_key = f"market-news-{news_type}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/market-news/{news_type}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)  # Set cache expiration time to 15 min
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/market-news/{news_type}.json", default=[])
 
 
 @app.post("/stock-news")
@@ -758,7 +815,7 @@ async def stock_news(data: TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     cache_key = f"stock-news-{ticker}"
 
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -767,15 +824,13 @@ async def stock_news(data: TickerData, api_key: str = Security(get_api_key)):
 
 
     try:
-        with open(f"json/market-news/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/market-news/companies/{ticker}.json")
     except:
         res = []
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*30)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -789,7 +844,7 @@ async def stock_news(data: TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     cache_key = f"press-releases-{ticker}"
 
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -798,15 +853,13 @@ async def stock_news(data: TickerData, api_key: str = Security(get_api_key)):
 
 
     try:
-        with open(f"json/market-news/press-releases/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/market-news/press-releases/{ticker}.json")
     except:
         res = []
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -821,7 +874,7 @@ async def stock_dividend(data: TickerData, api_key: str = Security(get_api_key))
     ticker = data.ticker.upper()
     cache_key = f"stock-dividend-{ticker}"
 
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -829,15 +882,13 @@ async def stock_dividend(data: TickerData, api_key: str = Security(get_api_key))
         headers={"Content-Encoding": "gzip"})
 
     try:
-        with open(f"json/dividends/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/dividends/companies/{ticker}.json")
     except:
         res = {'history': []}
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -848,23 +899,9 @@ async def stock_dividend(data: TickerData, api_key: str = Security(get_api_key))
 
 
 @app.post("/stock-quote")
-async def stock_dividend(data: TickerData, api_key: str = Security(get_api_key)):
+async def stock_dividend(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"stock-quote-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/quote/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60)
-    return res
+    return await file_cache.response(request, f"json/quote/{ticker}.json", default={})
 
 @app.post("/history-employees")
 async def history_employees(data: TickerData, api_key: str = Security(get_api_key)):
@@ -872,7 +909,7 @@ async def history_employees(data: TickerData, api_key: str = Security(get_api_ke
     ticker = data['ticker'].upper()
 
     cache_key = f"history-employees-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -892,8 +929,7 @@ async def history_employees(data: TickerData, api_key: str = Security(get_api_ke
     except:
         res = []
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600) # Set cache expiration time to 1 hour
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 @app.post("/stock-income")
@@ -902,7 +938,7 @@ async def stock_income(data: TickerData, api_key: str = Security(get_api_key)):
     ticker = data['ticker'].upper()
 
     cache_key = f"stock-income-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
 
     if cached_result:
         return StreamingResponse(
@@ -912,14 +948,12 @@ async def stock_income(data: TickerData, api_key: str = Security(get_api_key)):
         )
 
     try:
-        with open(f"json/financial-statements/income-statement/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
+        quarter_res = await read_json(f"json/financial-statements/income-statement/quarter/{ticker}.json")
     except:
         quarter_res = []
 
     try:
-        with open(f"json/financial-statements/income-statement/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
+        annual_res = await read_json(f"json/financial-statements/income-statement/annual/{ticker}.json")
     except:
         annual_res = []
 
@@ -928,8 +962,7 @@ async def stock_income(data: TickerData, api_key: str = Security(get_api_key)):
     res = orjson.dumps(res)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -943,7 +976,7 @@ async def stock_balance_sheet(data: TickerData, api_key: str = Security(get_api_
     ticker = data['ticker'].upper()
 
     cache_key = f"stock-balance-sheet-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
 
     if cached_result:
         return StreamingResponse(
@@ -953,14 +986,12 @@ async def stock_balance_sheet(data: TickerData, api_key: str = Security(get_api_
         )
 
     try:
-        with open(f"json/financial-statements/balance-sheet-statement/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
+        quarter_res = await read_json(f"json/financial-statements/balance-sheet-statement/quarter/{ticker}.json")
     except:
         quarter_res = []
 
     try:
-        with open(f"json/financial-statements/balance-sheet-statement/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
+        annual_res = await read_json(f"json/financial-statements/balance-sheet-statement/annual/{ticker}.json")
     except:
         annual_res = []
 
@@ -969,8 +1000,7 @@ async def stock_balance_sheet(data: TickerData, api_key: str = Security(get_api_
     res = orjson.dumps(res)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -984,7 +1014,7 @@ async def stock_ratios(data: TickerData, api_key: str = Security(get_api_key)):
     ticker = data['ticker'].upper()
 
     cache_key = f"stock-ratios-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
 
     if cached_result:
         return StreamingResponse(
@@ -994,14 +1024,12 @@ async def stock_ratios(data: TickerData, api_key: str = Security(get_api_key)):
         )
 
     try:
-        with open(f"json/financial-statements/ratios/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
+        quarter_res = await read_json(f"json/financial-statements/ratios/quarter/{ticker}.json")
     except:
         quarter_res = []
 
     try:
-        with open(f"json/financial-statements/ratios/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
+        annual_res = await read_json(f"json/financial-statements/ratios/annual/{ticker}.json")
     except:
         annual_res = []
 
@@ -1010,8 +1038,7 @@ async def stock_ratios(data: TickerData, api_key: str = Security(get_api_key)):
     res = orjson.dumps(res)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1026,7 +1053,7 @@ async def stock_cash_flow(data: TickerData, api_key: str = Security(get_api_key)
     ticker = data['ticker'].upper()
 
     cache_key = f"stock-cash-flow-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
 
     if cached_result:
         return StreamingResponse(
@@ -1036,14 +1063,12 @@ async def stock_cash_flow(data: TickerData, api_key: str = Security(get_api_key)
         )
 
     try:
-        with open(f"json/financial-statements/cash-flow-statement/quarter/{ticker}.json", 'rb') as file:
-            quarter_res = orjson.loads(file.read())
+        quarter_res = await read_json(f"json/financial-statements/cash-flow-statement/quarter/{ticker}.json")
     except:
         quarter_res = []
 
     try:
-        with open(f"json/financial-statements/cash-flow-statement/annual/{ticker}.json", 'rb') as file:
-            annual_res = orjson.loads(file.read())
+        annual_res = await read_json(f"json/financial-statements/cash-flow-statement/annual/{ticker}.json")
     except:
         annual_res = []
 
@@ -1052,8 +1077,7 @@ async def stock_cash_flow(data: TickerData, api_key: str = Security(get_api_key)
     res = orjson.dumps(res)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1065,205 +1089,59 @@ async def stock_cash_flow(data: TickerData, api_key: str = Security(get_api_key)
 
 
 @app.get("/economic-calendar")
-async def economic_calendar(api_key: str = Security(get_api_key)):
+async def economic_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/economic-calendar/calendar.json", default=[])
 
-    cache_key = f"economic-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
 
-    try:
-        with open(f"json/economic-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+@app.get("/earnings-calendar")
+async def earnings_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/earnings-calendar/calendar.json", default=[])
 
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+@app.get("/dividends-calendar")
+async def dividends_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/dividends-calendar/calendar.json", default=[])
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/stock-splits-calendar")
+async def stock_splits_calendar(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/stock-splits-calendar/calendar.json", default=[])
 
 
-@app.get("/earnings-calendar")
-async def earnings_calendar(api_key: str = Security(get_api_key)):
-    
-    cache_key = f"earnings-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
+@app.post("/stockdeck")
+async def rating_stock(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/stockdeck/{ticker}.json", default=[])
 
-@app.get("/dividends-calendar")
-async def dividends_calendar(api_key: str = Security(get_api_key)):
 
-    cache_key = f"dividends-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+@app.post("/analyst-summary-rating")
+async def get_analyst_rating(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/analyst/summary/{ticker}.json", default={})
 
-    try:
-        with open(f"json/dividends-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+@app.post("/analyst-ticker-history")
+async def get_analyst_ticke_history(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/analyst/history/{ticker}.json", default=[])
 
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/stock-splits-calendar")
-async def stock_splits_calendar(api_key: str = Security(get_api_key)):
-    cache_key = f"stock-splits-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/stock-splits-calendar/calendar.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-
-@app.post("/stockdeck")
-async def rating_stock(data: TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"stockdeck-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/stockdeck/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/analyst-summary-rating")
-async def get_analyst_rating(data: TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"analyst-summary-rating-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/analyst/summary/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-    return res
-
-@app.post("/analyst-ticker-history")
-async def get_analyst_ticke_history(data: TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"analyst-ticker-history-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/analyst/history/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.post("/indicator-data")
-async def get_indicator(data: IndicatorListData, api_key: str = Security(get_api_key)):
-    rule_of_list = data.ruleOfList or ['volume', 'marketCap', 'changesPercentage', 'price', 'symbol', 'name']
-    # Ensure 'symbol' and 'name' are always included in the rule_of_list
-    if 'symbol' not in rule_of_list:
-        rule_of_list.append('symbol')
-    if 'name' not in rule_of_list:
-        rule_of_list.append('name')
-    
-    ticker_list = [t.upper() for t in data.tickerList if t is not None]
+@app.post("/indicator-data")
+async def get_indicator(data: IndicatorListData, api_key: str = Security(get_api_key)):
+    rule_of_list = data.ruleOfList or ['volume', 'marketCap', 'changesPercentage', 'price', 'symbol', 'name']
+    # Ensure 'symbol' and 'name' are always included in the rule_of_list
+    if 'symbol' not in rule_of_list:
+        rule_of_list.append('symbol')
+    if 'name' not in rule_of_list:
+        rule_of_list.append('name')
+    
+    ticker_list = [t.upper() for t in data.tickerList if t is not None]
 
     combined_results = []
     
     # Load quote data in parallel
-    quote_data = await asyncio.gather(*[load_json_async(f"json/quote/{ticker}.json") for ticker in ticker_list])
-    quote_dict = {ticker: data for ticker, data in zip(ticker_list, quote_data) if data}
+    # One MGET for all quotes, misses read concurrently on the file pool
+    quote_data = await load_json_many(cache, [f"json/quote/{ticker}.json" for ticker in ticker_list])
+    quote_dict = {ticker: quote_data[f"json/quote/{ticker}.json"] for ticker in ticker_list if quote_data[f"json/quote/{ticker}.json"]}
 
     # Categorize tickers and extract data
     for ticker, quote in quote_dict.items():
@@ -1303,8 +1181,17 @@ async def get_indicator(data: IndicatorListData, api_key: str = Security(get_api
 
 
 
-async def process_watchlist_ticker(ticker, rule_of_list, quote_keys_to_include, screener_dict, etf_set, crypto_set):
-    """Optimized single ticker processing with reduced I/O and memory overhead."""
+def watchlist_ticker_paths(ticker):
+    ticker = ticker.upper()
+    return [
+        f"json/quote/{ticker}.json",
+        f"json/market-news/companies/{ticker}.json",
+        f"json/earnings/next/{ticker}.json",
+    ]
+
+
+def process_watchlist_ticker(ticker, rule_of_list, quote_keys_to_include, screener_dict, etf_set, crypto_set, loaded):
+    """Optimized single ticker processing on data prefetched by load_json_many."""
     ticker = ticker.upper()
     ticker_type = 'stocks'
     if ticker in etf_set:
@@ -1312,16 +1199,7 @@ async def process_watchlist_ticker(ticker, rule_of_list, quote_keys_to_include,
     elif ticker in crypto_set:
         ticker_type = 'crypto'
 
-    try:
-        # Combine I/O operations into single async read
-        quote_dict, news_dict, earnings_dict = await asyncio.gather(
-            load_json_async(f"json/quote/{ticker}.json"),
-            load_json_async(f"json/market-news/companies/{ticker}.json"),
-            load_json_async(f"json/earnings/next/{ticker}.json")
-        )
-    except Exception:
-        # Gracefully handle missing files
-        return None, [], None
+    quote_dict, news_dict, earnings_dict = (loaded.get(path) for path in watchlist_ticker_paths(ticker))
 
     # Early return if no quote data
     if not quote_dict:
@@ -1388,20 +1266,20 @@ async def get_watchlist(data: GetWatchList, api_key: str = Security(get_api_key)
         for item in stock_screener_data
     }
 
-    # Use concurrent processing with more efficient method
-    results_and_extras = await asyncio.gather(
-        *[
-            process_watchlist_ticker(
-                ticker, 
-                rule_of_list, 
-                quote_keys_to_include, 
-                screener_dict,
-                etf_set,  # Assuming these are pre-computed sets
-                crypto_set
-            ) 
-            for ticker in ticker_list
-        ]
-    )
+    # Fetch every file of the watchlist with one MGET and one pipelined write-back
+    loaded = await load_json_many(cache, [path for ticker in ticker_list for path in watchlist_ticker_paths(ticker)])
+    results_and_extras = [
+        process_watchlist_ticker(
+            ticker, 
+            rule_of_list, 
+            quote_keys_to_include, 
+            screener_dict,
+            etf_set,  # Assuming these are pre-computed sets
+            crypto_set,
+            loaded
+        ) 
+        for ticker in ticker_list
+    ]
 
     # Efficient list comprehensions for filtering
     combined_results = [result for result in (r[0] for r in results_and_extras) if result]
@@ -1566,7 +1444,7 @@ async def fetch_option_data(option_id: str):
 async def get_options_watchlist(data: OptionsWatchList, api_key: str = Security(get_api_key)):
     options_list_id = sorted(data.optionsIdList)
     cache_key = f"options-watchlist-{options_list_id}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -1580,9 +1458,8 @@ async def get_options_watchlist(data: OptionsWatchList, api_key: str = Security(
         file_path = OPTIONS_WATCHLIST_DIR / f"{option_id}.json"
         
         if file_path.exists():
-            with open(file_path, 'rb') as json_file:
-                option_data = orjson.loads(json_file.read())
-                result.extend(option_data)
+            option_data = await read_json(file_path)
+            result.extend(option_data)
         else:
             option_activity = await fetch_option_data(option_id)
             if option_activity:
@@ -1591,8 +1468,7 @@ async def get_options_watchlist(data: OptionsWatchList, api_key: str = Security(
                 result.extend(option_activity)
 
     compressed_data = gzip.compress(orjson.dumps(result))
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60 * 30)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1608,7 +1484,7 @@ async def brownian_motion(data:TickerData, api_key: str = Security(get_api_key))
     ticker = data['ticker'].upper()
 
     cache_key = f"price-prediction-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
     
@@ -1633,8 +1509,7 @@ async def brownian_motion(data:TickerData, api_key: str = Security(get_api_key))
     except:
         price_dict = {'1W': {'min': 0, 'mean': 0, 'max': 0}, '1M': {'min': 0, 'mean': 0, 'max': 0}, '3M': {'min': 0, 'mean': 0, 'max': 0}, '6M': {'min': 0, 'mean': 0, 'max': 0}}
 
-    redis_client.set(cache_key, orjson.dumps(price_dict))
-    redis_client.expire(cache_key, 3600*24) # Set cache expiration time to 1 hour
+    await cache.set(cache_key, orjson.dumps(price_dict))
     return price_dict
 
 
@@ -1644,7 +1519,7 @@ async def stock_finder(data:StockScreenerData, api_key: str = Security(get_api_k
     rule_of_list = sorted(data.ruleOfList)
 
     cache_key = f"stock-screener-data-{rule_of_list}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -1666,8 +1541,7 @@ async def stock_finder(data:StockScreenerData, api_key: str = Security(get_api_k
     res = orjson.dumps(filtered_data)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1676,13 +1550,32 @@ async def stock_finder(data:StockScreenerData, api_key: str = Security(get_api_k
     )
 
 
+@app.post("/stock-screener-query")
+async def stock_screener_query(data: StockScreenerQuery, api_key: str = Security(get_api_key)):
+    await refresh_screener_index()
+
+    try:
+        total, rows = screener_index.query(
+            filters=data.filters,
+            sort_by=data.sortBy,
+            sort_order=data.sortOrder,
+            limit=data.limit,
+            offset=data.offset,
+            fields=data.fields,
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {'total': total, 'data': rows}
+
+
 @app.post("/get-quant-stats")
 async def get_quant_stats(data: TickerData, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
     cache_key = f"get-quant-stats-{ticker}"
     
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
     if ticker in etf_symbols:
@@ -1713,8 +1606,7 @@ async def get_quant_stats(data: TickerData, api_key: str = Security(get_api_key)
     except:
         metrics_data = {}
     # Store the data and hash in the cache
-    redis_client.set(cache_key, orjson.dumps(metrics_data))
-    redis_client.expire(cache_key, 3600 *24) # Set cache expiration time to 1 hour
+    await cache.set(cache_key, orjson.dumps(metrics_data))
 
     return metrics_data
 
@@ -1723,24 +1615,9 @@ async def get_quant_stats(data: TickerData, api_key: str = Security(get_api_key)
 
 
 @app.post("/congress-trading-ticker")
-async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_fair_price(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-congress-trading-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/congress-trading/company/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 15*60) # Set cache expiration time to Infinity
-
-    return res
+    return await file_cache.response(request, f"json/congress-trading/company/{ticker}.json", default=[])
 
 
 
@@ -1751,19 +1628,17 @@ async def get_shareholders(data: TickerData, api_key: str = Security(get_api_key
     ticker = data['ticker'].upper()
 
     cache_key = f"shareholders-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
     try:
-        with open(f"json/shareholders/{ticker}.json", 'rb') as file:
-            shareholder_list = orjson.loads(file.read())
+        shareholder_list = await read_json(f"json/shareholders/{ticker}.json")
     except:
         shareholder_list = []
 
     try:
-        with open(f"json/ownership-stats/{ticker}.json", 'rb') as file:
-            stats = orjson.loads(file.read())
+        stats = await read_json(f"json/ownership-stats/{ticker}.json")
     except:
         stats = {}
 
@@ -1772,73 +1647,20 @@ async def get_shareholders(data: TickerData, api_key: str = Security(get_api_key
     except:
         res = {}
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 
 @app.post("/cik-data")
-async def get_hedge_funds_data(data: GetCIKData, api_key: str = Security(get_api_key)):
+async def get_hedge_funds_data(data: GetCIKData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     cik = data['cik']
-
-    cache_key = f"{cik}-hedge-funds"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    
-    try:
-        with open(f"json/hedge-funds/companies/{cik}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 3600) # Set cache expiration time to Infinity
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/hedge-funds/companies/{cik}.json", default=[])
 
 
 @app.get("/all-hedge-funds")
-async def get_all_hedge_funds_data(api_key: str = Security(get_api_key)):
-    
-    cache_key = f"all-hedge-funds"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/hedge-funds/all-hedge-funds.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    res = orjson.dumps(res)
-    compressed_data = gzip.compress(res)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 3600) # Set cache expiration time to Infinity
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_all_hedge_funds_data(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/hedge-funds/all-hedge-funds.json", default=[])
 
 @app.get("/searchbar")
 async def get_stock(
@@ -1849,37 +1671,18 @@ async def get_stock(
     if not query:
         return JSONResponse(content=[])
 
-    # Check for exact ISIN match first
-    exact_match = next((item for item in searchbar_data if item.get("isin",None) == query), None)
-    if exact_match:
-        return JSONResponse(content=[exact_match])
-
-    # Precompile case-insensitive regex for faster matching
-    search_pattern = re.compile(re.escape(query.lower()), re.IGNORECASE)
-
-    # Filter items based on the search pattern (ignore items where neither name nor symbol match)
-    filtered_data = [
-        item for item in searchbar_data
-        if search_pattern.search(item['name']) or search_pattern.search(item['symbol'])
-    ]
-
-    # Sort by the calculated score, giving exact symbol matches the highest priority,
-    # and then by descending marketCap for other matches
-    results = sorted(
-        filtered_data,
-        key=lambda item: (
-            calculate_score(item, query),
-            0 if item.get('marketCap') is None else -item['marketCap']
-        )
-    )[:5]
+    await refresh_searchbar()
+    # ISIN lookup, prefix ranges and n-gram postings, ranked like calculate_score
+    results = search_index.search(query, limit=5)
     return JSONResponse(content=orjson.loads(orjson.dumps(results)))
 
 
 @app.get("/full-searchbar")
 async def get_data(api_key: str = Security(get_api_key)):
     
+    await refresh_searchbar()
     cache_key = f"full-searchbar"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -1891,8 +1694,7 @@ async def get_data(api_key: str = Security(get_api_key)):
     res = orjson.dumps(searchbar_data)
     compressed_data = gzip.compress(res)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 3600) # Set cache expiration time to Infinity
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -1907,9 +1709,9 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
     ticker = data['ticker'].upper()
 
     cache_key = f"revenue-segmentation-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
-        #redis_client.expire(cache_key, caching_time) 
+        #await redis_client.expire(cache_key, caching_time) 
         return orjson.loads(cached_result)
 
 
@@ -1936,8 +1738,7 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
 
     res_list = [product_list, geographic_list]
 
-    redis_client.set(cache_key, orjson.dumps(res_list))
-    redis_client.expire(cache_key, 3600 * 24) # Set cache expiration time to Infinity
+    await cache.set(cache_key, orjson.dumps(res_list))
 
     return res_list
 
@@ -1947,7 +1748,7 @@ async def revenue_segmentation(data: TickerData, api_key: str = Security(get_api
 async def get_crypto_profile(data: TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
     cache_key = f"crypto-profile-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -1971,8 +1772,7 @@ async def get_crypto_profile(data: TickerData, api_key: str = Security(get_api_k
     except:
         profile_list = []
 
-    redis_client.set(cache_key, orjson.dumps(profile_list))
-    redis_client.expire(cache_key, 3600 * 24) # Set cache expiration time to Infinity
+    await cache.set(cache_key, orjson.dumps(profile_list))
 
     return profile_list
 
@@ -1984,7 +1784,7 @@ async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key))
     ticker = data['ticker'].upper()
 
     cache_key = f"etf-profile-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
@@ -2011,149 +1811,36 @@ async def get_fair_price(data: TickerData, api_key: str = Security(get_api_key))
     except:
         profile_list = []
 
-    redis_client.set(cache_key, orjson.dumps(profile_list))
-    redis_client.expire(cache_key, 3600 * 24) # Set cache expiration time to Infinity
+    await cache.set(cache_key, orjson.dumps(profile_list))
 
     return profile_list
 
 
 
 @app.post("/etf-holdings")
-async def etf_holdings(data: TickerData, api_key: str = Security(get_api_key)):
+async def etf_holdings(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"etf-holdings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/etf/holding/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*10)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/etf/holding/{ticker}.json", default={})
 
 
 @app.post("/etf-sector-weighting")
-async def etf_holdings(data: TickerData, api_key: str = Security(get_api_key)):
+async def etf_holdings(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"etf-sector-weighting-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/etf-sector/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/etf-sector/{ticker}.json", default=[])
 
 
 
 @app.get("/all-etf-tickers")
-async def get_all_etf_tickers(api_key: str = Security(get_api_key)):
-    cache_key = f"all-etf-tickers"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/all-symbols/etfs.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_all_etf_tickers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/all-symbols/etfs.json", default=[])
 
 @app.get("/all-crypto-tickers")
-async def get_all_crypto_tickers(api_key: str = Security(get_api_key)):
-    cache_key = f"all-crypto-tickers"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/all-symbols/cryptos.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_all_crypto_tickers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/all-symbols/cryptos.json", default=[])
 
 @app.get("/congress-rss-feed")
-async def get_congress_rss_feed(api_key: str = Security(get_api_key)):
-    cache_key = f"congress-rss-feed"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/congress-trading/rss-feed/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*15)
-    return res
+async def get_congress_rss_feed(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/congress-trading/rss-feed/data.json", default=[])
 
 
 
@@ -2163,7 +1850,7 @@ async def historical_sector_price(data:FilterStockList, api_key: str = Security(
     data = data.dict()
     sector = data['filterList']
     cache_key = f"history-price-sector-{sector}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
 
     if cached_result:
         return StreamingResponse(
@@ -2172,15 +1859,13 @@ async def historical_sector_price(data:FilterStockList, api_key: str = Security(
         headers={"Content-Encoding": "gzip"})
 
     try:
-        with open(f"json/sector/{sector}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/sector/{sector}.json")
     except:
         res = []
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2236,7 +1921,7 @@ async def get_earnings_call_transcripts(data:TranscriptData, api_key: str = Secu
     year = data['year']
     quarter = data['quarter']
     cache_key = f"earnings-call-transcripts-{ticker}-{year}-{quarter}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
 
     if cached_result:
         return orjson.loads(cached_result)
@@ -2255,130 +1940,62 @@ async def get_earnings_call_transcripts(data:TranscriptData, api_key: str = Secu
     except:
         res = {}
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 @app.get("/ticker-mentioning")
-async def get_ticker_mentioning(api_key: str = Security(get_api_key)):
+async def get_ticker_mentioning(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/ticker-mentioning/data.json", default=[])
+
 
-    cache_key = f"get-ticker-mentioning"
-    cached_result = redis_client.get(cache_key)
+@app.post("/top-etf-ticker-holder")
+async def top_etf_ticker_holder(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/top-etf-ticker-holder/{ticker}.json", default=[])
+
+
+@app.get("/popular-etfs")
+async def get_popular_etfs(api_key: str = Security(get_api_key)):
+    cache_key = "popular-etfs"
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
     try:
-        with open(f"json/ticker-mentioning/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/top-etf-ticker-holder")
-async def top_etf_ticker_holder(data: TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"top-etf-{ticker}-holder"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/top-etf-ticker-holder/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.get("/popular-etfs")
-async def get_popular_etfs(api_key: str = Security(get_api_key)):
-    cache_key = "popular-etfs"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open("json/mini-plots-index/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-            for item in res:
-                price_data = item["priceData"]
-                last_price_data = price_data[-1]  # Get the last element of priceData
-                if last_price_data['value'] == None:
-                    last_price_data = price_data[-2]  # If last element is None, take the second last
+        res = await read_json("json/mini-plots-index/data.json")
+        for item in res:
+            price_data = item["priceData"]
+            last_price_data = price_data[-1]  # Get the last element of priceData
+            if last_price_data['value'] == None:
+                last_price_data = price_data[-2]  # If last element is None, take the second last
                 
-                item["price"] = last_price_data["value"]  # Update priceData with just the value
-                del item["priceData"]  # Remove the old key
-                del item["previousClose"]  # Remove the old key
+            item["price"] = last_price_data["value"]  # Update priceData with just the value
+            del item["priceData"]  # Remove the old key
+            del item["previousClose"]  # Remove the old key
     except Exception as e:
         print(f"Error: {e}")
         res = []
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*5)  # Set cache expiration time to 5 minutes
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 
 @app.get("/all-etf-providers")
-async def get_all_etf_providers(api_key: str = Security(get_api_key)):
-
-    cache_key = f"get-all-etf-providers"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/all-etf-providers/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+async def get_all_etf_providers(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/all-etf-providers/data.json", default=[])
 
 
 
 @app.post("/etf-provider")
-async def etf_holdings(data: ETFProviderData, api_key: str = Security(get_api_key)):
+async def etf_holdings(data: ETFProviderData, request: Request, api_key: str = Security(get_api_key)):
     etf_provider = data.etfProvider.lower()
-    cache_key = f"etf-provider-{etf_provider}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/etf/provider/{etf_provider}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*10)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/etf/provider/{etf_provider}.json", default=[])
 
 
 @app.get("/etf-new-launches")
 async def etf_provider(api_key: str = Security(get_api_key)):
     cache_key = f"etf-new-launches"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     limit = 100
     if cached_result:
         return orjson.loads(cached_result)
@@ -2392,152 +2009,52 @@ async def etf_provider(api_key: str = Security(get_api_key)):
 
     # Extract only relevant data and sort it
     res = [{'symbol': row[0], 'name': row[1], 'expenseRatio': row[2], 'totalAssets': row[3], 'numberOfHoldings': row[4], 'inceptionDate': row[5]} for row in raw_data]
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 @app.get("/etf-bitcoin-list")
-async def get_etf_bitcoin_list(api_key: str = Security(get_api_key)):
-
-    cache_key = f"get-etf-bitcoin-list"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/etf-bitcoin-list/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+async def get_etf_bitcoin_list(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/etf-bitcoin-list/data.json", default=[])
 
 
 @app.post("/analyst-estimate")
-async def get_analyst_estimate(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_analyst_estimate(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     data = data.dict()
     ticker = data['ticker'].upper()
-
-    cache_key = f"get-analyst-estimates-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst-estimate/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/analyst-estimate/{ticker}.json", default=[])
 
 
 @app.post("/insider-trading")
-async def get_insider_trading(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_insider_trading(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"insider-trading-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/insider-trading/history/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-    
+    return await file_cache.response(request, f"json/insider-trading/history/{ticker}.json", default=[])
 
 @app.post("/insider-trading-statistics")
 async def get_insider_trading_statistics(data:TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
 
     cache_key = f"insider-trading-statistics-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
     try:
-        with open(f"json/insider-trading/statistics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())[0]
+        res = await read_json(f"json/insider-trading/statistics/{ticker}.json")[0]
     except:
         res = {}
     
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 @app.post("/get-executives")
-async def get_executives(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_executives(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-executives-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/executives/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/executives/{ticker}.json", default=[])
 
 @app.post("/get-sec-filings")
-async def get_sec_filings(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_sec_filings(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-sec-filings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/sec-filings/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    # Compress the JSON data
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/sec-filings/{ticker}.json", default=[])
 
 
 
@@ -2545,7 +2062,7 @@ async def get_sec_filings(data:TickerData, api_key: str = Security(get_api_key))
 async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
     year = data.year
     cache_key = f"ipo-calendar-{year}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -2553,8 +2070,7 @@ async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
         headers={"Content-Encoding": "gzip"})
 
     try:
-        with open(f"json/ipo-calendar/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/ipo-calendar/data.json")
         if year != 'all':
             res = [entry for entry in res if entry['date'].startswith(year)]
     except:
@@ -2562,8 +2078,7 @@ async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600 * 24)  # Set cache expiration time to 1 day
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2572,36 +2087,13 @@ async def get_ipo_calendar(data:IPOData, api_key: str = Security(get_api_key)):
     )
 
 @app.get("/trending")
-async def get_trending(api_key: str = Security(get_api_key)):
-    cache_key = f"get-trending"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/trending/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*15)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_trending(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/trending/data.json", default=[])
 
 @app.get("/heatmap")
 async def get_heatmap(api_key: str = Security(get_api_key)):
     cache_key = "heatmap"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     
     if cached_result:
         return StreamingResponse(
@@ -2611,8 +2103,7 @@ async def get_heatmap(api_key: str = Security(get_api_key)):
         )
     
     try:
-        with open("json/heatmap/data.html", 'r', encoding='utf-8') as file:
-            html_content = file.read()
+        html_content = (await read_bytes("json/heatmap/data.html")).decode('utf-8')
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Heatmap file not found")
     except Exception as e:
@@ -2622,8 +2113,7 @@ async def get_heatmap(api_key: str = Security(get_api_key)):
     compressed_data = gzip.compress(html_content.encode('utf-8'))
     
     # Cache the compressed HTML
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60 * 5)  # Set cache expiration time to 5 min
+    await cache.set(cache_key, compressed_data)
     
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2635,70 +2125,21 @@ async def get_heatmap(api_key: str = Security(get_api_key)):
     )
 
 @app.post("/pre-post-quote")
-async def get_pre_post_quote(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_pre_post_quote(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-pre-post-quote-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/pre-post-quote/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/pre-post-quote/{ticker}.json", default={})
 
 @app.post("/get-quote")
-async def get_pre_post_quote(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_pre_post_quote(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"get-quote-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/quote/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/quote/{ticker}.json", default={})
 
 
 
 @app.post("/options-contract-history")
-async def get_data(data:GeneralData, api_key: str = Security(get_api_key)):
+async def get_data(data:GeneralData, request: Request, api_key: str = Security(get_api_key)):
     contract_id = data.params
-    cache_key = f"options-contract-history-{contract_id}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/hottest-contracts/contracts/{contract_id}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/hottest-contracts/contracts/{contract_id}.json", default=[])
 
 @app.post("/options-gex-dex")
 async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
@@ -2706,7 +2147,7 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     category = data.category.lower()
 
     cache_key = f"options-gex-dex-{ticker}-{category}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -2714,20 +2155,18 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
         headers={"Content-Encoding": "gzip"})
 
     try:
-        with open(f"json/gex-dex/{category}/{ticker}.json", 'rb') as file:
-            data = orjson.loads(file.read())
-            if category == 'strike':
-                key_element = 'gex'
-                val_sums = [item[f"call_{key_element}"] + item[f"put_{key_element}"] for item in data]
-                threshold = np.percentile(val_sums, 85)
-                data = [item for item in data if (item[f"call_{key_element}"] + item[f"put_{key_element}"]) >= threshold]
+        data = await read_json(f"json/gex-dex/{category}/{ticker}.json")
+        if category == 'strike':
+            key_element = 'gex'
+            val_sums = [item[f"call_{key_element}"] + item[f"put_{key_element}"] for item in data]
+            threshold = np.percentile(val_sums, 85)
+            data = [item for item in data if (item[f"call_{key_element}"] + item[f"put_{key_element}"]) >= threshold]
 
     except:
         data = []
     data = orjson.dumps(data)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
+    await cache.set(cache_key, compressed_data)
     return StreamingResponse(
         io.BytesIO(compressed_data),
         media_type="application/json",
@@ -2741,26 +2180,24 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     category = data.category.lower()
 
     cache_key = f"options-oi-{ticker}-{category}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
         media_type="application/json",
         headers={"Content-Encoding": "gzip"})
     try:
-        with open(f"json/oi/{category}/{ticker}.json", 'rb') as file:
-            data = orjson.loads(file.read())
-            if category == 'strike':
-                val_sums = [item[f"call_oi"] + item[f"put_oi"] for item in data]
-                threshold = np.percentile(val_sums, 85)
-                data = [item for item in data if (item[f"call_oi"] + item[f"put_oi"]) >= threshold]     
+        data = await read_json(f"json/oi/{category}/{ticker}.json")
+        if category == 'strike':
+            val_sums = [item[f"call_oi"] + item[f"put_oi"] for item in data]
+            threshold = np.percentile(val_sums, 85)
+            data = [item for item in data if (item[f"call_oi"] + item[f"put_oi"]) >= threshold]     
     except:
         data = []
     data = orjson.dumps(data)
 
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
+    await cache.set(cache_key, compressed_data)
     return StreamingResponse(
         io.BytesIO(compressed_data),
         media_type="application/json",
@@ -2768,31 +2205,9 @@ async def get_data(data:ParamsData, api_key: str = Security(get_api_key)):
     )
 
 @app.post("/options-stats-ticker")
-async def get_options_stats_ticker(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_options_stats_ticker(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"options-stats-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/options-stats/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/options-stats/companies/{ticker}.json", default={})
 
 
 @app.post("/raw-options-flow-ticker")
@@ -2805,7 +2220,7 @@ async def get_raw_options_flow_ticker(data:OptionsFlowData, request: Request, ap
     page = data.page
     cache_key = f"raw-options-flow-{ticker}-{start_date}-{end_date}-{pagesize}-{page}"
     #print(ticker, start_date, end_date, pagesize, page)
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -2820,8 +2235,7 @@ async def get_raw_options_flow_ticker(data:OptionsFlowData, request: Request, ap
 
     data = orjson.dumps(data)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60)  # Set cache expiration time to 5 min
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2835,7 +2249,7 @@ async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_a
     ticker = data.ticker.upper()
     cache_key = f"options-flow-{ticker}"
 
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
@@ -2859,8 +2273,7 @@ async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_a
 
     data = orjson.dumps(res_list)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)  # Set cache expiration time to 5 min
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2874,22 +2287,20 @@ async def get_options_flow_ticker(data:TickerData, api_key: str = Security(get_a
     ticker = data.ticker.upper()
     cache_key = f"options-gex-{ticker}"
 
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
         media_type="application/json",
         headers={"Content-Encoding": "gzip"})
     try:
-        with open(f"json/options-gex/companies/{ticker}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
+        res_list = await read_json(f"json/options-gex/companies/{ticker}.json")
     except:
         res_list = []
 
     data = orjson.dumps(res_list)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 5 min
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2902,22 +2313,20 @@ async def get_options_chain(data:TickerData, api_key: str = Security(get_api_key
     ticker = data.ticker.upper()
     cache_key = f"options-historical-data-{ticker}"
 
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
         media_type="application/json",
         headers={"Content-Encoding": "gzip"})
     try:
-        with open(f"json/options-historical-data/companies/{ticker}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
+        res_list = await read_json(f"json/options-historical-data/companies/{ticker}.json")
     except:
         res_list = []
 
     data = orjson.dumps(res_list)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 5 min
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2930,21 +2339,19 @@ async def get_options_chain(data:TickerData, api_key: str = Security(get_api_key
 async def get_options_chain(data:HistoricalDate, api_key: str = Security(get_api_key)):
     selected_date = data.date
     cache_key = f"options-historical-flow-{selected_date}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
         io.BytesIO(cached_result),
         media_type="application/json",
         headers={"Content-Encoding": "gzip"})
     try:
-        with open(f"json/options-historical-data/flow-data/{selected_date}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
+        res_list = await read_json(f"json/options-historical-data/flow-data/{selected_date}.json")
     except:
         res_list = []
     data = orjson.dumps(res_list)
     compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 5 min
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -2992,8 +2399,7 @@ async def get_options_flow_feed(data: LastOptionId, api_key: str = Security(get_
 @app.get("/options-flow-feed")
 async def get_options_flow_feed(api_key: str = Security(get_api_key)):
     try:
-        with open(f"json/options-flow/feed/data.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
+        res_list = await read_json(f"json/options-flow/feed/data.json")
     except:
         res_list = []
     data = orjson.dumps(res_list)
@@ -3008,7 +2414,7 @@ async def get_options_flow_feed(api_key: str = Security(get_api_key)):
 @app.get("/dark-pool-flow-feed")
 async def get_dark_pool_feed(api_key: str = Security(get_api_key)):
     cache_key = f"dark-pooll-flow-feed"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -3027,8 +2433,7 @@ async def get_dark_pool_feed(api_key: str = Security(get_api_key)):
     data = orjson.dumps(res_list)
     compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -3041,8 +2446,7 @@ async def get_dark_pool_feed(api_key: str = Security(get_api_key)):
 @app.get("/options-zero-dte")
 async def get_options_flow_feed(api_key: str = Security(get_api_key)):
     try:
-        with open(f"json/options-flow/zero-dte/data.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
+        res_list = await read_json(f"json/options-flow/zero-dte/data.json")
     except:
         res_list = []
     data = orjson.dumps(res_list)
@@ -3055,954 +2459,174 @@ async def get_options_flow_feed(api_key: str = Security(get_api_key)):
 
 
 @app.post("/options-bubble")
-async def get_options_bubble(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_options_bubble(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-
-    cache_key = f"options-bubble-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/options-bubble/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*24)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/options-bubble/{ticker}.json", default={})
 
 
 @app.get("/top-analysts")
-async def get_all_analysts(api_key: str = Security(get_api_key)):
-    cache_key = f"top-analysts"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst/top-analysts.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60*2)  # Set cache expiration time to 1 day
-    return res
+async def get_all_analysts(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/analyst/top-analysts.json", default=[])
 
 @app.get("/top-analysts-stocks")
-async def get_all_analysts(api_key: str = Security(get_api_key)):
-    cache_key = f"top-analysts-stocks"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst/top-stocks.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60*2)  # Set cache expiration time to 1 day
-    return res
+async def get_all_analysts(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/analyst/top-stocks.json", default=[])
 
 @app.post("/analyst-stats")
-async def get_all_analysts(data:AnalystId, api_key: str = Security(get_api_key)):
+async def get_all_analysts(data:AnalystId, request: Request, api_key: str = Security(get_api_key)):
     analyst_id = data.analystId
-
-    cache_key = f"analyst-stats-{analyst_id}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-
-    try:
-        with open(f"json/analyst/analyst-db/{analyst_id}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*60*2)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/analyst/analyst-db/{analyst_id}.json", default={})
 
 @app.post("/wiim")
 async def get_wiim(data:TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
 
     cache_key = f"wiim-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return orjson.loads(cached_result)
 
     try:
-        with open(f"json/wiim/company/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())[:5]
+        res = await read_json(f"json/wiim/company/{ticker}.json")[:5]
     except:
         res = []
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*5)
+    await cache.set(cache_key, orjson.dumps(res))
     return res
 
 @app.get("/dashboard-info")
-async def get_dashboard_info(api_key: str = Security(get_api_key)):
-
-    cache_key = f"dashboard-info"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/dashboard/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*5)
-    return res
+async def get_dashboard_info(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/dashboard/data.json", default=[])
 
 @app.post("/sentiment-analysis")
-async def get_sentiment_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_sentiment_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"sentiment-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/sentiment-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/sentiment-analysis/{ticker}.json", default=[])
 
 @app.post("/trend-analysis")
-async def get_trend_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_trend_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"trend-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/trend-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/trend-analysis/{ticker}.json", default=[])
 
 @app.post("/price-analysis")
-async def get_price_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_price_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"price-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/price-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/price-analysis/{ticker}.json", default={})
 
 
 
 @app.post("/fundamental-predictor-analysis")
-async def get_fundamental_predictor_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_fundamental_predictor_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"fundamental-predictor-analysis-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/fundamental-predictor-analysis/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/fundamental-predictor-analysis/{ticker}.json", default={})
 
 
 @app.post("/value-at-risk")
-async def get_trend_analysis(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_trend_analysis(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"value-at-risk-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/var/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/var/{ticker}.json", default={})
 
 @app.post("/government-contract")
-async def get_government_contract(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_government_contract(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"government-contract-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/government-contract/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/government-contract/{ticker}.json", default=[])
 
 @app.post("/corporate-lobbying")
-async def get_lobbying(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_lobbying(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"corporate-lobbying-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/corporate-lobbying/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
+    return await file_cache.response(request, f"json/corporate-lobbying/companies/{ticker}.json", default=[])
 
 @app.post("/enterprise-values")
-async def get_enterprise_values(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"enterprise-values-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/enterprise-values/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/share-statistics")
-async def get_enterprise_values(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"share-statistics-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/share-statistics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/politician-stats")
-async def get_politician_stats(data:PoliticianId, api_key: str = Security(get_api_key)):
-    politician_id = data.politicianId.lower()
-    cache_key = f"politician-stats-{politician_id}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/congress-trading/politician-db/{politician_id}.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = {}
-
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/all-politicians")
-async def get_all_politician(api_key: str = Security(get_api_key)):
-    
-    cache_key = f"all-politician"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    
-    try:
-        with open(f"json/congress-trading/search_list.json", 'rb') as file:
-            res_list = orjson.loads(file.read())
-    except:
-        res_list = []
-
-    data = orjson.dumps(res_list)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-
-@app.get("/most-shorted-stocks")
-async def get_most_shorted_stocks(api_key: str = Security(get_api_key)):
-    cache_key = f"most-shorted-stocks"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/most-shorted-stocks/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/historical-dark-pool")
-async def get_dark_pool(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"historical-dark-pool-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/dark-pool/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.post("/dark-pool-level")
-async def get_dark_pool(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"dark-pool-level-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-        io.BytesIO(cached_result),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"})
-
-    try:
-        with open(f"json/dark-pool/price-level/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*5)
-    
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-
-@app.post("/market-maker")
-async def get_market_maker(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"market-maker-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/market-maker/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-@app.post("/clinical-trial")
-async def get_clinical_trial(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"clinical-trial-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/clinical-trial/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.get("/fda-calendar")
-async def get_market_maker(api_key: str = Security(get_api_key)):
-    cache_key = f"fda-calendar"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/fda-calendar/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 60*15)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/fail-to-deliver")
-async def get_fail_to_deliver(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"fail-to-deliver-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/fail-to-deliver/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.post("/analyst-insight")
-async def get_analyst_insight(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"analyst-insight-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/analyst/insight/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key, 3600*3600)  # Set cache expiration time to 1 day
-    return res
-
-
-@app.post("/implied-volatility")
-async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
+async def get_enterprise_values(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"implied-volatility-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/implied-volatility/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except Exception as e:
-        print(e)
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*60)  # Set cache expiration time to 1 day
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.post("/hottest-contracts")
-async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"hottest-contracts-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/hottest-contracts/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*10)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/cramer-tracker")
-async def get_cramer_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"cramer-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/cramer-tracker/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/lobbying-tracker")
-async def get_cramer_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"corporate-lobbying-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/corporate-lobbying/tracker/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*15)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.get("/reddit-tracker")
-async def get_reddit_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"reddit-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/reddit-tracker/wallstreetbets/data.json", 'rb') as file:
-            latest_post = orjson.loads(file.read())[0:25]
-    except:
-        latest_post = []
-
-    try:
-        with open(f"json/reddit-tracker/wallstreetbets/stats.json", 'rb') as file:
-            stats = orjson.loads(file.read())
-    except:
-        stats = []
+    return await file_cache.response(request, f"json/enterprise-values/{ticker}.json", default=[])
 
-    try:
-        with open(f"json/reddit-tracker/wallstreetbets/trending.json", 'rb') as file:
-            trending = orjson.loads(file.read())
-    except:
-        trending = {}
-
-    res = {'posts': latest_post, 'stats': stats, 'trending': trending}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key, 60*15)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-
-@app.post("/historical-market-cap")
-async def get_historical_market_cap(data:TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
-    cache_key = f"historical-market-cap-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/market-cap/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/economic-indicator")
-async def get_economic_indicator(api_key: str = Security(get_api_key)):
-    cache_key = f"economic-indicator"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/economic-indicator/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/sector-industry-overview")
-async def get_industry_overview(api_key: str = Security(get_api_key)):
-    cache_key = f"sector-industry-overview"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/overview.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-@app.get("/sector-overview")
-async def get_sector_overview(api_key: str = Security(get_api_key)):
-    cache_key = f"sector-overview"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/sector-overview.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
-
-
-@app.post("/industry-stocks")
-async def get_sector_overview(data: FilterStockList, api_key: str = Security(get_api_key)):
-    filter_list = data.filterList.lower()
-    cache_key = f"industry-stocks-{filter_list}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/industries/{filter_list}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*15)
+@app.post("/share-statistics")
+async def get_enterprise_values(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/share-statistics/{ticker}.json", default={})
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
+@app.post("/politician-stats")
+async def get_politician_stats(data:PoliticianId, request: Request, api_key: str = Security(get_api_key)):
+    politician_id = data.politicianId.lower()
+    return await file_cache.response(request, f"json/congress-trading/politician-db/{politician_id}.json", default={})
 
-@app.get("/industry-overview")
-async def get_industry_overview(api_key: str = Security(get_api_key)):
-    cache_key = f"industry-overview"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/industry/industry-overview.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+@app.get("/all-politicians")
+async def get_all_politician(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/congress-trading/search_list.json", default=[])
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/most-shorted-stocks")
+async def get_most_shorted_stocks(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/most-shorted-stocks/data.json", default=[])
 
-@app.post("/next-earnings")
-async def get_next_earnings(data:TickerData, api_key: str = Security(get_api_key)):
+
+@app.post("/historical-dark-pool")
+async def get_dark_pool(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"next-earnings-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings/next/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
+    return await file_cache.response(request, f"json/dark-pool/companies/{ticker}.json", default=[])
 
-    
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,15*60)
+@app.post("/dark-pool-level")
+async def get_dark_pool(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/dark-pool/price-level/{ticker}.json", default=[])
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
 
-@app.post("/earnings-surprise")
-async def get_surprise_earnings(data:TickerData, api_key: str = Security(get_api_key)):
+
+@app.post("/market-maker")
+async def get_market_maker(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"earnings-surprise-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/earnings/surprise/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
+    return await file_cache.response(request, f"json/market-maker/companies/{ticker}.json", default={})
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
+@app.post("/clinical-trial")
+async def get_clinical_trial(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/clinical-trial/companies/{ticker}.json", default=[])
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,15*60)
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/fda-calendar")
+async def get_market_maker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/fda-calendar/data.json", default=[])
 
-@app.post("/price-action-earnings")
+
+@app.post("/fail-to-deliver")
+async def get_fail_to_deliver(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/fail-to-deliver/companies/{ticker}.json", default=[])
+
+
+@app.post("/analyst-insight")
+async def get_analyst_insight(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/analyst/insight/{ticker}.json", default={})
+
+
+@app.post("/implied-volatility")
 async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"price-action-earnings-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    cache_key = f"implied-volatility-{ticker}"
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
             media_type="application/json",
             headers={"Content-Encoding": "gzip"}
         )
+
     try:
-        with open(f"json/earnings/past/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
+        res = await read_json(f"json/implied-volatility/{ticker}.json")
+    except Exception as e:
+        print(e)
         res = []
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*60)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -4010,76 +2634,52 @@ async def get_data(data:TickerData, api_key: str = Security(get_api_key)):
         headers={"Content-Encoding": "gzip"}
     )
 
-@app.post("/info-text")
-async def get_info_text(data:InfoText, api_key: str = Security(get_api_key)):
-    parameter = data.parameter
-    cache_key = f"info-text-{parameter}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return orjson.loads(cached_result)
-    try:
-        with open(f"json/info-text/data.json", 'rb') as file:
-            res = orjson.loads(file.read())[parameter]
-    except:
-        res = {}
+@app.post("/hottest-contracts")
+async def get_data(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/hottest-contracts/companies/{ticker}.json", default=[])
 
-    redis_client.set(cache_key, orjson.dumps(res))
-    redis_client.expire(cache_key,3600*3600)
+@app.get("/cramer-tracker")
+async def get_cramer_tracker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/cramer-tracker/data.json", default=[])
 
-    return res
+@app.get("/lobbying-tracker")
+async def get_cramer_tracker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/corporate-lobbying/tracker/data.json", default=[])
 
-@app.post("/fomc-impact")
-async def get_fomc_impact(data: TickerData, api_key: str = Security(get_api_key)):
-    ticker = data.ticker.upper()
 
-    cache_key = f"fomc-impact-{ticker}"
-    cached_result = redis_client.get(cache_key)
+@app.get("/reddit-tracker")
+async def get_reddit_tracker(api_key: str = Security(get_api_key)):
+    cache_key = f"reddit-tracker"
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
             media_type="application/json",
             headers={"Content-Encoding": "gzip"}
         )
+
     try:
-        with open(f"json/fomc-impact/companies/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        latest_post = await read_json(f"json/reddit-tracker/wallstreetbets/data.json")[0:25]
     except:
-        res = {}
-
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+        latest_post = []
 
-@app.get("/sentiment-tracker")
-async def get_fomc_impact(api_key: str = Security(get_api_key)):
+    try:
+        stats = await read_json(f"json/reddit-tracker/wallstreetbets/stats.json")
+    except:
+        stats = []
 
-    cache_key = f"sentiment-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
     try:
-        with open(f"json/tracker/sentiment/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        trending = await read_json(f"json/reddit-tracker/wallstreetbets/trending.json")
     except:
-        res = []
+        trending = {}
+
+    res = {'posts': latest_post, 'stats': stats, 'trending': trending}
 
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,5*60)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -4087,98 +2687,96 @@ async def get_fomc_impact(api_key: str = Security(get_api_key)):
         headers={"Content-Encoding": "gzip"}
     )
 
-@app.post("/business-metrics")
-async def get_fomc_impact(data: TickerData, api_key: str = Security(get_api_key)):
+
+
+@app.post("/historical-market-cap")
+async def get_historical_market_cap(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"business-metrics-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/business-metrics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
+    return await file_cache.response(request, f"json/market-cap/companies/{ticker}.json", default=[])
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
+@app.get("/economic-indicator")
+async def get_economic_indicator(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/economic-indicator/data.json", default={})
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
+@app.get("/sector-industry-overview")
+async def get_industry_overview(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/industry/overview.json", default={})
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.get("/sector-overview")
+async def get_sector_overview(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/industry/sector-overview.json", default=[])
 
 
-@app.get("/insider-tracker")
-async def get_insider_tracker(api_key: str = Security(get_api_key)):
-    cache_key = f"insider-tracker"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-    try:
-        with open(f"json/tracker/insider/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = []
+@app.post("/industry-stocks")
+async def get_sector_overview(data: FilterStockList, request: Request, api_key: str = Security(get_api_key)):
+    filter_list = data.filterList.lower()
+    return await file_cache.response(request, f"json/industry/industries/{filter_list}.json", default={})
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,5*60)
+@app.get("/industry-overview")
+async def get_industry_overview(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/industry/industry-overview.json", default=[])
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.post("/next-earnings")
+async def get_next_earnings(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/earnings/next/{ticker}.json", default={})
 
-@app.post("/statistics")
-async def get_statistics(data: TickerData, api_key: str = Security(get_api_key)):
+@app.post("/earnings-surprise")
+async def get_surprise_earnings(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/earnings/surprise/{ticker}.json", default={})
+
+@app.post("/price-action-earnings")
+async def get_data(data:TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"statistics-{ticker}"
-    cached_result = redis_client.get(cache_key)
+    return await file_cache.response(request, f"json/earnings/past/{ticker}.json", default=[])
+
+@app.post("/info-text")
+async def get_info_text(data:InfoText, api_key: str = Security(get_api_key)):
+    parameter = data.parameter
+    cache_key = f"info-text-{parameter}"
+    cached_result = await cache.get(cache_key)
     if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
+        return orjson.loads(cached_result)
     try:
-        with open(f"json/statistics/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/info-text/data.json")[parameter]
     except:
         res = {}
 
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
+    await cache.set(cache_key, orjson.dumps(res))
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*60)
+    return res
 
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+@app.post("/fomc-impact")
+async def get_fomc_impact(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/fomc-impact/companies/{ticker}.json", default={})
+
+@app.get("/sentiment-tracker")
+async def get_fomc_impact(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/tracker/sentiment/data.json", default=[])
+
+@app.post("/business-metrics")
+async def get_fomc_impact(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/business-metrics/{ticker}.json", default={})
+
+
+@app.get("/insider-tracker")
+async def get_insider_tracker(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/tracker/insider/data.json", default=[])
+
+@app.post("/statistics")
+async def get_statistics(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
+    ticker = data.ticker.upper()
+    return await file_cache.response(request, f"json/statistics/{ticker}.json", default={})
 
 @app.post("/list-category")
 async def get_statistics(data: FilterStockList, api_key: str = Security(get_api_key)):
     filter_list = data.filterList.lower()
     cache_key = f"filter-list-{filter_list}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -4197,15 +2795,13 @@ async def get_statistics(data: FilterStockList, api_key: str = Security(get_api_
     else:
         category_type = 'market-cap'
     try:
-        with open(f"json/{category_type}/list/{filter_list}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/{category_type}/list/{filter_list}.json")
     except:
         res = []
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*10)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -4218,7 +2814,7 @@ async def get_statistics(data: ParamsData, api_key: str = Security(get_api_key))
     params = data.params
     category = data.category
     cache_key = f"pre-after-market-movers-{category}-{params}"
-    cached_result = redis_client.get(cache_key)
+    cached_result = await cache.get(cache_key)
     if cached_result:
         return StreamingResponse(
             io.BytesIO(cached_result),
@@ -4227,16 +2823,14 @@ async def get_statistics(data: ParamsData, api_key: str = Security(get_api_key))
         )
 
     try:
-        with open(f"json/market-movers/{category}/{params}.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/market-movers/{category}/{params}.json")
     except:
         res = {'gainers': [], 'losers': []}
         
     data = orjson.dumps(res)
     compressed_data = gzip.compress(data)
 
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,60*15)
+    await cache.set(cache_key, compressed_data)
 
     return StreamingResponse(
         io.BytesIO(compressed_data),
@@ -4246,70 +2840,19 @@ async def get_statistics(data: ParamsData, api_key: str = Security(get_api_key))
 
 
 @app.post("/profile")
-async def get_statistics(data: TickerData, api_key: str = Security(get_api_key)):
+async def get_statistics(data: TickerData, request: Request, api_key: str = Security(get_api_key)):
     ticker = data.ticker.upper()
-    cache_key = f"profile-{ticker}"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/profile/{ticker}.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-        
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,3600*3600)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+    return await file_cache.response(request, f"json/profile/{ticker}.json", default={})
 
 @app.get("/market-flow")
-async def get_market_flow(api_key: str = Security(get_api_key)):
-    cache_key = f"market-flow"
-    cached_result = redis_client.get(cache_key)
-    if cached_result:
-        return StreamingResponse(
-            io.BytesIO(cached_result),
-            media_type="application/json",
-            headers={"Content-Encoding": "gzip"}
-        )
-
-    try:
-        with open(f"json/market-flow/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
-    except:
-        res = {}
-        
-    data = orjson.dumps(res)
-    compressed_data = gzip.compress(data)
-
-    redis_client.set(cache_key, compressed_data)
-    redis_client.expire(cache_key,2*60)
-
-    return StreamingResponse(
-        io.BytesIO(compressed_data),
-        media_type="application/json",
-        headers={"Content-Encoding": "gzip"}
-    )
+async def get_market_flow(request: Request, api_key: str = Security(get_api_key)):
+    return await file_cache.response(request, f"json/market-flow/data.json", default={})
 
 
 @app.get("/newsletter")
 async def get_newsletter():
     try:
-        with open(f"json/newsletter/data.json", 'rb') as file:
-            res = orjson.loads(file.read())
+        res = await read_json(f"json/newsletter/data.json")
     except:
         res = []
     return res
@@ -20,6 +20,8 @@ import aiohttp
 import pickle
 import time
 
+from utils.feature_store import compute_indicators
+
 import argparse
 
 # Set up argument parser
@@ -43,48 +45,53 @@ async def download_data(ticker, start_date, end_date, nth_day):
 
 
 class TrendPredictor:
+    FEATURES = ['macd', 'macd_signal', 'macd_diff', 'adx_14', 'adx_pos_14', 'adx_neg_14', 'cci_20', 'mfi_14', 'nvi', 'obv', 'vpt',
+                'rsi_14', 'stoch_rsi_k_14', 'bb_hband_14', 'bb_lband_14', 'adi', 'cmf_20', 'emv_20', 'fi_13', 'williams_14', 'stoch_14']
+
     def __init__(self, nth_day, path="ml_models/weights"):
         self.model = RandomForestClassifier(n_estimators=500, max_depth = 10, min_samples_split=10, random_state=42, n_jobs=10)
         self.scaler = MinMaxScaler()
         self.nth_day = nth_day
         self.path = path
 
-    def generate_features(self, df):
+    def generate_features(self, df, features=None):
+        # `features` are the FEATURES indicators row-aligned with df (FeatureStore.align)
+        if features is None:
+            features = compute_indicators(df, self.FEATURES)
+        ind = {name: np.asarray(features[name]) for name in self.FEATURES}
         new_predictors = []
 
-        df['macd'] = macd(df['close'])
-        df['macd_signal'] = macd_signal(df['close'])
-        df['macd_hist'] = 2*macd_diff(df['close'])
-        df['adx'] = adx(df['high'],df['low'],df['close'])
-        df["adx_pos"] = adx_pos(df['high'],df['low'],df['close'])
-        df["adx_neg"] = adx_neg(df['high'],df['low'],df['close'])
-        df['cci'] = CCIIndicator(high=df['high'], low=df['low'], close=df['close']).cci()
-        df['mfi'] = MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume']).money_flow_index()
+        df['macd'] = ind['macd']
+        df['macd_signal'] = ind['macd_signal']
+        df['macd_hist'] = 2*ind['macd_diff']
+        df['adx'] = ind['adx_14']
+        df["adx_pos"] = ind['adx_pos_14']
+        df["adx_neg"] = ind['adx_neg_14']
+        df['cci'] = ind['cci_20']
+        df['mfi'] = ind['mfi_14']
         
-        df['nvi'] = NegativeVolumeIndexIndicator(close=df['close'], volume=df['volume']).negative_volume_index()
-        df['obv'] = OnBalanceVolumeIndicator(close=df['close'], volume=df['volume']).on_balance_volume()
-        df['vpt'] = VolumePriceTrendIndicator(close=df['close'], volume=df['volume']).volume_price_trend()
-
-        df['rsi'] = rsi(df["close"], window=14)
-        df['stoch_rsi'] = stochrsi_k(df['close'], window=14, smooth1=3, smooth2=3)
-        df['bb_hband'] = bollinger_hband(df['close'], window=14)/df['close']
-        df['bb_lband'] = bollinger_lband(df['close'], window=14)/df['close']
-
-        df['adi'] = acc_dist_index(high=df['high'],low=df['low'],close=df['close'],volume=df['volume'])
-        df['cmf'] = chaikin_money_flow(high=df['high'],low=df['low'],close=df['close'],volume=df['volume'], window=20)
-        df['emv'] = ease_of_movement(high=df['high'],low=df['low'],volume=df['volume'], window=20)
-        df['fi'] = force_index(close=df['close'], volume=df['volume'], window= 13)
-
-        #df['atr'] = average_true_range(df['high'], df['low'], df['close'], window=20)
-        #df['roc'] = roc(df['close'], window=20)
-        df['williams'] = WilliamsRIndicator(high=df['high'], low=df['low'], close=df['close']).williams_r()
+        df['nvi'] = ind['nvi']
+        df['obv'] = ind['obv']
+        df['vpt'] = ind['vpt']
+
+        df['rsi'] = ind['rsi_14']
+        df['stoch_rsi'] = ind['stoch_rsi_k_14']
+        df['bb_hband'] = ind['bb_hband_14']/df['close']
+        df['bb_lband'] = ind['bb_lband_14']/df['close']
+
+        df['adi'] = ind['adi']
+        df['cmf'] = ind['cmf_20']
+        df['emv'] = ind['emv_20']
+        df['fi'] = ind['fi_13']
+
+        df['williams'] = ind['williams_14']
         #df['vwap'] = VolumeWeightedAveragePrice(high=df['high'],low=df['low'],close=df['close'], volume=df['volume'],window=14).volume_weighted_average_price()
         #df['sma_cross'] = (sma_indicator(df['close'], window=10) -sma_indicator(df['close'], window=50)).fillna(0).astype(int)
         #df['ema_cross'] = (ema_indicator(df['close'], window=10) -ema_indicator(df['close'], window=50)).fillna(0).astype(int)
         #df['wma_cross'] = (wma_indicator(df['close'], window=10) -wma_indicator(df['close'], window=50)).fillna(0).astype(int)
         #each data is reducing accuracy
 
-        df['stoch'] = stoch(df['high'], df['low'], df['close'], window=14)
+        df['stoch'] = ind['stoch_14']
 
         new_predictors+=['williams','fi','emv','cmf','adi','bb_hband','bb_lband','vpt','stoch','stoch_rsi','rsi','nvi','obv','macd','macd_signal','macd_hist','adx','adx_pos','adx_neg','cci','mfi']
         return new_predictors
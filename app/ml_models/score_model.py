@@ -16,6 +16,10 @@ import time
 import os
 
 
+# Lower bounds of the scores 1..10 on the class 1 probability
+SCORE_THRESHOLDS = [0, 0.3, 0.35, 0.4, 0.45, 0.5, 0.6, 0.7, 0.75, 0.8]
+
+
 class ScorePredictor:
     def __init__(self):
         self.scaler = MinMaxScaler()
@@ -28,25 +32,50 @@ class ScorePredictor:
             random_state=42
         )
         self.warm_start_model_path = 'ml_models/weights/ai-score/stacking_weights.pkl'
+        # Scaler fitted on the training set and the feature order it expects
+        self.preprocessing_path = 'ml_models/weights/ai-score/preprocessing.pkl'
+        self.features = None
+        self.loaded = False
         #self.pca = PCA(n_components=3)
     
     def preprocess_train_data(self, X):
+        if isinstance(X, pd.DataFrame):
+            self.features = X.columns.tolist()
         X = np.where(np.isinf(X), np.nan, X)
         X = np.nan_to_num(X)
         X = self.scaler.fit_transform(X)
         return X #self.pca.fit_transform(X)
 
     def preprocess_test_data(self, X):
+        if isinstance(X, pd.DataFrame) and self.features is not None:
+            X = X.reindex(columns=self.features, fill_value=0)
         X = np.where(np.isinf(X), np.nan, X)
         X = np.nan_to_num(X)
-        X = self.scaler.fit_transform(X)
+        # Transform only: the scaler keeps the ranges seen at train time
+        X = self.scaler.transform(X)
         return X #self.pca.fit_transform(X)
 
+    def load(self):
+        """
+        Load the model weights and the train-time scaler once per process.
+        """
+        if self.loaded:
+            return
+        with open(self.warm_start_model_path, 'rb') as f:
+            self.model = pickle.load(f)
+        with open(self.preprocessing_path, 'rb') as f:
+            preprocessing = pickle.load(f)
+        self.scaler = preprocessing['scaler']
+        self.features = preprocessing['features']
+        self.loaded = True
+
     def warm_start_training(self, X_train, y_train):
         X_train = self.preprocess_train_data(X_train)
         
         self.model.fit(X_train, y_train)
         pickle.dump(self.model, open(self.warm_start_model_path, 'wb'))
+        pickle.dump({'scaler': self.scaler, 'features': self.features}, open(self.preprocessing_path, 'wb'))
+        self.loaded = True
         print("Warm start model saved.")
 
     def fine_tune_model(self, X_train, y_train):
@@ -61,50 +90,77 @@ class ScorePredictor:
         self.model.fit(X_train, y_train, epochs=100, batch_size=128, validation_split=0.1, callbacks=[early_stopping, reduce_lr])
         print("Model fine-tuned (not saved).")
 
-    def evaluate_model(self, X_test, y_test):
-        X_test = self.preprocess_test_data(X_test)
-        
-        with open(self.warm_start_model_path, 'rb') as f:
-            self.model = pickle.load(f)
+    def predict(self, X):
+        """
+        Class 1 probabilities for a stacked feature matrix in one model call.
+        """
+        self.load()
+        return self.model.predict_proba(self.preprocess_test_data(X))[:, 1]
+
+    @staticmethod
+    def probability_to_score(probabilities):
+        """
+        Map probabilities to the 1-10 score: 0.8+ -> 10, 0.75+ -> 9, 0.7+ -> 8,
+        0.6+ -> 7, 0.5+ -> 6, 0.45+ -> 5, 0.4+ -> 4, 0.35+ -> 3, 0.3+ -> 2, else 1.
+        """
+        return np.searchsorted(SCORE_THRESHOLDS, probabilities, side='right')
+
+    @staticmethod
+    def metrics(y_test, binary_predictions):
+        return {
+            'accuracy': round(accuracy_score(y_test, binary_predictions) * 100),
+            'precision': round(precision_score(y_test, binary_predictions) * 100),
+            'f1_score': round(f1_score(y_test, binary_predictions) * 100),
+            'recall_score': round(recall_score(y_test, binary_predictions) * 100),
+            'roc_auc_score': round(roc_auc_score(y_test, binary_predictions) * 100),
+        }
 
-        test_predictions = self.model.predict_proba(X_test)
-        class_1_probabilities = test_predictions[:, 1]
+    def evaluate_model(self, X_test, y_test):
+        class_1_probabilities = self.predict(X_test)
         binary_predictions = (class_1_probabilities >= 0.5).astype(int)
 
-        # Calculate and print metrics
-        test_precision = precision_score(y_test, binary_predictions)
-        test_accuracy = accuracy_score(y_test, binary_predictions)
-        test_f1_score = f1_score(y_test, binary_predictions)
-        test_recall_score = recall_score(y_test, binary_predictions)
-        test_roc_auc_score = roc_auc_score(y_test, binary_predictions)
-
-        print(f"Test Precision: {round(test_precision * 100)}%")
-        print(f"Test Accuracy: {round(test_accuracy * 100)}%")
-        print(f"F1 Score: {round(test_f1_score * 100)}%")
-        print(f"Recall: {round(test_recall_score * 100)}%")
-        print(f"ROC AUC: {round(test_roc_auc_score * 100)}%")
+        res = self.metrics(y_test, binary_predictions)
+        print(f"Test Precision: {res['precision']}%")
+        print(f"Test Accuracy: {res['accuracy']}%")
+        print(f"F1 Score: {res['f1_score']}%")
+        print(f"Recall: {res['recall_score']}%")
+        print(f"ROC AUC: {res['roc_auc_score']}%")
 
         last_prediction_prob = class_1_probabilities[-1]
         print(pd.DataFrame({'y_test': y_test, 'y_pred': binary_predictions}))
         print(f"Last prediction probability: {last_prediction_prob}")
 
-        thresholds = [0.8, 0.75, 0.7, 0.6, 0.5, 0.45, 0.4, 0.35, 0.3, 0]
-        scores = [10, 9, 8, 7, 6, 5, 4, 3, 2, 1]
+        res['score'] = int(self.probability_to_score(last_prediction_prob))
+        return res
 
-        score = None        
-        for threshold, value in zip(thresholds, scores):
-            if last_prediction_prob >= threshold:
-                score = value
-                break
+    def evaluate_batch(self, test_sets):
+        """
+        Evaluate {ticker: (X_test, y_test)} with a single predict_proba call
+        over the stacked test rows of every ticker. Returns {ticker: metrics
+        and score of the ticker's last row}; tickers whose metrics cannot be
+        computed (e.g. a single class in y_test) are left out.
+        """
+        tickers = [ticker for ticker, (X_test, _) in test_sets.items() if len(X_test)]
+        if not tickers:
+            return {}
+
+        X = pd.concat([test_sets[ticker][0] for ticker in tickers], ignore_index=True)
+        bounds = np.cumsum([0] + [len(test_sets[ticker][0]) for ticker in tickers])
+
+        class_1_probabilities = self.predict(X)
+        binary_predictions = (class_1_probabilities >= 0.5).astype(int)
+        scores = self.probability_to_score(class_1_probabilities[bounds[1:] - 1])
+
+        res = {}
+        for i, ticker in enumerate(tickers):
+            lo, hi = bounds[i], bounds[i + 1]
+            try:
+                res[ticker] = self.metrics(test_sets[ticker][1], binary_predictions[lo:hi])
+                res[ticker]['score'] = int(scores[i])
+            except Exception as e:
+                print(f"Error evaluating {ticker}: {e}")
+        return res
 
-        return {
-            'accuracy': round(test_accuracy * 100),
-            'precision': round(test_precision * 100),
-            'f1_score': round(test_f1_score * 100),
-            'recall_score': round(test_recall_score * 100),
-            'roc_auc_score': round(test_roc_auc_score * 100),
-            'score': score
-        }
     def feature_selection(self, X_train, y_train, k=100):
         print('Feature selection:')
         print(f"X_train shape: {X_train.shape}, y_train shape: {y_train.shape}")
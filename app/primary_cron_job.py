@@ -1,450 +1,131 @@
-
 from datetime import datetime, time as datetime_time
 import schedule
 import time
 import subprocess
-import threading  # Import threading module for parallel execution
-#import logging  # Import logging module
-#from logging.handlers import RotatingFileHandler
 from pytz import timezone
 
 from dotenv import load_dotenv
 import os
+from utils.job_runner import Job, JobRunner
 load_dotenv()
 
-# Create a dictionary to store the status of each job
-job_status = {
-    'options_flow_job': {'running': False},
-}
-
 ny_tz = timezone('America/New_York')
 
-# Setup logging
-'''
-log_file = 'logs/cron_job.log'
-logger = logging.getLogger('CronJobLogger')
-logger.setLevel(logging.INFO)
-handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=5)  # 5MB per file, 5 backup files
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-'''
-
-
-# Set the system's timezone to Berlin at the beginning
-subprocess.run(["timedatectl", "set-timezone", "Europe/Berlin"])
-
-
-def run_if_not_running(job_func, job_tag):
-    def wrapper():
-        if not job_status[job_tag]['running']:
-            job_status[job_tag]['running'] = True
-            try:
-                job_func()
-            finally:
-                job_status[job_tag]['running'] = False
-    return wrapper
-
-# Function to run commands and log output
-def run_command(command):
-    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    stdout, stderr = process.communicate()
-    
-    # Log stdout and stderr
-    '''
-    logger.info(f"Command: {' '.join(command)}")
-    logger.info("Output:\n" + stdout)
-    if stderr:
-        logger.error("Error:\n" + stderr)
-    '''
-
-def run_dark_pool_flow():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    hour = now.hour
-    if week <= 4 and 8 <= hour < 17:
-        run_command(["python3", "cron_dark_pool_flow.py"])
-
-def run_market_flow():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    current_time = now.time()
-    hour = now.hour
-    if week <= 4 and 8 <= hour < 20:
-        run_command(["python3", "cron_market_flow.py"])
-
-def run_options_stats():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    hour = now.hour
-    if week <= 4 and 9 <= hour <= 16:
-        run_command(["python3", "cron_options_stats.py"])
-
-def run_dark_pool_level():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    hour = now.hour
-    if week <= 4 and 8 <= hour < 20:
-        run_command(["python3", "cron_dark_pool_level.py"])
-
-def run_dark_pool_ticker():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    if week <= 5:
-        run_command(["python3", "cron_dark_pool_ticker.py"])
-
-
-def run_options_jobs():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    if week <= 5:
-        run_command(["python3", "cron_options_gex_dex.py"])
-        time.sleep(60)
-        run_command(["python3", "cron_options_oi.py"])
-        time.sleep(60)
-        run_command(["python3", "cron_options_stats.py"])
-        time.sleep(60)
-        run_command(["python3", "cron_options_historical_volume.py"])
-        time.sleep(60)
-        run_command(["python3", "cron_implied_volatility.py"])
-        time.sleep(60)
-        run_command(["python3", "cron_options_hottest_contracts.py"])
-        time.sleep(60)
-        run_command(["python3", "cron_options_single_contract.py"])
-
-def run_fda_calendar():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    hour = now.hour
-    if week <= 4 and 8 <= hour < 20:
-        run_command(["python3", "cron_fda_calendar.py"])
-
-def run_cron_insider_trading():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_insider_trading.py"])
-
-def run_congress_trading():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_congress_trading.py"])
-        run_command(["python3", "restart_json.py"])
-
-def run_dividend_list():
-    week = datetime.today().weekday()
-    current_time = datetime.now().time()
-    start_time = datetime_time(15, 30)
-    end_time = datetime_time(22, 30)
-
-    if week <= 4 and start_time <= current_time < end_time:
-        run_command(["python3", "cron_dividend_kings.py"])
-        run_command(["python3", "cron_dividend_aristocrats.py"])
-
-def run_cron_var():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_var.py"])
-
-def run_cron_sector():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_sector.py"])
-
-def run_cron_industry():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_industry.py"])
-
-def run_analyst_estimate():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_analyst_estimate.py"])
-
-def run_shareholders():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_shareholders.py"])
-
-def run_profile():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_profile.py"])
-
-def run_share_statistics():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_share_statistics.py"])
-
-
-def run_cron_market_news():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_market_news.py"])
-        run_command(["python3", "cron_ipo_news.py"])
-
-def run_company_news():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_company_news.py"])
-
-def run_press_releases():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_press_releases.py"])
-
-def run_cron_heatmap():
-    run_command(["python3", "cron_heatmap.py"])
-
-
-def run_cron_options_flow():
-    week = datetime.today().weekday()
-    current_time = datetime.now().time()
-    start_time = datetime_time(15, 30)
-    end_time = datetime_time(22, 30)
-
-    if week <= 4 and start_time <= current_time < end_time:
-        run_command(["python3", "cron_options_flow.py"])
-
-        
-def run_ta_rating():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_ta_rating.py"])
-
-
-def run_similar_stocks():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_similar_stocks.py"])
-
-def run_historical_price():
-    week = datetime.today().weekday()
-    if week <= 5:
-        run_command(["python3", "cron_historical_price.py"])
-
-def run_one_day_price():
-    now = datetime.now(ny_tz)
-    week = now.weekday()
-    hour = now.hour
-    if week <= 4 and 9 <= hour < 17:
-        run_command(["python3", "cron_one_day_price.py"])
-
-def run_sec_filings():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_sec_filings.py"])
-
-def run_executive():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_executive.py"])
-
-def run_analyst_rating():
-    week = datetime.today().weekday()
-    if week <= 5:
-        run_command(["python3", "cron_analyst_insight.py"])
-        run_command(["python3", "cron_analyst_db.py"])
-        run_command(["python3", "cron_analyst_ticker.py"])
-
-def run_market_moods():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_wiim.py"])
-
-def run_db_schedule_job():
-    #update db daily
-    week = datetime.today().weekday()
-    if week <= 5:
-        run_command(["bash", "run_universe.sh"])
-
-
-def run_ownership_stats():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_ownership_stats.py"])
-
-
-def run_options_historical_flow():
-    week = datetime.today().weekday()
-    if week <= 5:
-        run_command(["python3", "cron_options_historical_flow.py"])
-        
-    
-
-def run_hedge_fund():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_hedge_funds.py"])
-
-def run_dashboard():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_quote.py"])
-        run_command(["python3", "cron_market_movers.py"])
-        run_command(["python3", "cron_dashboard.py"])
-
-
-def run_tracker():
-
-    scripts = [
-        "cron_reddit_tracker.py",
-        "cron_reddit_statistics.py",
+HOUR = 3600
+
+
+# Gates checked before each start of a job
+def weekdays(last=4):
+    return lambda: datetime.today().weekday() <= last
+
+def ny_hours(start, end):
+    def gate():
+        now = datetime.now(ny_tz)
+        return now.weekday() <= 4 and start <= now.hour < end
+    return gate
+
+def local_window(start, end):
+    def gate():
+        current_time = datetime.now().time()
+        return datetime.today().weekday() <= 4 and start <= current_time < end
+    return gate
+
+
+def build_jobs():
+    # Downstream jobs start as soon as all their upstream jobs have succeeded
+    # (or, for `after`, finished) since their own last start, instead of at a
+    # later wall-clock time. Only jobs that need the upstream output are
+    # gated on its success.
+    return [
+        # Options, nightly in sequence
+        Job('options_gex_dex', 'cron_options_gex_dex.py', trigger=schedule.every().day.at("02:00"), when=weekdays(5), pool='heavy', timeout=2*HOUR),
+        Job('options_oi', 'cron_options_oi.py', upstream=['options_gex_dex'], pool='heavy', timeout=2*HOUR),
+        Job('options_stats_daily', 'cron_options_stats.py', upstream=['options_oi'], pool='heavy', timeout=2*HOUR),
+        Job('options_historical_volume', 'cron_options_historical_volume.py', upstream=['options_stats_daily'], pool='heavy', timeout=2*HOUR),
+        Job('implied_volatility', 'cron_implied_volatility.py', upstream=['options_historical_volume'], pool='heavy', timeout=2*HOUR),
+        Job('options_hottest_contracts', 'cron_options_hottest_contracts.py', upstream=['implied_volatility'], pool='heavy', timeout=2*HOUR),
+        Job('options_single_contract', 'cron_options_single_contract.py', upstream=['options_hottest_contracts'], pool='heavy', timeout=2*HOUR),
+        Job('options_historical_flow', 'cron_options_historical_flow.py', trigger=schedule.every().day.at("05:00"), when=weekdays(5)),
+
+        # Databases
+        Job('universe', command=["bash", "run_universe.sh"], trigger=schedule.every().day.at("01:00"), when=weekdays(5), timeout=4*HOUR),
+        Job('price_store', 'cron_price_store.py', upstream=['universe']),
+
+        # Daily prices -> shared indicators -> ta rating and ai score
+        Job('historical_price', 'cron_historical_price.py', trigger=schedule.every().day.at("06:00"), when=weekdays(5), pool='heavy', timeout=3*HOUR),
+        Job('feature_store', 'cron_feature_store.py', upstream=['historical_price'], pool='heavy'),
+        Job('ta_rating', 'cron_ta_rating.py', upstream=['feature_store'], when=weekdays()),
+        Job('ai_score', 'cron_ai_score.py', upstream=['feature_store'], pool='heavy', timeout=6*HOUR),
+        # Data refreshes: after ai_score whatever its outcome, and on their own
+        # every afternoon so a day without an ai_score run still gets them
+        Job('stockdeck', 'cron_stockdeck.py', after=['ai_score'], trigger=schedule.every().day.at("13:00")),
+        Job('restart_json', 'restart_json.py', after=['stockdeck']),
+        Job('statistics', 'cron_statistics.py', after=['restart_json']),
+
+        Job('price_reaction', 'cron_earnings_price_reaction.py', trigger=schedule.every().day.at("08:00"), when=weekdays(5)),
+        Job('dark_pool_ticker', 'cron_dark_pool_ticker.py', trigger=schedule.every().day.at("08:00"), when=weekdays(5)),
+        Job('hedge_fund', 'cron_hedge_funds.py', trigger=schedule.every().day.at("09:00"), when=weekdays()),
+        Job('financial_statements', 'cron_financial_statements.py', trigger=schedule.every().day.at("07:30"), when=weekdays(), pool='heavy', timeout=3*HOUR),
+        Job('economy_indicator', 'cron_economic_indicator.py', trigger=schedule.every().day.at("08:00"), when=weekdays()),
+        Job('insider_trading', 'cron_insider_trading.py', trigger=schedule.every().day.at("08:00"), when=weekdays()),
+        Job('dividends', 'cron_dividends.py', trigger=schedule.every().day.at("08:30"), when=weekdays()),
+        Job('shareholders', 'cron_shareholders.py', trigger=schedule.every().day.at("09:00"), when=weekdays()),
+        Job('profile', 'cron_profile.py', trigger=schedule.every().day.at("09:30"), when=weekdays()),
+        #Job('sec_filings', 'cron_sec_filings.py', trigger=schedule.every().day.at("10:30"), when=weekdays()),
+        #Job('executive', 'cron_executive.py', trigger=schedule.every().day.at("11:00"), when=weekdays()),
+        Job('market_cap', 'cron_market_cap.py', trigger=schedule.every().day.at("12:00"), when=weekdays()),
+        Job('analyst_estimate', 'cron_analyst_estimate.py', trigger=schedule.every().day.at("13:40"), when=weekdays()),
+        Job('similar_stocks', 'cron_similar_stocks.py', trigger=schedule.every().day.at("13:45"), when=weekdays()),
+        Job('var', 'cron_var.py', trigger=schedule.every().day.at("14:00"), when=weekdays()),
+        Job('sector', 'cron_sector.py', trigger=schedule.every().day.at("14:00"), when=weekdays()),
+        Job('financial_score', 'cron_financial_score.py', trigger=schedule.every(2).days.at("08:30"), when=weekdays()),
+        Job('ownership_stats', 'cron_ownership_stats.py', trigger=schedule.every().saturday.at("05:00"), when=weekdays()),
+
+        # Intraday
+        Job('dividend_kings', 'cron_dividend_kings.py', trigger=schedule.every(30).minutes, when=local_window(datetime_time(15, 30), datetime_time(22, 30))),
+        Job('dividend_aristocrats', 'cron_dividend_aristocrats.py', upstream=['dividend_kings']),
+        Job('congress_trading', 'cron_congress_trading.py', trigger=schedule.every(3).hours, when=weekdays()),
+        Job('restart_json_congress', 'restart_json.py', upstream=['congress_trading']),
+        Job('market_news', 'cron_market_news.py', trigger=schedule.every(30).minutes, when=weekdays()),
+        Job('ipo_news', 'cron_ipo_news.py', upstream=['market_news']),
+        Job('industry', 'cron_industry.py', trigger=schedule.every(30).minutes, when=weekdays()),
+        Job('one_day_price', 'cron_one_day_price.py', trigger=schedule.every(8).minutes, when=ny_hours(9, 17)),
+        #Job('heatmap', 'cron_heatmap.py', trigger=schedule.every(15).minutes),
+        Job('reddit_tracker', 'cron_reddit_tracker.py', trigger=schedule.every(20).minutes),
+        Job('reddit_statistics', 'cron_reddit_statistics.py', upstream=['reddit_tracker']),
+        Job('insider_tracker', 'cron_insider_tracker.py', upstream=['reddit_statistics'], when=weekdays()),
+        Job('market_moods', 'cron_wiim.py', trigger=schedule.every(30).minutes, when=weekdays()),
+        Job('earnings', 'cron_earnings.py', trigger=schedule.every(10).minutes, when=weekdays()),
+        #Job('share_statistics', 'cron_share_statistics.py', trigger=schedule.every(4).hours, when=weekdays()),
+        Job('analyst_insight', 'cron_analyst_insight.py', trigger=schedule.every(2).hours, when=weekdays(5)),
+        Job('analyst_db', 'cron_analyst_db.py', upstream=['analyst_insight']),
+        Job('analyst_ticker', 'cron_analyst_ticker.py', upstream=['analyst_db']),
+        Job('company_news', 'cron_company_news.py', trigger=schedule.every(1).hours, when=weekdays()),
+        Job('press_releases', 'cron_press_releases.py', trigger=schedule.every(3).hours, when=weekdays()),
+        Job('fda_calendar', 'cron_fda_calendar.py', trigger=schedule.every(1).hours, when=ny_hours(8, 20)),
+        Job('options_stats', 'cron_options_stats.py', trigger=schedule.every(10).minutes, when=ny_hours(9, 17), timeout=30*60),
+        Job('market_flow', 'cron_market_flow.py', trigger=schedule.every(5).minutes, when=ny_hours(8, 20), timeout=30*60),
+        Job('list', 'cron_list.py', trigger=schedule.every(5).minutes, when=weekdays(5), timeout=30*60),
+        Job('screener', 'cron_screener.py', trigger=schedule.every(5).minutes, when=ny_hours(9, 17), timeout=30*60),
+        Job('dark_pool_level', 'cron_dark_pool_level.py', trigger=schedule.every(30).minutes, when=ny_hours(8, 20)),
+        Job('dark_pool_flow', 'cron_dark_pool_flow.py', trigger=schedule.every(10).seconds, when=ny_hours(8, 17), timeout=5*60),
+        Job('options_flow', 'cron_options_flow.py', trigger=schedule.every(10).seconds, when=local_window(datetime_time(15, 30), datetime_time(22, 30)), timeout=10*60),
+
+        # Quotes -> market movers -> dashboard
+        Job('quote', 'cron_quote.py', trigger=schedule.every(2).minutes, when=weekdays(), timeout=10*60),
+        Job('market_movers', 'cron_market_movers.py', upstream=['quote'], timeout=10*60),
+        Job('dashboard', 'cron_dashboard.py', upstream=['market_movers'], timeout=10*60),
     ]
-    for script in scripts:
-        run_command(["python3", script])
-
-    week = datetime.today().weekday()
-    if week <= 4:
-        scripts = [
-            #"cron_cramer_tracker.py",
-            #"cron_lobbying_tracker.py",
-            #"cron_sentiment_tracker.py",
-            "cron_insider_tracker.py",
-        ]
-        for script in scripts:
-            run_command(["python3", script])
-
-
-def run_list():
-    week = datetime.today().weekday()
-    if week <= 5:
-        run_command(["python3", "cron_list.py"])
-
-
-def run_financial_statements():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_financial_statements.py"])
-
-def run_financial_score():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_financial_score.py"])
- 
-
-def run_market_cap():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_market_cap.py"])
-
-
-def run_dividends():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_dividends.py"])
-
-
-def run_earnings():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_earnings.py"])
-
-def run_price_reaction():
-    week = datetime.today().weekday()
-    if week <= 5:
-        run_command(["python3", "cron_earnings_price_reaction.py"])
-
-
-
-def run_economy_indicator():
-    week = datetime.today().weekday()
-    if week <= 4:
-        run_command(["python3", "cron_economic_indicator.py"])
-
-
-def run_ai_score():
-    run_command(["python3", "cron_ai_score.py"])
-    run_command(["python3", "cron_stockdeck.py"])
-    run_command(["python3", "restart_json.py"])
-    run_command(["python3", "cron_statistics.py"])
-
-# Create functions to run each schedule in a separate thread
-def run_threaded(job_func):
-    job_thread = threading.Thread(target=job_func)
-    job_thread.start()
-
-# Schedule the job to run
-
-schedule.every().day.at("02:00").do(run_threaded, run_options_jobs).tag('options_job')
-schedule.every().day.at("01:00").do(run_threaded, run_db_schedule_job)
-schedule.every().day.at("05:00").do(run_threaded, run_options_historical_flow).tag('options_historical_flow_job')
-
-
-schedule.every().day.at("06:00").do(run_threaded, run_historical_price).tag('historical_job')
-schedule.every().day.at("06:30").do(run_threaded, run_ai_score).tag('ai_score_job')
-
-schedule.every().day.at("07:00").do(run_threaded, run_ta_rating).tag('ta_rating_job')
-schedule.every().day.at("08:00").do(run_threaded, run_price_reaction).tag('price_reaction_job')
-schedule.every().day.at("08:00").do(run_threaded, run_dark_pool_ticker).tag('dark_pool_ticker_job')
-schedule.every().day.at("09:00").do(run_threaded, run_hedge_fund).tag('hedge_fund_job')
-schedule.every().day.at("07:30").do(run_threaded, run_financial_statements).tag('financial_statements_job')
-schedule.every().day.at("08:00").do(run_threaded, run_economy_indicator).tag('economy_indicator_job')
-schedule.every().day.at("08:00").do(run_threaded, run_cron_insider_trading).tag('insider_trading_job')
-schedule.every().day.at("08:30").do(run_threaded, run_dividends).tag('dividends_job')
-schedule.every().day.at("09:00").do(run_threaded, run_shareholders).tag('shareholders_job')
-schedule.every().day.at("09:30").do(run_threaded, run_profile).tag('profile_job')
-
-#schedule.every().day.at("10:30").do(run_threaded, run_sec_filings).tag('sec_filings_job')
-#schedule.every().day.at("11:00").do(run_threaded, run_executive).tag('executive_job')
-schedule.every().day.at("12:00").do(run_threaded, run_market_cap).tag('market_cap_job')
-
-#schedule.every().day.at("05:00").do(run_threaded, run_implied_volatility).tag('implied_volatility_job')
-
-
-schedule.every().day.at("13:40").do(run_threaded, run_analyst_estimate).tag('analyst_estimate_job')
-schedule.every().day.at("13:45").do(run_threaded, run_similar_stocks).tag('similar_stocks_job')
-schedule.every().day.at("14:00").do(run_threaded, run_cron_var).tag('var_job')
-schedule.every().day.at("14:00").do(run_threaded, run_cron_sector).tag('sector_job')
-
-
-schedule.every(2).days.at("08:30").do(run_threaded, run_financial_score).tag('financial_score_job')
-schedule.every().saturday.at("05:00").do(run_threaded, run_ownership_stats).tag('ownership_stats_job')
-#schedule.every().saturday.at("06:00").do(run_threaded, run_sentiment_analysis).tag('sentiment_analysis_job')
-#schedule.every().saturday.at("10:00").do(run_threaded, run_price_analysis).tag('price_analysis_job')
-
-
-schedule.every(30).minutes.do(run_threaded, run_dividend_list).tag('dividend_list_job')
-schedule.every(3).hours.do(run_threaded, run_congress_trading).tag('congress_job')
-schedule.every(30).minutes.do(run_threaded, run_cron_market_news).tag('market_news_job')
-
-schedule.every(30).minutes.do(run_threaded, run_cron_industry).tag('industry_job')
-
-schedule.every(8).minutes.do(run_threaded, run_one_day_price).tag('one_day_price_job')
-#schedule.every(15).minutes.do(run_threaded, run_cron_heatmap).tag('heatmap_job')
-
-
-schedule.every(20).minutes.do(run_threaded, run_tracker).tag('tracker_job')
-
-
-schedule.every(30).minutes.do(run_threaded, run_market_moods).tag('market_moods_job')
-schedule.every(10).minutes.do(run_threaded, run_earnings).tag('earnings_job')
-
-#schedule.every(4).hours.do(run_threaded, run_share_statistics).tag('share_statistics_job')
-
-schedule.every(2).hours.do(run_threaded, run_analyst_rating).tag('analyst_job')
-schedule.every(1).hours.do(run_threaded, run_company_news).tag('company_news_job')
-schedule.every(3).hours.do(run_threaded, run_press_releases).tag('press_release_job')
-
-schedule.every(1).hours.do(run_threaded, run_fda_calendar).tag('fda_calendar_job')
-
-schedule.every(10).minutes.do(run_threaded, run_options_stats).tag('options_stats_job')
-
-schedule.every(5).minutes.do(run_threaded, run_market_flow).tag('market_flow_job')
-schedule.every(5).minutes.do(run_threaded, run_list).tag('stock_list_job')
-
-
-
-schedule.every(30).minutes.do(run_threaded, run_dark_pool_level).tag('dark_pool_level_job')
-schedule.every(10).seconds.do(run_threaded, run_dark_pool_flow).tag('dark_pool_flow_job')
-
-schedule.every(2).minutes.do(run_threaded, run_dashboard).tag('dashboard_job')
-
 
-schedule.every(10).seconds.do(run_threaded, run_if_not_running(run_cron_options_flow, 'options_flow_job')).tag('options_flow_job')
 
+if __name__ == "__main__":
+    # Set the system's timezone to Berlin at the beginning
+    subprocess.run(["timedatectl", "set-timezone", "Europe/Berlin"])
 
+    runner = JobRunner(build_jobs(), pools={'default': 8, 'heavy': 2})
+    runner.schedule()
 
-# Run the scheduled jobs indefinitelyp
-while True:
-    schedule.run_pending()
-    time.sleep(3)
\ No newline at end of file
+    # Run the scheduled jobs indefinitely
+    while True:
+        schedule.run_pending()
+        time.sleep(3)
@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from ta.utils import *
 from ta.volatility import *
@@ -6,10 +7,15 @@ from ta.momentum import *
 from ta.trend import *
 from ta.volume import *
 
+from utils.feature_store import compute_indicators
+
 
 
 class rating_model:
-    def __init__(self, df):
+    FEATURES = ['sma_20', 'sma_50', 'ema_20', 'ema_50', 'wma_20', 'adx_14', 'adx_pos_14', 'adx_neg_14', 'williams_14',
+                'rsi_14', 'stoch_rsi_k_14', 'macd', 'macd_signal', 'macd_diff', 'roc_14', 'cci_20', 'mfi_14']
+
+    def __init__(self, df, features=None):
         #Results are in the form of
         # Strong Sell => 0
         # Sell => 1
@@ -18,6 +24,8 @@ class rating_model:
         # Strong Buy => 4
 
         self.data = df
+        # Canonical indicators row-aligned with df, e.g. from the feature store
+        self.features = features
     
     def compute_overall_signal(self, data):
         ratingMap = {
@@ -52,16 +60,21 @@ class rating_model:
         return overall_signal
 
     def ta_rating(self):
-        df = pd.DataFrame()
-        df['sma_20'] = sma_indicator(self.data['close'], window=20)
-        df['sma_50'] = sma_indicator(self.data['close'], window=50)
-        df['ema_20'] = ema_indicator(self.data['close'], window=20)
-        df['ema_50'] = ema_indicator(self.data['close'], window=50)
-        df['wma'] = wma_indicator(self.data['close'], window=20)
-        df['adx'] = adx(self.data['high'],self.data['low'],self.data['close'])
-        df["adx_pos"] = adx_pos(self.data['high'],self.data['low'],self.data['close'])
-        df["adx_neg"] = adx_neg(self.data['high'],self.data['low'],self.data['close'])
-        df['williams'] = WilliamsRIndicator(high=self.data['high'], low=self.data['low'], close=self.data['close']).williams_r()
+        features = self.features
+        if features is None:
+            features = compute_indicators(self.data, self.FEATURES)
+        ind = {name: np.asarray(features[name]) for name in self.FEATURES}
+
+        df = pd.DataFrame(index=self.data.index)
+        df['sma_20'] = ind['sma_20']
+        df['sma_50'] = ind['sma_50']
+        df['ema_20'] = ind['ema_20']
+        df['ema_50'] = ind['ema_50']
+        df['wma'] = ind['wma_20']
+        df['adx'] = ind['adx_14']
+        df["adx_pos"] = ind['adx_pos_14']
+        df["adx_neg"] = ind['adx_neg_14']
+        df['williams'] = ind['williams_14']
 
         # Assign ratings based on SMA values
         df['sma_rating'] = 'Neutral'
@@ -120,16 +133,15 @@ class rating_model:
         #=========Momentum Indicators ============#
 
       
-        aroon = AroonIndicator(self.data['close'], low=self.data['low'], window=14)
-        df['rsi'] = rsi(self.data['close'], window=14)
-        df['stoch_rsi'] = stochrsi_k(self.data['close'], window=14, smooth1 = 3, smooth2 =3)*100
-
-        df['macd'] = macd(self.data['close'])
-        df['macd_signal'] = macd_signal(self.data['close'])
-        df['macd_hist'] = 2*macd_diff(self.data['close'])
-        df['roc'] = roc(self.data['close'], window=14)
-        df['cci'] = CCIIndicator(high=self.data['high'], low=self.data['low'], close=self.data['close']).cci()
-        df['mfi'] = MFIIndicator(high=self.data['high'], low=self.data['low'], close=self.data['close'], volume=self.data['volume']).money_flow_index()
+        df['rsi'] = ind['rsi_14']
+        df['stoch_rsi'] = ind['stoch_rsi_k_14']*100
+
+        df['macd'] = ind['macd']
+        df['macd_signal'] = ind['macd_signal']
+        df['macd_hist'] = 2*ind['macd_diff']
+        df['roc'] = ind['roc_14']
+        df['cci'] = ind['cci_20']
+        df['mfi'] = ind['mfi_14']
         
         # Assign ratings based on MFI values
         df['mfi_rating'] = pd.cut(df['mfi'], 
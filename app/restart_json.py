@@ -17,6 +17,8 @@ import hashlib
 import glob
 from tqdm import tqdm
 from utils.country_list import country_list
+from utils.screener import build_screener_table, save_screener_table
+from utils.quote_store import open_quote_store, read_quote
 
 from dotenv import load_dotenv
 import os
@@ -28,109 +30,7 @@ benzinga_api_key = os.getenv('benzinga_api_key')
 
 berlin_tz = pytz.timezone('Europe/Berlin')
 
-
-query_price = """
-    SELECT 
-        close
-    FROM 
-        "{symbol}"
-    WHERE
-        date <= ?
-    ORDER BY 
-        date DESC
-    LIMIT 1
-"""
-
-query_shares = f"""
-    SELECT 
-        historicalShares
-    FROM 
-        stocks
-    WHERE
-        symbol = ?
-"""
-
-
-time_frames = {
-    'change1W': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
-    'change1M': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
-    'change3M': (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'),
-    'change6M': (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d'),
-    'change1Y': (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d'),
-    'change3Y': (datetime.now() - timedelta(days=365 * 3)).strftime('%Y-%m-%d'),
-}
-
-one_year_ago = datetime.now() - timedelta(days=365)
-
-def calculate_price_changes(symbol, item, con):
-    try:
-        # Loop through each time frame to calculate the change
-        for name, date in time_frames.items():
-            item[name] = None  # Initialize to None
-
-            query = query_price.format(symbol=symbol)
-            data = pd.read_sql_query(query, con, params=(date,))
-            
-            # Check if data was retrieved and calculate the percentage change
-            if not data.empty:
-                past_price = data.iloc[0]['close']
-                current_price = item['price']
-                change = round(((current_price - past_price) / past_price) * 100, 2)
-                
-                # Set item[name] to None if the change is -100
-                item[name] = None if change == -100 else change
-                
-    except:
-        # Handle exceptions by setting all fields to None
-        for name in time_frames.keys():
-            item[name] = None
-
-
-def filter_data_quarterly(data):
-    # Generate a range of quarter-end dates from the start to the end date
-    start_date = data[0]['date']
-    end_date = datetime.today().strftime('%Y-%m-%d')
-    quarter_ends = pd.date_range(start=start_date, end=end_date, freq='QE').strftime('%Y-%m-%d').tolist()
-
-    # Filter data to keep only entries with dates matching quarter-end dates
-    filtered_data = [entry for entry in data if entry['date'] in quarter_ends]
-    
-    return filtered_data
-
-def calculate_share_changes(symbol, item, con):
-    item['sharesQoQ'] = None
-    item['sharesYoY'] = None
-    item['floatShares'] = None
-    try: 
-        # Execute query and load data
-        df = pd.read_sql_query(query_shares, con, params=(symbol,))
-        shareholder_statistics = orjson.loads(df.to_dict()['historicalShares'][0])
-        
-        # Keys to keep
-        keys_to_keep = ["date", "floatShares", "outstandingShares"]
-
-        # Create new list with only the specified keys and convert floatShares and outstandingShares to integers
-        shareholder_statistics = [
-            {key: int(d[key]) if key in ["floatShares", "outstandingShares"] else d[key] 
-             for key in keys_to_keep}
-            for d in shareholder_statistics
-        ]
-
-        shareholder_statistics = sorted(shareholder_statistics, key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'), reverse=False)
-        #Add latest float shares for statistics page
-        item['floatShares'] = shareholder_statistics[-1]['floatShares']
-        historical_shares = filter_data_quarterly(shareholder_statistics)
-        
-        latest_data = historical_shares[-1]['outstandingShares']
-        previous_quarter = historical_shares[-2]['outstandingShares']
-        previous_year = historical_shares[-4]['outstandingShares']
-
-        item['sharesQoQ'] = round((latest_data/previous_quarter-1)*100,2)
-        item['sharesYoY'] = round((latest_data/previous_year-1)*100,2)
-    except:
-        item['sharesQoQ'] = None
-        item['sharesYoY'] = None
-        item['floatShares'] = None
+quote_store = open_quote_store()
 
 
 # Replace NaN values with None in the resulting JSON object
@@ -158,834 +58,9 @@ def generate_id(name):
 
 
 
-def count_consecutive_growth_years(financial_data, key_element):
-    # Sort the financial data by date
-    financial_data = sorted(financial_data, key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'))
-    
-    consecutive_years = 0
-    prev_val = None
-
-    for data in financial_data:
-        current_val = data[key_element] #e.g. revenue
-        
-        if current_val is not None:
-            if prev_val is not None:
-                if current_val > prev_val:
-                    consecutive_years += 1
-                else:
-                    consecutive_years = 0
-            prev_val = current_val
-
-    # Check one last time in case the streak continues to the end
-    
-    return consecutive_years
-
-
-def filter_latest_analyst_unique_rating(data):
-    latest_entries = {}
-
-    for entry in data:
-        try:
-            # Create a unique key by combining 'analyst' and 'name'
-            key = f"{entry.get('analyst')}-{entry.get('name')}"
-
-            # Convert date and time to a datetime object
-            date_time_str = f"{entry.get('date')}"
-            date_time = datetime.strptime(date_time_str, "%Y-%m-%d")
-
-            # Check if this entry is the latest for the given key
-            if key not in latest_entries or date_time > latest_entries[key]['dateTime']:
-                latest_entries[key] = {'dateTime': date_time, 'entry': entry}
-        except Exception as e:
-            print(f"Error processing entry: {e}")
-
-    # Extract and return the latest entries
-    return [value['entry'] for value in latest_entries.values()]
-
-def process_top_analyst_data(data, current_price):
-    data = [item for item in data if item.get('analystScore', 0) >= 4] if data else []
-    data = filter_latest_analyst_unique_rating(data)
-    # Filter recent data from the last 12 months
-    recent_data = [
-        item for item in data
-        if 'date' in item and datetime.strptime(item['date'], "%Y-%m-%d") >= one_year_ago
-    ][:30]  # Consider only the last 30 ratings
-
-    # Count filtered analysts
-    if len(recent_data) > 0:
-        filtered_analyst_count = len(recent_data)
-
-        # Extract and filter price targets
-        price_targets = [
-            float(item['adjusted_pt_current']) for item in recent_data
-            if 'adjusted_pt_current' in item and item['adjusted_pt_current'] and not math.isnan(float(item['adjusted_pt_current']))
-        ]
-
-        # Calculate median price target
-        median_price_target = None
-        if price_targets:
-            price_targets.sort()
-            median_index = len(price_targets) // 2
-            median_price_target = (
-                price_targets[median_index]
-                if len(price_targets) % 2 != 0 else
-                (price_targets[median_index - 1] + price_targets[median_index]) / 2
-            )
-        if median_price_target <= 0:
-            median_price_target = None
-        # Calculate changes percentage
-        upside = None
-        if median_price_target != None  and current_price is not None:
-            upside = round(((median_price_target / current_price - 1) * 100), 2)
-
-        # Define rating scores
-        rating_scores = {
-            "Strong Buy": 5,
-            "Buy": 4,
-            "Hold": 3,
-            "Sell": 2,
-            "Strong Sell": 1,
-        }
-
-        # Calculate total rating score
-        total_rating_score = sum(
-            rating_scores.get(item.get('rating_current'), 0) for item in recent_data
-        )
-
-        # Calculate average rating score
-        average_rating_score = (
-            round(total_rating_score / filtered_analyst_count,2)
-            if filtered_analyst_count > 0 else 0
-        )
-
-        # Determine consensus rating
-        if average_rating_score >= 4.5:
-            consensus_rating = "Strong Buy"
-        elif average_rating_score >= 3.5:
-            consensus_rating = "Buy"
-        elif average_rating_score >= 2.5:
-            consensus_rating = "Hold"
-        elif average_rating_score >= 1.5:
-            consensus_rating = "Sell"
-        elif average_rating_score >= 1.0:
-            consensus_rating = "Strong Sell"
-        else:
-            consensus_rating = None
-
-        return {
-            "topAnalystCounter": filtered_analyst_count,
-            "topAnalystPriceTarget": median_price_target,
-            "topAnalystUpside": upside,
-            "topAnalystRating": consensus_rating,
-        }
-    else:
-        return {
-            "topAnalystCounter": None,
-            "topAnalystPriceTarget": None,
-            "topAnalystUpside": None,
-            "topAnalystRating": None,
-        }
-
-
-def process_financial_data(file_path, key_list):
-    """
-    Read JSON data from file and extract specified keys with rounding.
-    """
-    data = defaultdict(lambda: None)  # Initialize with default value of None
-    try:
-        with open(file_path, 'r') as file:
-            res = orjson.loads(file.read())[0]
-            for key in key_list:
-                if key in res:
-                    try:
-                        value = float(res[key])
-                        if 'growth' in file_path or key in ['longTermDebtToCapitalization','totalDebtToCapitalization']:
-                            value = value*100  # Multiply by 100 for percentage
-
-                        data[key] = round(value, 2) if value is not None else None
-                    except (ValueError, TypeError):
-                        # If there's an issue converting the value, leave it as None
-                        data[key] = None
-    except (FileNotFoundError, KeyError, IndexError):
-        # If the file doesn't exist or there's an issue reading the data,
-        # data will retain None as the default value for all keys
-        pass
-
-    return data
-
-def check_and_process(file_path, key_list):
-    """
-    Check if the file exists, and then process the financial data if it does.
-    If the file doesn't exist, return a dictionary with all keys set to None.
-    """
-    if os.path.exists(file_path):
-        return process_financial_data(file_path, key_list)
-    else:
-        return {key: None for key in key_list}
-
-def get_financial_statements(item, symbol):
-    """
-    Update item with financial data from various JSON files.
-    """
-    # Define the keys to be extracted for each type of statement
-    key_ratios = [
-        "currentRatio", "quickRatio", "cashRatio", "daysOfSalesOutstanding",
-        "daysOfInventoryOutstanding", "operatingCycle", "daysOfPayablesOutstanding",
-        "cashConversionCycle", "grossProfitMargin", "operatingProfitMargin",
-        "pretaxProfitMargin", "netProfitMargin", "effectiveTaxRate", "returnOnAssets",
-        "returnOnEquity", "returnOnCapitalEmployed", "netIncomePerEBT", "ebtPerEbit",
-        "ebitPerRevenue", "debtRatio", "debtEquityRatio", "longTermDebtToCapitalization",
-        "totalDebtToCapitalization", "interestCoverage", "cashFlowToDebtRatio",
-        "companyEquityMultiplier", "receivablesTurnover", "payablesTurnover",
-        "inventoryTurnover", "fixedAssetTurnover", "assetTurnover",
-        "operatingCashFlowPerShare", "freeCashFlowPerShare", "cashPerShare", "payoutRatio",
-        "operatingCashFlowSalesRatio", "freeCashFlowOperatingCashFlowRatio",
-        "cashFlowCoverageRatios", "shortTermCoverageRatios", "capitalExpenditureCoverageRatio",
-        "dividendPaidAndCapexCoverageRatio", "dividendPayoutRatio", "priceBookValueRatio",
-        "priceToBookRatio", "priceToSalesRatio", "priceEarningsRatio", "priceToFreeCashFlowsRatio",
-        "priceToOperatingCashFlowsRatio", "priceCashFlowRatio", "priceEarningsToGrowthRatio",
-        "priceSalesRatio", "dividendYield", "enterpriseValueMultiple", "priceFairValue"
-    ]
-    
-    key_cash_flow = [
-        "netIncome", "depreciationAndAmortization", "deferredIncomeTax", "stockBasedCompensation",
-        "changeInWorkingCapital", "accountsReceivables", "inventory", "accountsPayables",
-        "otherWorkingCapital", "otherNonCashItems", "netCashProvidedByOperatingActivities",
-        "investmentsInPropertyPlantAndEquipment", "acquisitionsNet", "purchasesOfInvestments",
-        "salesMaturitiesOfInvestments", "otherInvestingActivites", "netCashUsedForInvestingActivites",
-        "debtRepayment", "commonStockIssued", "commonStockRepurchased", "dividendsPaid",
-        "otherFinancingActivites", "netCashUsedProvidedByFinancingActivities", "effectOfForexChangesOnCash",
-        "netChangeInCash", "cashAtEndOfPeriod", "cashAtBeginningOfPeriod", "operatingCashFlow",
-        "capitalExpenditure", "freeCashFlow"
-    ]
-
-    key_income = [
-        "revenue", "costOfRevenue", "grossProfit", "grossProfitRatio",
-        "researchAndDevelopmentExpenses", "generalAndAdministrativeExpenses", "sellingAndMarketingExpenses",
-        "sellingGeneralAndAdministrativeExpenses", "otherExpenses", "operatingExpenses",
-        "costAndExpenses", "interestIncome", "interestExpense", "depreciationAndAmortization",
-        "ebitda", "ebitdaratio", "operatingIncome", "operatingIncomeRatio",
-        "totalOtherIncomeExpensesNet", "incomeBeforeTax", "incomeBeforeTaxRatio", "incomeTaxExpense",
-        "netIncome", "netIncomeRatio", "eps", "epsdiluted", "weightedAverageShsOut",
-        "weightedAverageShsOutDil"
-    ]
-
-    key_balance_sheet = [
-        "cashAndCashEquivalents", "shortTermInvestments", "cashAndShortTermInvestments",
-        "netReceivables", "inventory", "otherCurrentAssets", "totalCurrentAssets",
-        "propertyPlantEquipmentNet", "goodwill", "intangibleAssets", "goodwillAndIntangibleAssets",
-        "longTermInvestments", "taxAssets", "otherNonCurrentAssets", "totalNonCurrentAssets",
-        "otherAssets", "totalAssets", "accountPayables", "shortTermDebt", "taxPayables",
-        "deferredRevenue", "otherCurrentLiabilities", "totalCurrentLiabilities", "longTermDebt",
-        "deferredRevenueNonCurrent", "deferredTaxLiabilitiesNonCurrent", "otherNonCurrentLiabilities",
-        "totalNonCurrentLiabilities", "otherLiabilities", "capitalLeaseObligations", "totalLiabilities",
-        "preferredStock", "commonStock", "retainedEarnings", "accumulatedOtherComprehensiveIncomeLoss",
-        "othertotalStockholdersEquity", "totalStockholdersEquity", "totalEquity",
-        "totalLiabilitiesAndStockholdersEquity", "minorityInterest", "totalLiabilitiesAndTotalEquity",
-        "totalInvestments", "totalDebt", "netDebt"
-    ]
-
-    key_income_growth = [
-        "growthRevenue",
-        "growthCostOfRevenue",
-        "growthGrossProfit",
-        "growthGrossProfitRatio",
-        "growthResearchAndDevelopmentExpenses",
-        "growthGeneralAndAdministrativeExpenses",
-        "growthSellingAndMarketingExpenses",
-        "growthOtherExpenses",
-        "growthOperatingExpenses",
-        "growthCostAndExpenses",
-        "growthInterestExpense",
-        "growthDepreciationAndAmortization",
-        "growthEBITDA",
-        "growthEBITDARatio",
-        "growthOperatingIncome",
-        "growthOperatingIncomeRatio",
-        "growthTotalOtherIncomeExpensesNet",
-        "growthIncomeBeforeTax",
-        "growthIncomeBeforeTaxRatio",
-        "growthIncomeTaxExpense",
-        "growthNetIncome",
-        "growthNetIncomeRatio",
-        "growthEPS",
-        "growthEPSDiluted",
-        "growthWeightedAverageShsOut",
-        "growthWeightedAverageShsOutDil"
-    ]
-    key_cash_flow_growth = [
-    "growthNetIncome",
-    "growthDepreciationAndAmortization",
-    "growthDeferredIncomeTax",
-    "growthStockBasedCompensation",
-    "growthChangeInWorkingCapital",
-    "growthAccountsReceivables",
-    "growthInventory",
-    "growthAccountsPayables",
-    "growthOtherWorkingCapital",
-    "growthOtherNonCashItems",
-    "growthNetCashProvidedByOperatingActivites",
-    "growthInvestmentsInPropertyPlantAndEquipment",
-    "growthAcquisitionsNet",
-    "growthPurchasesOfInvestments",
-    "growthSalesMaturitiesOfInvestments",
-    "growthOtherInvestingActivites",
-    "growthNetCashUsedForInvestingActivites",
-    "growthDebtRepayment",
-    "growthCommonStockIssued",
-    "growthCommonStockRepurchased",
-    "growthDividendsPaid",
-    "growthOtherFinancingActivites",
-    "growthNetCashUsedProvidedByFinancingActivities",
-    "growthEffectOfForexChangesOnCash",
-    "growthNetChangeInCash",
-    "growthCashAtEndOfPeriod",
-    "growthCashAtBeginningOfPeriod",
-    "growthOperatingCashFlow",
-    "growthCapitalExpenditure",
-    "growthFreeCashFlow"
-]
-    key_balance_sheet_growth = [
-        "growthCashAndCashEquivalents",
-        "growthShortTermInvestments",
-        "growthCashAndShortTermInvestments",
-        "growthNetReceivables",
-        "growthInventory",
-        "growthOtherCurrentAssets",
-        "growthTotalCurrentAssets",
-        "growthPropertyPlantEquipmentNet",
-        "growthGoodwill",
-        "growthIntangibleAssets",
-        "growthGoodwillAndIntangibleAssets",
-        "growthLongTermInvestments",
-        "growthTaxAssets",
-        "growthOtherNonCurrentAssets",
-        "growthTotalNonCurrentAssets",
-        "growthOtherAssets",
-        "growthTotalAssets",
-        "growthAccountPayables",
-        "growthShortTermDebt",
-        "growthTaxPayables",
-        "growthDeferredRevenue",
-        "growthOtherCurrentLiabilities",
-        "growthTotalCurrentLiabilities",
-        "growthLongTermDebt",
-        "growthDeferredRevenueNonCurrent",
-        "growthDeferredTaxLiabilitiesNonCurrent",
-        "growthOtherNonCurrentLiabilities",
-        "growthTotalNonCurrentLiabilities",
-        "growthOtherLiabilities",
-        "growthTotalLiabilities",
-        "growthCommonStock",
-        "growthRetainedEarnings",
-        "growthAccumulatedOtherComprehensiveIncomeLoss",
-        "growthOtherTotalStockholdersEquity",
-        "growthTotalStockholdersEquity",
-        "growthTotalLiabilitiesAndStockholdersEquity",
-        "growthTotalInvestments",
-        "growthTotalDebt",
-        "growthNetDebt"
-    ]
-
-    # Process each financial statement
-    statements = [
-        (f"json/financial-statements/ratios/annual/{symbol}.json", key_ratios),
-        (f"json/financial-statements/cash-flow-statement/annual/{symbol}.json", key_cash_flow),
-        (f"json/financial-statements/income-statement/annual/{symbol}.json", key_income),
-        (f"json/financial-statements/balance-sheet-statement/annual/{symbol}.json", key_balance_sheet),
-        (f"json/financial-statements/income-statement-growth/annual/{symbol}.json", key_income_growth),
-        (f"json/financial-statements/balance-sheet-statement-growth/annual/{symbol}.json", key_balance_sheet_growth),
-        (f"json/financial-statements/cash-flow-statement-growth/annual/{symbol}.json", key_cash_flow_growth)
-    ]
-
-    # Process each financial statement
-    for file_path, key_list in statements:
-        item.update(check_and_process(file_path, key_list))
-    
-    try:
-        item['freeCashFlowMargin'] = round((item['freeCashFlow'] / item['revenue']) * 100,2)
-    except:
-        item['freeCashFlowMargin'] = None
-    try:
-        item['earningsYield'] = round((item['eps'] / item['price']) * 100,2)
-    except:
-        item['earningsYield'] = None
-    try:
-        item['freeCashFlowYield'] = round((item['freeCashFlow'] / item['marketCap']) * 100,2)
-    except:
-        item['freeCashFlowYield'] = None
-    try:
-        item['ebitdaMargin'] = round((item['ebitda'] / item['revenue']) * 100,2)
-    except:
-        item['ebitdaMargin'] = None
-    try:
-        item['revenuePerEmployee'] = round((item['revenue'] / item['employees']),2)
-    except:
-        item['revenuePerEmployee'] = None
-    try:
-        item['profitPerEmployee'] = round((item['netIncome'] / item['employees']),2)
-    except:
-        item['profitPerEmployee'] = None
-    try:
-        tax_rate = item['incomeTaxExpense'] / item['incomeBeforeTax'] if item['incomeBeforeTax'] != 0 else 0
-        nopat = item['operatingIncome'] * (1 - tax_rate)
-        invested_capital = item['totalDebt'] + item['totalEquity']
-        item['returnOnInvestedCapital'] = round((nopat / invested_capital)*100,2) if invested_capital != 0 else None
-    except:
-        item['returnOnInvestedCapital'] = None
-    try:
-        item['researchDevelopmentRevenueRatio'] = round((item['researchAndDevelopmentExpenses'] / item['revenue']) * 100,2)
-    except:
-        item['researchDevelopmentRevenueRatio'] = None
-    try:
-        item['shortTermDebtToCapitalization'] = round((item['shortTermDebt'] / item['marketCap']) * 100,1)
-    except:
-        item['shortTermDebtToCapitalization'] = None
-    try:
-        item['interestIncomeToCapitalization'] = round((item['interestIncome'] / item['marketCap']) * 100,1)
-    except:
-        item['interestIncomeToCapitalization'] = None
-
-    try:
-        item['ebit'] = item['operatingIncome']
-        item['operatingMargin'] = round((item['operatingIncome'] / item['revenue']) * 100,2)
-        item['ebitMargin'] = item['operatingMargin']
-    except:
-        item['ebit'] = None
-        item['operatingMargin'] = None
-        item['ebitMargin'] = None
-
-
-    return item
-
-def get_halal_compliant(item, debt_threshold=30, interest_threshold=30, revenue_threshold=5, liquidity_threshold=30, forbidden_industries=None):
-    # Set default forbidden industries if not provided
-    if forbidden_industries is None:
-        forbidden_industries = {'Alcohol', 'Equity', 'Palantir','Holding', 'Acquisition','Tobacco', 'Gambling', 'Weapons', 'Pork', 'Aerospace', 'Defense', 'Asset', 'Banks'}
-
-    # Ensure all required fields are present
-    required_fields = [
-        'longTermDebtToCapitalization', 
-        'shortTermDebtToCapitalization', 
-        'interestIncomeToCapitalization', 
-        'cashAndCashEquivalents',  # Field for liquidity
-        'totalAssets',  # Field for liquidity
-        'name', 
-        'industry',
-        'country',
-    ]
-    for field in required_fields:
-        if field not in item:
-            halal_compliant = None  # In case of missing data
-            return halal_compliant
-
-    # Calculate liquidity ratio
-    liquidity_ratio = (item['cashAndCashEquivalents'] / item['totalAssets']) * 100
-
-    # Apply halal-compliance checks
-    if (item['country'] == 'United States'
-        and item['longTermDebtToCapitalization'] < debt_threshold
-        and item['shortTermDebtToCapitalization'] < debt_threshold
-        and item['interestIncomeToCapitalization'] < interest_threshold
-        and liquidity_ratio < liquidity_threshold  # Liquidity ratio check
-        and not any(sector in item['name'] for sector in forbidden_industries)
-        and not any(industry in item['industry'] for industry in forbidden_industries)):
-
-        halal_compliant = 'Compliant'
-    else:
-        halal_compliant = 'Non-Compliant'
-    return halal_compliant
-
-def get_country_name(country_code):
-    for country in country_list:
-        if country['short'] == country_code:
-            return country['long']
-    return None
-
-def calculate_cagr(start_value, end_value, periods):
-    try:
-        return round(((end_value / start_value) ** (1 / periods) - 1) * 100, 2)
-    except:
-        return None
-
-
 async def get_stock_screener(con):
     #Stock Screener Data
-    cursor = con.cursor()
-    cursor.execute("PRAGMA journal_mode = wal")
-    
-    next_year = datetime.now().year+1
-
-    #Stock Screener Data
-    
-    cursor.execute("SELECT symbol, name, sma_20, sma_50, sma_100, sma_200, ema_20, ema_50, ema_100, ema_200, rsi, atr, stoch_rsi, mfi, cci, beta FROM stocks WHERE symbol NOT LIKE '%.%' AND eps IS NOT NULL AND marketCap IS NOT NULL AND beta IS NOT NULL")
-    raw_data = cursor.fetchall()
-    stock_screener_data = [{
-            'symbol': symbol,
-            'name': name,
-            'sma20': sma_20,
-            'sma50': sma_50,
-            'sma100': sma_100,
-            'sma200': sma_200,
-            'ema20': ema_20,
-            'ema50': ema_50,
-            'ema100': ema_100,
-            'ema200': ema_200,
-            'rsi': rsi,
-            'atr': atr,
-            'stochRSI': stoch_rsi,
-            'mfi': mfi,
-            'cci': cci,
-            'beta': beta,
-        } for (symbol, name, sma_20, sma_50, sma_100, sma_200, ema_20, ema_50, ema_100, ema_200, rsi, atr, stoch_rsi, mfi, cci, beta) in raw_data]
-
-    stock_screener_data = [{k: round(v, 2) if isinstance(v, (int, float)) else v for k, v in entry.items()} for entry in stock_screener_data]
-
-   
-    cursor.execute("SELECT symbol, name,  sma_50, sma_200, ema_50, ema_200, rsi, atr, stoch_rsi, mfi, cci, beta FROM stocks WHERE symbol NOT LIKE '%.%' AND eps IS NOT NULL AND marketCap IS NOT NULL AND beta IS NOT NULL")
-    raw_data = cursor.fetchall()
-
-    # Iterate through stock_screener_data and update 'price' and 'changesPercentage' if symbols match
-    # Add VaR value to stock screener
-    for item in tqdm(stock_screener_data):
-        symbol = item['symbol']
-
-        try:
-            with open(f"json/quote/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['price'] = round(float(res['price']),2)
-                item['changesPercentage'] = round(float(res['changesPercentage']),2)
-                item['avgVolume'] = int(res['avgVolume'])
-                item['volume'] = int(res['volume'])
-                item['relativeVolume'] = round(( item['volume'] / item['avgVolume'] )*100,2)
-                item['pe'] = round(float(res['pe']),2)
-                item['marketCap'] = int(res['marketCap'])
-        except:
-            item['price'] = None
-            item['changesPercentage'] = None
-            item['avgVolume'] = None
-            item['volume'] = None
-            item['relativeVolume'] = None
-            item['pe'] = None
-            item['marketCap'] = None
-
-        calculate_price_changes(symbol, item, con)
-        calculate_share_changes(symbol, item, con)
-        
-
-        try:
-            with open(f"json/stockdeck/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['employees'] = int(res['fullTimeEmployees'])
-                item['sharesOutStanding'] = int(res['sharesOutstanding'])
-                item['country'] = get_country_name(res['country'])
-                item['sector'] = res['sector']
-                item['industry'] = res['industry']
-        except:
-            item['employees'] = None
-            item['sharesOutStanding'] = None
-            item['country'] = None
-            item['sector'] = None
-            item['industry'] = None
-
-        try:
-            with open(f"json/profile/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['isin'] = res['isin']
-        except:
-            item['isin'] = None
-
-        try:
-            with open(f"json/stockdeck/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                data = res['stockSplits'][0]
-                item['lastStockSplit'] = data['date']
-                item['splitType'] = 'forward' if data['numerator'] > data['denominator'] else 'backward'
-                item['splitRatio'] = f"{data['numerator']}"+":"+f"{data['denominator']}"
-        except:
-            item['lastStockSplit'] = None
-            item['splitType'] = None
-            item['splitRatio'] = None
-
-        #Financial Statements
-        item.update(get_financial_statements(item, symbol))
- 
-
-        try:
-            with open(f"json/financial-statements/income-statement/annual/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-            
-            # Ensure there are enough elements in the list
-            if len(res) >= 5:
-                latest_revenue = int(res[0].get('revenue', 0))
-                revenue_3_years_ago = int(res[2].get('revenue', 0))
-                revenue_5_years_ago = int(res[4].get('revenue', 0))
-
-                latest_eps = int(res[0].get('eps', 0))
-                eps_3_years_ago = int(res[2].get('eps', 0))  # eps 3 years ago
-                eps_5_years_ago = int(res[4].get('eps', 0))  # eps 5 years ago
-                
-                item['cagr3YearRevenue'] = calculate_cagr(revenue_3_years_ago, latest_revenue, 3)
-                item['cagr5YearRevenue'] = calculate_cagr(revenue_5_years_ago, latest_revenue, 5)
-                item['cagr3YearEPS'] = calculate_cagr(eps_3_years_ago, latest_eps, 3)
-                item['cagr5YearEPS'] = calculate_cagr(eps_5_years_ago, latest_eps, 5)
-            else:
-                item['cagr3YearRevenue'] = None
-                item['cagr5YearRevenue'] = None
-                item['cagr3YearEPS'] = None
-                item['cagr3YearEPS'] = None
-
-        except (FileNotFoundError, orjson.JSONDecodeError) as e:
-            item['cagr3YearRevenue'] = None
-            item['cagr5YearRevenue'] = None
-            item['cagr3YearEPS'] = None
-            item['cagr5YearEPS'] = None
-
-        try:
-            with open(f"json/var/{symbol}.json", 'r') as file:
-                item['var'] = orjson.loads(file.read())['history'][-1]['var']
-        except:
-            item['var'] = None
-
-        try:
-            with open(f"json/enterprise-values/{symbol}.json", 'r') as file:
-                ev = orjson.loads(file.read())[-1]['enterpriseValue']
-                item['enterpriseValue'] = ev
-                item['evSales'] = round(ev / item['revenue'],2)
-                item['evEarnings'] = round(ev / item['netIncome'],2)
-                item['evEBITDA'] = round(ev / item['ebitda'],2)
-                item['evEBIT'] = round(ev / item['ebit'],2)
-                item['evFCF'] = round(ev / item['freeCashFlow'],2)
-        except:
-            item['enterpriseValue'] = None
-            item['evSales'] = None
-            item['evEarnings'] = None
-            item['evEBITDA'] = None
-            item['evEBIT'] = None
-            item['evFCF'] = None
-
-        try:
-            with open(f"json/analyst/summary/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['analystRating'] = res['consensusRating']
-                item['analystCounter'] = res['numOfAnalyst']
-                item['priceTarget'] = res['medianPriceTarget']
-                item['upside'] = round((item['priceTarget']/item['price']-1)*100, 1) if item['price'] else None
-        except Exception as e:
-            item['analystRating'] = None
-            item['analystCounter'] = None
-            item['priceTarget'] = None
-            item['upside'] = None
-
-        #top analyst rating
-        try:
-            with open(f"json/analyst/history/{symbol}.json") as file:
-                data = orjson.loads(file.read())
-                res_dict = process_top_analyst_data(data, item['price'])
-
-                item['topAnalystCounter'] = res_dict['topAnalystCounter']
-                item['topAnalystPriceTarget'] = res_dict['topAnalystPriceTarget']
-                item['topAnalystUpside'] = res_dict['topAnalystUpside']
-                item['topAnalystRating'] = res_dict['topAnalystRating']
-        except:
-            item['topAnalystCounter'] = None
-            item['topAnalystPriceTarget'] = None
-            item['topAnalystUpside'] = None
-            item['topAnalystRating'] = None
-
-
-
-        try:
-            with open(f"json/fail-to-deliver/companies/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())[-1]
-                item['failToDeliver'] = res['failToDeliver']
-                item['relativeFTD'] = round((item['failToDeliver']/item['avgVolume'] )*100,2)
-        except Exception as e:
-            item['failToDeliver'] = None
-            item['relativeFTD'] = None
-
-        try:
-            with open(f"json/ownership-stats/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                if res['ownershipPercent'] > 100:
-                    item['institutionalOwnership'] = 99.99
-                else:
-                    item['institutionalOwnership'] = round(res['ownershipPercent'],2)
-        except Exception as e:
-            item['institutionalOwnership'] = None
-
-        try:
-            with open(f"json/financial-statements/key-metrics/annual/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())[0]
-                item['revenuePerShare'] = round(res['revenuePerShare'],2)
-                item['netIncomePerShare'] = round(res['netIncomePerShare'],2)
-                item['shareholdersEquityPerShare'] = round(res['shareholdersEquityPerShare'],2)
-                item['interestDebtPerShare'] = round(res['interestDebtPerShare'],2)
-                item['capexPerShare'] = round(res['capexPerShare'],2)
-                item['tangibleAssetValue'] = round(res['tangibleAssetValue'],2)
-                item['returnOnTangibleAssets'] = round(res['returnOnTangibleAssets'],2)
-                item['grahamNumber'] = round(res['grahamNumber'],2)
-
-        except:
-            item['revenuePerShare'] = None
-            item['netIncomePerShare'] = None
-            item['shareholdersEquityPerShare'] = None
-            item['interestDebtPerShare'] = None
-            item['capexPerShare'] = None
-            item['tangibleAssetValue'] = None
-            item['returnOnTangibleAssets'] = None
-            item['grahamNumber'] = None
-
-
-        try:
-            with open(f"json/financial-statements/key-metrics/ttm/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())[0]
-                item['revenueTTM'] = round(res['revenuePerShareTTM']*item['sharesOutStanding'],2)
-                item['netIncomeTTM'] = round(res['netIncomePerShareTTM']*item['sharesOutStanding'],2)
-         
-        except:
-            item['revenueTTM'] = None
-            item['netIncomeTTM'] = None
-            
-
-        try:
-            with open(f"json/ai-score/companies/{symbol}.json", 'r') as file:
-                score = orjson.loads(file.read())['score']
-                
-                if  score == 10:
-                    item['score'] = 'Strong Buy'
-                elif score in [7,8,9]:
-                    item['score'] = 'Buy'
-                elif score in [4,5,6]:
-                    item['score'] = 'Hold'
-                elif score in [2,3]:
-                    item['score'] = 'Sell'
-                elif score == 1:
-                    item['score'] = 'Strong Sell'
-                else:
-                    item['score'] = None
-        except:
-            item['score'] = None
-
-        try:
-            with open(f"json/forward-pe/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                if res['forwardPE'] != 0:
-                    item['forwardPE'] = round(res['forwardPE'],2)
-        except:
-            item['forwardPE'] = None
-
-        try:
-            with open(f"json/financial-score/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['altmanZScore'] = res['altmanZScore']
-                item['piotroskiScore'] = res['piotroskiScore']
-                item['workingCapital'] = res['workingCapital']
-                item['totalAssets'] = res['totalAssets']
-
-        except:
-            item['altmanZScore'] = None
-            item['piotroskiScore'] = None
-            item['workingCapital'] = None
-            item['totalAssets'] = None
-
-        try:
-            with open(f"json/dividends/companies/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['annualDividend'] = round(res['annualDividend'],2)
-                item['dividendYield'] = round(res['dividendYield'],2)
-                item['payoutRatio'] = round(res['payoutRatio'],2)
-                item['dividendGrowth'] = round(res['dividendGrowth'],2)
-        except:
-            item['annualDividend'] = None
-            item['dividendYield'] = None
-            item['payoutRatio'] = None
-            item['dividendGrowth'] = None
-
-        try:
-            with open(f"json/share-statistics/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['sharesShort'] = round(float(res['sharesShort']),2)
-                item['shortRatio'] = round(float(res['shortRatio']),2)
-                item['shortOutStandingPercent'] = round(float(res['shortOutStandingPercent']),2)
-                item['shortFloatPercent'] = round(float(res['shortFloatPercent']),2)
-        except:
-            item['sharesShort'] = None
-            item['shortRatio'] = None
-            item['shortOutStandingPercent'] = None
-            item['shortFloatPercent'] = None
-
-        try:
-            with open(f"json/options-stats/companies/{symbol}.json", "r") as file:
-                res = orjson.loads(file.read())
-                item['gexRatio'] = res['gex_ratio']
-                item['ivRank'] = res['iv_rank']
-                item['iv30d'] = res['iv30d']
-                item['totalOI'] = res['total_open_interest']
-                item['changeOI'] = res['open_interest_change']
-                item['netCallPrem'] = res['net_call_premium']
-                item['netPutPrem'] = res['net_put_premium']
-                item['callVolume'] = res['call_volume']
-                item['putVolume'] = res['put_volume']
-                item['pcRatio'] = res['put_call_ratio']
-                item['totalPrem'] = res['call_premium']+res['put_premium']
-        except:
-            item['gexRatio'] = None
-            item['ivRank'] = None
-            item['iv30d'] = None
-            item['totalOI'] = None
-            item['changeOI'] = None
-            item['netCallPrem'] = None
-            item['netPutPrem'] = None
-            item['callVolume'] = None
-            item['putVolume'] = None
-            item['pcRatio'] = None
-            item['totalPrem'] = None
-
-
-        try:
-            with open(f"json/analyst-estimate/{symbol}.json", 'r') as file:
-                res = orjson.loads(file.read())
-                item['forwardPS'] = None
-                item['peg'] = None
-                for analyst_item in res:
-                    if analyst_item['date'] == next_year and item['marketCap'] > 0 and analyst_item['estimatedRevenueAvg'] > 0:
-                        # Calculate forwardPS: marketCap / estimatedRevenueAvg
-                        item['forwardPS'] = round(item['marketCap'] / analyst_item['estimatedRevenueAvg'], 1)
-                        if item['eps'] > 0:
-                            cagr = ((analyst_item['estimatedEpsHigh']/item['eps'] ) -1)*100
-                            item['peg'] = round(item['priceEarningsRatio'] / cagr,2) if cagr > 0 else None
-                        break  # Exit the loop once the desired item is found
-        except:
-            item['forwardPS'] = None
-            item['peg'] = None
- 
-        try:
-            item['halalStocks'] = get_halal_compliant(item)
-        except:
-            item['halalStocks'] = None
-
-        try:
-            with open(f"json/financial-statements/income-statement/annual/{symbol}.json", "r") as file:
-                financial_data = orjson.loads(file.read())
-                item['revenueGrowthYears'] = count_consecutive_growth_years(financial_data, "revenue")
-                item['epsGrowthYears'] = count_consecutive_growth_years(financial_data, 'eps')
-                item['netIncomeGrowthYears'] = count_consecutive_growth_years(financial_data, 'netIncome')
-                item['grossProfitGrowthYears'] = count_consecutive_growth_years(financial_data, 'grossProfit')
-        except:
-            item['revenueGrowthYears'] = None
-            item['epsGrowthYears'] = None
-            item['netIncomeGrowthYears'] = None
-            item['grossProfitGrowthYears'] = None
-
-    for item in stock_screener_data:
-        for key, value in item.items():
-            if isinstance(value, float):
-                if math.isnan(value) or math.isinf(value):
-                    item[key] = None
-                    print(key)
-
-    return stock_screener_data
+    return build_screener_table(con)
 
 
 async def get_dividends_calendar(con,symbols):
@@ -1140,12 +215,11 @@ async def get_earnings_calendar(con, stock_symbols):
     for item in res_list:
         symbol = item.get('symbol')
         try:
-            with open(f"json/quote/{symbol}.json", 'r') as file:
-                quote = ujson.load(file)
-                try:
-                    earnings_date = datetime.strptime(quote['earningsAnnouncement'].split('T')[0], '%Y-%m-%d').strftime('%Y-%m-%d')
-                except:
-                    earnings_date = '-'
+            quote = read_quote(symbol, quote_store)
+            try:
+                earnings_date = datetime.strptime(quote['earningsAnnouncement'].split('T')[0], '%Y-%m-%d').strftime('%Y-%m-%d')
+            except:
+                earnings_date = '-'
         except Exception as e:
             earnings_date = '-'
             print(e)
@@ -1815,8 +889,7 @@ async def get_ipo_calendar(con, symbols):
     for entry in combined_data:
         try:
             symbol = entry['symbol']
-            with open(f"json/quote/{symbol}.json","r") as file:
-                quote_data = ujson.load(file)
+            quote_data = read_quote(symbol, quote_store)
             
             entry['currentPrice'] = quote_data.get('price',None)
             df =  pd.read_sql_query(query_open_price.format(ticker = entry['symbol']), con)
@@ -1856,9 +929,8 @@ async def save_json_files():
 
 
     
-    stock_screener_data = await get_stock_screener(con)
-    with open(f"json/stock-screener/data.json", 'w') as file:
-        ujson.dump(stock_screener_data, file)
+    stock_screener_table = await get_stock_screener(con)
+    save_screener_table(stock_screener_table)
 
     data = await get_ipo_calendar(con, symbols)
     with open(f"json/ipo-calendar/data.json", 'w') as file:
@@ -13,52 +13,45 @@ import pytz
 import sqlite3
 import pandas as pd
 import numpy as np
-import threading  # Import threading module for parallel execution
+from utils.job_runner import Job, JobRunner
 
 
 berlin_tz = pytz.timezone('Europe/Berlin')
 
-# Set the system's timezone to Berlin at the beginning
-subprocess.run(["timedatectl", "set-timezone", "Europe/Berlin"])
+RESTART_SERVERS = [["pm2", "restart", "fastapi"], ["pm2", "restart", "fastify"], ["pm2", "restart", "websocket"]]
 
 
-def run_pocketbase():
-    # Run the asynchronous function inside an asyncio loop
-    subprocess.run(["python3", "cron_pocketbase.py"])
-    
-def run_restart_cache():
-    #update db daily
-    week = datetime.today().weekday()
-    if week <= 5:
-        subprocess.run(["pm2", "restart","fastapi"])
-        subprocess.run(["pm2", "restart","fastify"])
-        subprocess.run(["pm2", "restart","websocket"])
+def weekdays(last=4):
+    return lambda: datetime.today().weekday() <= last
 
-        
-def run_json_job():
-    # Run the asynchronous function inside an asyncio loop
-    subprocess.run(["python3", "restart_json.py"])
-    subprocess.run(["pm2", "restart","fastapi"])
-    subprocess.run(["pm2", "restart","fastify"])
-    subprocess.run(["pm2", "restart","websocket"])
+
+def build_jobs():
+    return [
+        Job('pocketbase', 'cron_pocketbase.py', trigger=schedule.every().day.at("06:30")),
+        #update db daily
+        Job('restart_cache', command=RESTART_SERVERS, trigger=[schedule.every().day.at("15:31"), schedule.every().day.at("23:00")], when=weekdays(5)),
+        Job('json', 'restart_json.py', trigger=schedule.every(2).hours),
+        Job('restart_servers', command=RESTART_SERVERS, upstream=['json']),
+    ]
+
+
+price_alert_process = None
 
 def run_cron_price_alert():
-    week = datetime.today().weekday()
-    if week <= 4:
-        subprocess.run(["python3", "cron_price_alert.py"])
+    # cron_price_alert.py is a long-running engine, (re)start it if it exited
+    global price_alert_process
+    if price_alert_process is None or price_alert_process.poll() is not None:
+        price_alert_process = subprocess.Popen(["python3", "cron_price_alert.py"])
 
-# Create functions to run each schedule in a separate thread
-def run_threaded(job_func):
-    job_thread = threading.Thread(target=job_func)
-    job_thread.start()
 
+if __name__ == "__main__":
+    # Set the system's timezone to Berlin at the beginning
+    subprocess.run(["timedatectl", "set-timezone", "Europe/Berlin"])
 
-schedule.every().day.at("06:30").do(run_threaded, run_pocketbase).tag('pocketbase_job')
-schedule.every().day.at("15:31").do(run_threaded, run_restart_cache)
-schedule.every().day.at("23:00").do(run_threaded, run_restart_cache)
-schedule.every(2).hours.do(run_threaded, run_json_job).tag('json_job')
-schedule.every(1).minutes.do(run_threaded, run_cron_price_alert).tag('price_alert_job')
+    runner = JobRunner(build_jobs())
+    runner.schedule()
+    schedule.every(1).minutes.do(run_cron_price_alert).tag('price_alert_job')
 
-while True:
-    schedule.run_pending()
-    time.sleep(3)
\ No newline at end of file
+    while True:
+        schedule.run_pending()
+        time.sleep(3)
@@ -10,6 +10,7 @@ import os
 from dotenv import load_dotenv
 import seaborn as sns
 import sqlite3
+from utils.options_greeks import option_greeks
 
 def calculate_volatility(prices_df):
     prices_df = prices_df.sort_values(by='date')
@@ -85,33 +86,6 @@ ticker_data = [
 
 print(len(ticker_data))
 
-def calculate_option_greeks(S, K, T, r, sigma, option_type='CALL'):
-    """
-    Calculate option Greeks using Black-Scholes formula with improved accuracy
-    S: Current stock price
-    K: Strike price
-    T: Time to expiration (in years)
-    r: Risk-free rate
-    sigma: Volatility
-    """
-    if T <= 0 or sigma <= 0 or S <= 0:
-        return 0, 0
-    
-    try:
-        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        if option_type == 'CALL':
-            delta = norm.cdf(d1)
-            gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-        else:  # PUT
-            delta = -norm.cdf(-d1)
-            gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-            
-        return delta, gamma
-    except:
-        return 0, 0
-
 def process_options_data_by_expiry(df):
     """
     Process options data with separate calculations for each expiration date
@@ -131,17 +105,10 @@ def process_options_data_by_expiry(df):
     # Use current risk-free rate
     risk_free_rate = 0.0525
     
-    # Calculate Greeks for each option
-    greeks = df.apply(lambda row: calculate_option_greeks(
-        row['underlying_price'],
-        row['strike_price'],
-        row['T'],
-        risk_free_rate,
-        volatility,
-        row['put_call']
-    ), axis=1)
+    # Greeks of all options at once (utils/options_greeks.py)
+    greeks = option_greeks(df['underlying_price'], df['strike_price'], df['T'], volatility, df['put_call'] == 'CALL', risk_free_rate)
     
-    df['delta'], df['gamma'] = zip(*greeks)
+    df['delta'], df['gamma'] = greeks['delta'], greeks['gamma']
     
     # Calculate exposures
     contract_multiplier = 100
@@ -12,33 +12,43 @@ import concurrent.futures
 import json
 from tqdm import tqdm
 
+from utils.feature_store import compute_indicators, open_feature_stores, align_features
+from utils.price_store import open_stores
+
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value encountered in scalar divide")
 
 #This is for the stock screener
 
 class TASignals:
+    FEATURES = ['sma_20', 'sma_50', 'sma_100', 'sma_200', 'ema_20', 'ema_50', 'rsi_14', 'stoch_rsi_k_14', 'atr_14', 'cci_20', 'mfi_14']
 
-    def __init__(self,data):
+    def __init__(self,data, features=None):
 
         self.data = data
+        # Canonical indicators row-aligned with data, e.g. from the feature store
+        self.features = features
 
     def run(self):
+        features = self.features
+        if features is None:
+            features = compute_indicators(self.data.rename(columns=str.lower), self.FEATURES)
+
         ta_df = pd.DataFrame()
 
-        ta_df['sma_20'] = sma_indicator(self.data["Close"], window=20)
-        ta_df['sma_50'] = sma_indicator(self.data["Close"], window=50)
-        ta_df['sma_100'] = sma_indicator(self.data["Close"], window=100)
-        ta_df['sma_200'] = sma_indicator(self.data["Close"], window=200)
-        ta_df['ema_20'] = ema_indicator(self.data['Close'], window=20)
-        ta_df['ema_50'] = ema_indicator(self.data['Close'], window=50)
-        ta_df['ema_100'] = sma_indicator(self.data["Close"], window=100)
-        ta_df['ema_200'] = sma_indicator(self.data['Close'], window=200)
-        ta_df['rsi'] = rsi(self.data['Close'], window=14)
-        ta_df['stoch_rsi'] = stochrsi_k(self.data['Close'], window=14, smooth1 = 3, smooth2 =3)*100
-        ta_df['atr'] = AverageTrueRange(self.data['High'], self.data['Low'], self.data['Close'], window=14).average_true_range()
-        ta_df['cci'] = CCIIndicator(high=self.data['High'], low=self.data['Low'], close=self.data['Close']).cci()
-        ta_df['mfi'] = MFIIndicator(high=self.data['High'], low=self.data['Low'], close=self.data['Close'], volume=self.data['Volume']).money_flow_index()
+        ta_df['sma_20'] = features['sma_20']
+        ta_df['sma_50'] = features['sma_50']
+        ta_df['sma_100'] = features['sma_100']
+        ta_df['sma_200'] = features['sma_200']
+        ta_df['ema_20'] = features['ema_20']
+        ta_df['ema_50'] = features['ema_50']
+        ta_df['ema_100'] = features['sma_100']
+        ta_df['ema_200'] = features['sma_200']
+        ta_df['rsi'] = features['rsi_14']
+        ta_df['stoch_rsi'] = np.asarray(features['stoch_rsi_k_14'])*100
+        ta_df['atr'] = features['atr_14']
+        ta_df['cci'] = features['cci_20']
+        ta_df['mfi'] = features['mfi_14']
 
 
         last_values = {col: [round(ta_df[col].iloc[-1],2)] for col in ta_df.columns} if not ta_df.empty else None
@@ -89,16 +99,20 @@ def process_symbol(ticker):
                 date BETWEEN ? AND ?
         """
 
-        query = query_template.format(ticker=ticker)
-        df = pd.read_sql_query(query, con, params=(start_date, end_date))
+        if price_store is not None and ticker in price_store:
+            df = price_store.frame(ticker, start_date, end_date)
+        else:
+            query = query_template.format(ticker=ticker)
+            df = pd.read_sql_query(query, con, params=(start_date, end_date))
 
 
         if not df.empty:
+            features = align_features(feature_stores, ticker, df['date'], TASignals.FEATURES, df['close'])
             df = df.rename(columns={"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"})
 
             df['date'] = pd.to_datetime(df['date'])
             df = df.set_index('date')
-            ta_df = TASignals(df).run()
+            ta_df = TASignals(df, features).run()
         else:
             ta_df = []
 
@@ -118,6 +132,11 @@ symbols = [symbol[0] for symbol in symbol_cursor.fetchall()]
 start_date = datetime(2022, 1, 1)
 end_date = datetime.today()
 
+# OHLCV and indicators come from the daily price/feature stores when they
+# have the symbol, the sqlite table is only the fallback
+price_store = open_stores().get('stocks.db')
+feature_stores = open_feature_stores()
+
 
 if __name__ == '__main__': 
     # Number of concurrent workers
@@ -12,6 +12,10 @@ import json
 from tqdm import tqdm
 
 import argparse
+
+from utils.feature_store import compute_indicators, open_feature_stores, align_features
+from utils.price_store import open_stores
+
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning, message="invalid value encountered in scalar divide")
 
@@ -79,32 +83,22 @@ class MyStrategy(Strategy):
            
 
 class TradingSignals:
-
-    def __init__(self,data):
-        data['sm_5'] = sma_indicator(data["Close"], window=5)
-        data['sm_20'] = sma_indicator(data["Close"], window=20)
-
-        # Calculate MACD and its signal line
-        data['macd'] = macd(data["Close"], window_slow=26, window_fast=12)
-        data['signal_line'] = macd_signal(data["Close"], window_slow=26, window_fast=12)
-
-        data['ema_10'] = ema_indicator(data['Close'], window=5)
-        data['ema_50'] = sma_indicator(data['Close'], window=20)
-
-        data['rsi'] = rsi(data['Close'], window=14)
-        aroon = AroonIndicator(data['Close'], low=data['Low'], window=14)
-        data['aroon_up'] = aroon.aroon_up()
-        data['aroon_down'] = aroon.aroon_down()
-        data['bb_middle'] = BollingerBands(close=data["Close"], window=20, window_dev=2).bollinger_mavg()
-
-        data['roc'] = roc(data['Close'], window=14)
-
-        data['williams'] = WilliamsRIndicator(high=data['High'], low=data['Low'], close=data['Close']).williams_r()
-        data['stoch_rsi'] = StochRSIIndicator(close=data['Close']).stochrsi()
-
-        data['adx_ind'] = adx(data['High'],data['Low'],data['Close'])
-        data['adx_pos_ind'] = adx_pos(data['High'], data['Low'], data['Close'])
-        data['adx_neg_ind'] = adx_neg(data['High'], data['Low'], data['Close'])
+    # strategy column -> canonical indicator of utils.feature_store
+    FEATURES = {
+        'sm_5': 'sma_5', 'sm_20': 'sma_20', 'macd': 'macd', 'signal_line': 'macd_signal',
+        'ema_10': 'ema_5', 'ema_50': 'sma_20', 'rsi': 'rsi_14', 'aroon_up': 'aroon_up_14', 'aroon_down': 'aroon_down_14',
+        'bb_middle': 'sma_20', 'roc': 'roc_14', 'williams': 'williams_14', 'stoch_rsi': 'stoch_rsi_14',
+        'adx_ind': 'adx_14', 'adx_pos_ind': 'adx_pos_14', 'adx_neg_ind': 'adx_neg_14',
+    }
+    FEATURE_INPUTS = list(dict.fromkeys(FEATURES.values()))
+
+    def __init__(self,data, features=None):
+        # `features` are the FEATURE_INPUTS indicators row-aligned with data (FeatureStore.align)
+        if features is None:
+            features = compute_indicators(data.rename(columns=str.lower), self.FEATURE_INPUTS)
+
+        for column, name in self.FEATURES.items():
+            data[column] = np.asarray(features[name])
 
         self.data = data
 
@@ -270,16 +264,20 @@ def process_symbol(ticker):
                 date BETWEEN ? AND ?
         """
 
-        query = query_template.format(ticker=ticker)
-        df = pd.read_sql_query(query, con, params=(start_date, end_date))
+        if price_store is not None and ticker in price_store:
+            df = price_store.frame(ticker, start_date, end_date, fields=['date', 'open', 'high', 'low', 'close'])
+        else:
+            query = query_template.format(ticker=ticker)
+            df = pd.read_sql_query(query, con, params=(start_date, end_date))
 
 
         if not df.empty:
+            features = align_features(feature_stores, ticker, df['date'], TradingSignals.FEATURE_INPUTS, df['close'])
             df = df.rename(columns={"open": "Open", "high": "High", "low": "Low", "close": "Close"})
 
             df['date'] = pd.to_datetime(df['date'])
             df = df.set_index('date')
-            res = TradingSignals(df).run()
+            res = TradingSignals(df, features).run()
         else:
             res = []
 
@@ -302,6 +300,9 @@ symbols = [symbol[0] for symbol in symbol_cursor.fetchall()]
 start_date = datetime(1970, 1, 1)
 end_date = datetime.today()
 
+price_store = open_stores().get(f'{db_name}.db')
+feature_stores = open_feature_stores()
+
 # Number of concurrent workers
 num_processes = 4 # You can adjust this based on your system's capabilities
 futures = []
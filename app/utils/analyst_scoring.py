@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+
+BUY_RATINGS = ['Outperform', 'Overweight', 'Market Outperform', 'Buy', 'Positive', 'Sector Outperform']
+SELL_RATINGS = ['Negative', 'Underperform', 'Underweight', 'Reduce', 'Sell']
+
+# A rating on a day without a close is priced at the latest close up to this
+# many calendar days before it
+ENTRY_LOOKBACK_DAYS = 4
+# Composite (ticker, day) keys: days since the window start fit in 20 bits
+DAY_BITS = 20
+
+
+def _days(dates):
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+class CloseIndex:
+    """
+    Daily closes of many tickers in one array sorted by (ticker, date), so
+    the close of any number of (ticker, day) pairs is one searchsorted.
+    """
+
+    def __init__(self, tickers, dates, closes, start):
+        self.tickers = list(tickers)
+        self.code = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.base = int(_days([start])[0])
+        lengths = np.array([len(values) for values in dates], dtype=np.int64)
+        self.days = np.concatenate([_days(values) for values in dates]) if len(dates) else np.empty(0, dtype=np.int64)
+        self.close = np.concatenate([np.asarray(values, dtype=np.float64) for values in closes]) if len(closes) else np.empty(0)
+        self.owner = np.repeat(np.arange(len(self.tickers), dtype=np.int64), lengths)
+        self.keys = self._key(self.owner, self.days)
+        # Last bar of each ticker, -1 for tickers without any
+        self.last = np.where(lengths > 0, np.cumsum(lengths) - 1, -1)
+
+    def _key(self, codes, days):
+        return (codes << DAY_BITS) + (days - self.base)
+
+    @classmethod
+    def from_store(cls, store, tickers, start, end):
+        """
+        From a utils.price_store.PriceStore; tickers it doesn't have get no
+        bars.
+        """
+        tickers = list(tickers)
+        data = [store.get(ticker, start, end, fields=['date', 'close']) if ticker in store else None for ticker in tickers]
+        return cls(tickers,
+                   [item['date'] if item else np.empty(0, dtype='datetime64[D]') for item in data],
+                   [item['close'] if item else np.empty(0) for item in data], start)
+
+    @classmethod
+    def from_sqlite(cls, con, tickers, start, end):
+        """
+        From the one-table-per-ticker stocks.db, when no price store has been
+        built yet.
+        """
+        tickers = list(tickers)
+        dates, closes = [], []
+        for ticker in tickers:
+            try:
+                df = pd.read_sql_query(f'SELECT date, close FROM "{ticker}" WHERE date BETWEEN ? AND ? ORDER BY date',
+                                       con, params=(start, end))
+                df = df.drop_duplicates('date')
+                dates.append(df['date'].str[:10].to_numpy(dtype='datetime64[D]'))
+                closes.append(pd.to_numeric(df['close'], errors='coerce').to_numpy(dtype=np.float64))
+            except Exception:
+                dates.append(np.empty(0, dtype='datetime64[D]'))
+                closes.append(np.empty(0))
+        return cls(tickers, dates, closes, start)
+
+    def codes(self, tickers):
+        return np.array([self.code.get(ticker, -1) for ticker in tickers], dtype=np.int64)
+
+    def entry(self, codes, dates, lookback=ENTRY_LOOKBACK_DAYS):
+        """
+        Close on each date, or on the latest day with a close at most
+        `lookback` days before it; NaN when there is none.
+        """
+        if not len(self.keys):
+            return np.full(len(codes), np.nan), np.zeros(len(codes), dtype=bool)
+        days = _days(dates)
+        pos = np.searchsorted(self.keys, self._key(codes, days), side='right') - 1
+        safe = np.maximum(pos, 0)
+        found = (codes >= 0) & (pos >= 0) & (self.owner[safe] == codes) & (self.days[safe] >= days - lookback)
+        return np.where(found, self.close[safe], np.nan), found
+
+    def exact_or_last(self, codes, dates):
+        """
+        Close on exactly each date, the ticker's last close when that day has
+        none; NaN for tickers without closes.
+        """
+        if not len(self.keys):
+            return np.full(len(codes), np.nan)
+        keys = self._key(codes, _days(dates))
+        pos = np.minimum(np.searchsorted(self.keys, keys, side='left'), len(self.keys) - 1)
+        exact = (codes >= 0) & (self.keys[pos] == keys)
+        pos = np.where(exact, pos, self.last[np.maximum(codes, 0)])
+        pos = np.where(codes >= 0, pos, -1)
+        return np.where(pos >= 0, self.close[np.maximum(pos, 0)], np.nan)
+
+
+def add_months(dates, months):
+    """
+    `dates` shifted by whole months, the day clamped to the end of shorter
+    months (as pd.DateOffset(months=...)).
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    month = dates.astype('datetime64[M]')
+    day_of_month = dates - month.astype('datetime64[D]')
+    target = month + months
+    return np.minimum(target.astype('datetime64[D]') + day_of_month, (target + 1).astype('datetime64[D]') - 1)
+
+
+def rating_table(analysts):
+    """
+    One row per buy or sell rating of every analyst: analyst position in
+    `analysts`, ticker, date and side. Neutral ratings are left out, as are
+    ratings with a missing field or a bad date.
+    """
+    buy, sell = set(BUY_RATINGS), set(SELL_RATINGS)
+    owner, tickers, dates, is_buy = [], [], [], []
+    for i, analyst in enumerate(analysts):
+        for rating in analyst.get('ratingsList') or []:
+            try:
+                ticker, date, current = rating['ticker'], rating['date'], rating['rating_current']
+            except (KeyError, TypeError):
+                continue
+            if current not in buy and current not in sell:
+                continue
+            owner.append(i)
+            tickers.append(ticker)
+            dates.append(date)
+            is_buy.append(current in buy)
+    parsed = pd.to_datetime(pd.Series(dates, dtype=object), format='%Y-%m-%d', errors='coerce')
+    valid = parsed.notna().to_numpy()
+    return {
+        'analyst': np.array(owner, dtype=np.int64)[valid],
+        'ticker': np.array(tickers, dtype=object)[valid],
+        'date': parsed.to_numpy()[valid].astype('datetime64[D]'),
+        'is_buy': np.array(is_buy, dtype=bool)[valid],
+    }
+
+
+def analyst_returns(analysts, closes, table=None, months=12):
+    """
+    Average return and success rate (in %) of every analyst's buy and sell
+    ratings, held `months` months (or until the latest close when the exit
+    day has no close), all ratings of all analysts at once.
+
+    Returns (avg_return, success_rate, scored) arrays aligned with
+    `analysts`; analysts without a priced rating get 0 and 0.
+    """
+    table = table if table is not None else rating_table(analysts)
+    codes = closes.codes(table['ticker'])
+    entry, found = closes.entry(codes, table['date'])
+    exit = closes.exact_or_last(codes, add_months(table['date'], months))
+
+    analyst = table['analyst'][found]
+    entry, exit, is_buy = entry[found], exit[found], table['is_buy'][found]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = (exit - entry) / entry
+    success = np.where(is_buy, exit > entry, exit < entry)
+
+    size = len(analysts)
+    scored = np.bincount(analyst, minlength=size)
+    total = np.bincount(analyst, weights=returns, minlength=size)
+    wins = np.bincount(analyst, weights=success, minlength=size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_return = np.where(scored > 0, total / np.maximum(scored, 1) * 100, 0.0)
+        success_rate = np.where(scored > 0, wins / np.maximum(scored, 1) * 100, 0.0)
+    return avg_return, success_rate, scored
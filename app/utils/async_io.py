@@ -0,0 +1,81 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
+
+# Bounded pool for the blocking open()/read() calls of the API handlers, so a
+# slow disk never stalls the event loop and never spawns unbounded threads.
+FILE_IO_WORKERS = int(os.getenv('FILE_IO_WORKERS', 16))
+file_executor = ThreadPoolExecutor(max_workers=FILE_IO_WORKERS, thread_name_prefix='file-io')
+
+
+def _read_bytes(file_path):
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+
+async def read_bytes(file_path):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(file_executor, _read_bytes, file_path)
+
+
+async def read_json(file_path):
+    """
+    Non-blocking `orjson.loads(open(file_path, 'rb').read())`. Raises the
+    same exceptions, so existing try/except fallbacks keep working.
+    """
+    return orjson.loads(await read_bytes(file_path))
+
+
+async def _read_json_or_none(file_path):
+    try:
+        return await read_json(file_path)
+    except Exception:
+        return None
+
+
+async def load_json_cached(cache, file_path):
+    """
+    Read a json file through a utils.cache.TwoTierCache: cached copy if
+    present, otherwise read it from disk and cache it with the TTL of its
+    namespace. Returns None on a missing or invalid file.
+    """
+    cached_data = await cache.get(file_path)
+    if cached_data:
+        return orjson.loads(cached_data)
+
+    data = await _read_json_or_none(file_path)
+    if data is not None:
+        await cache.set(file_path, orjson.dumps(data))
+    return data
+
+
+async def load_json_many(cache, file_paths):
+    """
+    Batched load_json_cached: one MGET for all paths, concurrent reads of
+    the misses on the file pool and one pipelined write-back.
+    Returns {file_path: data or None}.
+    """
+    file_paths = list(dict.fromkeys(file_paths))
+    if not file_paths:
+        return {}
+
+    res = {}
+    missing = []
+    for file_path, cached_data in zip(file_paths, await cache.mget(file_paths)):
+        if cached_data:
+            res[file_path] = orjson.loads(cached_data)
+        else:
+            missing.append(file_path)
+
+    if missing:
+        loaded = await asyncio.gather(*[_read_json_or_none(file_path) for file_path in missing])
+        res.update(zip(missing, loaded))
+        await cache.set_many({
+            file_path: orjson.dumps(data)
+            for file_path, data in zip(missing, loaded) if data is not None
+        })
+
+    return res
@@ -0,0 +1,204 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import orjson
+
+
+BAR_STORE_PATH = 'json/export/bars'
+# One fixed-width record per bar, sorted by timestamp (seconds of the
+# provider's wall-clock "YYYY-MM-DD HH:MM:SS", unique per file)
+BAR_DTYPE = np.dtype([('ts', '<i8'), ('open', '<f8'), ('low', '<f8'), ('high', '<f8'), ('close', '<f8'), ('volume', '<i8')])
+FIELDS = ['open', 'low', 'high', 'close', 'volume']
+# Records formatted per chunk of a streamed export
+EXPORT_CHUNK = 5000
+
+
+def to_timestamps(dates):
+    return np.asarray([str(date)[:19] for date in dates], dtype='datetime64[s]').astype(np.int64)
+
+
+def to_dates(timestamps):
+    return np.datetime_as_string(np.asarray(timestamps, dtype='datetime64[s]'), unit='s').astype(object)
+
+
+def bars_to_records(bars):
+    """
+    Provider bars ({date, open, low, high, close, volume}) as records sorted
+    by timestamp, one per timestamp (the last one given wins).
+    """
+    bars = [bar for bar in bars if bar.get('date')]
+    records = np.zeros(len(bars), dtype=BAR_DTYPE)
+    if not bars:
+        return records
+    records['ts'] = to_timestamps([bar['date'] for bar in bars])
+    for name in FIELDS:
+        records[name] = [bar.get(name) or 0 for bar in bars]
+    # Stable sort, then keep the last of each run of equal timestamps
+    records = records[np.argsort(records['ts'], kind='stable')]
+    last = np.append(records['ts'][1:] != records['ts'][:-1], True)
+    return records[last]
+
+
+def _rows(records):
+    dates = to_dates(records['ts'])
+    columns = [records[name].tolist() for name in FIELDS]
+    return dates, columns
+
+
+def records_to_bars(records):
+    dates, (opens, lows, highs, closes, volumes) = _rows(records)
+    return [{'date': date.replace('T', ' '), 'open': o, 'low': l, 'high': h, 'close': c, 'volume': v}
+            for date, o, l, h, c, v in zip(dates, opens, lows, highs, closes, volumes)]
+
+
+class BarStore:
+    """
+    Append-only intraday bars, one binary file of BAR_DTYPE records per
+    symbol and interval ({path}/{interval}/{symbol}.bin), with a small
+    index of each file's record count and last timestamp
+    ({path}/{interval}/index.json).
+
+    Appending bars newer than the last one writes only the new records; bars
+    at or before it (a restated or overlapping window) rewrite the file from
+    the first one they touch, so timestamps stay sorted and unique. Reads
+    binary search the memory-mapped file.
+    """
+
+    def __init__(self, path=BAR_STORE_PATH):
+        self.path = path
+        self.indexes = {}
+
+    def _file(self, interval, symbol):
+        return os.path.join(self.path, interval, f"{symbol}.bin")
+
+    def index(self, interval):
+        if interval not in self.indexes:
+            try:
+                with open(os.path.join(self.path, interval, 'index.json'), 'rb') as file:
+                    self.indexes[interval] = orjson.loads(file.read())
+            except (OSError, ValueError):
+                self.indexes[interval] = {}
+        return self.indexes[interval]
+
+    def save_index(self, interval):
+        index_path = os.path.join(self.path, interval, 'index.json')
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        tmp = index_path + '.tmp'
+        with open(tmp, 'wb') as file:
+            file.write(orjson.dumps(self.index(interval)))
+        os.replace(tmp, index_path)
+
+    def _state(self, interval, symbol, repair=False):
+        """
+        (count, last timestamp) of a file. The index is trusted when it
+        matches the file size; otherwise (an append since it was loaded, or
+        a crash before the index save) the file's own last record is used.
+        A partially written record is ignored, and cut off when `repair`.
+        """
+        file_path = self._file(interval, symbol)
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return 0, None
+        count = size // BAR_DTYPE.itemsize
+        entry = self.index(interval).get(symbol)
+        if entry and entry[0] == count and size == count * BAR_DTYPE.itemsize:
+            return count, entry[1]
+        if repair and size != count * BAR_DTYPE.itemsize:
+            os.truncate(file_path, count * BAR_DTYPE.itemsize)
+        if count == 0:
+            return 0, None
+        with open(file_path, 'rb') as file:
+            file.seek((count - 1) * BAR_DTYPE.itemsize)
+            return count, int(np.frombuffer(file.read(BAR_DTYPE.itemsize), dtype=BAR_DTYPE)['ts'][0])
+
+    def last_date(self, interval, symbol):
+        """
+        Datetime of the latest stored bar, None when there is none.
+        """
+        _, last = self._state(interval, symbol)
+        return None if last is None else datetime.utcfromtimestamp(last)
+
+    def append(self, interval, symbol, bars, save_index=True):
+        """
+        Store provider bars; returns the number of records written.
+        """
+        records = bars_to_records(bars)
+        if not len(records):
+            return 0
+        file_path = self._file(interval, symbol)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        count, last = self._state(interval, symbol, repair=True)
+
+        if last is None or records['ts'][0] > last:
+            with open(file_path, 'ab') as file:
+                file.write(records.tobytes())
+            count += len(records)
+            written = len(records)
+        else:
+            # Merge with the stored tail from the first timestamp touched
+            stored = np.memmap(file_path, dtype=BAR_DTYPE, mode='r', shape=(count,))
+            start = int(np.searchsorted(stored['ts'], records['ts'][0], side='left'))
+            tail = np.array(stored[start:])
+            del stored
+            merged = np.concatenate([tail, records])
+            merged = merged[np.argsort(merged['ts'], kind='stable')]
+            merged = merged[np.append(merged['ts'][1:] != merged['ts'][:-1], True)]
+            with open(file_path, 'r+b') as file:
+                file.seek(start * BAR_DTYPE.itemsize)
+                file.write(merged.tobytes())
+                file.truncate()
+            count = start + len(merged)
+            written = len(merged)
+
+        with open(file_path, 'rb') as file:
+            file.seek((count - 1) * BAR_DTYPE.itemsize)
+            last = int(np.frombuffer(file.read(BAR_DTYPE.itemsize), dtype=BAR_DTYPE)['ts'][0])
+        self.index(interval)[symbol] = [count, last]
+        if save_index:
+            self.save_index(interval)
+        return written
+
+    def read(self, interval, symbol, start=None, end=None):
+        """
+        Records with start <= date <= end (datetimes or date strings), a
+        copy-free view of the mapped file when possible.
+        """
+        count, _ = self._state(interval, symbol)
+        if count == 0:
+            return np.zeros(0, dtype=BAR_DTYPE)
+        records = np.memmap(self._file(interval, symbol), dtype=BAR_DTYPE, mode='r', shape=(count,))
+        lo, hi = 0, count
+        if start is not None:
+            lo = int(np.searchsorted(records['ts'], to_timestamps([start])[0], side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(records['ts'], to_timestamps([end])[0], side='right'))
+        return records[lo:hi]
+
+    def __contains__(self, key):
+        interval, symbol = key
+        return os.path.exists(self._file(interval, symbol))
+
+    def iter_json(self, interval, symbol, start=None, end=None, chunk=EXPORT_CHUNK):
+        """
+        The bars as a JSON array, in byte chunks of `chunk` records.
+        """
+        records = self.read(interval, symbol, start, end)
+        yield b'['
+        for lo in range(0, len(records), chunk):
+            body = orjson.dumps(records_to_bars(records[lo:lo + chunk]))[1:-1]
+            yield body if lo == 0 else b',' + body
+        yield b']'
+
+    def iter_csv(self, interval, symbol, start=None, end=None, chunk=EXPORT_CHUNK):
+        """
+        The bars as CSV (date,open,low,high,close,volume), in byte chunks of
+        `chunk` records.
+        """
+        records = self.read(interval, symbol, start, end)
+        yield b'date,open,low,high,close,volume\n'
+        for lo in range(0, len(records), chunk):
+            dates, columns = _rows(records[lo:lo + chunk])
+            yield ''.join(f"{date.replace('T', ' ')},{o!r},{l!r},{h!r},{c!r},{v}\n"
+                          for date, o, l, h, c, v in zip(dates, *columns)).encode()
@@ -0,0 +1,249 @@
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+
+
+DEFAULT_NAMESPACE = 'default'
+
+
+class _Flight:
+    __slots__ = ('future', 'owner')
+
+    def __init__(self, future, owner):
+        self.future = future
+        self.owner = owner
+
+
+class TwoTierCache:
+    """
+    Byte-value cache with a size-bounded in-process LRU (L1) in front of
+    Redis (L2).
+
+    Keys are grouped into namespaces by prefix (`historical-price-AAPL-max`
+    belongs to `historical-price`), and each namespace has its own TTL so
+    handlers call `set(key, value)` without an expiry of their own. L1
+    entries never outlive the namespace TTL nor `l1_ttl`, which bounds how
+    long a worker can serve a value another worker already replaced.
+
+    Concurrent misses on the same key are coalesced: the first `get` that
+    misses both tiers becomes the leader, and later `get` calls for that key
+    wait for the leader's `set` instead of recomputing the value. The flight
+    is released when the leader task finishes, so a leader that fails
+    without calling `set` only sends the followers back to computing the
+    value themselves.
+    """
+
+    def __init__(self, redis_client, namespaces=None, default_ttl=600, max_bytes=256 * 1024 ** 2, l1_ttl=60, single_flight_timeout=10):
+        self.redis = redis_client
+        self.namespaces = dict(namespaces or {})
+        self.prefixes = sorted(self.namespaces, key=len, reverse=True)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.l1_ttl = l1_ttl
+        self.single_flight_timeout = single_flight_timeout
+
+        self.entries = OrderedDict()  # key -> (value, expires_at, namespace)
+        self.total_bytes = 0
+        self.flights = {}
+        self.counters = defaultdict(lambda: defaultdict(int))
+
+    def namespace(self, key):
+        for prefix in self.prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return DEFAULT_NAMESPACE
+
+    def ttl(self, namespace):
+        return self.namespaces.get(namespace, self.default_ttl)
+
+    # ---- L1 ----
+
+    def _l1_get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._l1_drop(key)
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def _l1_put(self, key, value, namespace, ttl):
+        if len(value) > self.max_bytes:
+            return
+        self._l1_drop(key)
+        self.entries[key] = (value, time.monotonic() + min(ttl, self.l1_ttl), namespace)
+        self.total_bytes += len(value)
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, (old_value, _, old_namespace) = self.entries.popitem(last=False)
+            self.total_bytes -= len(old_value)
+            self.counters[old_namespace]['evictions'] += 1
+
+    def _l1_drop(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[0])
+
+    # ---- single flight ----
+
+    def _release(self, key, flight, value=None):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+        if not flight.future.done():
+            flight.future.set_result(value)
+
+    def _lead(self, key):
+        owner = asyncio.current_task()
+        flight = _Flight(asyncio.get_running_loop().create_future(), owner)
+        self.flights[key] = flight
+        if owner is not None:
+            owner.add_done_callback(lambda _: self._release(key, flight))
+        return flight
+
+    # ---- public API ----
+
+    async def get(self, key):
+        namespace = self.namespace(key)
+        counters = self.counters[namespace]
+
+        value = self._l1_get(key)
+        if value is not None:
+            counters['l1_hits'] += 1
+            return value
+
+        flight = self.flights.get(key)
+        if flight is not None and flight.owner is not asyncio.current_task():
+            try:
+                value = await asyncio.wait_for(asyncio.shield(flight.future), self.single_flight_timeout)
+            except asyncio.TimeoutError:
+                value = None
+            if value is not None:
+                counters['coalesced'] += 1
+                return value
+
+        flight = self._lead(key)
+        value = await self.redis.get(key)
+        if value is not None:
+            counters['l2_hits'] += 1
+            self._l1_put(key, value, namespace, self.ttl(namespace))
+            self._release(key, flight, value)
+            return value
+
+        counters['misses'] += 1
+        return None
+
+    async def set(self, key, value, ex=None):
+        namespace = self.namespace(key)
+        ttl = ex if ex is not None else self.ttl(namespace)
+        self.counters[namespace]['sets'] += 1
+        self._l1_put(key, value, namespace, ttl)
+        flight = self.flights.get(key)
+        if flight is not None:
+            self._release(key, flight, value)
+        await self.redis.set(key, value, ex=ttl)
+
+    async def mget(self, keys):
+        """
+        Batched get without single flight: L1 first, one MGET for the rest.
+        """
+        res = [None] * len(keys)
+        missing = []
+        for i, key in enumerate(keys):
+            value = self._l1_get(key)
+            if value is not None:
+                self.counters[self.namespace(key)]['l1_hits'] += 1
+                res[i] = value
+            else:
+                missing.append(i)
+
+        if missing:
+            values = await self.redis.mget([keys[i] for i in missing])
+            for i, value in zip(missing, values):
+                namespace = self.namespace(keys[i])
+                if value is not None:
+                    self.counters[namespace]['l2_hits'] += 1
+                    self._l1_put(keys[i], value, namespace, self.ttl(namespace))
+                    res[i] = value
+                else:
+                    self.counters[namespace]['misses'] += 1
+        return res
+
+    async def set_many(self, items, ex=None):
+        """
+        Pipelined set of {key: value}.
+        """
+        if not items:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                namespace = self.namespace(key)
+                ttl = ex if ex is not None else self.ttl(namespace)
+                self.counters[namespace]['sets'] += 1
+                self._l1_put(key, value, namespace, ttl)
+                pipe.set(key, value, ex=ttl)
+            await pipe.execute()
+
+    async def delete(self, key):
+        self._l1_drop(key)
+        await self.redis.delete(key)
+
+    async def invalidate_namespace(self, namespace):
+        """
+        Drop every key of `namespace` from both tiers. Uses SCAN, so it is
+        safe on a large keyspace.
+        """
+        for key in [key for key in self.entries if key.startswith(namespace)]:
+            self._l1_drop(key)
+
+        deleted = 0
+        batch = []
+        async for key in self.redis.scan_iter(match=f"{namespace}*", count=1000):
+            batch.append(key)
+            if len(batch) >= 1000:
+                deleted += await self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.redis.unlink(*batch)
+        return deleted
+
+    async def warm(self, keys):
+        """
+        Preload `keys` from Redis into L1 (one pipelined GET + PTTL round
+        trip). Returns the number of keys found.
+        """
+        if not keys:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.get(key)
+                pipe.pttl(key)
+            results = await pipe.execute()
+
+        found = 0
+        for key, value, pttl in zip(keys, results[0::2], results[1::2]):
+            if value is None:
+                continue
+            namespace = self.namespace(key)
+            ttl = pttl / 1000 if pttl and pttl > 0 else self.ttl(namespace)
+            self._l1_put(key, value, namespace, ttl)
+            self.counters[namespace]['warmed'] += 1
+            found += 1
+        return found
+
+    def stats(self):
+        namespaces = {}
+        for namespace, counters in sorted(self.counters.items()):
+            lookups = counters['l1_hits'] + counters['l2_hits'] + counters['coalesced'] + counters['misses']
+            hits = lookups - counters['misses']
+            namespaces[namespace] = {
+                **counters,
+                'ttl': self.ttl(namespace),
+                'hit_rate': round(hits / lookups, 4) if lookups else None,
+            }
+        return {
+            'l1_entries': len(self.entries),
+            'l1_bytes': self.total_bytes,
+            'inflight': len(self.flights),
+            'namespaces': namespaces,
+        }
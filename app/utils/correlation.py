@@ -0,0 +1,139 @@
+import numpy as np
+
+
+def load_close_matrix(store, symbols, start_date, end_date, min_coverage=0.9):
+    """
+    Date-aligned close and mean volume for `symbols` from a PriceStore.
+    Symbols that miss more than (1 - min_coverage) of the trading days are
+    dropped; the remaining gaps are forward/back filled so every column is
+    a complete series on the same calendar.
+    """
+    dates, symbols, close = store.matrix(symbols, 'close', start_date, end_date)
+    _, _, volume = store.matrix(symbols, 'volume', start_date, end_date)
+    if close.size == 0:
+        return dates, [], close, np.array([])
+
+    coverage = np.isfinite(close).mean(axis=0)
+    keep = coverage >= min_coverage
+    close = close[:, keep]
+    volume = volume[:, keep]
+    symbols = [symbol for symbol, k in zip(symbols, keep) if k]
+
+    # Forward fill, then back fill leading gaps
+    idx = np.where(np.isfinite(close), np.arange(len(dates))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    close = close[idx, np.arange(close.shape[1])]
+    first_valid = np.argmax(np.isfinite(close), axis=0)
+    leading = np.arange(len(dates))[:, None] < first_valid
+    close = np.where(leading, close[first_valid, np.arange(close.shape[1])], close)
+
+    avg_volume = np.nanmean(volume, axis=0)
+    return dates, symbols, close, avg_volume
+
+
+def standardize(matrix):
+    """
+    Column-wise z-score scaled by 1/sqrt(T), so that Z.T @ Z is the Pearson
+    correlation matrix. Constant columns are returned as NaN.
+    """
+    centered = matrix - matrix.mean(axis=0)
+    norm = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return centered / np.where(norm > 0, norm, np.nan)
+
+
+def top_bottom_correlations(close, avg_volume, k=5, volume_ratio=0.5, memory_budget=256 * 1024 ** 2):
+    """
+    Compute the full correlation matrix in row blocks of Z.T @ Z and keep,
+    for every symbol, the k most and k least correlated peers.
+
+    A peer only qualifies when its mean volume is above `volume_ratio` times
+    the symbol's own mean volume. The block height is chosen so that the
+    per-block working set (correlations, a work copy for the partitions, the
+    exclusion mask and one argpartition result, about 25 bytes per cell)
+    stays within `memory_budget` bytes; the buffers are reused across blocks.
+
+    Returns a list (one entry per column) of [(peer_index, correlation), ...]
+    sorted by correlation descending.
+    """
+    z = np.ascontiguousarray(standardize(close).T)
+    n = z.shape[0]
+    valid = np.isfinite(z).all(axis=1)
+    z[~valid] = 0.0
+
+    kk = min(k, n - 1)
+    if kk <= 0:
+        return [[] for _ in range(n)]
+
+    # float64 corr + float64 work + int64 argpartition + bool mask per cell
+    block = max(1, min(n, memory_budget // max(1, n * 25)))
+    corr_buf = np.empty((block, n))
+    work_buf = np.empty((block, n))
+    excluded_buf = np.empty((block, n), dtype=bool)
+    results = []
+
+    for lo in range(0, n, block):
+        hi = min(n, lo + block)
+        rows = hi - lo
+        corr = corr_buf[:rows]
+        np.matmul(z[lo:hi], z.T, out=corr)
+
+        # Peers failing the volume filter, invalid series and the diagonal
+        excluded = excluded_buf[:rows]
+        np.greater(avg_volume[None, :], volume_ratio * avg_volume[lo:hi, None], out=excluded)
+        np.logical_not(excluded, out=excluded)
+        excluded |= ~valid[None, :]
+        excluded |= ~valid[lo:hi, None]
+        excluded[np.arange(rows), np.arange(lo, hi)] = True
+
+        # Partition -corr then corr in the same buffer, excluded cells last
+        work = work_buf[:rows]
+        np.negative(corr, out=work)
+        np.copyto(work, np.inf, where=excluded)
+        top_idx = np.argpartition(work, kk - 1, axis=1)[:, :kk].copy()
+        np.copyto(work, corr)
+        np.copyto(work, np.inf, where=excluded)
+        bottom_idx = np.argpartition(work, kk - 1, axis=1)[:, :kk].copy()
+
+        for row in range(rows):
+            picked = {}
+            for j in np.concatenate([top_idx[row], bottom_idx[row]]):
+                if not excluded[row, j]:
+                    picked[int(j)] = float(corr[row, j])
+            results.append(sorted(picked.items(), key=lambda x: x[1], reverse=True))
+
+    return results
+
+
+def run_correlation(store, con, table, symbols, start_date, end_date, k=5):
+    """
+    Correlation peers for every symbol of `table`, formatted like the
+    json/correlation/companies/{symbol}.json files.
+    """
+    dates, symbols, close, avg_volume = load_close_matrix(store, symbols, start_date, end_date)
+    if not symbols:
+        return {}
+
+    cursor = con.cursor()
+    cursor.execute(f"SELECT symbol, name, marketCap FROM {table}")
+    fundamentals = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+
+    peers = top_bottom_correlations(close, avg_volume, k=k)
+
+    res = {}
+    for symbol, items in zip(symbols, peers):
+        res_list = []
+        for j, value in items:
+            peer = symbols[j]
+            name, market_cap = fundamentals.get(peer, (None, None))
+            if name is None or market_cap is None or np.isnan(value):
+                continue
+            res_list.append({
+                'symbol': peer,
+                'name': name,
+                'marketCap': int(market_cap),
+                'value': round(min(1.0, max(-1.0, value)), 3)
+            })
+        if res_list:
+            res[symbol] = res_list
+    return res
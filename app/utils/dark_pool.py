@@ -0,0 +1,296 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pandas as pd
+
+
+# Daily files of cron_dark_pool_flow.py and the per-file index snapshots
+HISTORICAL_FLOW_PATH = 'json/dark-pool/historical-flow'
+DARK_POOL_INDEX_PATH = 'json/dark-pool/index'
+DARK_POOL_INDEX_VERSION = 1
+HOTTEST_TRADES = 5
+
+
+def _premium(value):
+    return float(str(value).replace(',', ''))
+
+
+def _number(value):
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def parse_trades(trades):
+    """
+    Columns of a list of historical-flow trades, each field parsed once:
+    ticker codes (into `tickers`), price, size, premium and execution time
+    in ns since the epoch.
+    """
+    trades = [trade for trade in trades if isinstance(trade, dict) and trade.get('ticker')]
+    if not trades:
+        return None
+    tickers, codes = np.unique([trade['ticker'] for trade in trades], return_inverse=True)
+    return {
+        'trades': trades,
+        'tickers': tickers,
+        'code': codes,
+        'price': np.array([float(trade['price']) for trade in trades]),
+        'size': np.array([float(trade['size']) for trade in trades]),
+        'premium': np.array([_premium(trade['premium']) for trade in trades]),
+        'time': pd.to_datetime([trade['date'] for trade in trades], utc=True, format='ISO8601').asi8,
+        'id': [trade.get('trackingID') for trade in trades],
+    }
+
+
+class DarkPoolIndex:
+    """
+    Dark-pool trades aggregated per ticker: volume and premium per price
+    level (price / price_grouping rounded to 0.1, as the price-level page
+    always did), trade count and sums for the metrics, the hottest trades by
+    premium and the latest price.
+
+    `add` only takes trades after the watermark (latest execution time seen)
+    or with a tracking id it hasn't seen, so a day file that grows during the
+    session is folded in incrementally.
+    """
+
+    def __init__(self, price_grouping=1.0, top=HOTTEST_TRADES):
+        self.price_grouping = price_grouping
+        self.top = top
+        self.levels = {}
+        self.totals = {}
+        self.hottest = {}
+        self.last = {}
+        self.watermark = None
+        self.seen = set()
+
+    def __contains__(self, ticker):
+        return ticker in self.totals
+
+    def __len__(self):
+        return len(self.totals)
+
+    def tickers(self):
+        return list(self.totals)
+
+    def add(self, trades):
+        """
+        Fold new trades in; returns how many were new.
+        """
+        columns = parse_trades(trades)
+        if columns is None:
+            return 0
+        # Trades after the watermark are new, older ones only if their id is
+        # unknown (late prints)
+        if self.watermark is None:
+            new = np.ones(len(columns['id']), dtype=bool)
+        else:
+            new = columns['time'] > self.watermark
+            for i in np.flatnonzero(~new):
+                new[i] = columns['id'][i] is not None and columns['id'][i] not in self.seen
+        if not new.any():
+            return 0
+        rows = np.flatnonzero(new)
+        code, price, size, premium, times = (columns[name][rows] for name in ('code', 'price', 'size', 'premium', 'time'))
+        tickers = columns['tickers']
+
+        # (ticker, level) histogram of the batch, then one dict update per key
+        level = np.rint(price / self.price_grouping * 10).astype(np.int64)
+        keys, inverse = np.unique((code.astype(np.int64) << 32) | level, return_inverse=True)
+        level_size = np.bincount(inverse, weights=size)
+        level_premium = np.bincount(inverse, weights=premium)
+        for key, key_size, key_premium in zip(keys.tolist(), level_size.tolist(), level_premium.tolist()):
+            bucket = self.levels.setdefault(str(tickers[key >> 32]), {}).setdefault(key & 0xFFFFFFFF, [0.0, 0.0])
+            bucket[0] += key_size
+            bucket[1] += key_premium
+
+        # Per-ticker partition of the batch for the totals, hottest and last trade
+        order = np.lexsort((times, code))
+        bounds = np.flatnonzero(np.diff(code[order])) + 1
+        for part in np.split(order, bounds):
+            ticker = str(tickers[code[part[0]]])
+            totals = self.totals.setdefault(ticker, [0, 0.0, 0.0])
+            totals[0] += len(part)
+            totals[1] += float(size[part].sum())
+            totals[2] += float(premium[part].sum())
+            latest = part[-1]
+            if ticker not in self.last or times[latest] >= self.last[ticker][0]:
+                self.last[ticker] = (int(times[latest]), float(price[latest]))
+            best = part[np.argsort(-premium[part], kind='stable')[:self.top]]
+            candidates = self.hottest.get(ticker, []) + [(float(premium[i]), columns['trades'][rows[i]]) for i in np.sort(best)]
+            candidates.sort(key=lambda item: -item[0])
+            self.hottest[ticker] = candidates[:self.top]
+
+        latest = int(times.max())
+        self.watermark = latest if self.watermark is None else max(self.watermark, latest)
+        self.seen.update(columns['id'][i] for i in rows if columns['id'][i] is not None)
+        return len(rows)
+
+    def merge(self, other):
+        """
+        Add the aggregates of `other` (e.g. another day) to this index.
+        """
+        for ticker, levels in other.levels.items():
+            mine = self.levels.setdefault(ticker, {})
+            for level, (size, premium) in levels.items():
+                bucket = mine.setdefault(level, [0.0, 0.0])
+                bucket[0] += size
+                bucket[1] += premium
+        for ticker, (count, size, premium) in other.totals.items():
+            totals = self.totals.setdefault(ticker, [0, 0.0, 0.0])
+            totals[0] += count
+            totals[1] += size
+            totals[2] += premium
+        for ticker, last in other.last.items():
+            if ticker not in self.last or last[0] >= self.last[ticker][0]:
+                self.last[ticker] = last
+        for ticker, trades in other.hottest.items():
+            candidates = self.hottest.get(ticker, []) + trades
+            candidates.sort(key=lambda item: -item[0])
+            self.hottest[ticker] = candidates[:self.top]
+        if other.watermark is not None:
+            self.watermark = other.watermark if self.watermark is None else max(self.watermark, other.watermark)
+        self.seen |= other.seen
+        return self
+
+    def price_levels(self, ticker, size_threshold=0.8):
+        """
+        Price levels whose volume is at or above the `size_threshold`
+        quantile of the ticker's levels, sorted by price, without the level
+        at the latest trade price. Same records as the pandas groupby the
+        price-level page used.
+        """
+        levels = self.levels.get(ticker)
+        if not levels:
+            return []
+        level = np.fromiter(levels.keys(), dtype=np.int64, count=len(levels))
+        values = np.array(list(levels.values()))
+        price_level = level / 10 * self.price_grouping
+        keep = values[:, 0] >= np.quantile(values[:, 0], size_threshold)
+        keep &= price_level != self.last[ticker][1]
+        rows = np.flatnonzero(keep)
+        rows = rows[np.argsort(price_level[rows])]
+        return [{'price_level': float(price_level[i]), 'size': _number(values[i, 0]), 'premium': float(values[i, 1])} for i in rows]
+
+    def metrics(self, ticker):
+        count, size, premium = self.totals[ticker]
+        return {
+            'avgTradeSize': round(size / count, 2),
+            'totalPrem': round(premium, 2),
+            'avgPremTrade': round(premium / count, 2),
+        }
+
+    def hottest_trades(self, ticker, exclude=('ticker', 'sector', 'assetType')):
+        """
+        The ticker's largest trades by premium, ranked.
+        """
+        result = []
+        for rank, (_, trade) in enumerate(self.hottest.get(ticker, []), 1):
+            item = {key: value for key, value in trade.items() if key not in exclude}
+            item['rank'] = rank
+            result.append(item)
+        return result
+
+    def to_dict(self):
+        return {
+            'version': DARK_POOL_INDEX_VERSION,
+            'price_grouping': self.price_grouping,
+            'top': self.top,
+            'levels': {ticker: [[level, size, premium] for level, (size, premium) in levels.items()] for ticker, levels in self.levels.items()},
+            'totals': self.totals,
+            'hottest': {ticker: [trade for _, trade in trades] for ticker, trades in self.hottest.items()},
+            'last': self.last,
+            'watermark': self.watermark,
+            'seen': sorted(self.seen),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls(data['price_grouping'], data['top'])
+        index.levels = {ticker: {level: [size, premium] for level, size, premium in levels} for ticker, levels in data['levels'].items()}
+        index.totals = data['totals']
+        index.hottest = {ticker: [(_premium(trade['premium']), trade) for trade in trades] for ticker, trades in data['hottest'].items()}
+        index.last = {ticker: tuple(last) for ticker, last in data['last'].items()}
+        index.watermark = data['watermark']
+        index.seen = set(data['seen'])
+        return index
+
+
+def _snapshot_path(name, index_path):
+    return os.path.join(index_path, name)
+
+
+def _read_snapshot(name, index_path, price_grouping):
+    """
+    (index, mtime of the file it was built from) of a snapshot, or
+    (None, None) when it is missing or was built with other settings.
+    """
+    try:
+        with open(_snapshot_path(name, index_path), 'rb') as file:
+            data = orjson.loads(file.read())
+        if data.get('version') == DARK_POOL_INDEX_VERSION and data.get('price_grouping') == price_grouping:
+            return DarkPoolIndex.from_dict(data), data.get('source_mtime')
+    except (OSError, ValueError, KeyError):
+        pass
+    return None, None
+
+
+def load_day(name, directory=HISTORICAL_FLOW_PATH, index_path=DARK_POOL_INDEX_PATH, price_grouping=1.0):
+    """
+    Index of one historical-flow file. The snapshot written next to it is
+    reused as is while the file is unchanged; when the file grew, only the
+    trades after the snapshot's watermark are aggregated.
+    """
+    source = os.path.join(directory, name)
+    mtime = os.path.getmtime(source)
+    index, source_mtime = _read_snapshot(name, index_path, price_grouping)
+    if index is not None and source_mtime == mtime:
+        return index
+    index = index or DarkPoolIndex(price_grouping)
+    with open(source, 'rb') as file:
+        index.add(orjson.loads(file.read()))
+    save_day(index, name, mtime, index_path)
+    return index
+
+
+def update_day(name, new_trades, all_trades, previous_mtime, directory=HISTORICAL_FLOW_PATH, index_path=DARK_POOL_INDEX_PATH, price_grouping=1.0):
+    """
+    Fold the trades cron_dark_pool_flow.py just appended to a day file into
+    its snapshot. Only `new_trades` are added when the snapshot was up to
+    date with the file before the write (`previous_mtime`), otherwise all of
+    `all_trades` are offered to it.
+    """
+    index, source_mtime = _read_snapshot(name, index_path, price_grouping)
+    up_to_date = index is not None and previous_mtime is not None and source_mtime == previous_mtime
+    index = index or DarkPoolIndex(price_grouping)
+    index.add(new_trades if up_to_date else all_trades)
+    save_day(index, name, os.path.getmtime(os.path.join(directory, name)), index_path)
+    return index
+
+
+def save_day(index, name, source_mtime, index_path=DARK_POOL_INDEX_PATH):
+    os.makedirs(index_path, exist_ok=True)
+    data = index.to_dict()
+    data['source_mtime'] = source_mtime
+    data['built_at'] = datetime.now().isoformat()
+    tmp = _snapshot_path(name, index_path) + '.tmp'
+    with open(tmp, 'wb') as file:
+        file.write(orjson.dumps(data))
+    os.replace(tmp, _snapshot_path(name, index_path))
+
+
+def load_window(dates, directory=HISTORICAL_FLOW_PATH, index_path=DARK_POOL_INDEX_PATH, price_grouping=1.0):
+    """
+    Merged index of the historical-flow files of `dates` (missing days are
+    skipped).
+    """
+    window = DarkPoolIndex(price_grouping)
+    for date in dates:
+        name = f"{date}.json"
+        if os.path.exists(os.path.join(directory, name)):
+            try:
+                window.merge(load_day(name, directory, index_path, price_grouping))
+            except Exception as e:
+                print(f"Error loading dark pool trades of {date}: {e}")
+    return window
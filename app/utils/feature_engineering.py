@@ -7,6 +7,8 @@ from ta.trend import *
 from ta.volatility import *
 from ta.volume import *
 
+from utils.feature_store import compute_indicators
+
 
 
 def trend_intensity(close, window=20):
@@ -21,57 +23,61 @@ def calculate_fdi(high, low, close, window=30):
     return (2 - n1) * 100
 
 
-def generate_ta_features(df):
+# generate_ta_features column -> canonical indicator of utils.feature_store
+TA_FEATURES = {
+    'sma_50': 'sma_50', 'sma_200': 'sma_200', 'ema_50': 'ema_50', 'ema_200': 'ema_200', 'wma': 'wma_30',
+    'ichimoku_a': 'ichimoku_a', 'ichimoku_b': 'ichimoku_b', 'atr': 'atr_14',
+    'macd': 'macd', 'macd_signal': 'macd_signal', 'adx': 'adx_14', 'adx_pos': 'adx_pos_14', 'adx_neg': 'adx_neg_14',
+    'cci': 'cci_20', 'mfi': 'mfi_14', 'nvi': 'nvi', 'obv': 'obv', 'vpt': 'vpt',
+    'rsi': 'rsi_60', 'stoch_rsi': 'stoch_rsi_k_60', 'adi': 'adi', 'cmf': 'cmf_20', 'emv': 'emv_20', 'fi': 'fi_13',
+    'williams': 'williams_14', 'kama': 'kama_10', 'stoch_k': 'stoch_60', 'stoch_d': 'stoch_signal_60',
+    'don_hband': 'don_hband_60', 'don_lband': 'don_lband_60', 'don_mband': 'don_mband_60', 'don_pband': 'don_pband_60', 'don_wband': 'don_wband_60',
+    'aroon_down': 'aroon_down_60', 'aroon_indicator': 'aroon_indicator_60', 'aroon_up': 'aroon_up_60',
+    'ulcer': 'ulcer_60',
+}
+TA_FEATURE_INPUTS = list(dict.fromkeys(list(TA_FEATURES.values()) + ['bb_hband_20', 'bb_lband_20', 'macd_diff']))
+
+
+def generate_ta_features(df, features=None):
+    """
+    `features` are the TA_FEATURE_INPUTS indicators row-aligned with `df`,
+    e.g. from FeatureStore.align; they are computed here when not given.
+    """
+    if features is None:
+        features = compute_indicators(df, TA_FEATURE_INPUTS)
+    ind = {name: np.asarray(features[name]) for name in TA_FEATURE_INPUTS}
 
     df_features = df.copy()
 
-    df_features['sma_50'] = df['close'].rolling(window=50).mean()
-    df_features['sma_200'] = df['close'].rolling(window=200).mean()
+    df_features['sma_50'] = ind['sma_50']
+    df_features['sma_200'] = ind['sma_200']
     df_features['sma_crossover'] = ((df_features['sma_50'] > df_features['sma_200']) & (df_features['sma_50'].shift(1) <= df_features['sma_200'].shift(1))).astype(int)
 
-    df_features['ema_50'] = EMAIndicator(close=df['close'], window=50).ema_indicator()
-    df_features['ema_200'] = EMAIndicator(close=df['close'], window=200).ema_indicator()
+    df_features['ema_50'] = ind['ema_50']
+    df_features['ema_200'] = ind['ema_200']
     df_features['ema_crossover'] = ((df_features['ema_50'] > df_features['ema_200']) & (df_features['ema_50'].shift(1) <= df_features['ema_200'].shift(1))).astype(int)
 
-    df_features['wma'] = WMAIndicator(df['close'], window = 30).wma()
+    df_features['wma'] = ind['wma_30']
 
-    ichimoku = IchimokuIndicator(high=df['high'], low=df['low'])
-    df_features['ichimoku_a'] = ichimoku.ichimoku_a()
-    df_features['ichimoku_b'] = ichimoku.ichimoku_b()
-    df_features['atr'] = AverageTrueRange(high=df['high'], low=df['low'], close=df['close']).average_true_range()
-    bb = BollingerBands(close=df['close'])
-    df_features['bb_width'] = (bb.bollinger_hband() - bb.bollinger_lband()) / df['close']
+    df_features['ichimoku_a'] = ind['ichimoku_a']
+    df_features['ichimoku_b'] = ind['ichimoku_b']
+    df_features['atr'] = ind['atr_14']
+    df_features['bb_width'] = (ind['bb_hband_20'] - ind['bb_lband_20']) / df['close'].values
 
 
-    df_features['macd'] = macd(df['close'])
-    df_features['macd_signal'] = macd_signal(df['close'])
-    df_features['macd_hist'] = 2*macd_diff(df['close'])
-    df_features['adx'] = adx(df['high'],df['low'],df['close'])
-    df_features["adx_pos"] = adx_pos(df['high'],df['low'],df['close'])
-    df_features["adx_neg"] = adx_neg(df['high'],df['low'],df['close'])
-    df_features['cci'] = CCIIndicator(high=df['high'], low=df['low'], close=df['close']).cci()
-    df_features['mfi'] = MFIIndicator(high=df['high'], low=df['low'], close=df['close'], volume=df['volume']).money_flow_index()
-    
-    df_features['nvi'] = NegativeVolumeIndexIndicator(close=df['close'], volume=df['volume']).negative_volume_index()
-    df_features['obv'] = OnBalanceVolumeIndicator(close=df['close'], volume=df['volume']).on_balance_volume()
-    df_features['vpt'] = VolumePriceTrendIndicator(close=df['close'], volume=df['volume']).volume_price_trend()
+    df_features['macd'] = ind['macd']
+    df_features['macd_signal'] = ind['macd_signal']
+    df_features['macd_hist'] = 2*ind['macd_diff']
+    for column in ['adx', 'adx_pos', 'adx_neg', 'cci', 'mfi', 'nvi', 'obv', 'vpt']:
+        df_features[column] = ind[TA_FEATURES[column]]
     
-    df_features['rsi'] = rsi(df["close"], window=60)
+    df_features['rsi'] = ind['rsi_60']
     df_features['rolling_rsi'] = df_features['rsi'].rolling(window=10).mean()
-    df_features['stoch_rsi'] = stochrsi_k(df['close'], window=60, smooth1=3, smooth2=3)
+    df_features['stoch_rsi'] = ind['stoch_rsi_k_60']
     df_features['rolling_stoch_rsi'] = df_features['stoch_rsi'].rolling(window=10).mean()
 
-    df_features['adi'] = acc_dist_index(high=df['high'],low=df['low'],close=df['close'],volume=df['volume'])
-    df_features['cmf'] = chaikin_money_flow(high=df['high'],low=df['low'],close=df['close'],volume=df['volume'], window=20)
-    df_features['emv'] = ease_of_movement(high=df['high'],low=df['low'],volume=df['volume'], window=20)
-    df_features['fi'] = force_index(close=df['close'], volume=df['volume'], window= 13)
-
-    df_features['williams'] = WilliamsRIndicator(high=df['high'], low=df['low'], close=df['close']).williams_r()
-    df_features['kama'] = KAMAIndicator(close=df['close']).kama()
-
-    stoch = StochasticOscillator(high=df['high'], low=df['low'], close=df['close'], window=60, smooth_window=3)
-    df_features['stoch_k'] = stoch.stoch()
-    df_features['stoch_d'] = stoch.stoch_signal()
+    for column in ['adi', 'cmf', 'emv', 'fi', 'williams', 'kama', 'stoch_k', 'stoch_d']:
+        df_features[column] = ind[TA_FEATURES[column]]
 
     df_features['rocr'] = df['close'] / df['close'].shift(30) - 1 # Rate of Change Ratio (ROCR)
     df_features['ppo'] = (df_features['ema_50'] - df_features['ema_200']) / df_features['ema_50'] * 100
@@ -82,21 +88,12 @@ def generate_ta_features(df):
     df_features['tii'] = trend_intensity(df['close'])
 
     df_features['fft'] = np.abs(np.fft.fft(df['close']))
-    don_channel = DonchianChannel(high=df['high'], low=df['low'],close=df['close'], window=60)
-    df_features['don_hband'] = don_channel.donchian_channel_hband()
-    df_features['don_lband'] = don_channel.donchian_channel_lband()
-    df_features['don_mband'] = don_channel.donchian_channel_mband()
-    df_features['don_pband'] = don_channel.donchian_channel_pband()
-    df_features['don_wband'] = don_channel.donchian_channel_wband()
-
-    aroon = AroonIndicator(high=df['high'], low=df['low'], window=60)
-    df_features['aroon_down'] = aroon.aroon_down()
-    df_features['aroon_indicator'] = aroon.aroon_indicator()
-    df_features['aroon_up'] = aroon.aroon_up()
+    for column in ['don_hband', 'don_lband', 'don_mband', 'don_pband', 'don_wband', 'aroon_down', 'aroon_indicator', 'aroon_up']:
+        df_features[column] = ind[TA_FEATURES[column]]
 
     #df_features['ultimate_oscillator'] = UltimateOscillator(high=df['high'], low=df['low'], close=df['close']).ultimate_oscillator()
     #df_features['choppiness'] = 100 * np.log10((df['high'].rolling(window=60).max() - df['low'].rolling(window=30).min()) / df_features['atr']) / np.log10(14)
-    df_features['ulcer'] = UlcerIndex(df['close'],window=60).ulcer_index()
+    df_features['ulcer'] = ind['ulcer_60']
     #df_features['keltner_hband'] = keltner_channel_hband_indicator(high=df['high'],low=df['low'],close=df['close'],window=60)
     #df_features['keltner_lband'] = keltner_channel_lband_indicator(high=df['high'],low=df['low'],close=df['close'],window=60)
 
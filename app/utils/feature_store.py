@@ -0,0 +1,361 @@
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pandas as pd
+from ta.momentum import KAMAIndicator, StochRSIIndicator, StochasticOscillator, WilliamsRIndicator, roc, rsi, stochrsi_k
+from ta.trend import (AroonIndicator, CCIIndicator, IchimokuIndicator, adx, adx_neg, adx_pos, ema_indicator, macd,
+                      macd_diff, macd_signal, sma_indicator, wma_indicator)
+from ta.volatility import AverageTrueRange, BollingerBands, DonchianChannel, UlcerIndex
+from ta.volume import (MFIIndicator, NegativeVolumeIndexIndicator, OnBalanceVolumeIndicator, VolumePriceTrendIndicator,
+                       acc_dist_index, chaikin_money_flow, ease_of_movement, force_index)
+
+from utils.price_store import DEFAULT_STORES, PriceStore
+
+
+# Canonical indicator set shared by feature_engineering, classification,
+# ta_signal, trade_signal and rating. Names carry their parameters; bump
+# `version` whenever a definition changes so the next build recomputes it for
+# every symbol. `full` marks indicators that depend on the whole history
+# (cumulative sums, series means) and can't be extended from a tail window.
+INDICATORS = {
+    'sma_5': {'version': 1, 'compute': lambda d: sma_indicator(d['close'], window=5)},
+    'sma_20': {'version': 1, 'compute': lambda d: sma_indicator(d['close'], window=20)},
+    'sma_50': {'version': 1, 'compute': lambda d: sma_indicator(d['close'], window=50)},
+    'sma_100': {'version': 1, 'compute': lambda d: sma_indicator(d['close'], window=100)},
+    'sma_200': {'version': 1, 'compute': lambda d: sma_indicator(d['close'], window=200)},
+    'ema_5': {'version': 1, 'compute': lambda d: ema_indicator(d['close'], window=5)},
+    'ema_20': {'version': 1, 'compute': lambda d: ema_indicator(d['close'], window=20)},
+    'ema_50': {'version': 1, 'compute': lambda d: ema_indicator(d['close'], window=50)},
+    'ema_200': {'version': 1, 'compute': lambda d: ema_indicator(d['close'], window=200)},
+    'wma_20': {'version': 1, 'compute': lambda d: wma_indicator(d['close'], window=20)},
+    'wma_30': {'version': 1, 'compute': lambda d: wma_indicator(d['close'], window=30)},
+    'kama_10': {'version': 1, 'compute': lambda d: KAMAIndicator(close=d['close']).kama()},
+    'ichimoku_a': {'version': 1, 'compute': lambda d: IchimokuIndicator(high=d['high'], low=d['low']).ichimoku_a()},
+    'ichimoku_b': {'version': 1, 'compute': lambda d: IchimokuIndicator(high=d['high'], low=d['low']).ichimoku_b()},
+    'macd': {'version': 1, 'compute': lambda d: macd(d['close'])},
+    'macd_signal': {'version': 1, 'compute': lambda d: macd_signal(d['close'])},
+    'macd_diff': {'version': 1, 'compute': lambda d: macd_diff(d['close'])},
+    'adx_14': {'version': 1, 'compute': lambda d: adx(d['high'], d['low'], d['close'])},
+    'adx_pos_14': {'version': 1, 'compute': lambda d: adx_pos(d['high'], d['low'], d['close'])},
+    'adx_neg_14': {'version': 1, 'compute': lambda d: adx_neg(d['high'], d['low'], d['close'])},
+    'cci_20': {'version': 1, 'compute': lambda d: CCIIndicator(high=d['high'], low=d['low'], close=d['close']).cci()},
+    'aroon_up_14': {'version': 1, 'compute': lambda d: AroonIndicator(high=d['high'], low=d['low'], window=14).aroon_up()},
+    'aroon_down_14': {'version': 1, 'compute': lambda d: AroonIndicator(high=d['high'], low=d['low'], window=14).aroon_down()},
+    'aroon_up_60': {'version': 1, 'compute': lambda d: AroonIndicator(high=d['high'], low=d['low'], window=60).aroon_up()},
+    'aroon_down_60': {'version': 1, 'compute': lambda d: AroonIndicator(high=d['high'], low=d['low'], window=60).aroon_down()},
+    'aroon_indicator_60': {'version': 1, 'compute': lambda d: AroonIndicator(high=d['high'], low=d['low'], window=60).aroon_indicator()},
+    'rsi_14': {'version': 1, 'compute': lambda d: rsi(d['close'], window=14)},
+    'rsi_60': {'version': 1, 'compute': lambda d: rsi(d['close'], window=60)},
+    'stoch_rsi_14': {'version': 1, 'compute': lambda d: StochRSIIndicator(close=d['close']).stochrsi()},
+    'stoch_rsi_k_14': {'version': 1, 'compute': lambda d: stochrsi_k(d['close'], window=14, smooth1=3, smooth2=3)},
+    'stoch_rsi_k_60': {'version': 1, 'compute': lambda d: stochrsi_k(d['close'], window=60, smooth1=3, smooth2=3)},
+    'stoch_14': {'version': 1, 'compute': lambda d: StochasticOscillator(high=d['high'], low=d['low'], close=d['close'], window=14).stoch()},
+    'stoch_60': {'version': 1, 'compute': lambda d: StochasticOscillator(high=d['high'], low=d['low'], close=d['close'], window=60, smooth_window=3).stoch()},
+    'stoch_signal_60': {'version': 1, 'compute': lambda d: StochasticOscillator(high=d['high'], low=d['low'], close=d['close'], window=60, smooth_window=3).stoch_signal()},
+    'williams_14': {'version': 1, 'compute': lambda d: WilliamsRIndicator(high=d['high'], low=d['low'], close=d['close']).williams_r()},
+    'roc_14': {'version': 1, 'compute': lambda d: roc(d['close'], window=14)},
+    'atr_14': {'version': 1, 'compute': lambda d: AverageTrueRange(high=d['high'], low=d['low'], close=d['close'], window=14).average_true_range()},
+    'bb_hband_14': {'version': 1, 'compute': lambda d: BollingerBands(close=d['close'], window=14).bollinger_hband()},
+    'bb_lband_14': {'version': 1, 'compute': lambda d: BollingerBands(close=d['close'], window=14).bollinger_lband()},
+    'bb_hband_20': {'version': 1, 'compute': lambda d: BollingerBands(close=d['close'], window=20).bollinger_hband()},
+    'bb_lband_20': {'version': 1, 'compute': lambda d: BollingerBands(close=d['close'], window=20).bollinger_lband()},
+    'don_hband_60': {'version': 1, 'compute': lambda d: DonchianChannel(high=d['high'], low=d['low'], close=d['close'], window=60).donchian_channel_hband()},
+    'don_lband_60': {'version': 1, 'compute': lambda d: DonchianChannel(high=d['high'], low=d['low'], close=d['close'], window=60).donchian_channel_lband()},
+    'don_mband_60': {'version': 1, 'compute': lambda d: DonchianChannel(high=d['high'], low=d['low'], close=d['close'], window=60).donchian_channel_mband()},
+    'don_pband_60': {'version': 1, 'compute': lambda d: DonchianChannel(high=d['high'], low=d['low'], close=d['close'], window=60).donchian_channel_pband()},
+    'don_wband_60': {'version': 1, 'compute': lambda d: DonchianChannel(high=d['high'], low=d['low'], close=d['close'], window=60).donchian_channel_wband()},
+    'ulcer_60': {'version': 1, 'compute': lambda d: UlcerIndex(d['close'], window=60).ulcer_index()},
+    'mfi_14': {'version': 1, 'compute': lambda d: MFIIndicator(high=d['high'], low=d['low'], close=d['close'], volume=d['volume']).money_flow_index()},
+    'cmf_20': {'version': 1, 'compute': lambda d: chaikin_money_flow(high=d['high'], low=d['low'], close=d['close'], volume=d['volume'], window=20)},
+    'emv_20': {'version': 1, 'compute': lambda d: ease_of_movement(high=d['high'], low=d['low'], volume=d['volume'], window=20)},
+    'fi_13': {'version': 1, 'compute': lambda d: force_index(close=d['close'], volume=d['volume'], window=13)},
+    'nvi': {'version': 1, 'full': True, 'compute': lambda d: NegativeVolumeIndexIndicator(close=d['close'], volume=d['volume']).negative_volume_index()},
+    'obv': {'version': 1, 'full': True, 'compute': lambda d: OnBalanceVolumeIndicator(close=d['close'], volume=d['volume']).on_balance_volume()},
+    'vpt': {'version': 1, 'full': True, 'compute': lambda d: VolumePriceTrendIndicator(close=d['close'], volume=d['volume']).volume_price_trend()},
+    'adi': {'version': 1, 'full': True, 'compute': lambda d: acc_dist_index(high=d['high'], low=d['low'], close=d['close'], volume=d['volume'])},
+}
+
+FEATURE_STORE_VERSION = 2
+# Relative tolerance of the stored close against the caller's close in
+# `align`; any larger difference (split or dividend adjustment, restated bar)
+# means the stored indicators were computed on other prices
+CLOSE_RTOL = 1e-6
+# Bars recomputed before the first new bar when a symbol is extended, enough
+# for the recursive indicators (EMA, RSI, ADX, KAMA) to forget their seed
+INCREMENTAL_WARMUP = 1000
+
+# price store directory -> feature store directory
+DEFAULT_FEATURE_STORES = {
+    store_path: store_path.replace('price_store', 'feature_store', 1)
+    for _, store_path in DEFAULT_STORES.values()
+}
+
+
+def compute_indicators(df, names=None):
+    """
+    {name: float64 array} of the requested indicators over an OHLCV frame
+    with lowercase open/high/low/close/volume columns. Used by the store
+    build and as the fallback of every consumer, so both paths share the
+    same definitions.
+    """
+    names = list(INDICATORS) if names is None else names
+    # Frames without volume (e.g. trade_signal) only leave the volume indicators NaN
+    d = df.reindex(columns=['open', 'high', 'low', 'close', 'volume']).reset_index(drop=True).astype(np.float64)
+    res = {}
+    for name in names:
+        try:
+            res[name] = np.asarray(INDICATORS[name]['compute'](d), dtype=np.float64)
+        except Exception as e:
+            print(f"Error computing {name}: {e}")
+            res[name] = np.full(len(d), np.nan)
+    return res
+
+
+class FeatureStore:
+    """
+    Read-only view of a feature store written by `build_feature_store`.
+    One memory-mapped float64 file per indicator, plus the dates and the
+    close the indicators were computed on; every symbol occupies one
+    contiguous, date-sorted slice [offset, offset + length) in all of them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'index.json'), 'rb') as file:
+            meta = orjson.loads(file.read())
+
+        if meta.get('version') != FEATURE_STORE_VERSION:
+            raise ValueError(f"Unsupported feature store version {meta.get('version')} in {path}")
+
+        self.built_at = meta.get('built_at')
+        self.definitions = meta['definitions']
+        self.index = {symbol: (offset, length) for symbol, (offset, length, _) in meta['symbols'].items()}
+        self.last_close = {symbol: last_close for symbol, (_, _, last_close) in meta['symbols'].items()}
+        self.dates = np.load(os.path.join(path, 'date.npy'), mmap_mode='r')
+        self.close = np.load(os.path.join(path, 'close.npy'), mmap_mode='r')
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            for name in self.definitions
+        }
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    @property
+    def symbols(self):
+        return list(self.index.keys())
+
+    def has(self, names):
+        """
+        True when every indicator in `names` is stored with its current definition.
+        """
+        return all(self.definitions.get(name) == INDICATORS[name]['version'] for name in names)
+
+    def get(self, symbol, names, start=None, end=None):
+        """
+        {'date': array, name: array, ...} for one symbol as read-only views.
+        """
+        offset, length = self.index[symbol]
+        lo, hi = offset, offset + length
+        dates = self.dates[lo:hi]
+        if start is not None:
+            lo = offset + int(np.searchsorted(dates, np.datetime64(str(start)[:10], 'D'), side='left'))
+        if end is not None:
+            hi = offset + int(np.searchsorted(dates, np.datetime64(str(end)[:10], 'D'), side='right'))
+        res = {'date': self.dates[lo:hi]}
+        for name in names:
+            res[name] = self.columns[name][lo:hi]
+        return res
+
+    def align(self, symbol, dates, names, close=None):
+        """
+        Indicators of `symbol` as a DataFrame row-aligned with `dates` (any
+        sequence of YYYY-MM-DD strings or datetimes), or None when the store
+        lacks the symbol, an indicator, or any of the requested dates, when
+        `dates` doesn't start at the symbol's first stored bar, or when `close`
+        (the caller's close on `dates`) differs from the stored one. Callers
+        fall back to `compute_indicators` on None.
+
+        The indicators were computed from the first stored bar, so a later
+        window would get cumulative columns (obv, adi, nvi, vpt) shifted by a
+        constant and EMA-based ones warmed up on bars the caller never saw.
+        """
+        if symbol not in self.index or not self.has(names):
+            return None
+        offset, length = self.index[symbol]
+        stored = self.dates[offset:offset + length]
+        wanted = pd.to_datetime(pd.Series(dates)).values.astype('datetime64[D]')
+        rows = np.searchsorted(stored, wanted)
+        if len(wanted) == 0 or rows[0] != 0 or rows.max() >= length or not np.array_equal(stored[rows], wanted):
+            return None
+        rows += offset
+        if close is not None:
+            close = np.asarray(close, dtype=np.float64)
+            if len(close) != len(rows) or not np.allclose(self.close[rows], close, rtol=CLOSE_RTOL, atol=0, equal_nan=True):
+                return None
+        return pd.DataFrame({name: self.columns[name][rows] for name in names})
+
+
+def open_feature_stores(stores=DEFAULT_STORES, feature_stores=DEFAULT_FEATURE_STORES):
+    """
+    Open every feature store that exists on disk, keyed by its database file name.
+    """
+    res = {}
+    for db_path, (_, store_path) in stores.items():
+        path = feature_stores.get(store_path)
+        if path and os.path.exists(os.path.join(path, 'index.json')):
+            try:
+                res[db_path] = FeatureStore(path)
+            except Exception as e:
+                print(f"Feature store {path} unavailable: {e}")
+    return res
+
+
+def align_features(stores, symbol, dates, names, close=None):
+    """
+    `FeatureStore.align` over whichever of `stores` holds `symbol`.
+    """
+    for store in stores.values():
+        if symbol in store:
+            return store.align(symbol, dates, names, close)
+    return None
+
+
+def feature_start(stores, symbol):
+    """
+    First stored date (YYYY-MM-DD) of `symbol` in whichever of `stores` holds
+    it, or None. Windows starting there can be served by `align_features`.
+    """
+    for store in stores.values():
+        if symbol in store:
+            offset, length = store.index[symbol]
+            if length:
+                return str(store.dates[offset])
+    return None
+
+
+def _extend(previous, symbol, dates, close, frame, names):
+    """
+    Indicator slices for `symbol` reusing the previous build where possible.
+    Returns {name: array}; indicators that can't be reused are recomputed on
+    the full history, the others only on the new bars plus a warmup tail.
+    """
+    if previous is None or symbol not in previous:
+        return compute_indicators(frame, names)
+
+    offset, length = previous.index[symbol]
+    stored_dates = previous.dates[offset:offset + length]
+    # A changed history (split adjustment, backfill) invalidates the old rows
+    if (length == 0 or length > len(dates)
+            or stored_dates[-1] != dates[length - 1]
+            or previous.last_close[symbol] != float(close[length - 1])):
+        return compute_indicators(frame, names)
+
+    reusable = [
+        name for name in names
+        if previous.definitions.get(name) == INDICATORS[name]['version'] and not INDICATORS[name].get('full')
+    ]
+    res = {}
+    if length == len(dates):
+        for name in reusable:
+            res[name] = np.asarray(previous.columns[name][offset:offset + length])
+    else:
+        lo = max(0, length - INCREMENTAL_WARMUP)
+        tail = compute_indicators(frame.iloc[lo:], reusable)
+        for name in reusable:
+            res[name] = np.concatenate([previous.columns[name][offset:offset + length], tail[name][length - lo:]])
+
+    missing = [name for name in names if name not in res]
+    if missing:
+        res.update(compute_indicators(frame, missing))
+    return res
+
+
+def build_feature_store(price_store_path, out_path, names=None):
+    """
+    Compute the indicator set for every symbol of a PriceStore and write it
+    as one column file per indicator. Symbols whose history only grew since
+    the previous build get their new bars appended; definitions whose
+    version changed are recomputed. The new store is swapped in atomically.
+    """
+    names = list(INDICATORS) if names is None else names
+    prices = PriceStore(price_store_path)
+    try:
+        previous = FeatureStore(out_path)
+    except (OSError, ValueError, KeyError):
+        previous = None
+
+    symbols = sorted(prices.symbols)
+    total = sum(prices.index[symbol][1] for symbol in symbols)
+
+    tmp_path = out_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    date_col = np.lib.format.open_memmap(os.path.join(tmp_path, 'date.npy'), mode='w+', dtype='datetime64[D]', shape=(total,))
+    close_col = np.lib.format.open_memmap(os.path.join(tmp_path, 'close.npy'), mode='w+', dtype=np.float64, shape=(total,))
+    columns = {
+        name: np.lib.format.open_memmap(os.path.join(tmp_path, f"{name}.npy"), mode='w+', dtype=np.float64, shape=(total,))
+        for name in names
+    }
+
+    index = {}
+    offset = 0
+    reused = 0
+    for symbol in symbols:
+        data = prices.get(symbol)
+        length = len(data['date'])
+        if length == 0:
+            continue
+        frame = pd.DataFrame({key: np.asarray(values) for key, values in data.items() if key != 'date'})
+        try:
+            values = _extend(previous, symbol, data['date'], data['close'], frame, names)
+        except Exception as e:
+            print(f"Error computing features for {symbol}: {e}")
+            continue
+
+        if previous is not None and symbol in previous:
+            reused += 1
+        end = offset + length
+        date_col[offset:end] = data['date']
+        close_col[offset:end] = data['close']
+        for name in names:
+            columns[name][offset:end] = values[name]
+        index[symbol] = [offset, length, float(data['close'][-1])]
+        offset = end
+
+    date_col.flush()
+    close_col.flush()
+    for column in columns.values():
+        column.flush()
+    del date_col, close_col
+    columns.clear()
+
+    # Trim the preallocated files when symbols were skipped
+    if offset < total:
+        for name in ['date', 'close'] + names:
+            file_path = os.path.join(tmp_path, f"{name}.npy")
+            data = np.load(file_path, mmap_mode='r')[:offset].copy()
+            np.save(file_path, data)
+
+    with open(os.path.join(tmp_path, 'index.json'), 'wb') as file:
+        file.write(orjson.dumps({
+            'version': FEATURE_STORE_VERSION,
+            'built_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'source': price_store_path,
+            'definitions': {name: INDICATORS[name]['version'] for name in names},
+            'symbols': index,
+        }))
+
+    previous = None
+    old_path = out_path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(out_path):
+        os.rename(out_path, old_path)
+    os.rename(tmp_path, out_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    return len(index), reused
@@ -0,0 +1,249 @@
+import multiprocessing
+import os
+import runpy
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+
+JOB_HISTORY_DB = 'job_history.db'
+DEFAULT_TIMEOUT = 3600
+# Imported once by the warm fork server, so job processes start with them loaded
+PRELOAD = [
+    'asyncio', 'sqlite3', 'numpy', 'pandas', 'aiohttp', 'aiofiles', 'requests', 'orjson', 'ujson',
+    'pytz', 'dotenv', 'tqdm', 'utils.price_store', 'utils.quote_store',
+]
+# Output kept in the history for runs that did not succeed
+OUTPUT_TAIL = 4000
+
+
+class Job:
+    """
+    One node of the job graph.
+
+    Exactly one of `script` (a cron_*.py file, run in a fork of the warm
+    server) or `command` (argv run with subprocess, e.g. bash or pm2, or a
+    list of argvs run in order) is set. A job starts on its `trigger` (an
+    unbound `schedule.every(...)` job, or a list of them) and/or once every
+    job in `upstream` has succeeded and every job in `after` has finished
+    (whatever its status) since its last start.
+    `when` is an optional gate checked before each start (market hours etc.).
+    """
+
+    def __init__(self, name, script=None, command=None, upstream=(), trigger=None, when=None,
+                 timeout=DEFAULT_TIMEOUT, pool='default', after=()):
+        if (script is None) == (command is None):
+            raise ValueError(f"Job {name} needs either a script or a command")
+        self.name = name
+        self.script = script
+        if command is not None and isinstance(command[0], str):
+            command = [command]
+        self.commands = command
+        self.upstream = list(upstream)
+        self.after = list(after)
+        self.triggers = trigger if isinstance(trigger, list) else [trigger] if trigger is not None else []
+        self.when = when
+        self.timeout = timeout
+        self.pool = pool
+
+
+def _run_script(path, output_path):
+    # Runs in a fork of the warm server: same effect as `python3 path`
+    fd = os.open(output_path, os.O_WRONLY | os.O_APPEND)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    os.close(fd)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    sys.argv = [path]
+    runpy.run_path(path, run_name='__main__')
+
+
+class JobRunner:
+    """
+    Runs a DAG of jobs. Scripts run in processes forked from a multiprocessing
+    forkserver that has PRELOAD imported, so a job pays a fork instead of an
+    interpreter start-up plus pandas/numpy/aiohttp imports, while every run
+    still gets a fresh process (module globals, open databases and leaks do
+    not carry over).
+
+    A job never overlaps with itself, `pools` caps how many jobs of a pool
+    run at once, each run is killed after its timeout and recorded in the
+    job_runs table of `history_path`.
+
+    The forkserver re-imports the main module in each job process like
+    spawn does, so the calling script must keep its start-up code under
+    `if __name__ == "__main__":`.
+    """
+
+    def __init__(self, jobs, pools=None, history_path=JOB_HISTORY_DB, preload=PRELOAD):
+        self.jobs = {job.name: job for job in jobs}
+        self.pools = {name: threading.Semaphore(size) for name, size in (pools or {'default': 8}).items()}
+        self.downstream = defaultdict(list)
+        for job in jobs:
+            if job.pool not in self.pools:
+                raise ValueError(f"Job {job.name} uses unknown pool {job.pool}")
+            for name in job.upstream + job.after:
+                if name not in self.jobs:
+                    raise ValueError(f"Job {job.name} depends on unknown job {name}")
+                self.downstream[name].append(job.name)
+        self._check_acyclic()
+
+        self.lock = threading.Condition()
+        self.running = set()
+        self.last_start = {}
+        self.last_success = {}
+        self.last_finish = {}
+
+        self.history = sqlite3.connect(history_path, check_same_thread=False)
+        self.history.execute("""
+            CREATE TABLE IF NOT EXISTS job_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job TEXT NOT NULL,
+                reason TEXT,
+                started_at TEXT NOT NULL,
+                duration REAL,
+                status TEXT NOT NULL,
+                exit_code INTEGER,
+                output TEXT
+            )""")
+        self.history.execute("CREATE INDEX IF NOT EXISTS job_runs_job ON job_runs (job, started_at)")
+        self.history.commit()
+        self.history_lock = threading.Lock()
+
+        self.context = multiprocessing.get_context('forkserver')
+        self.context.set_forkserver_preload(preload)
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Job graph has a cycle: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for upstream in self.jobs[name].upstream + self.jobs[name].after:
+                visit(upstream, path + [name])
+            state[name] = 'done'
+
+        for name in self.jobs:
+            visit(name, [])
+
+    def schedule(self):
+        """
+        Register the job triggers with the schedule module; the caller keeps
+        running schedule.run_pending().
+        """
+        for job in self.jobs.values():
+            for trigger in job.triggers:
+                trigger.do(self.submit, job.name).tag(job.name)
+
+    def submit(self, name, reason='schedule'):
+        """
+        Start `name` in the background unless it is gated off or already
+        running. Returns whether it was started.
+        """
+        job = self.jobs[name]
+        if job.when is not None and not job.when():
+            return False
+        with self.lock:
+            if name in self.running:
+                return False
+            self.running.add(name)
+        threading.Thread(target=self._run, args=(job, reason), daemon=True).start()
+        return True
+
+    def wait(self, timeout=None):
+        """
+        Block until no job is running, including downstream jobs started meanwhile.
+        """
+        with self.lock:
+            return self.lock.wait_for(lambda: not self.running, timeout)
+
+    def _ready(self, name):
+        since = self.last_start.get(name, 0)
+        job = self.jobs[name]
+        return (all(self.last_success.get(upstream, 0) > since for upstream in job.upstream)
+                and all(self.last_finish.get(upstream, 0) > since for upstream in job.after))
+
+    def _run(self, job, reason):
+        with self.pools[job.pool]:
+            started = time.time()
+            with self.lock:
+                self.last_start[job.name] = started
+            try:
+                status, exit_code, output = self._execute(job)
+            except Exception as e:
+                status, exit_code, output = 'error', None, str(e)
+            duration = time.time() - started
+
+        self._record(job.name, reason, started, duration, status, exit_code, output)
+        if status != 'success':
+            print(f"Job {job.name} {status} after {duration:.1f}s (exit code {exit_code})")
+
+        with self.lock:
+            self.last_finish[job.name] = time.time()
+            if status == 'success':
+                self.last_success[job.name] = time.time()
+            ready = [name for name in self.downstream[job.name]
+                     if (status == 'success' or job.name in self.jobs[name].after) and self._ready(name)]
+        # Downstream jobs are submitted before this one leaves `running`,
+        # so wait() does not return in between
+        for name in ready:
+            self.submit(name, reason=f"after {job.name}")
+        with self.lock:
+            self.running.discard(job.name)
+            self.lock.notify_all()
+
+    def _execute(self, job):
+        if job.commands is not None:
+            deadline = time.monotonic() + job.timeout
+            for command in job.commands:
+                try:
+                    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                            timeout=max(deadline - time.monotonic(), 0), text=True, errors='replace')
+                except subprocess.TimeoutExpired:
+                    return 'timeout', None, None
+                if result.returncode != 0:
+                    return 'failed', result.returncode, result.stdout[-OUTPUT_TAIL:]
+            return 'success', 0, None
+
+        fd, output_path = tempfile.mkstemp(prefix=f"job-{job.name}-", suffix='.log')
+        os.close(fd)
+        try:
+            process = self.context.Process(target=_run_script, args=(job.script, output_path), name=job.name)
+            process.start()
+            process.join(job.timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(30)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+                status = 'timeout'
+            else:
+                status = 'success' if process.exitcode == 0 else 'failed'
+            output = None
+            if status != 'success':
+                with open(output_path, 'r', errors='replace') as file:
+                    output = file.read()[-OUTPUT_TAIL:]
+            return status, process.exitcode, output
+        finally:
+            os.remove(output_path)
+
+    def _record(self, name, reason, started, duration, status, exit_code, output):
+        try:
+            with self.history_lock:
+                self.history.execute(
+                    "INSERT INTO job_runs (job, reason, started_at, duration, status, exit_code, output) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name, reason, datetime.fromtimestamp(started).isoformat(timespec='seconds'), duration, status, exit_code, output))
+                self.history.commit()
+        except sqlite3.Error as e:
+            print(f"Failed to record run of {name}: {e}")
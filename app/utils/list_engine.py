@@ -0,0 +1,185 @@
+import os
+import numbers
+
+import numpy as np
+import orjson
+
+from utils.quote_store import read_quote
+
+
+STOCK_LIST_PATH = 'json/stocks-list/list'
+
+
+def _number(value):
+    if isinstance(value, numbers.Real):
+        return float(value)
+    return np.nan
+
+
+class ListFrame:
+    """
+    Quote and screener fields of a symbol universe as columns, loaded once
+    and shared by every list spec evaluated against it.
+
+    Numeric columns are float64 with NaN where the value is missing (or
+    None, or not a number), so any comparison on them is False, as the
+    per-symbol code that raised and skipped the symbol. Screener fields
+    missing from a row take their value in `defaults` (the `.get(field,
+    default)` of the per-symbol code); symbols without a screener row are
+    NaN everywhere.
+    """
+
+    def __init__(self, symbols, store=None, screener=None, defaults=None):
+        self.symbols = list(symbols)
+        self.size = len(self.symbols)
+        self.store = store
+        self.screener_rows = [(screener or {}).get(symbol) for symbol in self.symbols]
+        self.defaults = defaults or {}
+        self.quotes = {}
+        self.columns = {}
+
+        # Symbols the quote store doesn't have fall back to json/quote, once
+        if store is not None:
+            self.rows = np.array([store.index.get(symbol, -1) for symbol in self.symbols], dtype=np.int64)
+        else:
+            self.rows = np.full(self.size, -1, dtype=np.int64)
+        self.fallback = {}
+        for i in np.flatnonzero(self.rows < 0).tolist():
+            quote = read_quote(self.symbols[i])
+            if quote:
+                self.fallback[i] = quote
+        self.has_quote = self.rows >= 0
+        self.has_quote[list(self.fallback)] = True
+
+    def quote(self, field, decimals=None):
+        """
+        Quote `field` of every symbol, rounded to `decimals` when given.
+        """
+        key = ('quote', field)
+        if key not in self.columns:
+            values = np.full(self.size, np.nan)
+            if self.store is not None and field in self.store.kinds and self.store.kinds[field] != 'text':
+                found = self.rows >= 0
+                values[found] = self.store.column(field)[self.rows[found]]
+            for i, quote in self.fallback.items():
+                values[i] = _number(quote.get(field))
+            self.columns[key] = values
+        values = self.columns[key]
+        return values if decimals is None else np.round(values, decimals)
+
+    def screener(self, field):
+        """
+        Numeric screener `field` of every symbol.
+        """
+        key = ('screener', field)
+        if key not in self.columns:
+            default = self.defaults.get(field)
+            self.columns[key] = np.array([np.nan if row is None else _number(row.get(field, default))
+                                          for row in self.screener_rows], dtype=np.float64)
+        return self.columns[key]
+
+    def text(self, field):
+        """
+        Screener `field` as an object column, for equality tests.
+        """
+        key = ('text', field)
+        if key not in self.columns:
+            default = self.defaults.get(field)
+            self.columns[key] = np.array([None if row is None else row.get(field, default)
+                                          for row in self.screener_rows], dtype=object)
+        return self.columns[key]
+
+    def isin(self, field, values):
+        values = set(values)
+        return np.fromiter((value in values for value in self.text(field)), dtype=bool, count=self.size)
+
+    def symbol_contains(self, text):
+        return np.fromiter((text in symbol for symbol in self.symbols), dtype=bool, count=self.size)
+
+    def quote_dict(self, i):
+        if i not in self.quotes:
+            self.quotes[i] = self.fallback[i] if i in self.fallback else self.store.get(self.symbols[i])
+        return self.quotes[i]
+
+    def column(self, spec, field):
+        return self.quote(field) if field in spec.get('quote', ()) else self.screener(field)
+
+
+def top_rows(keys, limit=None):
+    """
+    Positions of the `limit` smallest `keys` in ascending order, ties in
+    their original order (as a stable sort of the whole list would give),
+    found with argpartition instead of sorting everything.
+    """
+    if limit is not None and limit < len(keys):
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        kth = keys[np.argpartition(keys, limit - 1)[limit - 1]]
+        candidates = np.flatnonzero(keys <= kth)
+    else:
+        candidates = np.arange(len(keys))
+    order = np.argsort(keys[candidates], kind='stable')
+    return candidates[order[:limit]]
+
+
+def evaluate(frame, spec):
+    """
+    Ranked rows of one list spec:
+
+    - `where(frame)`: boolean mask of the symbols in the list
+    - `sort`, `descending` (default True) and `limit` (None for all)
+    - `quote` / `screener`: fields added to symbol, name, price and
+      changesPercentage, in that order, from the quote or the screener row
+    - `require`: quote fields that must be set besides price and
+      changesPercentage (which every list rounds)
+
+    Only the symbols that make the list are turned back into dicts.
+    """
+    mask = frame.has_quote & spec['where'](frame)
+    for field in ['price', 'changesPercentage', *spec.get('require', ())]:
+        mask &= ~np.isnan(frame.quote(field))
+    matched = np.flatnonzero(mask)
+
+    values = frame.column(spec, spec['sort'])[matched]
+    keys = -values if spec.get('descending', True) else values
+    keys = np.where(np.isnan(keys), np.inf, keys)
+    selected = matched[top_rows(keys, spec.get('limit'))]
+
+    result = []
+    for rank, i in enumerate(selected.tolist(), 1):
+        quote = frame.quote_dict(i)
+        item = {
+            'symbol': frame.symbols[i],
+            'name': quote.get('name'),
+            'price': round(quote.get('price'), 2),
+            'changesPercentage': round(quote.get('changesPercentage'), 2),
+        }
+        for field in spec.get('quote', ()):
+            item[field] = quote.get(field)
+        row = frame.screener_rows[i]
+        for field in spec.get('screener', ()):
+            item[field] = row.get(field, frame.defaults.get(field))
+        item['rank'] = rank
+        result.append(item)
+    return result
+
+
+def build_lists(frame, specs, directory=STOCK_LIST_PATH):
+    """
+    Evaluate every spec against `frame` and write {directory}/{name}.json.
+    Empty lists are not written, so the previous file stays. Returns
+    {name: number of rows}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for spec in specs:
+        try:
+            result = evaluate(frame, spec)
+        except Exception as e:
+            print(f"Error building list {spec['name']}: {e}")
+            continue
+        counts[spec['name']] = len(result)
+        if result:
+            with open(os.path.join(directory, f"{spec['name']}.json"), 'wb') as file:
+                file.write(orjson.dumps(result))
+    return counts
@@ -0,0 +1,110 @@
+import zlib
+
+import numpy as np
+
+
+# Horizons written to the pricePrediction column, in trading days
+HORIZONS = {'1W': 7, '1M': 30, '3M': 90, '6M': 180}
+PERCENTILES = [1, 50, 99.99]
+EMPTY_BAND = {'min': 0, 'mean': 0, 'max': 0}
+# Days of shocks drawn per step of a simulation
+BLOCK_DAYS = 16
+
+
+def symbol_rng(symbol, seed=42):
+    """
+    Independent, reproducible random stream per symbol: the same (seed,
+    symbol) always yields the same paths, regardless of batch order or of
+    which worker process simulates it.
+    """
+    return np.random.default_rng([seed, zlib.crc32(symbol.encode())])
+
+
+def log_return_stats(close):
+    """
+    Drift and volatility of the daily log returns, matching
+    `np.log(1 + pd.Series(close).pct_change())` with pandas' mean/std.
+    Returns (nan, nan) when there are fewer than two valid returns.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lr = np.diff(np.log(close))
+    lr = lr[np.isfinite(lr)]
+    if len(lr) < 2:
+        return np.nan, np.nan
+    mu = lr.mean()
+    sigma = lr.std(ddof=1)
+    return mu - sigma ** 2 / 2, sigma
+
+
+def simulate_terminal(last_close, drift, sigma, days, num_sim, rngs, dt=None, block_days=BLOCK_DAYS):
+    """
+    Price on the last day of `days`-day geometric Brownian motion paths, for
+    a batch of symbols: (symbol, trial) array. Day 0 is the last close;
+    every later day multiplies by exp(drift*dt + sigma*sqrt(dt)*Z).
+
+    Only the terminal log-price is kept: shocks are drawn `block_days` days
+    at a time into one buffer, scaled in place and added day by day (the
+    order a cumsum over the full path would use), so memory is
+    (block_days + 1) x batch x trials floats whatever the horizon.
+
+    `dt` defaults to days/num_sim, the step the original mc.py used.
+    """
+    n = len(last_close)
+    dt = days / num_sim if dt is None else dt
+    drift = np.asarray(drift, dtype=np.float64)[:, None, None]
+    scale = np.asarray(sigma, dtype=np.float64)[:, None, None] * np.sqrt(dt)
+    step = drift * dt
+
+    total = np.zeros((n, num_sim))
+    block = np.empty((n, max(1, min(block_days, days - 1)), num_sim))
+    for lo in range(1, days, block.shape[1]):
+        size = min(block.shape[1], days - lo)
+        shocks = block[:, :size, :]
+        # Consecutive draws continue each symbol's stream where they stopped
+        for i, rng in enumerate(rngs):
+            rng.standard_normal((size, num_sim), out=shocks[i])
+        shocks *= scale
+        shocks += step
+        for t in range(size):
+            total += shocks[:, t, :]
+    total += np.log(np.asarray(last_close, dtype=np.float64))[:, None]
+    return np.exp(total, out=total)
+
+
+def price_predictions(series, horizons=HORIZONS, num_sim=1000, seed=42, memory_budget=256 * 1024 ** 2):
+    """
+    {symbol: {label: {'min', 'mean', 'max'}}} for {symbol: close array}.
+
+    Symbols are simulated in batches whose buffers (the shock block, the
+    running terminal log-price and the copy np.percentile sorts) stay within
+    `memory_budget` bytes. Symbols without enough
+    history get the all-zero band the old implementation wrote on failure.
+    """
+    res = {symbol: {} for symbol in series}
+    stats = {}
+    for symbol, close in series.items():
+        close = np.asarray(close, dtype=np.float64)
+        drift, sigma = log_return_stats(close)
+        if len(close) and np.isfinite(close[-1]) and close[-1] > 0 and np.isfinite(drift) and np.isfinite(sigma):
+            stats[symbol] = (close[-1], drift, sigma)
+
+    valid = list(stats)
+    for label, days in horizons.items():
+        for symbol in series:
+            if symbol not in stats:
+                res[symbol][label] = dict(EMPTY_BAND)
+
+        live = min(BLOCK_DAYS, max(days - 1, 1)) + 2
+        batch = max(1, memory_budget // (live * num_sim * 8))
+        for lo in range(0, len(valid), batch):
+            chunk = valid[lo:lo + batch]
+            last_close, drift, sigma = (np.array(values) for values in zip(*(stats[symbol] for symbol in chunk)))
+            # Per-horizon stream so adding a horizon never shifts the others
+            rngs = [symbol_rng(f"{symbol}-{days}", seed) for symbol in chunk]
+            terminal = simulate_terminal(last_close, drift, sigma, days, num_sim, rngs)
+            low, mid, high = np.percentile(terminal, PERCENTILES, axis=-1)
+            for i, symbol in enumerate(chunk):
+                res[symbol][label] = {'min': float(low[i]), 'mean': float(mid[i]), 'max': float(high[i])}
+
+    return res
@@ -0,0 +1,197 @@
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+
+# Daily OHLC tables of stocks.db, etf.db and crypto.db: one table per symbol
+OHLC_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'change_percent']
+# Relative difference of the close of the last stored day that is taken as a
+# split or a restatement of the history
+ADJUSTMENT_TOLERANCE = 0.005
+# Missing days between two stored rows before the window is fetched again:
+# business days for stocks and ETFs (long weekends, holidays), calendar days
+# for crypto which trades every day
+MAX_GAP = 4
+GAPS_TABLE = 'ohlc_gaps'
+
+
+def ensure_ohlc_table(conn, symbol):
+    """
+    Create the OHLC table of `symbol`. Tables written by DataFrame.to_sql
+    have no unique date, they get a unique index (keeping the last row of a
+    duplicated date) so the upsert can use ON CONFLICT(date).
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS '{symbol}' (
+            date TEXT UNIQUE,
+            open FLOAT,
+            high FLOAT,
+            low FLOAT,
+            close FLOAT,
+            volume INT,
+            change_percent FLOAT
+        )
+    """)
+    unique = any(
+        index[2] and [column[2] for column in conn.execute(f"PRAGMA index_info('{index[1]}')")] == ['date']
+        for index in conn.execute(f"PRAGMA index_list('{symbol}')")
+    )
+    if not unique:
+        with conn:
+            conn.execute(f"DELETE FROM '{symbol}' WHERE rowid NOT IN (SELECT MAX(rowid) FROM '{symbol}' GROUP BY date)")
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS '{symbol}_date' ON '{symbol}' (date)")
+
+
+def ohlc_rows(payload):
+    """
+    Rows of an FMP historical-price-full payload, oldest first.
+    """
+    historical = payload.get('historical', []) if isinstance(payload, dict) else payload or []
+    rows = [(item['date'], item.get('open'), item.get('high'), item.get('low'), item.get('close'),
+             item.get('volume'), item.get('changePercent')) for item in historical if item.get('date')]
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def upsert_ohlc(conn, symbol, rows):
+    """
+    Insert or overwrite `rows` in one transaction. Returns the number of rows.
+    """
+    if not rows:
+        return 0
+    updates = ', '.join(f"{column}=excluded.{column}" for column in OHLC_COLUMNS[1:])
+    with conn:
+        conn.executemany(f"""
+            INSERT INTO '{symbol}' ({', '.join(OHLC_COLUMNS)}) VALUES ({', '.join('?' * len(OHLC_COLUMNS))})
+            ON CONFLICT(date) DO UPDATE SET {updates}
+        """, rows)
+    return len(rows)
+
+
+def find_gaps(dates, max_gap=MAX_GAP, business_days=True):
+    """
+    (after, before) pairs of consecutive stored dates with more than
+    `max_gap` missing days between them.
+    """
+    if len(dates) < 2:
+        return []
+    days = np.array(dates, dtype='datetime64[D]')
+    if business_days:
+        missing = np.busday_count(days[:-1] + 1, days[1:])
+    else:
+        missing = (days[1:] - days[:-1]).astype(int) - 1
+    return [(dates[i], dates[i + 1]) for i in np.flatnonzero(missing > max_gap)]
+
+
+def _shift(day, days):
+    return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _checked_gaps(conn, symbol):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {GAPS_TABLE} (symbol TEXT, gap_start TEXT, gap_end TEXT, checked_at TEXT, PRIMARY KEY (symbol, gap_start, gap_end))")
+    return set(conn.execute(f"SELECT gap_start, gap_end FROM {GAPS_TABLE} WHERE symbol = ?", (symbol,)).fetchall())
+
+
+async def sync_ohlc(conn, symbol, fetch, start_date, end_date, business_days=True):
+    """
+    Bring the OHLC table of `symbol` up to `end_date`. `fetch(from, to)` is a
+    coroutine returning the provider payload of that range.
+
+    - empty table: the whole range [start_date, end_date] is fetched
+    - otherwise only [last stored date, end_date]; when the overlapping day's
+      close moved (split, restated history) [start_date, last stored date]
+      is fetched again and overwritten
+    - windows between stored rows with more than MAX_GAP missing days are
+      fetched once; gaps the provider can't fill (halts, late listings) are
+      recorded in ohlc_gaps and not asked for again
+
+    Returns {'mode', 'calls', 'rows', 'gaps'}.
+    """
+    ensure_ohlc_table(conn, symbol)
+    stats = {'mode': 'current', 'calls': 0, 'rows': 0, 'gaps': 0}
+    last = conn.execute(f"SELECT date, close FROM '{symbol}' ORDER BY date DESC LIMIT 1").fetchone()
+
+    if last is None:
+        stats['mode'] = 'full'
+        rows = ohlc_rows(await fetch(start_date, end_date))
+        stats['calls'] += 1
+        stats['rows'] += upsert_ohlc(conn, symbol, rows)
+        return stats
+
+    last_date, last_close = last
+    if last_date < end_date:
+        stats['mode'] = 'delta'
+        rows = ohlc_rows(await fetch(last_date, end_date))
+        stats['calls'] += 1
+        overlap = next((row for row in rows if row[0] == last_date), None)
+        if overlap is not None and overlap[4] is not None and last_close:
+            if abs(overlap[4] - last_close) > ADJUSTMENT_TOLERANCE * abs(last_close):
+                stats['mode'] = 'adjusted'
+                history = ohlc_rows(await fetch(start_date, last_date))
+                stats['calls'] += 1
+                stats['rows'] += upsert_ohlc(conn, symbol, [row for row in history if row[0] < last_date])
+        stats['rows'] += upsert_ohlc(conn, symbol, rows)
+
+    dates = [row[0] for row in conn.execute(f"SELECT date FROM '{symbol}' ORDER BY date")]
+    checked = _checked_gaps(conn, symbol)
+    for after, before in find_gaps(dates, business_days=business_days):
+        if (after, before) in checked:
+            continue
+        rows = ohlc_rows(await fetch(_shift(after, 1), _shift(before, -1)))
+        stats['calls'] += 1
+        stats['gaps'] += 1
+        stats['rows'] += upsert_ohlc(conn, symbol, rows)
+        with conn:
+            conn.execute(f"INSERT OR REPLACE INTO {GAPS_TABLE} VALUES (?, ?, ?, ?)", (symbol, after, before, date.today().isoformat()))
+    return stats
+
+
+def upsert_symbols(conn, table, columns, rows):
+    """
+    Insert or update the symbol rows of the universe table (symbol first in
+    `columns`) in one transaction.
+    """
+    updates = ', '.join(f"{column}=excluded.{column}" for column in columns[1:])
+    with conn:
+        conn.executemany(f"""
+            INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})
+            ON CONFLICT(symbol) DO UPDATE SET {updates}
+        """, rows)
+
+
+def prune_symbols(conn, table, symbols, table_name=lambda symbol: symbol):
+    """
+    Drop the rows and OHLC tables of symbols that left the universe, now that
+    the databases are updated in place instead of being rebuilt.
+    """
+    if not symbols:
+        return []
+    keep = set(symbols)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    kept_tables = {table_name(symbol) for symbol in keep}
+    removed = [row[0] for row in conn.execute(f"SELECT symbol FROM {table}") if row[0] not in keep]
+    with conn:
+        for symbol in removed:
+            conn.execute(f"DELETE FROM {table} WHERE symbol = ?", (symbol,))
+            name = table_name(symbol)
+            if name in tables and name not in kept_tables and name not in (table, GAPS_TABLE):
+                conn.execute(f"DROP TABLE '{name}'")
+        if GAPS_TABLE in tables:
+            conn.executemany(f"DELETE FROM {GAPS_TABLE} WHERE symbol = ?", [(table_name(symbol),) for symbol in removed])
+    return removed
+
+
+def update_row(conn, table, symbol, values, column_type):
+    """
+    Write the fields in `values` to the row of `symbol` with one UPDATE,
+    adding the columns that don't exist yet (typed by `column_type(value)`).
+    """
+    if not values:
+        return
+    columns = {column[1] for column in conn.execute(f"PRAGMA table_info({table})")}
+    for column, value in values.items():
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type(value)}")
+    assignments = ', '.join(f"{column} = ?" for column in values)
+    with conn:
+        conn.execute(f"UPDATE {table} SET {assignments} WHERE symbol = ?", (*values.values(), symbol))
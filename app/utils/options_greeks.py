@@ -0,0 +1,151 @@
+import re
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+
+RISK_FREE_RATE = 0.0525
+CONTRACT_MULTIPLIER = 100
+GREEKS = ['delta', 'gamma', 'vanna', 'charm']
+# OCC option symbol: root, yymmdd expiry, C/P, strike x 1000
+OCC_PATTERN = re.compile(r'^([A-Z.]+?)(\d{6})([CP])(\d{8})$')
+
+
+def _pdf(x):
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def option_greeks(spot, strike, years, sigma, is_call, r=RISK_FREE_RATE):
+    """
+    Black-Scholes delta, gamma, vanna and charm of every contract at once.
+    Arguments are arrays (or scalars) broadcast together; contracts with no
+    time left, no volatility or no spot get zeros, as the scalar version
+    that support.py used did (see benchmarks/options_greeks.py).
+
+    - delta: per $1 of the underlying
+    - gamma: change of delta per $1
+    - vanna: change of delta per 1.00 of volatility
+    - charm: change of delta per year (decay of delta with time)
+    """
+    spot, strike, years, sigma, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64), np.asarray(strike, dtype=np.float64),
+        np.asarray(years, dtype=np.float64), np.asarray(sigma, dtype=np.float64), np.asarray(is_call, dtype=bool))
+    valid = (years > 0) & (sigma > 0) & (spot > 0) & (strike > 0)
+    # Dummy values where invalid so nothing below divides by zero
+    s = np.where(valid, spot, 1.0)
+    k = np.where(valid, strike, 1.0)
+    t = np.where(valid, years, 1.0)
+    v = np.where(valid, sigma, 1.0)
+
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(s / k) + (r + 0.5 * v ** 2) * t) / (v * sqrt_t)
+    d2 = d1 - v * sqrt_t
+    pdf = _pdf(d1)
+
+    delta = np.where(is_call, ndtr(d1), -ndtr(-d1))
+    gamma = pdf / (s * v * sqrt_t)
+    vanna = -pdf * d2 / v
+    # Without dividends the charm of a put equals the charm of the call
+    charm = -pdf * (2 * r * t - d2 * v * sqrt_t) / (2 * t * v * sqrt_t)
+
+    return {name: np.where(valid, value, 0.0) for name, value in
+            (('delta', delta), ('gamma', gamma), ('vanna', vanna), ('charm', charm))}
+
+
+def parse_option_symbols(option_symbols):
+    """
+    (root, expiry as datetime64[D], is_call, strike) arrays of OCC option
+    symbols; unparsable symbols get an empty root.
+    """
+    parts = pd.Series(option_symbols, dtype=object).str.extract(OCC_PATTERN)
+    valid = parts[0].notna().to_numpy()
+    expiry = pd.to_datetime(parts[1].where(parts[1].notna(), '700101'), format='%y%m%d').to_numpy().astype('datetime64[D]')
+    strike = pd.to_numeric(parts[3], errors='coerce').fillna(0).to_numpy() / 1000
+    return parts[0].fillna('').to_numpy(), expiry, (parts[2] == 'C').to_numpy() & valid, strike
+
+
+def chain_from_contracts(contracts, spot, ticker=None):
+    """
+    Columnar chain of an Unusual Whales option-contracts response (one dict
+    per contract with option_symbol, implied_volatility, open_interest).
+    """
+    contracts = [item for item in contracts if item.get('option_symbol')]
+    root, expiry, is_call, strike = parse_option_symbols([item['option_symbol'] for item in contracts])
+    return {
+        'ticker': np.full(len(contracts), ticker, dtype=object) if ticker else root,
+        'strike': strike,
+        'expiry': expiry,
+        'is_call': is_call,
+        'iv': np.array([float(item.get('implied_volatility') or 0) for item in contracts]),
+        'oi': np.array([float(item.get('open_interest') or 0) for item in contracts]),
+        'spot': np.full(len(contracts), float(spot)),
+    }
+
+
+def concat_chains(chains):
+    """
+    One chain of several tickers, so they are all computed in one pass.
+    """
+    chains = [chain for chain in chains if len(chain['strike'])]
+    if not chains:
+        return {}
+    return {key: np.concatenate([chain[key] for chain in chains]) for key in chains[0]}
+
+
+def exposures(chain, as_of=None, r=RISK_FREE_RATE):
+    """
+    Dollar exposures of every contract of `chain`, dealer signed (puts
+    negative for gamma):
+
+    - delta: delta x OI x 100 x spot
+    - gamma: gamma x OI x 100 x spot^2 x 1% (delta change for a 1% move)
+    - vanna: vanna x OI x 100 x spot x 1% (delta change per volatility point)
+    - charm: charm x OI x 100 x spot / 365 (delta change per day)
+    """
+    as_of = np.datetime64(as_of or date.today(), 'D')
+    years = (chain['expiry'] - as_of).astype(np.int64) / 365.0
+    greeks = option_greeks(chain['spot'], chain['strike'], years, chain['iv'], chain['is_call'], r)
+    notional = chain['oi'] * CONTRACT_MULTIPLIER * chain['spot']
+    sign = np.where(chain['is_call'], 1.0, -1.0)
+    return {
+        'delta': greeks['delta'] * notional,
+        'gamma': sign * greeks['gamma'] * notional * chain['spot'] * 0.01,
+        'vanna': greeks['vanna'] * notional * 0.01,
+        'charm': greeks['charm'] * notional / 365,
+    }
+
+
+def exposure_profiles(chain, by='strike', as_of=None, r=RISK_FREE_RATE, decimals=2):
+    """
+    Exposure per ticker and strike (or expiry), calls and puts apart, with
+    one grouped reduction over the whole chain. Returns {ticker: [{by,
+    call_delta, put_delta, call_gamma, ...}, ...]} sorted by `by`.
+    """
+    if not chain or not len(chain['strike']):
+        return {}
+    values = exposures(chain, as_of, r)
+    ticker_code, tickers = pd.factorize(chain['ticker'], sort=True)
+    if by == 'strike':
+        groups, group_code = np.unique(chain['strike'], return_inverse=True)
+        labels = groups.tolist()
+    elif by == 'expiry':
+        groups, group_code = np.unique(chain['expiry'], return_inverse=True)
+        labels = groups.astype(str).tolist()
+    else:
+        raise ValueError(f"Unknown grouping {by}")
+
+    keys, inverse = np.unique(ticker_code.astype(np.int64) * len(groups) + group_code, return_inverse=True)
+    fields = [by]
+    columns = [np.array(labels, dtype=object)[keys % len(groups)].tolist()]
+    for name in GREEKS:
+        for side, mask in (('call', chain['is_call']), ('put', ~chain['is_call'])):
+            fields.append(f"{side}_{name}")
+            columns.append(np.round(np.bincount(inverse, weights=np.where(mask, values[name], 0.0), minlength=len(keys)), decimals).tolist())
+    records = [dict(zip(fields, row)) for row in zip(*columns)]
+
+    # Keys are sorted by ticker first, so each ticker is one slice of records
+    owner = keys // len(groups)
+    bounds = [0, *(np.flatnonzero(np.diff(owner)) + 1).tolist(), len(keys)]
+    return {str(tickers[owner[start]]): records[start:end] for start, end in zip(bounds[:-1], bounds[1:])}
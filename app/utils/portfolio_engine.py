@@ -0,0 +1,258 @@
+import os
+
+import numpy as np
+import orjson
+
+
+INITIAL_BUDGET = 100000
+# PocketBase batch requests per transaction
+BATCH_SIZE = 50
+PORTFOLIO_STATE_PATH = 'json/portfolio/positions.json'
+
+# Record attribute (as the PocketBase client names it) of each written field
+FIELDS = {
+    'accountValue': 'account_value',
+    'overallReturn': 'overall_return',
+    'availableCash': 'available_cash',
+    'holdings': 'holdings',
+    'rank': 'rank',
+}
+
+
+def apply_transactions(cash, shares, transactions):
+    """
+    Cash and share count per symbol after `transactions`, in order (the
+    same arithmetic as replaying the whole trading history).
+    """
+    shares = dict(shares)
+    for transaction in transactions:
+        kind = transaction['type']
+        if kind == 'buy':
+            cash -= transaction['numberOfShares'] * transaction['price']
+            shares[transaction['symbol']] = shares.get(transaction['symbol'], 0) + transaction['numberOfShares']
+        elif kind == 'sell':
+            cash += transaction['numberOfShares'] * transaction['price']
+            shares[transaction['symbol']] = shares.get(transaction['symbol'], 0) - transaction['numberOfShares']
+    return cash, shares
+
+
+class PortfolioEngine:
+    """
+    Values the paper-trading portfolios of PocketBase and writes back what
+    changed.
+
+    Cash and shares derived from each portfolio's trading history are kept
+    in `state_path` together with how many transactions they include and
+    the last of them, so a run only applies transactions appended since the
+    last one. The whole history is replayed when it got shorter or its
+    transaction at that position changed; an edit further back that leaves
+    both in place is not detected.
+    All portfolios are valued against one price vector, ranked with one
+    sort, and only changed fields are sent, in batch transactions.
+
+    `pb` is a PocketBase client (or anything with the same collection/send
+    calls).
+    """
+
+    def __init__(self, pb, state_path=PORTFOLIO_STATE_PATH, batch_size=BATCH_SIZE, initial_budget=INITIAL_BUDGET):
+        self.pb = pb
+        self.state_path = state_path
+        self.batch_size = batch_size
+        self.initial_budget = initial_budget
+        self.positions = self.load_state()
+        self.stats = {'portfolios': 0, 'replayed': 0, 'transactions': 0, 'failed': 0,
+                      'changed': 0, 'written': 0, 'batches': 0, 'fallback_calls': 0}
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'rb') as file:
+                return orjson.loads(file.read())
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'wb') as file:
+            file.write(orjson.dumps(self.positions))
+        os.replace(tmp, self.state_path)
+
+    def load_portfolios(self, since):
+        return self.pb.collection("portfolios").get_full_list(query_params={"filter": f'created >= "{since}"'})
+
+    def position(self, portfolio_id, history):
+        """
+        (cash, shares) of a portfolio, applying only the transactions its
+        stored position doesn't include yet. The stored position is dropped
+        when the history is shorter than what was applied or the last
+        applied transaction differs.
+        """
+        state = self.positions.get(portfolio_id)
+        applied = state['applied'] if state else 0
+        if state is None or len(history) < applied or (applied and history[applied - 1] != state['last']):
+            if state is not None:
+                self.stats['replayed'] += 1
+            state = {'applied': 0, 'last': None, 'cash': self.initial_budget, 'shares': {}}
+        new = history[state['applied']:]
+        if new:
+            cash, shares = apply_transactions(state['cash'], state['shares'], new)
+            state = {'applied': len(history), 'last': history[-1], 'cash': cash, 'shares': shares}
+            self.stats['transactions'] += len(new)
+        self.positions[portfolio_id] = state
+        return state['cash'], state['shares']
+
+    def value(self, records, quotes):
+        """
+        New field values of every portfolio with a trading history, valued at
+        `quotes` ({symbol: price}). Returns {id: fields}; portfolios that
+        can't be valued (bad transaction or holding) are left out.
+        """
+        symbols = list(quotes)
+        code = {symbol: i for i, symbol in enumerate(symbols)}
+        prices = np.array([np.nan if quotes[s] is None else quotes[s] for s in symbols], dtype=np.float64)
+
+        # One row per cash balance and per quoted holding, each portfolio's
+        # cash first, so the per-portfolio sum adds up in the same order as
+        # cash + price x shares holding by holding
+        owner, quote_code, amount, bought, where = [], [], [], [], []
+        portfolios = []
+        for record in records:
+            history = record.trading_history
+            if not history:
+                continue
+            try:
+                cash, shares = self.position(record.id, history)
+                holdings = [dict(holding) for holding in record.holdings] if record.holdings else []
+                rows = []
+                for n, holding in enumerate(holdings):
+                    if holding['symbol'] in shares:
+                        holding['numberOfShares'] = shares[holding['symbol']]
+                    i = code.get(holding['symbol'])
+                    if i is not None:
+                        rows.append((i, float(holding['numberOfShares']), float(holding['boughtPrice']), n))
+            except Exception as e:
+                print(f"Error valuing portfolio {record.id}: {e}")
+                self.stats['failed'] += 1
+                continue
+            k = len(portfolios)
+            portfolios.append((record, cash, holdings))
+            if holdings:
+                owner.append(k)
+                quote_code.append(-1)
+                amount.append(cash)
+                bought.append(np.nan)
+                where.append(-1)
+                for i, number, bought_price, n in rows:
+                    owner.append(k)
+                    quote_code.append(i)
+                    amount.append(number)
+                    bought.append(bought_price)
+                    where.append(n)
+
+        owner = np.array(owner, dtype=np.int64)
+        quote_code = np.array(quote_code, dtype=np.int64)
+        amount = np.array(amount, dtype=np.float64)
+        bought = np.array(bought, dtype=np.float64)
+        is_holding = quote_code >= 0
+        price = np.where(is_holding, prices[np.maximum(quote_code, 0)] if len(prices) else np.nan, np.nan)
+        weights = np.where(is_holding, price * amount, amount)
+        account_values = np.bincount(owner, weights=weights, minlength=len(portfolios))
+        # A missing price, or a zero or missing buy price, can't be valued
+        bad = np.zeros(len(portfolios), dtype=bool)
+        bad[owner[is_holding & (np.isnan(price) | np.isnan(amount) | np.isnan(bought) | (bought == 0))]] = True
+        with np.errstate(divide='ignore', invalid='ignore'):
+            changes = ((price / bought - 1) * 100).tolist()
+
+        rows_of = {}
+        for row in np.flatnonzero(is_holding).tolist():
+            rows_of.setdefault(int(owner[row]), []).append(row)
+
+        result = {}
+        budget = self.initial_budget
+        for k, (record, cash, holdings) in enumerate(portfolios):
+            if bad[k]:
+                print(f"Error valuing portfolio {record.id}: missing or zero price")
+                self.stats['failed'] += 1
+                continue
+            if holdings:
+                for row in rows_of.get(k, []):
+                    holding = holdings[where[row]]
+                    holding['currentPrice'] = quotes[holding['symbol']]
+                    holding['sinceBoughtChange'] = round(changes[row], 2)
+                account_value = account_values[k].item() if k in rows_of else cash
+                result[record.id] = {
+                    'accountValue': account_value,
+                    'overallReturn': round((account_value / budget - 1) * 100, 2),
+                    'availableCash': cash,
+                    'holdings': holdings,
+                }
+            else:
+                overall_return = (cash - budget) / budget * 100
+                account_value = round(budget * (1 + overall_return / 100), 2)
+                result[record.id] = {
+                    'accountValue': account_value,
+                    'overallReturn': overall_return,
+                    'availableCash': account_value,
+                }
+        self.stats['portfolios'] += len(result)
+        return result
+
+    @staticmethod
+    def rank(values):
+        """
+        Rank by overall return, best first; ties keep the record order.
+        """
+        ids = list(values)
+        returns = np.array([values[portfolio_id]['overallReturn'] for portfolio_id in ids], dtype=np.float64)
+        order = np.argsort(-returns, kind='stable')
+        for rank, i in enumerate(order.tolist(), 1):
+            values[ids[i]]['rank'] = rank
+        return values
+
+    @staticmethod
+    def changed_fields(record, fields):
+        return {name: value for name, value in fields.items() if getattr(record, FIELDS[name], None) != value}
+
+    def write(self, updates):
+        """
+        PATCH {id: changed fields}, one PocketBase batch transaction per
+        `batch_size` records; a failed batch is retried record by record.
+        """
+        items = list(updates.items())
+        for lo in range(0, len(items), self.batch_size):
+            chunk = items[lo:lo + self.batch_size]
+            requests = [{'method': 'PATCH', 'url': f"/api/collections/portfolios/records/{portfolio_id}", 'body': body}
+                        for portfolio_id, body in chunk]
+            try:
+                self.pb.send("/api/batch", {"method": "POST", "body": {"requests": requests}})
+                self.stats['batches'] += 1
+                self.stats['written'] += len(chunk)
+                continue
+            except Exception as e:
+                print(f"Batch write failed, falling back to single calls: {e}")
+
+            for portfolio_id, body in chunk:
+                try:
+                    self.pb.collection("portfolios").update(portfolio_id, body)
+                    self.stats['fallback_calls'] += 1
+                    self.stats['written'] += 1
+                except Exception as e:
+                    print(f"Failed to update portfolio {portfolio_id}: {e}")
+
+    def update(self, records, quotes):
+        """
+        One valuation run over `records`: value, rank, write the changes and
+        save the positions of `records` (deleted portfolios are dropped).
+        """
+        values = self.rank(self.value(records, quotes))
+        by_id = {record.id: record for record in records}
+        updates = {}
+        for portfolio_id, fields in values.items():
+            changed = self.changed_fields(by_id[portfolio_id], fields)
+            if changed:
+                updates[portfolio_id] = changed
+        self.stats['changed'] += len(updates)
+        self.write(updates)
+        self.positions = {portfolio_id: state for portfolio_id, state in self.positions.items() if portfolio_id in by_id}
+        self.save_state()
+        return values
@@ -0,0 +1,224 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+
+BOT_USER_ID = '9ncz4wunmhk0k52'  # stocknear bot id
+# PocketBase batch requests per transaction (two per triggered alert)
+BATCH_SIZE = 50
+
+
+def pb_timestamp(value):
+    """
+    PocketBase filter literal for a record's `updated` value (datetime or string).
+    """
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3] + 'Z'
+    return str(value)
+
+
+def alert_from_record(record):
+    """
+    Plain dict of a priceAlert record, or None when it can't be indexed.
+    """
+    try:
+        condition = record.condition
+        if condition not in ('above', 'below'):
+            return None
+        return {
+            'id': record.id,
+            'symbol': record.symbol.upper(),
+            'condition': condition,
+            'target_price': round(float(record.target_price), 2),
+            'user': record.user,
+            'asset_type': record.asset_type,
+            'triggered': bool(record.triggered),
+            'updated': pb_timestamp(record.updated),
+        }
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class AlertIndex:
+    """
+    Active alerts per symbol as two sorted threshold arrays. An 'above' alert
+    fires once price >= target, a 'below' alert once price <= target, so for
+    a new price the fired alerts are a prefix of the above array and a suffix
+    of the below array, found with one bisect each.
+    """
+
+    def __init__(self):
+        self.alerts = {}
+        # symbol -> (targets, ids), targets ascending
+        self.above = {}
+        self.below = {}
+
+    def __len__(self):
+        return len(self.alerts)
+
+    def __contains__(self, alert_id):
+        return alert_id in self.alerts
+
+    def symbols(self):
+        return set(self.above) | set(self.below)
+
+    def _side(self, alert):
+        return self.above if alert['condition'] == 'above' else self.below
+
+    def add(self, alert):
+        self.remove(alert['id'])
+        targets, ids = self._side(alert).setdefault(alert['symbol'], ([], []))
+        i = bisect_right(targets, alert['target_price'])
+        targets.insert(i, alert['target_price'])
+        ids.insert(i, alert['id'])
+        self.alerts[alert['id']] = alert
+
+    def remove(self, alert_id):
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return None
+        side = self._side(alert)
+        targets, ids = side[alert['symbol']]
+        i = bisect_left(targets, alert['target_price'])
+        while ids[i] != alert_id:
+            i += 1
+        del targets[i], ids[i]
+        if not targets:
+            del side[alert['symbol']]
+        return alert
+
+    def crossed(self, symbol, price):
+        """
+        Remove and return the alerts of `symbol` that `price` triggers.
+        """
+        price = round(price, 2)
+        fired = []
+        above = self.above.get(symbol)
+        if above is not None:
+            k = bisect_right(above[0], price)
+            if k:
+                fired += above[1][:k]
+                del above[0][:k], above[1][:k]
+                if not above[0]:
+                    del self.above[symbol]
+        below = self.below.get(symbol)
+        if below is not None:
+            k = bisect_left(below[0], price)
+            if k < len(below[0]):
+                fired += below[1][k:]
+                del below[0][k:], below[1][k:]
+                if not below[0]:
+                    del self.below[symbol]
+        return [{**self.alerts.pop(alert_id), 'current_price': price} for alert_id in fired]
+
+
+class PriceAlertEngine:
+    """
+    Keeps the untriggered priceAlert records of PocketBase in an AlertIndex,
+    resolves price updates against it and writes triggered alerts back.
+
+    `pb` is a PocketBase client (or anything with the same collection/send
+    calls). Its methods block, so the async caller runs `load_*` and
+    `write_triggered` in a thread and applies the results on the loop.
+    """
+
+    def __init__(self, pb, batch_size=BATCH_SIZE):
+        self.pb = pb
+        self.batch_size = batch_size
+        self.index = AlertIndex()
+        self.since = None
+        self.pending = []
+        # id -> `updated` of alerts fired here, so a sync that still sees
+        # them untriggered does not re-arm them before the write lands
+        self.fired = {}
+        self.stats = {'synced': 0, 'triggered': 0, 'written': 0, 'batches': 0, 'fallback_calls': 0}
+
+    def load_all(self):
+        return self.pb.collection("priceAlert").get_full_list(query_params={"filter": 'triggered=false'})
+
+    def load_changed(self):
+        # >= so records sharing the last timestamp are not missed, re-adding is idempotent
+        return self.pb.collection("priceAlert").get_full_list(query_params={"filter": f'updated >= "{self.since}"'})
+
+    def apply_full(self, records):
+        """
+        Rebuild the index; also the only way deleted alerts leave it.
+        """
+        self.index = AlertIndex()
+        self.since = None
+        self.apply_changed(records)
+
+    def apply_changed(self, records):
+        for record in records:
+            alert = alert_from_record(record)
+            if alert is None:
+                continue
+            if alert['triggered']:
+                self.index.remove(alert['id'])
+                self.fired.pop(alert['id'], None)
+            elif alert['updated'] > self.fired.get(alert['id'], ''):
+                # Newer than the fired version means the user re-armed it
+                self.fired.pop(alert['id'], None)
+                self.index.add(alert)
+            if self.since is None or alert['updated'] > self.since:
+                self.since = alert['updated']
+            self.stats['synced'] += 1
+
+    def on_price(self, symbol, price):
+        """
+        Resolve one price update; triggered alerts are queued for `write_triggered`.
+        """
+        fired = self.index.crossed(symbol.upper(), price)
+        if fired:
+            for alert in fired:
+                self.fired[alert['id']] = alert['updated']
+            self.pending += fired
+            self.stats['triggered'] += len(fired)
+        return fired
+
+    def take_pending(self):
+        pending, self.pending = self.pending, []
+        return pending
+
+    def _requests(self, alert):
+        notification = {
+            'opUser': alert['user'],
+            'user': BOT_USER_ID,
+            'notifyType': 'priceAlert',
+            'priceAlert': alert['id'],
+            'liveResults': {'symbol': alert['symbol'], 'assetType': alert['asset_type'], 'condition': alert['condition'],
+                            'targetPrice': alert['target_price'], 'currentPrice': alert['current_price']},
+        }
+        return [
+            {'method': 'PATCH', 'url': f"/api/collections/priceAlert/records/{alert['id']}", 'body': {'triggered': True}},
+            {'method': 'POST', 'url': '/api/collections/notifications/records', 'body': notification},
+        ], notification
+
+    def write_triggered(self, alerts):
+        """
+        Mark `alerts` triggered and create their notifications, one PocketBase
+        batch transaction per `batch_size` requests. A batch that fails (batch
+        API disabled, alert deleted meanwhile) is retried call by call so one
+        bad record doesn't hold back the others.
+        """
+        per_batch = max(1, self.batch_size // 2)
+        for lo in range(0, len(alerts), per_batch):
+            chunk = alerts[lo:lo + per_batch]
+            requests = [request for alert in chunk for request in self._requests(alert)[0]]
+            try:
+                self.pb.send("/api/batch", {"method": "POST", "body": {"requests": requests}})
+                self.stats['batches'] += 1
+                self.stats['written'] += len(chunk)
+                continue
+            except Exception as e:
+                print(f"Batch write failed, falling back to single calls: {e}")
+
+            for alert in chunk:
+                try:
+                    self.pb.collection("priceAlert").update(alert['id'], {"triggered": True})
+                    self.pb.collection('notifications').create(self._requests(alert)[1])
+                    self.stats['fallback_calls'] += 2
+                    self.stats['written'] += 1
+                except Exception as e:
+                    print(f"Failed to write price alert {alert['id']}: {e}")
+                    # Let the next sync re-arm it
+                    self.fired.pop(alert['id'], None)
@@ -0,0 +1,233 @@
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import orjson
+import pandas as pd
+
+
+# Column files of a store. Every symbol occupies one contiguous, date-sorted
+# slice [offset, offset + length) in each of them.
+COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+DTYPES = {
+    'date': 'datetime64[D]',
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+}
+STORE_VERSION = 1
+
+# sqlite database -> (symbol table, store directory)
+DEFAULT_STORES = {
+    'stocks.db': ('stocks', 'price_store/stocks'),
+    'etf.db': ('etfs', 'price_store/etf'),
+    'crypto.db': ('cryptos', 'price_store/crypto'),
+}
+
+
+def _to_datetime64(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value[:10]
+    return np.datetime64(value, 'D')
+
+
+class PriceStore:
+    """
+    Read-only view of a columnar OHLCV store written by `import_sqlite`.
+    All column files are memory mapped, so `get` returns zero-copy slices.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'index.json'), 'rb') as file:
+            meta = orjson.loads(file.read())
+
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported price store version {meta.get('version')} in {path}")
+
+        self.built_at = meta.get('built_at')
+        self.index = {symbol: (offset, length) for symbol, (offset, length) in meta['symbols'].items()}
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+            for name in COLUMNS
+        }
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def symbols(self):
+        return list(self.index.keys())
+
+    def _bounds(self, symbol, start=None, end=None):
+        offset, length = self.index[symbol]
+        lo, hi = offset, offset + length
+        if start is not None or end is not None:
+            dates = self.columns['date'][lo:hi]
+            if start is not None:
+                lo = offset + int(np.searchsorted(dates, _to_datetime64(start), side='left'))
+            if end is not None:
+                hi = offset + int(np.searchsorted(dates, _to_datetime64(end), side='right'))
+        return lo, hi
+
+    def get(self, symbol, start=None, end=None, fields=COLUMNS):
+        """
+        Return {field: array} for one symbol. The arrays are read-only views
+        into the mapped files, restricted to start <= date <= end.
+        """
+        lo, hi = self._bounds(symbol, start, end)
+        return {name: self.columns[name][lo:hi] for name in fields}
+
+    def get_many(self, symbols, start=None, end=None, fields=COLUMNS):
+        return {
+            symbol: self.get(symbol, start, end, fields)
+            for symbol in symbols if symbol in self.index
+        }
+
+    def frame(self, symbol, start=None, end=None, fields=COLUMNS):
+        """
+        Drop-in for the per-ticker `pd.read_sql_query` calls: a DataFrame with
+        the requested columns and `date` formatted as YYYY-MM-DD strings.
+        """
+        data = self.get(symbol, start, end, fields)
+        df = pd.DataFrame({name: np.asarray(values) for name, values in data.items()})
+        if 'date' in df:
+            df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+        return df
+
+    def matrix(self, symbols, field='close', start=None, end=None):
+        """
+        Align `field` of several symbols on the union of their dates.
+        Returns (dates, symbols, values) where values has shape
+        (len(dates), len(symbols)) and NaN marks a missing bar.
+        """
+        symbols = [symbol for symbol in symbols if symbol in self.index]
+        bounds = [self._bounds(symbol, start, end) for symbol in symbols]
+        date_col = self.columns['date']
+        value_col = self.columns[field]
+
+        if not bounds:
+            return np.array([], dtype='datetime64[D]'), symbols, np.empty((0, 0))
+
+        dates = np.unique(np.concatenate([date_col[lo:hi] for lo, hi in bounds]))
+        values = np.full((len(dates), len(symbols)), np.nan)
+        for j, (lo, hi) in enumerate(bounds):
+            rows = np.searchsorted(dates, date_col[lo:hi])
+            values[rows, j] = value_col[lo:hi]
+
+        return dates, symbols, values
+
+
+def open_stores(stores=DEFAULT_STORES):
+    """
+    Open every store that exists on disk, keyed by its database file name.
+    """
+    res = {}
+    for db_path, (_, store_path) in stores.items():
+        if os.path.exists(os.path.join(store_path, 'index.json')):
+            res[db_path] = PriceStore(store_path)
+    return res
+
+
+def import_sqlite(db_path, table, out_path):
+    """
+    Convert the one-table-per-ticker layout of stocks.db / etf.db / crypto.db
+    into a columnar store. Rows are counted first so the column files can be
+    preallocated and filled without holding the whole history in memory.
+    The new store is swapped in atomically once it is complete.
+    """
+    con = sqlite3.connect(db_path)
+    cursor = con.cursor()
+    cursor.execute("PRAGMA journal_mode = wal")
+    cursor.execute(f"SELECT DISTINCT symbol FROM {table}")
+    symbols = sorted(row[0] for row in cursor.fetchall())
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    symbols = [symbol for symbol in symbols if symbol in tables]
+
+    counts = {}
+    for symbol in symbols:
+        cursor.execute(f'SELECT COUNT(*) FROM "{symbol}" WHERE date IS NOT NULL')
+        counts[symbol] = cursor.fetchone()[0]
+    total = sum(counts.values())
+
+    tmp_path = out_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = {
+        name: np.lib.format.open_memmap(os.path.join(tmp_path, f"{name}.npy"), mode='w+', dtype=DTYPES[name], shape=(total,))
+        for name in COLUMNS
+    }
+
+    index = {}
+    offset = 0
+    for symbol in symbols:
+        try:
+            cursor.execute(f"""
+                SELECT date, open, high, low, close, volume
+                FROM "{symbol}"
+                WHERE date IS NOT NULL
+                ORDER BY date
+            """)
+            rows = cursor.fetchall()
+        except Exception as e:
+            print(f"Error reading {symbol}: {e}")
+            continue
+
+        # Keep the last row per date in case a table holds duplicates
+        by_date = {str(row[0])[:10]: row for row in rows}
+        rows = [by_date[key] for key in sorted(by_date)]
+        # Never write past the slice reserved by the COUNT pass
+        rows = rows[:counts[symbol]]
+        length = len(rows)
+        if length == 0:
+            continue
+
+        end = offset + length
+        columns['date'][offset:end] = np.array([str(row[0])[:10] for row in rows], dtype='datetime64[D]')
+        for i, name in enumerate(COLUMNS[1:], start=1):
+            columns[name][offset:end] = np.array([np.nan if row[i] is None else row[i] for row in rows], dtype=np.float64)
+
+        index[symbol] = [offset, length]
+        offset = end
+
+    con.close()
+
+    for column in columns.values():
+        column.flush()
+    columns.clear()
+
+    # Trim the preallocated files when duplicate dates were dropped
+    if offset < total:
+        for name in COLUMNS:
+            file_path = os.path.join(tmp_path, f"{name}.npy")
+            data = np.load(file_path, mmap_mode='r')[:offset].copy()
+            np.save(file_path, data)
+
+    with open(os.path.join(tmp_path, 'index.json'), 'wb') as file:
+        file.write(orjson.dumps({
+            'version': STORE_VERSION,
+            'built_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'source': db_path,
+            'columns': COLUMNS,
+            'symbols': index,
+        }))
+
+    old_path = out_path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(out_path):
+        os.rename(out_path, old_path)
+    os.rename(tmp_path, out_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    return len(index), offset
@@ -0,0 +1,199 @@
+import os
+import shutil
+from datetime import datetime
+
+import numpy as np
+import orjson
+
+
+# Snapshot of every json/quote/{symbol}.json written by cron_quote.py.
+# quotes.npy holds one row per symbol as a structured array (one field per
+# numeric quote key), present.npy which keys each quote has, meta.json the
+# symbol order and the text fields.
+QUOTE_STORE_PATH = 'json/quote-store'
+QUOTE_STORE_VERSION = 2
+
+INT_MISSING = np.iinfo(np.int64).min
+# Side column of a 'number' field: the exact value of the quotes holding an int
+INT_SUFFIX = '#int'
+
+
+def _field_kind(values):
+    # 'int' or 'float' when every value has that type, 'number' when ints and
+    # floats mix (e.g. volume across stocks and crypto), 'text' otherwise
+    seen = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return 'text'
+        if isinstance(value, int) and abs(value) >= 2 ** 63 - 1:
+            return 'text'
+        seen.add(type(value))
+    if seen == {int}:
+        return 'int'
+    return 'number' if int in seen else 'float'
+
+
+class QuoteStore:
+    """
+    Read-only, memory-mapped view of the quote snapshot.
+
+    `get(symbol)` rebuilds the quote dict in O(1), with the keys and value
+    types of the symbol's own quote; `column(field)` and
+    `take(symbols, field)` return numeric vectors (NaN for missing values)
+    for universe-wide filters without touching a single json file.
+    """
+
+    def __init__(self, path=QUOTE_STORE_PATH):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'rb') as file:
+            meta = orjson.loads(file.read())
+
+        if meta.get('version') != QUOTE_STORE_VERSION:
+            raise ValueError(f"Unsupported quote store version {meta.get('version')} in {path}")
+
+        self.built_at = meta.get('built_at')
+        self.fields = meta['fields']
+        self.kinds = meta['kinds']
+        self.text = meta['text']
+        self.symbol_list = meta['symbols']
+        self.index = {symbol: i for i, symbol in enumerate(self.symbol_list)}
+        self.data = np.load(os.path.join(path, 'quotes.npy'), mmap_mode='r')
+        self.present = np.load(os.path.join(path, 'present.npy'), mmap_mode='r')
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    def __len__(self):
+        return len(self.symbol_list)
+
+    @property
+    def symbols(self):
+        return list(self.symbol_list)
+
+    def _value(self, field, i):
+        kind = self.kinds[field]
+        if kind == 'text':
+            return self.text[field][i]
+        if kind == 'number':
+            value = self.data[field + INT_SUFFIX][i]
+            if value != INT_MISSING:
+                return int(value)
+        value = self.data[field][i]
+        if kind == 'int':
+            return None if value == INT_MISSING else int(value)
+        return None if np.isnan(value) else float(value)
+
+    def get(self, symbol, default=None):
+        """
+        The quote dict of `symbol`, or `default`: the keys it had (missing
+        keys are left out, null values kept) with their int/float/text
+        values. Keys come in store order, not the json file's.
+        """
+        i = self.index.get(symbol)
+        if i is None:
+            return default
+        return {field: self._value(field, i) for field, present in zip(self.fields, self.present[i].tolist()) if present}
+
+    def column(self, field):
+        """
+        Numeric column over all symbols (in `symbols` order) as float64.
+        """
+        values = np.asarray(self.data[field])
+        if self.kinds[field] == 'int':
+            return np.where(values == INT_MISSING, np.nan, values.astype(np.float64))
+        return values
+
+    def take(self, symbols, field):
+        """
+        `field` for `symbols` as a float64 vector, NaN for unknown symbols.
+        """
+        rows = np.array([self.index.get(symbol, -1) for symbol in symbols], dtype=np.int64)
+        values = self.column(field)
+        if len(values) == 0:
+            return np.full(len(rows), np.nan)
+        res = values[np.maximum(rows, 0)]
+        res[rows < 0] = np.nan
+        return res
+
+
+def open_quote_store(path=QUOTE_STORE_PATH):
+    """
+    QuoteStore of `path`, or None when no snapshot has been written yet.
+    """
+    try:
+        return QuoteStore(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Quote store unavailable, falling back to json/quote: {e}")
+        return None
+
+
+def read_quote(symbol, store=None):
+    """
+    Quote of `symbol` from `store` when it has it, otherwise from
+    json/quote/{symbol}.json. Returns None when neither has the symbol.
+    """
+    if store is not None:
+        quote = store.get(symbol)
+        if quote is not None:
+            return quote
+    try:
+        with open(f"json/quote/{symbol}.json", 'rb') as file:
+            return orjson.loads(file.read())
+    except Exception:
+        return None
+
+
+def write_quote_store(quotes, path=QUOTE_STORE_PATH):
+    """
+    Write {symbol: quote dict} as a new snapshot and swap it in atomically.
+    Readers that still map the previous snapshot keep a valid view.
+    """
+    symbols = sorted(quotes)
+    fields = list(dict.fromkeys(key for symbol in symbols for key in quotes[symbol]))
+    kinds = {field: _field_kind(quotes[symbol].get(field) for symbol in symbols) for field in fields}
+
+    numeric = [field for field in fields if kinds[field] != 'text']
+    columns = [(field, np.int64 if kinds[field] == 'int' else np.float64) for field in numeric]
+    columns += [(field + INT_SUFFIX, np.int64) for field in numeric if kinds[field] == 'number']
+    data = np.zeros(len(symbols), dtype=np.dtype(columns))
+    for field in numeric:
+        values = [quotes[symbol].get(field) for symbol in symbols]
+        if kinds[field] == 'int':
+            data[field] = [INT_MISSING if v is None else v for v in values]
+        else:
+            data[field] = [np.nan if v is None else v for v in values]
+        if kinds[field] == 'number':
+            data[field + INT_SUFFIX] = [v if isinstance(v, int) else INT_MISSING for v in values]
+
+    present = np.array([[field in quotes[symbol] for field in fields] for symbol in symbols], dtype=bool).reshape(len(symbols), len(fields))
+
+    text = {
+        field: [quotes[symbol].get(field) for symbol in symbols]
+        for field in fields if kinds[field] == 'text'
+    }
+
+    tmp_path = path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    np.save(os.path.join(tmp_path, 'quotes.npy'), data)
+    np.save(os.path.join(tmp_path, 'present.npy'), present)
+    with open(os.path.join(tmp_path, 'meta.json'), 'wb') as file:
+        file.write(orjson.dumps({
+            'version': QUOTE_STORE_VERSION,
+            'built_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'fields': fields,
+            'kinds': kinds,
+            'symbols': symbols,
+            'text': text,
+        }))
+
+    old_path = path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    return len(symbols)
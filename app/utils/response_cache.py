@@ -0,0 +1,199 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import orjson
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class _Entry:
+    __slots__ = ('signature', 'etag', 'identity', 'gzip', 'br', 'nbytes')
+
+    def __init__(self, signature, body):
+        self.signature = signature
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.identity = body
+        self.gzip = gzip.compress(body, compresslevel=6)
+        self.br = brotli.compress(body, quality=5) if brotli is not None else None
+        self.nbytes = len(body) + len(self.gzip) + (len(self.br) if self.br else 0)
+
+
+def _accepts(accept_encoding, coding):
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip().lower() == coding:
+            return params.replace(' ', '').lower() not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _is_valid_json(body):
+    """
+    True when `body` parses as strict JSON. Rejects empty or half-written
+    files as well as the NaN/Infinity tokens json.dump lets through, which
+    the endpoints' orjson.loads never served either. Run once per entry.
+    """
+    try:
+        orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return False
+    return True
+
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class FileResponseCache:
+    """
+    In-process cache of JSON files ready to be sent as HTTP bodies.
+
+    Each entry keeps the file bytes as written (parsed once to validate,
+    never re-serialized) together with a gzip (and, when the brotli package is
+    installed, a brotli) encoding and a strong ETag derived from the content. Entries are keyed by path and validated against the
+    file's (mtime_ns, size) on every request, so a cron job rewriting a file
+    is picked up on the next hit without any explicit invalidation. The
+    cache is bounded by total bytes and evicts least recently used entries.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 ** 2, executor=None):
+        self.max_bytes = max_bytes
+        self.executor = executor
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.nbytes
+
+    def _drop(self, path):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.total_bytes -= entry.nbytes
+
+    def lookup(self, path):
+        """
+        Cached entry for `path` if it is still current, without reading the
+        file. Returns (entry or None, signature or None).
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self.lock:
+                self._drop(path)
+            return None, None
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.signature == signature:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry, signature
+        return None, signature
+
+    def get(self, path):
+        """
+        Return the up-to-date entry for `path`, or None when the file does
+        not exist or is not valid JSON.
+        """
+        entry, signature = self.lookup(path)
+        if entry is not None or signature is None:
+            return entry
+        return self._load(path, signature)
+
+    def _load(self, path, signature):
+        try:
+            with open(path, 'rb') as file:
+                body = file.read()
+        except OSError:
+            return None
+        # Served as written once it parses: the crons write compact JSON
+        if not _is_valid_json(body):
+            return None
+
+        entry = _Entry(signature, body)
+        with self.lock:
+            self.misses += 1
+            self._drop(path)
+            if entry.nbytes <= self.max_bytes:
+                self.entries[path] = entry
+                self.total_bytes += entry.nbytes
+                self._evict()
+        return entry
+
+    def invalidate(self, path=None):
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+                self.total_bytes = 0
+            else:
+                self._drop(path)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+            }
+
+    async def response(self, request, path, default=None):
+        """
+        Serve `path` for `request`: 304 when If-None-Match matches the
+        current ETag, otherwise the best encoding the client accepts.
+        A missing or unreadable file is answered with `default` (uncached),
+        matching the `except: res = []` fallback of the endpoints.
+        Misses are read and compressed on `executor`.
+        """
+        entry, signature = self.lookup(path)
+        if entry is None and signature is not None:
+            loop = asyncio.get_running_loop()
+            entry = await loop.run_in_executor(self.executor, self._load, path, signature)
+        if entry is None:
+            return Response(content=orjson.dumps(default), media_type="application/json")
+
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self.lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        accept_encoding = request.headers.get("accept-encoding", "")
+        if entry.br is not None and _accepts(accept_encoding, 'br'):
+            headers["Content-Encoding"] = "br"
+            body = entry.br
+        elif _accepts(accept_encoding, 'gzip'):
+            headers["Content-Encoding"] = "gzip"
+            body = entry.gzip
+        else:
+            body = entry.identity
+        return Response(content=body, media_type="application/json", headers=headers)
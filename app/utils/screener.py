@@ -0,0 +1,1161 @@
+import math
+import os
+import sqlite3
+import time
+import concurrent.futures
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import orjson
+import pandas as pd
+
+from utils.country_list import country_list
+from utils.price_store import PriceStore
+from utils.quote_store import open_quote_store, read_quote
+
+
+query_shares = f"""
+    SELECT 
+        historicalShares
+    FROM 
+        stocks
+    WHERE
+        symbol = ?
+"""
+
+
+time_frames = {
+    'change1W': (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'),
+    'change1M': (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
+    'change3M': (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'),
+    'change6M': (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d'),
+    'change1Y': (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d'),
+    'change3Y': (datetime.now() - timedelta(days=365 * 3)).strftime('%Y-%m-%d'),
+}
+
+one_year_ago = datetime.now() - timedelta(days=365)
+
+def calculate_price_changes(symbol, item, store):
+    try:
+        # Last close on or before each time frame date, read from the mmap'd price store
+        for name, date in time_frames.items():
+            item[name] = None  # Initialize to None
+
+            close = store.get(symbol, end=date, fields=['close'])['close']
+            
+            # Check if data was retrieved and calculate the percentage change
+            if len(close) > 0:
+                past_price = float(close[-1])
+                current_price = item['price']
+                change = round(((current_price - past_price) / past_price) * 100, 2)
+                
+                # Set item[name] to None if the change is -100
+                item[name] = None if change == -100 else change
+                
+    except:
+        # Handle exceptions by setting all fields to None
+        for name in time_frames.keys():
+            item[name] = None
+
+
+def calculate_share_changes(symbol, item, con):
+    item['sharesQoQ'] = None
+    item['sharesYoY'] = None
+    item['floatShares'] = None
+    try: 
+        cursor = con.cursor()
+        cursor.execute(query_shares, (symbol,))
+        shareholder_statistics = orjson.loads(cursor.fetchone()[0])
+        
+        # Keys to keep
+        keys_to_keep = ["date", "floatShares", "outstandingShares"]
+
+        # Create new list with only the specified keys and convert floatShares and outstandingShares to integers
+        shareholder_statistics = [
+            {key: int(d[key]) if key in ["floatShares", "outstandingShares"] else d[key] 
+             for key in keys_to_keep}
+            for d in shareholder_statistics
+        ]
+
+        shareholder_statistics = sorted(shareholder_statistics, key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'), reverse=False)
+        #Add latest float shares for statistics page
+        item['floatShares'] = shareholder_statistics[-1]['floatShares']
+        historical_shares = filter_data_quarterly(shareholder_statistics)
+        
+        latest_data = historical_shares[-1]['outstandingShares']
+        previous_quarter = historical_shares[-2]['outstandingShares']
+        previous_year = historical_shares[-4]['outstandingShares']
+
+        item['sharesQoQ'] = round((latest_data/previous_quarter-1)*100,2)
+        item['sharesYoY'] = round((latest_data/previous_year-1)*100,2)
+    except:
+        item['sharesQoQ'] = None
+        item['sharesYoY'] = None
+        item['floatShares'] = None
+
+
+def filter_data_quarterly(data):
+    # Generate a range of quarter-end dates from the start to the end date
+    start_date = data[0]['date']
+    end_date = datetime.today().strftime('%Y-%m-%d')
+    quarter_ends = pd.date_range(start=start_date, end=end_date, freq='QE').strftime('%Y-%m-%d').tolist()
+
+    # Filter data to keep only entries with dates matching quarter-end dates
+    filtered_data = [entry for entry in data if entry['date'] in quarter_ends]
+    
+    return filtered_data
+
+
+def count_consecutive_growth_years(financial_data, key_element):
+    # Sort the financial data by date
+    financial_data = sorted(financial_data, key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d'))
+    
+    consecutive_years = 0
+    prev_val = None
+
+    for data in financial_data:
+        current_val = data[key_element] #e.g. revenue
+        
+        if current_val is not None:
+            if prev_val is not None:
+                if current_val > prev_val:
+                    consecutive_years += 1
+                else:
+                    consecutive_years = 0
+            prev_val = current_val
+
+    # Check one last time in case the streak continues to the end
+    
+    return consecutive_years
+
+
+def filter_latest_analyst_unique_rating(data):
+    latest_entries = {}
+
+    for entry in data:
+        try:
+            # Create a unique key by combining 'analyst' and 'name'
+            key = f"{entry.get('analyst')}-{entry.get('name')}"
+
+            # Convert date and time to a datetime object
+            date_time_str = f"{entry.get('date')}"
+            date_time = datetime.strptime(date_time_str, "%Y-%m-%d")
+
+            # Check if this entry is the latest for the given key
+            if key not in latest_entries or date_time > latest_entries[key]['dateTime']:
+                latest_entries[key] = {'dateTime': date_time, 'entry': entry}
+        except Exception as e:
+            print(f"Error processing entry: {e}")
+
+    # Extract and return the latest entries
+    return [value['entry'] for value in latest_entries.values()]
+
+def process_top_analyst_data(data, current_price):
+    data = [item for item in data if item.get('analystScore', 0) >= 4] if data else []
+    data = filter_latest_analyst_unique_rating(data)
+    # Filter recent data from the last 12 months
+    recent_data = [
+        item for item in data
+        if 'date' in item and datetime.strptime(item['date'], "%Y-%m-%d") >= one_year_ago
+    ][:30]  # Consider only the last 30 ratings
+
+    # Count filtered analysts
+    if len(recent_data) > 0:
+        filtered_analyst_count = len(recent_data)
+
+        # Extract and filter price targets
+        price_targets = [
+            float(item['adjusted_pt_current']) for item in recent_data
+            if 'adjusted_pt_current' in item and item['adjusted_pt_current'] and not math.isnan(float(item['adjusted_pt_current']))
+        ]
+
+        # Calculate median price target
+        median_price_target = None
+        if price_targets:
+            price_targets.sort()
+            median_index = len(price_targets) // 2
+            median_price_target = (
+                price_targets[median_index]
+                if len(price_targets) % 2 != 0 else
+                (price_targets[median_index - 1] + price_targets[median_index]) / 2
+            )
+        if median_price_target <= 0:
+            median_price_target = None
+        # Calculate changes percentage
+        upside = None
+        if median_price_target != None  and current_price is not None:
+            upside = round(((median_price_target / current_price - 1) * 100), 2)
+
+        # Define rating scores
+        rating_scores = {
+            "Strong Buy": 5,
+            "Buy": 4,
+            "Hold": 3,
+            "Sell": 2,
+            "Strong Sell": 1,
+        }
+
+        # Calculate total rating score
+        total_rating_score = sum(
+            rating_scores.get(item.get('rating_current'), 0) for item in recent_data
+        )
+
+        # Calculate average rating score
+        average_rating_score = (
+            round(total_rating_score / filtered_analyst_count,2)
+            if filtered_analyst_count > 0 else 0
+        )
+
+        # Determine consensus rating
+        if average_rating_score >= 4.5:
+            consensus_rating = "Strong Buy"
+        elif average_rating_score >= 3.5:
+            consensus_rating = "Buy"
+        elif average_rating_score >= 2.5:
+            consensus_rating = "Hold"
+        elif average_rating_score >= 1.5:
+            consensus_rating = "Sell"
+        elif average_rating_score >= 1.0:
+            consensus_rating = "Strong Sell"
+        else:
+            consensus_rating = None
+
+        return {
+            "topAnalystCounter": filtered_analyst_count,
+            "topAnalystPriceTarget": median_price_target,
+            "topAnalystUpside": upside,
+            "topAnalystRating": consensus_rating,
+        }
+    else:
+        return {
+            "topAnalystCounter": None,
+            "topAnalystPriceTarget": None,
+            "topAnalystUpside": None,
+            "topAnalystRating": None,
+        }
+
+
+def process_financial_data(file_path, key_list):
+    """
+    Read JSON data from file and extract specified keys with rounding.
+    """
+    data = defaultdict(lambda: None)  # Initialize with default value of None
+    try:
+        with open(file_path, 'r') as file:
+            res = orjson.loads(file.read())[0]
+            for key in key_list:
+                if key in res:
+                    try:
+                        value = float(res[key])
+                        if 'growth' in file_path or key in ['longTermDebtToCapitalization','totalDebtToCapitalization']:
+                            value = value*100  # Multiply by 100 for percentage
+
+                        data[key] = round(value, 2) if value is not None else None
+                    except (ValueError, TypeError):
+                        # If there's an issue converting the value, leave it as None
+                        data[key] = None
+    except (FileNotFoundError, KeyError, IndexError):
+        # If the file doesn't exist or there's an issue reading the data,
+        # data will retain None as the default value for all keys
+        pass
+
+    return data
+
+def check_and_process(file_path, key_list):
+    """
+    Check if the file exists, and then process the financial data if it does.
+    If the file doesn't exist, return a dictionary with all keys set to None.
+    """
+    if os.path.exists(file_path):
+        return process_financial_data(file_path, key_list)
+    else:
+        return {key: None for key in key_list}
+
+# Keys extracted from each annual financial statement file
+key_ratios = [
+    "currentRatio", "quickRatio", "cashRatio", "daysOfSalesOutstanding",
+    "daysOfInventoryOutstanding", "operatingCycle", "daysOfPayablesOutstanding",
+    "cashConversionCycle", "grossProfitMargin", "operatingProfitMargin",
+    "pretaxProfitMargin", "netProfitMargin", "effectiveTaxRate", "returnOnAssets",
+    "returnOnEquity", "returnOnCapitalEmployed", "netIncomePerEBT", "ebtPerEbit",
+    "ebitPerRevenue", "debtRatio", "debtEquityRatio", "longTermDebtToCapitalization",
+    "totalDebtToCapitalization", "interestCoverage", "cashFlowToDebtRatio",
+    "companyEquityMultiplier", "receivablesTurnover", "payablesTurnover",
+    "inventoryTurnover", "fixedAssetTurnover", "assetTurnover",
+    "operatingCashFlowPerShare", "freeCashFlowPerShare", "cashPerShare", "payoutRatio",
+    "operatingCashFlowSalesRatio", "freeCashFlowOperatingCashFlowRatio",
+    "cashFlowCoverageRatios", "shortTermCoverageRatios", "capitalExpenditureCoverageRatio",
+    "dividendPaidAndCapexCoverageRatio", "dividendPayoutRatio", "priceBookValueRatio",
+    "priceToBookRatio", "priceToSalesRatio", "priceEarningsRatio", "priceToFreeCashFlowsRatio",
+    "priceToOperatingCashFlowsRatio", "priceCashFlowRatio", "priceEarningsToGrowthRatio",
+    "priceSalesRatio", "dividendYield", "enterpriseValueMultiple", "priceFairValue"
+]
+
+key_cash_flow = [
+    "netIncome", "depreciationAndAmortization", "deferredIncomeTax", "stockBasedCompensation",
+    "changeInWorkingCapital", "accountsReceivables", "inventory", "accountsPayables",
+    "otherWorkingCapital", "otherNonCashItems", "netCashProvidedByOperatingActivities",
+    "investmentsInPropertyPlantAndEquipment", "acquisitionsNet", "purchasesOfInvestments",
+    "salesMaturitiesOfInvestments", "otherInvestingActivites", "netCashUsedForInvestingActivites",
+    "debtRepayment", "commonStockIssued", "commonStockRepurchased", "dividendsPaid",
+    "otherFinancingActivites", "netCashUsedProvidedByFinancingActivities", "effectOfForexChangesOnCash",
+    "netChangeInCash", "cashAtEndOfPeriod", "cashAtBeginningOfPeriod", "operatingCashFlow",
+    "capitalExpenditure", "freeCashFlow"
+]
+
+key_income = [
+    "revenue", "costOfRevenue", "grossProfit", "grossProfitRatio",
+    "researchAndDevelopmentExpenses", "generalAndAdministrativeExpenses", "sellingAndMarketingExpenses",
+    "sellingGeneralAndAdministrativeExpenses", "otherExpenses", "operatingExpenses",
+    "costAndExpenses", "interestIncome", "interestExpense", "depreciationAndAmortization",
+    "ebitda", "ebitdaratio", "operatingIncome", "operatingIncomeRatio",
+    "totalOtherIncomeExpensesNet", "incomeBeforeTax", "incomeBeforeTaxRatio", "incomeTaxExpense",
+    "netIncome", "netIncomeRatio", "eps", "epsdiluted", "weightedAverageShsOut",
+    "weightedAverageShsOutDil"
+]
+
+key_balance_sheet = [
+    "cashAndCashEquivalents", "shortTermInvestments", "cashAndShortTermInvestments",
+    "netReceivables", "inventory", "otherCurrentAssets", "totalCurrentAssets",
+    "propertyPlantEquipmentNet", "goodwill", "intangibleAssets", "goodwillAndIntangibleAssets",
+    "longTermInvestments", "taxAssets", "otherNonCurrentAssets", "totalNonCurrentAssets",
+    "otherAssets", "totalAssets", "accountPayables", "shortTermDebt", "taxPayables",
+    "deferredRevenue", "otherCurrentLiabilities", "totalCurrentLiabilities", "longTermDebt",
+    "deferredRevenueNonCurrent", "deferredTaxLiabilitiesNonCurrent", "otherNonCurrentLiabilities",
+    "totalNonCurrentLiabilities", "otherLiabilities", "capitalLeaseObligations", "totalLiabilities",
+    "preferredStock", "commonStock", "retainedEarnings", "accumulatedOtherComprehensiveIncomeLoss",
+    "othertotalStockholdersEquity", "totalStockholdersEquity", "totalEquity",
+    "totalLiabilitiesAndStockholdersEquity", "minorityInterest", "totalLiabilitiesAndTotalEquity",
+    "totalInvestments", "totalDebt", "netDebt"
+]
+
+key_income_growth = [
+    "growthRevenue",
+    "growthCostOfRevenue",
+    "growthGrossProfit",
+    "growthGrossProfitRatio",
+    "growthResearchAndDevelopmentExpenses",
+    "growthGeneralAndAdministrativeExpenses",
+    "growthSellingAndMarketingExpenses",
+    "growthOtherExpenses",
+    "growthOperatingExpenses",
+    "growthCostAndExpenses",
+    "growthInterestExpense",
+    "growthDepreciationAndAmortization",
+    "growthEBITDA",
+    "growthEBITDARatio",
+    "growthOperatingIncome",
+    "growthOperatingIncomeRatio",
+    "growthTotalOtherIncomeExpensesNet",
+    "growthIncomeBeforeTax",
+    "growthIncomeBeforeTaxRatio",
+    "growthIncomeTaxExpense",
+    "growthNetIncome",
+    "growthNetIncomeRatio",
+    "growthEPS",
+    "growthEPSDiluted",
+    "growthWeightedAverageShsOut",
+    "growthWeightedAverageShsOutDil"
+]
+key_cash_flow_growth = [
+    "growthNetIncome",
+    "growthDepreciationAndAmortization",
+    "growthDeferredIncomeTax",
+    "growthStockBasedCompensation",
+    "growthChangeInWorkingCapital",
+    "growthAccountsReceivables",
+    "growthInventory",
+    "growthAccountsPayables",
+    "growthOtherWorkingCapital",
+    "growthOtherNonCashItems",
+    "growthNetCashProvidedByOperatingActivites",
+    "growthInvestmentsInPropertyPlantAndEquipment",
+    "growthAcquisitionsNet",
+    "growthPurchasesOfInvestments",
+    "growthSalesMaturitiesOfInvestments",
+    "growthOtherInvestingActivites",
+    "growthNetCashUsedForInvestingActivites",
+    "growthDebtRepayment",
+    "growthCommonStockIssued",
+    "growthCommonStockRepurchased",
+    "growthDividendsPaid",
+    "growthOtherFinancingActivites",
+    "growthNetCashUsedProvidedByFinancingActivities",
+    "growthEffectOfForexChangesOnCash",
+    "growthNetChangeInCash",
+    "growthCashAtEndOfPeriod",
+    "growthCashAtBeginningOfPeriod",
+    "growthOperatingCashFlow",
+    "growthCapitalExpenditure",
+    "growthFreeCashFlow"
+]
+key_balance_sheet_growth = [
+    "growthCashAndCashEquivalents",
+    "growthShortTermInvestments",
+    "growthCashAndShortTermInvestments",
+    "growthNetReceivables",
+    "growthInventory",
+    "growthOtherCurrentAssets",
+    "growthTotalCurrentAssets",
+    "growthPropertyPlantEquipmentNet",
+    "growthGoodwill",
+    "growthIntangibleAssets",
+    "growthGoodwillAndIntangibleAssets",
+    "growthLongTermInvestments",
+    "growthTaxAssets",
+    "growthOtherNonCurrentAssets",
+    "growthTotalNonCurrentAssets",
+    "growthOtherAssets",
+    "growthTotalAssets",
+    "growthAccountPayables",
+    "growthShortTermDebt",
+    "growthTaxPayables",
+    "growthDeferredRevenue",
+    "growthOtherCurrentLiabilities",
+    "growthTotalCurrentLiabilities",
+    "growthLongTermDebt",
+    "growthDeferredRevenueNonCurrent",
+    "growthDeferredTaxLiabilitiesNonCurrent",
+    "growthOtherNonCurrentLiabilities",
+    "growthTotalNonCurrentLiabilities",
+    "growthOtherLiabilities",
+    "growthTotalLiabilities",
+    "growthCommonStock",
+    "growthRetainedEarnings",
+    "growthAccumulatedOtherComprehensiveIncomeLoss",
+    "growthOtherTotalStockholdersEquity",
+    "growthTotalStockholdersEquity",
+    "growthTotalLiabilitiesAndStockholdersEquity",
+    "growthTotalInvestments",
+    "growthTotalDebt",
+    "growthNetDebt"
+]
+
+financial_statement_files = [
+    ("json/financial-statements/ratios/annual/{symbol}.json", key_ratios),
+    ("json/financial-statements/cash-flow-statement/annual/{symbol}.json", key_cash_flow),
+    ("json/financial-statements/income-statement/annual/{symbol}.json", key_income),
+    ("json/financial-statements/balance-sheet-statement/annual/{symbol}.json", key_balance_sheet),
+    ("json/financial-statements/income-statement-growth/annual/{symbol}.json", key_income_growth),
+    ("json/financial-statements/balance-sheet-statement-growth/annual/{symbol}.json", key_balance_sheet_growth),
+    ("json/financial-statements/cash-flow-statement-growth/annual/{symbol}.json", key_cash_flow_growth)
+]
+
+
+def get_financial_statements(item, symbol):
+    """
+    Update item with financial data from various JSON files.
+    """
+
+    # Process each financial statement
+    for file_path, key_list in financial_statement_files:
+        item.update(check_and_process(file_path.format(symbol=symbol), key_list))
+    
+    try:
+        item['freeCashFlowMargin'] = round((item['freeCashFlow'] / item['revenue']) * 100,2)
+    except:
+        item['freeCashFlowMargin'] = None
+    try:
+        item['ebitdaMargin'] = round((item['ebitda'] / item['revenue']) * 100,2)
+    except:
+        item['ebitdaMargin'] = None
+    try:
+        item['revenuePerEmployee'] = round((item['revenue'] / item['employees']),2)
+    except:
+        item['revenuePerEmployee'] = None
+    try:
+        item['profitPerEmployee'] = round((item['netIncome'] / item['employees']),2)
+    except:
+        item['profitPerEmployee'] = None
+    try:
+        tax_rate = item['incomeTaxExpense'] / item['incomeBeforeTax'] if item['incomeBeforeTax'] != 0 else 0
+        nopat = item['operatingIncome'] * (1 - tax_rate)
+        invested_capital = item['totalDebt'] + item['totalEquity']
+        item['returnOnInvestedCapital'] = round((nopat / invested_capital)*100,2) if invested_capital != 0 else None
+    except:
+        item['returnOnInvestedCapital'] = None
+    try:
+        item['researchDevelopmentRevenueRatio'] = round((item['researchAndDevelopmentExpenses'] / item['revenue']) * 100,2)
+    except:
+        item['researchDevelopmentRevenueRatio'] = None
+    try:
+        item['ebit'] = item['operatingIncome']
+        item['operatingMargin'] = round((item['operatingIncome'] / item['revenue']) * 100,2)
+        item['ebitMargin'] = item['operatingMargin']
+    except:
+        item['ebit'] = None
+        item['operatingMargin'] = None
+        item['ebitMargin'] = None
+
+
+    return item
+
+def get_market_ratios(item):
+    """
+    Ratios of statement values to the quote price and market cap.
+    """
+    try:
+        item['earningsYield'] = round((item['eps'] / item['price']) * 100,2)
+    except:
+        item['earningsYield'] = None
+    try:
+        item['freeCashFlowYield'] = round((item['freeCashFlow'] / item['marketCap']) * 100,2)
+    except:
+        item['freeCashFlowYield'] = None
+    try:
+        item['shortTermDebtToCapitalization'] = round((item['shortTermDebt'] / item['marketCap']) * 100,1)
+    except:
+        item['shortTermDebtToCapitalization'] = None
+    try:
+        item['interestIncomeToCapitalization'] = round((item['interestIncome'] / item['marketCap']) * 100,1)
+    except:
+        item['interestIncomeToCapitalization'] = None
+
+    return item
+
+def get_halal_compliant(item, debt_threshold=30, interest_threshold=30, revenue_threshold=5, liquidity_threshold=30, forbidden_industries=None):
+    # Set default forbidden industries if not provided
+    if forbidden_industries is None:
+        forbidden_industries = {'Alcohol', 'Equity', 'Palantir','Holding', 'Acquisition','Tobacco', 'Gambling', 'Weapons', 'Pork', 'Aerospace', 'Defense', 'Asset', 'Banks'}
+
+    # Ensure all required fields are present
+    required_fields = [
+        'longTermDebtToCapitalization', 
+        'shortTermDebtToCapitalization', 
+        'interestIncomeToCapitalization', 
+        'cashAndCashEquivalents',  # Field for liquidity
+        'totalAssets',  # Field for liquidity
+        'name', 
+        'industry',
+        'country',
+    ]
+    for field in required_fields:
+        if field not in item:
+            halal_compliant = None  # In case of missing data
+            return halal_compliant
+
+    # Calculate liquidity ratio
+    liquidity_ratio = (item['cashAndCashEquivalents'] / item['totalAssets']) * 100
+
+    # Apply halal-compliance checks
+    if (item['country'] == 'United States'
+        and item['longTermDebtToCapitalization'] < debt_threshold
+        and item['shortTermDebtToCapitalization'] < debt_threshold
+        and item['interestIncomeToCapitalization'] < interest_threshold
+        and liquidity_ratio < liquidity_threshold  # Liquidity ratio check
+        and not any(sector in item['name'] for sector in forbidden_industries)
+        and not any(industry in item['industry'] for industry in forbidden_industries)):
+
+        halal_compliant = 'Compliant'
+    else:
+        halal_compliant = 'Non-Compliant'
+    return halal_compliant
+
+def get_country_name(country_code):
+    for country in country_list:
+        if country['short'] == country_code:
+            return country['long']
+    return None
+
+def calculate_cagr(start_value, end_value, periods):
+    try:
+        return round(((end_value / start_value) ** (1 / periods) - 1) * 100, 2)
+    except:
+        return None
+
+
+
+# ---------------------------------------------------------------------------
+# Field extractors. Each one receives the parsed source file (or None when the
+# source has no file) and writes its fields into `item`. Any exception sets
+# all fields declared for the source to None, like the old try/except blocks.
+# ---------------------------------------------------------------------------
+
+def load_quote(symbol, ctx):
+    quote = read_quote(symbol, ctx.get('quote_store'))
+    if quote is None:
+        raise FileNotFoundError(f"No quote for {symbol}")
+    return quote
+
+def extract_quote(symbol, item, res, ctx):
+    item['price'] = round(float(res['price']),2)
+    item['changesPercentage'] = round(float(res['changesPercentage']),2)
+    item['avgVolume'] = int(res['avgVolume'])
+    item['volume'] = int(res['volume'])
+    item['relativeVolume'] = round(( item['volume'] / item['avgVolume'] )*100,2)
+    item['pe'] = round(float(res['pe']),2)
+    item['marketCap'] = int(res['marketCap'])
+
+def extract_price_changes(symbol, item, res, ctx):
+    calculate_price_changes(symbol, item, ctx['price_store'])
+
+def extract_share_changes(symbol, item, res, ctx):
+    calculate_share_changes(symbol, item, ctx['con'])
+
+def extract_stockdeck(symbol, item, res, ctx):
+    try:
+        item['employees'] = int(res['fullTimeEmployees'])
+        item['sharesOutStanding'] = int(res['sharesOutstanding'])
+        item['country'] = get_country_name(res['country'])
+        item['sector'] = res['sector']
+        item['industry'] = res['industry']
+    except:
+        item['employees'] = None
+        item['sharesOutStanding'] = None
+        item['country'] = None
+        item['sector'] = None
+        item['industry'] = None
+
+    try:
+        data = res['stockSplits'][0]
+        item['lastStockSplit'] = data['date']
+        item['splitType'] = 'forward' if data['numerator'] > data['denominator'] else 'backward'
+        item['splitRatio'] = f"{data['numerator']}"+":"+f"{data['denominator']}"
+    except:
+        item['lastStockSplit'] = None
+        item['splitType'] = None
+        item['splitRatio'] = None
+
+def extract_profile(symbol, item, res, ctx):
+    item['isin'] = res['isin']
+
+def extract_financial_statements(symbol, item, res, ctx):
+    item.update(get_financial_statements(item, symbol))
+
+def extract_market_ratios(symbol, item, res, ctx):
+    item.update(get_market_ratios(item))
+
+def extract_income_history(symbol, item, res, ctx):
+    try:
+        # Ensure there are enough elements in the list
+        if len(res) >= 5:
+            latest_revenue = int(res[0].get('revenue', 0))
+            revenue_3_years_ago = int(res[2].get('revenue', 0))
+            revenue_5_years_ago = int(res[4].get('revenue', 0))
+
+            latest_eps = int(res[0].get('eps', 0))
+            eps_3_years_ago = int(res[2].get('eps', 0))  # eps 3 years ago
+            eps_5_years_ago = int(res[4].get('eps', 0))  # eps 5 years ago
+            
+            item['cagr3YearRevenue'] = calculate_cagr(revenue_3_years_ago, latest_revenue, 3)
+            item['cagr5YearRevenue'] = calculate_cagr(revenue_5_years_ago, latest_revenue, 5)
+            item['cagr3YearEPS'] = calculate_cagr(eps_3_years_ago, latest_eps, 3)
+            item['cagr5YearEPS'] = calculate_cagr(eps_5_years_ago, latest_eps, 5)
+        else:
+            item['cagr3YearRevenue'] = None
+            item['cagr5YearRevenue'] = None
+            item['cagr3YearEPS'] = None
+            item['cagr5YearEPS'] = None
+    except:
+        item['cagr3YearRevenue'] = None
+        item['cagr5YearRevenue'] = None
+        item['cagr3YearEPS'] = None
+        item['cagr5YearEPS'] = None
+
+    try:
+        item['revenueGrowthYears'] = count_consecutive_growth_years(res, "revenue")
+        item['epsGrowthYears'] = count_consecutive_growth_years(res, 'eps')
+        item['netIncomeGrowthYears'] = count_consecutive_growth_years(res, 'netIncome')
+        item['grossProfitGrowthYears'] = count_consecutive_growth_years(res, 'grossProfit')
+    except:
+        item['revenueGrowthYears'] = None
+        item['epsGrowthYears'] = None
+        item['netIncomeGrowthYears'] = None
+        item['grossProfitGrowthYears'] = None
+
+def extract_var(symbol, item, res, ctx):
+    item['var'] = res['history'][-1]['var']
+
+def extract_enterprise_values(symbol, item, res, ctx):
+    ev = res[-1]['enterpriseValue']
+    item['enterpriseValue'] = ev
+    item['evSales'] = round(ev / item['revenue'],2)
+    item['evEarnings'] = round(ev / item['netIncome'],2)
+    item['evEBITDA'] = round(ev / item['ebitda'],2)
+    item['evEBIT'] = round(ev / item['ebit'],2)
+    item['evFCF'] = round(ev / item['freeCashFlow'],2)
+
+def extract_analyst_summary(symbol, item, res, ctx):
+    item['analystRating'] = res['consensusRating']
+    item['analystCounter'] = res['numOfAnalyst']
+    item['priceTarget'] = res['medianPriceTarget']
+    item['upside'] = round((item['priceTarget']/item['price']-1)*100, 1) if item['price'] else None
+
+def extract_analyst_history(symbol, item, res, ctx):
+    item.update(process_top_analyst_data(res, item['price']))
+
+def extract_fail_to_deliver(symbol, item, res, ctx):
+    res = res[-1]
+    item['failToDeliver'] = res['failToDeliver']
+    item['relativeFTD'] = round((item['failToDeliver']/item['avgVolume'] )*100,2)
+
+def extract_ownership_stats(symbol, item, res, ctx):
+    if res['ownershipPercent'] > 100:
+        item['institutionalOwnership'] = 99.99
+    else:
+        item['institutionalOwnership'] = round(res['ownershipPercent'],2)
+
+def extract_key_metrics(symbol, item, res, ctx):
+    res = res[0]
+    item['revenuePerShare'] = round(res['revenuePerShare'],2)
+    item['netIncomePerShare'] = round(res['netIncomePerShare'],2)
+    item['shareholdersEquityPerShare'] = round(res['shareholdersEquityPerShare'],2)
+    item['interestDebtPerShare'] = round(res['interestDebtPerShare'],2)
+    item['capexPerShare'] = round(res['capexPerShare'],2)
+    item['tangibleAssetValue'] = round(res['tangibleAssetValue'],2)
+    item['returnOnTangibleAssets'] = round(res['returnOnTangibleAssets'],2)
+    item['grahamNumber'] = round(res['grahamNumber'],2)
+
+def extract_key_metrics_ttm(symbol, item, res, ctx):
+    res = res[0]
+    item['revenueTTM'] = round(res['revenuePerShareTTM']*item['sharesOutStanding'],2)
+    item['netIncomeTTM'] = round(res['netIncomePerShareTTM']*item['sharesOutStanding'],2)
+
+def extract_ai_score(symbol, item, res, ctx):
+    score = res['score']
+    if  score == 10:
+        item['score'] = 'Strong Buy'
+    elif score in [7,8,9]:
+        item['score'] = 'Buy'
+    elif score in [4,5,6]:
+        item['score'] = 'Hold'
+    elif score in [2,3]:
+        item['score'] = 'Sell'
+    elif score == 1:
+        item['score'] = 'Strong Sell'
+    else:
+        item['score'] = None
+
+def extract_forward_pe(symbol, item, res, ctx):
+    item['forwardPE'] = round(res['forwardPE'],2) if res['forwardPE'] != 0 else None
+
+def extract_financial_score(symbol, item, res, ctx):
+    item['altmanZScore'] = res['altmanZScore']
+    item['piotroskiScore'] = res['piotroskiScore']
+    item['workingCapital'] = res['workingCapital']
+    item['totalAssets'] = res['totalAssets']
+
+def extract_dividends(symbol, item, res, ctx):
+    item['annualDividend'] = round(res['annualDividend'],2)
+    item['dividendYield'] = round(res['dividendYield'],2)
+    item['payoutRatio'] = round(res['payoutRatio'],2)
+    item['dividendGrowth'] = round(res['dividendGrowth'],2)
+
+def extract_share_statistics(symbol, item, res, ctx):
+    item['sharesShort'] = round(float(res['sharesShort']),2)
+    item['shortRatio'] = round(float(res['shortRatio']),2)
+    item['shortOutStandingPercent'] = round(float(res['shortOutStandingPercent']),2)
+    item['shortFloatPercent'] = round(float(res['shortFloatPercent']),2)
+
+def extract_options_stats(symbol, item, res, ctx):
+    item['gexRatio'] = res['gex_ratio']
+    item['ivRank'] = res['iv_rank']
+    item['iv30d'] = res['iv30d']
+    item['totalOI'] = res['total_open_interest']
+    item['changeOI'] = res['open_interest_change']
+    item['netCallPrem'] = res['net_call_premium']
+    item['netPutPrem'] = res['net_put_premium']
+    item['callVolume'] = res['call_volume']
+    item['putVolume'] = res['put_volume']
+    item['pcRatio'] = res['put_call_ratio']
+    item['totalPrem'] = res['call_premium']+res['put_premium']
+
+def extract_analyst_estimate(symbol, item, res, ctx):
+    next_year = datetime.now().year+1
+    item['forwardPS'] = None
+    item['peg'] = None
+    for analyst_item in res:
+        if analyst_item['date'] == next_year and item['marketCap'] > 0 and analyst_item['estimatedRevenueAvg'] > 0:
+            # Calculate forwardPS: marketCap / estimatedRevenueAvg
+            item['forwardPS'] = round(item['marketCap'] / analyst_item['estimatedRevenueAvg'], 1)
+            if item['eps'] > 0:
+                cagr = ((analyst_item['estimatedEpsHigh']/item['eps'] ) -1)*100
+                item['peg'] = round(item['priceEarningsRatio'] / cagr,2) if cagr > 0 else None
+            break  # Exit the loop once the desired item is found
+
+def extract_halal(symbol, item, res, ctx):
+    item['halalStocks'] = get_halal_compliant(item)
+
+
+financial_statement_fields = list(dict.fromkeys(
+    key_ratios + key_cash_flow + key_income + key_balance_sheet
+    + key_income_growth + key_cash_flow_growth + key_balance_sheet_growth
+    + ['freeCashFlowMargin', 'ebitdaMargin', 'revenuePerEmployee', 'profitPerEmployee',
+       'returnOnInvestedCapital', 'researchDevelopmentRevenueRatio', 'ebit', 'operatingMargin', 'ebitMargin']
+))
+market_ratio_fields = ['earningsYield', 'freeCashFlowYield', 'shortTermDebtToCapitalization', 'interestIncomeToCapitalization']
+
+# Declarative source registry, evaluated in order for every symbol. Later
+# extractors may read fields written by earlier ones (e.g. `upside` needs the
+# quote price), and a later source may overwrite a field of an earlier one
+# (dividendYield/payoutRatio from dividends replace the ratio file values).
+#
+# `inputs` lists the files whose change invalidates a source (defaults to
+# `path`), and `depends` the earlier sources whose fields it reads or
+# overwrites. The incremental update uses both to decide what to recompute.
+# An optional `load(symbol, ctx)` replaces reading `path`.
+SCREENER_SOURCES = [
+    {'name': 'quote', 'path': 'json/quote/{symbol}.json', 'load': load_quote, 'extract': extract_quote,
+     'fields': ['price', 'changesPercentage', 'avgVolume', 'volume', 'relativeVolume', 'pe', 'marketCap']},
+    {'name': 'price_changes', 'path': None, 'extract': extract_price_changes,
+     'inputs': ['price_store/stocks/index.json'], 'depends': ['quote'],
+     'fields': list(time_frames.keys())},
+    {'name': 'share_changes', 'path': None, 'extract': extract_share_changes,
+     'inputs': ['stocks.db'],
+     'fields': ['sharesQoQ', 'sharesYoY', 'floatShares']},
+    {'name': 'stockdeck', 'path': 'json/stockdeck/{symbol}.json', 'extract': extract_stockdeck,
+     'fields': ['employees', 'sharesOutStanding', 'country', 'sector', 'industry', 'lastStockSplit', 'splitType', 'splitRatio']},
+    {'name': 'profile', 'path': 'json/profile/{symbol}.json', 'extract': extract_profile,
+     'fields': ['isin']},
+    {'name': 'financial_statements', 'path': None, 'extract': extract_financial_statements,
+     'inputs': [file_path for file_path, _ in financial_statement_files], 'depends': ['stockdeck'],
+     'fields': financial_statement_fields},
+    {'name': 'market_ratios', 'path': None, 'extract': extract_market_ratios,
+     'depends': ['quote', 'financial_statements'],
+     'fields': market_ratio_fields},
+    {'name': 'income_history', 'path': 'json/financial-statements/income-statement/annual/{symbol}.json', 'extract': extract_income_history,
+     'fields': ['cagr3YearRevenue', 'cagr5YearRevenue', 'cagr3YearEPS', 'cagr5YearEPS', 'revenueGrowthYears', 'epsGrowthYears', 'netIncomeGrowthYears', 'grossProfitGrowthYears']},
+    {'name': 'var', 'path': 'json/var/{symbol}.json', 'extract': extract_var,
+     'fields': ['var']},
+    {'name': 'enterprise_values', 'path': 'json/enterprise-values/{symbol}.json', 'extract': extract_enterprise_values,
+     'depends': ['financial_statements'],
+     'fields': ['enterpriseValue', 'evSales', 'evEarnings', 'evEBITDA', 'evEBIT', 'evFCF']},
+    {'name': 'analyst_summary', 'path': 'json/analyst/summary/{symbol}.json', 'extract': extract_analyst_summary,
+     'depends': ['quote'],
+     'fields': ['analystRating', 'analystCounter', 'priceTarget', 'upside']},
+    {'name': 'analyst_history', 'path': 'json/analyst/history/{symbol}.json', 'extract': extract_analyst_history,
+     'depends': ['quote'],
+     'fields': ['topAnalystCounter', 'topAnalystPriceTarget', 'topAnalystUpside', 'topAnalystRating']},
+    {'name': 'fail_to_deliver', 'path': 'json/fail-to-deliver/companies/{symbol}.json', 'extract': extract_fail_to_deliver,
+     'depends': ['quote'],
+     'fields': ['failToDeliver', 'relativeFTD']},
+    {'name': 'ownership_stats', 'path': 'json/ownership-stats/{symbol}.json', 'extract': extract_ownership_stats,
+     'fields': ['institutionalOwnership']},
+    {'name': 'key_metrics', 'path': 'json/financial-statements/key-metrics/annual/{symbol}.json', 'extract': extract_key_metrics,
+     'fields': ['revenuePerShare', 'netIncomePerShare', 'shareholdersEquityPerShare', 'interestDebtPerShare', 'capexPerShare', 'tangibleAssetValue', 'returnOnTangibleAssets', 'grahamNumber']},
+    {'name': 'key_metrics_ttm', 'path': 'json/financial-statements/key-metrics/ttm/{symbol}.json', 'extract': extract_key_metrics_ttm,
+     'depends': ['stockdeck'],
+     'fields': ['revenueTTM', 'netIncomeTTM']},
+    {'name': 'ai_score', 'path': 'json/ai-score/companies/{symbol}.json', 'extract': extract_ai_score,
+     'fields': ['score']},
+    {'name': 'forward_pe', 'path': 'json/forward-pe/{symbol}.json', 'extract': extract_forward_pe,
+     'fields': ['forwardPE']},
+    {'name': 'financial_score', 'path': 'json/financial-score/{symbol}.json', 'extract': extract_financial_score,
+     'depends': ['financial_statements'],
+     'fields': ['altmanZScore', 'piotroskiScore', 'workingCapital', 'totalAssets']},
+    {'name': 'dividends', 'path': 'json/dividends/companies/{symbol}.json', 'extract': extract_dividends,
+     'depends': ['financial_statements'],
+     'fields': ['annualDividend', 'dividendYield', 'payoutRatio', 'dividendGrowth']},
+    {'name': 'share_statistics', 'path': 'json/share-statistics/{symbol}.json', 'extract': extract_share_statistics,
+     'fields': ['sharesShort', 'shortRatio', 'shortOutStandingPercent', 'shortFloatPercent']},
+    {'name': 'options_stats', 'path': 'json/options-stats/companies/{symbol}.json', 'extract': extract_options_stats,
+     'fields': ['gexRatio', 'ivRank', 'iv30d', 'totalOI', 'changeOI', 'netCallPrem', 'netPutPrem', 'callVolume', 'putVolume', 'pcRatio', 'totalPrem']},
+    {'name': 'analyst_estimate', 'path': 'json/analyst-estimate/{symbol}.json', 'extract': extract_analyst_estimate,
+     'depends': ['quote', 'financial_statements'],
+     'fields': ['forwardPS', 'peg']},
+    {'name': 'halal', 'path': None, 'extract': extract_halal,
+     'depends': ['stockdeck', 'financial_statements', 'market_ratios', 'financial_score'],
+     'fields': ['halalStocks']},
+]
+
+
+def apply_source(source, symbol, item, ctx):
+    try:
+        res = None
+        if source.get('load'):
+            res = source['load'](symbol, ctx)
+        elif source['path']:
+            with open(source['path'].format(symbol=symbol), 'rb') as file:
+                res = orjson.loads(file.read())
+        source['extract'](symbol, item, res, ctx)
+    except:
+        for field in source['fields']:
+            item[field] = None
+
+    for field in source['fields']:
+        item.setdefault(field, None)
+
+
+def source_signature(source, symbol):
+    """
+    Cheap change marker for a source: (mtime_ns, size) of each input file,
+    None for a missing file. Nothing is opened or parsed.
+    """
+    inputs = source.get('inputs') or ([source['path']] if source['path'] else [])
+    signature = []
+    for template in inputs:
+        try:
+            st = os.stat(template.format(symbol=symbol))
+            signature.append(f"{st.st_mtime_ns}-{st.st_size}")
+        except OSError:
+            signature.append(None)
+    return signature
+
+
+def make_context(db_path='stocks.db', store_path='price_store/stocks'):
+    con = sqlite3.connect(db_path)
+    try:
+        store = PriceStore(store_path)
+    except Exception as e:
+        print(f"Price store unavailable, price changes will be empty: {e}")
+        store = None
+    return {'con': con, 'price_store': store, 'quote_store': open_quote_store()}
+
+
+def rows_to_columns(rows, fields):
+    return {field: [row.get(field) for row in rows] for field in fields}
+
+
+def build_shard(jobs, sources=SCREENER_SOURCES, db_path='stocks.db', store_path='price_store/stocks'):
+    """
+    Worker entry point. `jobs` is a list of (row, source_names) pairs; the
+    listed sources (all of them when source_names is None) are evaluated on
+    the row in registry order. Returns the shard as columns together with the
+    input signatures of the evaluated sources and per-source wall time.
+    """
+    ctx = make_context(db_path, store_path)
+    timings = defaultdict(float)
+    rows = []
+    state = {}
+    for base, names in jobs:
+        item = dict(base)
+        symbol = item['symbol']
+        state[symbol] = {}
+        for source in sources:
+            if names is not None and source['name'] not in names:
+                continue
+            start = time.perf_counter()
+            # Take the signature before reading so a concurrent write is picked up next run
+            state[symbol][source['name']] = source_signature(source, symbol)
+            apply_source(source, symbol, item, ctx)
+            timings[source['name']] += time.perf_counter() - start
+        rows.append(item)
+    ctx['con'].close()
+
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    return {
+        'symbols': [row['symbol'] for row in rows],
+        'fields': fields,
+        'columns': rows_to_columns(rows, fields),
+        'state': state,
+        'timings': dict(timings),
+    }
+
+
+def clean_column(values):
+    return [None if isinstance(v, float) and (math.isnan(v) or math.isinf(v)) else v for v in values]
+
+
+def get_base_rows(con):
+    cursor = con.cursor()
+    cursor.execute("PRAGMA journal_mode = wal")
+    cursor.execute("SELECT symbol, name, sma_20, sma_50, sma_100, sma_200, ema_20, ema_50, ema_100, ema_200, rsi, atr, stoch_rsi, mfi, cci, beta FROM stocks WHERE symbol NOT LIKE '%.%' AND eps IS NOT NULL AND marketCap IS NOT NULL AND beta IS NOT NULL")
+    raw_data = cursor.fetchall()
+    stock_screener_data = [{
+            'symbol': symbol,
+            'name': name,
+            'sma20': sma_20,
+            'sma50': sma_50,
+            'sma100': sma_100,
+            'sma200': sma_200,
+            'ema20': ema_20,
+            'ema50': ema_50,
+            'ema100': ema_100,
+            'ema200': ema_200,
+            'rsi': rsi,
+            'atr': atr,
+            'stochRSI': stoch_rsi,
+            'mfi': mfi,
+            'cci': cci,
+            'beta': beta,
+        } for (symbol, name, sma_20, sma_50, sma_100, sma_200, ema_20, ema_50, ema_100, ema_200, rsi, atr, stoch_rsi, mfi, cci, beta) in raw_data]
+
+    return [{k: round(v, 2) if isinstance(v, (int, float)) else v for k, v in entry.items()} for entry in stock_screener_data]
+
+
+def run_jobs(jobs, max_workers=None, sources=SCREENER_SOURCES):
+    """
+    Shard `jobs` across a process pool and merge the shards back into
+    (symbols, fields, columns, state), with symbols in job order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    num_shards = max_workers * 4
+    shards = [jobs[i::num_shards] for i in range(num_shards)]
+    shards = [shard for shard in shards if shard]
+
+    results = []
+    if len(shards) == 1:
+        results.append(build_shard(shards[0], sources))
+    elif shards:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(build_shard, shard, sources) for shard in shards]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error building screener shard: {e}")
+
+    fields = list(dict.fromkeys(field for res in results for field in res['fields']))
+    columns = {field: [] for field in fields}
+    symbols = []
+    state = {}
+    timings = defaultdict(float)
+    for res in results:
+        symbols.extend(res['symbols'])
+        n = len(res['symbols'])
+        for field in fields:
+            columns[field].extend(res['columns'].get(field, [None] * n))
+        state.update(res['state'])
+        for name, seconds in res['timings'].items():
+            timings[name] += seconds
+
+    # Restore the job order of the symbols
+    order = {row['symbol']: i for i, (row, _) in enumerate(jobs)}
+    perm = sorted(range(len(symbols)), key=lambda i: order[symbols[i]])
+    symbols = [symbols[i] for i in perm]
+    columns = {field: clean_column([values[i] for i in perm]) for field, values in columns.items()}
+
+    print_timings(timings)
+    return symbols, fields, columns, state
+
+
+def build_screener_table(con, max_workers=None, sources=SCREENER_SOURCES):
+    """
+    Build the screener as a columnar table {'symbols', 'fields', 'columns',
+    'state'}. The universe is split into shards that run on a process pool;
+    each shard comes back as columns which are concatenated in symbol order.
+    """
+    jobs = [(row, None) for row in get_base_rows(con)]
+    symbols, fields, columns, state = run_jobs(jobs, max_workers, sources)
+    return {'symbols': symbols, 'fields': fields, 'columns': columns, 'state': state}
+
+
+def load_screener_table(path='json/stock-screener'):
+    try:
+        with open(f"{path}/columns.json", 'rb') as file:
+            table = orjson.loads(file.read())
+        with open(f"{path}/state.json", 'rb') as file:
+            table['state'] = orjson.loads(file.read())
+        return table
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+def dirty_sources(symbol, previous, sources=SCREENER_SOURCES):
+    """
+    Names of the sources whose inputs changed since `previous` (the stored
+    signatures of this symbol), plus every source depending on one of them.
+    """
+    dirty = set()
+    for source in sources:
+        name = source['name']
+        if name not in previous or previous[name] != source_signature(source, symbol):
+            dirty.add(name)
+        elif any(dep in dirty for dep in source.get('depends', [])):
+            dirty.add(name)
+    return dirty
+
+
+def update_screener_table(con, table, max_workers=None, sources=SCREENER_SOURCES):
+    """
+    Incrementally refresh `table` in place: only sources whose input files
+    changed (and their dependents) are recomputed, and the resulting fields
+    are patched into the existing columns. New symbols get a full build,
+    delisted ones are dropped. Rows of a failed shard keep their previous
+    values and signatures, so they are recomputed on the next run.
+    """
+    base_rows = get_base_rows(con)
+    position = {symbol: i for i, symbol in enumerate(table['symbols'])}
+    previous_state = table.get('state', {})
+
+    jobs = []
+    counts = defaultdict(int)
+    for base in base_rows:
+        symbol = base['symbol']
+        if symbol not in position:
+            jobs.append((base, None))
+            counts['new symbol'] += 1
+            continue
+        names = dirty_sources(symbol, previous_state.get(symbol, {}), sources)
+        if names:
+            row = {field: table['columns'][field][position[symbol]] for field in table['fields']}
+            row.update(base)
+            jobs.append((row, names))
+            for name in names:
+                counts[name] += 1
+
+    print(f"Screener update: {len(jobs)} of {len(base_rows)} symbols changed")
+    for name, count in sorted(counts.items(), key=lambda x: x[1], reverse=True):
+        print(f"  {name:<22} {count}")
+
+    symbols, fields, columns, state = run_jobs(jobs, max_workers, sources) if jobs else ([], [], {}, {})
+
+    # Rebuild the universe in database order and patch the recomputed rows
+    all_fields = list(dict.fromkeys(table['fields'] + fields))
+    patched = {symbol: i for i, symbol in enumerate(symbols)}
+    new_columns = {field: [] for field in all_fields}
+    new_state = {}
+    new_symbols = []
+    for base in base_rows:
+        symbol = base['symbol']
+        if symbol not in patched and symbol not in position:
+            # A new symbol whose shard failed: nothing to keep, retried next run
+            print(f"Screener update: no data for new symbol {symbol}, skipped")
+            continue
+        new_symbols.append(symbol)
+        if symbol in patched:
+            i = patched[symbol]
+            for field in all_fields:
+                new_columns[field].append(columns[field][i] if field in columns else None)
+            new_state[symbol] = {**previous_state.get(symbol, {}), **state[symbol]}
+        else:
+            i = position[symbol]
+            for field in all_fields:
+                if field in base:
+                    new_columns[field].append(base[field])
+                else:
+                    new_columns[field].append(table['columns'][field][i] if field in table['columns'] else None)
+            new_state[symbol] = previous_state.get(symbol, {})
+
+    table['symbols'] = new_symbols
+    table['fields'] = all_fields
+    table['columns'] = {field: clean_column(values) for field, values in new_columns.items()}
+    table['state'] = new_state
+    return table
+
+
+def print_timings(timings):
+    total = sum(timings.values()) or 1
+    print("Screener source timings (summed over workers):")
+    for name, seconds in sorted(timings.items(), key=lambda x: x[1], reverse=True):
+        print(f"  {name:<22} {seconds:8.2f}s  {seconds / total * 100:5.1f}%")
+
+
+def table_to_rows(table):
+    fields = table['fields']
+    columns = [table['columns'][field] for field in fields]
+    return [dict(zip(fields, values)) for values in zip(*columns)]
+
+
+def save_screener_table(table, path='json/stock-screener'):
+    """
+    Serialize the columnar table once and derive the row-oriented data.json
+    that the API still loads from it. The per-(symbol, source) signatures go
+    to state.json for the next incremental update.
+
+    Each file is replaced atomically and state.json goes last, so an
+    interrupted save leaves old signatures, so the next update recomputes
+    the changed shards instead of trusting new signatures over stale data.
+    """
+    os.makedirs(path, exist_ok=True)
+    columnar = {key: table[key] for key in ['symbols', 'fields', 'columns']}
+    _write_json(f"{path}/columns.json", columnar)
+    _write_json(f"{path}/data.json", table_to_rows(table))
+    _write_json(f"{path}/state.json", table.get('state', {}))
+
+
+def _write_json(file_path, data):
+    tmp = file_path + '.tmp'
+    with open(tmp, 'wb') as file:
+        file.write(orjson.dumps(data))
+    os.replace(tmp, file_path)
@@ -0,0 +1,201 @@
+import os
+import numbers
+
+import numpy as np
+import orjson
+
+
+# Range filters that get a presorted index; everything else is answered with
+# a direct vectorized comparison.
+INDEXED_FIELDS = ['marketCap', 'price', 'changesPercentage', 'volume', 'avgVolume', 'pe', 'dividendYield', 'revenue', 'beta']
+
+ALWAYS_INCLUDE = ['symbol', 'marketCap', 'price', 'changesPercentage', 'name', 'volume', 'pe']
+
+MAX_LIMIT = 10000
+
+
+def _is_numeric(values):
+    return all(v is None or (isinstance(v, numbers.Real) and not isinstance(v, bool)) for v in values)
+
+
+class ScreenerIndex:
+    """
+    In-memory columnar copy of json/stock-screener built for server-side
+    screening. Numeric fields are float64 arrays (NaN for missing values),
+    text fields are integer category codes, and a handful of popular range
+    fields keep a presorted order so a range filter is two searchsorted calls.
+    The original Python values are kept per column for the response payload.
+    """
+
+    def __init__(self, symbols, fields, columns, source_path=None, mtime=None):
+        self.symbols = list(symbols)
+        self.fields = list(fields)
+        self.raw = columns
+        self.size = len(self.symbols)
+        self.source_path = source_path
+        self.mtime = mtime
+        # Position of every row in symbol order, the tie-break of `_order`
+        self.symbol_rank = np.empty(self.size, dtype=np.int64)
+        self.symbol_rank[sorted(range(self.size), key=self.symbols.__getitem__)] = np.arange(self.size)
+
+        self.numeric = {}
+        self.categories = {}
+        self.codes = {}
+        for field in self.fields:
+            values = columns[field]
+            if _is_numeric(values):
+                self.numeric[field] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                keys = [v if isinstance(v, str) else None for v in values]
+                categories = {}
+                codes = np.empty(self.size, dtype=np.int32)
+                for i, key in enumerate(keys):
+                    codes[i] = categories.setdefault(key, len(categories))
+                self.categories[field] = categories
+                self.codes[field] = codes
+
+        self.sorted_index = {}
+        for field in INDEXED_FIELDS:
+            if field in self.numeric:
+                values = self.numeric[field]
+                order = np.argsort(values, kind='stable')  # NaN sorts last
+                valid = int(np.count_nonzero(~np.isnan(values)))
+                self.sorted_index[field] = (order[:valid], values[order[:valid]])
+
+    @classmethod
+    def from_path(cls, path='json/stock-screener'):
+        """
+        Load the columnar table written by utils.screener, falling back to
+        the row-oriented data.json.
+        """
+        columns_path = f"{path}/columns.json"
+        if os.path.exists(columns_path):
+            mtime = os.stat(columns_path).st_mtime_ns
+            with open(columns_path, 'rb') as file:
+                table = orjson.loads(file.read())
+            return cls(table['symbols'], table['fields'], table['columns'], columns_path, mtime)
+
+        rows_path = f"{path}/data.json"
+        mtime = os.stat(rows_path).st_mtime_ns
+        with open(rows_path, 'rb') as file:
+            rows = orjson.loads(file.read())
+        return cls.from_rows(rows, rows_path, mtime)
+
+    @classmethod
+    def from_rows(cls, rows, source_path=None, mtime=None):
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+        columns = {field: [row.get(field) for row in rows] for field in fields}
+        return cls([row['symbol'] for row in rows], fields, columns, source_path, mtime)
+
+    def is_stale(self):
+        try:
+            return self.source_path is not None and os.stat(self.source_path).st_mtime_ns != self.mtime
+        except OSError:
+            return False
+
+    def _check_field(self, field):
+        if field not in self.numeric and field not in self.codes:
+            raise ValueError(f"Unknown field: {field}")
+
+    def _range_mask(self, field, low, high):
+        if field in self.sorted_index:
+            order, values = self.sorted_index[field]
+            lo = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+            hi = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+            mask = np.zeros(self.size, dtype=bool)
+            mask[order[lo:hi]] = True
+            return mask
+
+        values = self.numeric[field]
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def _value_mask(self, field, wanted):
+        if field in self.numeric:
+            wanted = np.array([float(v) for v in wanted], dtype=np.float64)
+            return np.isin(self.numeric[field], wanted)
+        categories = self.categories[field]
+        wanted_codes = [categories[v] for v in wanted if v in categories]
+        return np.isin(self.codes[field], wanted_codes)
+
+    def mask(self, filters):
+        """
+        AND of all filters. A filter is a dict with `field` and one of
+        `min`/`max` (inclusive range), `eq` or `in`.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for rule in filters:
+            field = rule.get('field')
+            self._check_field(field)
+            if 'min' in rule or 'max' in rule:
+                if field not in self.numeric:
+                    raise ValueError(f"Range filter on non-numeric field: {field}")
+                mask &= self._range_mask(field, rule.get('min'), rule.get('max'))
+            elif 'eq' in rule:
+                mask &= self._value_mask(field, [rule['eq']])
+            elif 'in' in rule:
+                mask &= self._value_mask(field, list(rule['in']))
+            else:
+                raise ValueError(f"Filter on {field} needs one of min/max/eq/in")
+        return mask
+
+    def _order(self, rows, sort_by, descending, k):
+        """
+        Order `rows` by `sort_by` and return the first k. Missing values go
+        last in either direction and equal values are ordered by symbol, so
+        pages don't overlap or skip rows. A partial partition is used when
+        only a small page is requested.
+        """
+        if sort_by in self.numeric:
+            keys = self.numeric[sort_by][rows]
+            keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+        else:
+            codes = self.codes[sort_by][rows]
+            labels = sorted((key for key in self.categories[sort_by] if key is not None))
+            rank = np.full(len(self.categories[sort_by]), len(labels), dtype=np.int64)
+            for position, key in enumerate(labels):
+                rank[self.categories[sort_by][key]] = len(labels) - 1 - position if descending else position
+            keys = rank[codes]
+
+        if k < len(rows):
+            # Every row up to the k-th key, ties at the cut included
+            kth = np.partition(keys, k - 1)[k - 1]
+            part = np.flatnonzero(keys <= kth)
+            part = part[np.lexsort((self.symbol_rank[rows[part]], keys[part]))[:k]]
+            return rows[part]
+        return rows[np.lexsort((self.symbol_rank[rows], keys))]
+
+    def query(self, filters=(), sort_by='marketCap', sort_order='desc', limit=50, offset=0, fields=()):
+        """
+        Returns (total, rows) where total counts all matches and rows is the
+        requested page, projected to ALWAYS_INCLUDE + `fields`.
+        """
+        limit = max(0, min(int(limit), MAX_LIMIT))
+        offset = max(0, int(offset))
+        projection = list(dict.fromkeys(ALWAYS_INCLUDE + list(fields)))
+        for field in projection:
+            if field != 'symbol':
+                self._check_field(field)
+
+        matched = np.flatnonzero(self.mask(filters))
+        total = len(matched)
+        if limit == 0 or offset >= total:
+            return total, []
+
+        if sort_by:
+            self._check_field(sort_by)
+            page = self._order(matched, sort_by, sort_order != 'asc', min(total, offset + limit))
+        else:
+            page = matched[:offset + limit]
+        page = page[offset:offset + limit]
+
+        raw = self.raw
+        rows = [
+            {field: raw[field][i] for field in projection if field in raw}
+            for i in page.tolist()
+        ]
+        return total, rows
@@ -0,0 +1,163 @@
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict
+
+
+# Prioritization strategy dictionary
+PRIORITY_STRATEGIES = {
+    'exact_symbol_match': 0,
+    'symbol_prefix_match': 1,
+    'exact_name_match': 2,
+    'name_prefix_match': 3,
+    'symbol_contains': 4,
+    'name_contains': 5
+}
+
+NO_MATCH = len(PRIORITY_STRATEGIES)
+
+
+def score_match(name_lower: str, symbol_lower: str, query_lower: str) -> int:
+    if len(query_lower) == 1:
+        if symbol_lower == query_lower:
+            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
+        elif name_lower == query_lower:
+            base_score = PRIORITY_STRATEGIES['exact_name_match']
+        else:
+            base_score = NO_MATCH
+    else:
+        if symbol_lower == query_lower:
+            base_score = PRIORITY_STRATEGIES['exact_symbol_match']
+        elif symbol_lower.startswith(query_lower):
+            base_score = PRIORITY_STRATEGIES['symbol_prefix_match']
+        elif name_lower == query_lower:
+            base_score = PRIORITY_STRATEGIES['exact_name_match']
+        elif name_lower.startswith(query_lower):
+            base_score = PRIORITY_STRATEGIES['name_prefix_match']
+        elif query_lower in symbol_lower:
+            base_score = PRIORITY_STRATEGIES['symbol_contains']
+        elif query_lower in name_lower:
+            base_score = PRIORITY_STRATEGIES['name_contains']
+        else:
+            base_score = NO_MATCH
+
+    dot_penalty = 1 if '.' in symbol_lower else 0
+    return base_score + dot_penalty
+
+
+def calculate_score(item: Dict, search_query: str) -> int:
+    return score_match(item['name'].lower(), item['symbol'].lower(), search_query.lower())
+
+
+def _prefix_range(sorted_keys, prefix):
+    lo = bisect_left(sorted_keys, prefix)
+    hi = bisect_left(sorted_keys, prefix + '\uffff')
+    return lo, hi
+
+
+class SearchIndex:
+    """
+    Index over the searchbar list answering top-k queries with the same
+    ordering as sorting the whole list by (calculate_score, -marketCap).
+
+    - ISIN hash map for exact ISIN lookups
+    - sorted symbol/name keys (a flattened trie) for exact and prefix matches
+    - trigram postings over symbol and name for substring matches
+    - a precomputed market-cap rank that breaks ties without re-sorting
+    """
+
+    def __init__(self, items):
+        self.items = items
+        n = len(items)
+        self.symbols = [(item.get('symbol') or '').lower() for item in items]
+        self.names = [(item.get('name') or '').lower() for item in items]
+        self.dots = ['.' in symbol for symbol in self.symbols]
+
+        # Position in the full (-marketCap, original position) order
+        order = sorted(range(n), key=lambda i: (-(items[i].get('marketCap') or 0), i))
+        self.rank = [0] * n
+        for position, i in enumerate(order):
+            self.rank[i] = position
+        self.by_rank = order
+
+        self.isin = {}
+        for i, item in enumerate(items):
+            isin = item.get('isin')
+            if isin is not None and isin not in self.isin:
+                self.isin[isin] = i
+
+        self.symbol_keys = sorted((symbol, i) for i, symbol in enumerate(self.symbols))
+        self.name_keys = sorted((name, i) for i, name in enumerate(self.names))
+        self.symbol_sorted = [key for key, _ in self.symbol_keys]
+        self.name_sorted = [key for key, _ in self.name_keys]
+
+        self.grams = defaultdict(set)
+        for i in range(n):
+            for text in (self.symbols[i], self.names[i]):
+                for gram in self._grams(text):
+                    self.grams[gram].add(i)
+
+    @staticmethod
+    def _grams(text):
+        if len(text) < 3:
+            return {text[j:j + 2] for j in range(max(1, len(text) - 1))} if text else set()
+        return {text[j:j + 3] for j in range(len(text) - 2)} | {text[j:j + 2] for j in range(len(text) - 1)}
+
+    def _contains(self, query_lower):
+        """
+        Ids whose symbol or name contains query_lower (len >= 2).
+        """
+        if len(query_lower) == 2:
+            candidates = self.grams.get(query_lower, set())
+        else:
+            postings = [self.grams.get(query_lower[j:j + 3], set()) for j in range(len(query_lower) - 2)]
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates &= posting
+                if not candidates:
+                    break
+        return [i for i in candidates if query_lower in self.symbols[i] or query_lower in self.names[i]]
+
+    def _key(self, i, query_lower):
+        return (score_match(self.names[i], self.symbols[i], query_lower), self.rank[i])
+
+    def search(self, query, limit=5):
+        if not query:
+            return []
+
+        if query in self.isin:
+            return [self.items[self.isin[query]]]
+
+        query_lower = query.lower()
+
+        if len(query_lower) == 1:
+            # Only exact matches score below NO_MATCH; everything else that
+            # contains the character ranks by dot penalty, then market cap.
+            exact = [i for _, i in self.symbol_keys[slice(*_prefix_range(self.symbol_sorted, query_lower))] if self.symbols[i] == query_lower]
+            exact += [i for _, i in self.name_keys[slice(*_prefix_range(self.name_sorted, query_lower))] if self.names[i] == query_lower]
+            picked = sorted(set(exact), key=lambda i: self._key(i, query_lower))[:limit]
+            seen = set(picked)
+            for with_dot in (False, True):
+                if len(picked) >= limit:
+                    break
+                for i in self.by_rank:
+                    if i in seen or self.dots[i] != with_dot:
+                        continue
+                    if query_lower in self.symbols[i] or query_lower in self.names[i]:
+                        picked.append(i)
+                        seen.add(i)
+                        if len(picked) >= limit:
+                            break
+            return [self.items[i] for i in picked]
+
+        # Every item with base score 0 or 1 sits in the symbol prefix range.
+        # When that range alone yields `limit` hits scoring <= 1, nothing
+        # outside it (score >= 2) can rank higher.
+        prefix = [i for _, i in self.symbol_keys[slice(*_prefix_range(self.symbol_sorted, query_lower))]]
+        picked = sorted(prefix, key=lambda i: self._key(i, query_lower))[:limit]
+        if len(picked) == limit and self._key(picked[-1], query_lower)[0] <= PRIORITY_STRATEGIES['symbol_prefix_match']:
+            return [self.items[i] for i in picked]
+
+        # Otherwise score every substring match from the n-gram postings
+        picked = sorted(self._contains(query_lower), key=lambda i: self._key(i, query_lower))[:limit]
+        return [self.items[i] for i in picked]
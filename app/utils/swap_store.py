@@ -0,0 +1,304 @@
+import os
+import shutil
+from datetime import datetime
+from zipfile import ZipFile
+
+import numpy as np
+import orjson
+import pandas as pd
+
+
+SWAP_STORE_PATH = 'json/swap/store'
+COMPANIES_PATH = 'json/swap/companies'
+# Rows parsed at a time, so memory doesn't grow with the size of a report
+CHUNK_SIZE = 50000
+# Reports making up the per-company output
+REPORT_WINDOW = 100
+STORE_VERSION = 1
+
+# Column files of a report partition. Every ticker occupies one contiguous
+# slice [offset, offset + length), rows in report order.
+COLUMNS = ['effective', 'expiration', 'notional', 'quantity', 'id', 'original_id', 'action']
+DTYPES = {
+    'effective': 'datetime64[D]',
+    'expiration': 'datetime64[D]',
+    'notional': np.int64,
+    'quantity': np.int64,
+    'id': np.int64,
+    'original_id': np.int64,
+    'action': 'U4',
+}
+# Both spellings of the report header
+RENAMES = {
+    "Dissemintation ID": "Dissemination Identifier",
+    "Original Dissemintation ID": "Original Dissemination Identifier",
+    "Action type": "Action Type",
+    "Action": "Action Type",
+}
+REPORT_COLUMNS = {
+    "Underlying Asset ID", "Underlier ID-Leg 1", "Effective Date", "Notional amount-Leg 1",
+    "Expiration Date", "Total notional quantity-Leg 1", "Primary Asset Class", *RENAMES, *RENAMES.values(),
+}
+# Action type of a report row cancelling a previous one
+CANCEL_ACTION = 'EROR'
+
+
+def report_date(name):
+    """
+    Date of a SEC_CUMULATIVE_EQUITIES_YYYY_MM_DD report (zip or csv name).
+    """
+    return datetime.strptime("_".join(os.path.splitext(os.path.basename(name))[0].split('_')[3:]), "%Y_%m_%d")
+
+
+def _amounts(series):
+    # "25,000,000+" (capped notional), "1500000.0" or "" -> int
+    cleaned = series.fillna('').str.replace(',', '', regex=False).str.rstrip('+')
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0).astype(np.int64).to_numpy()
+
+
+def _dates(series):
+    return pd.to_datetime(series.fillna('').str[:10], format='%Y-%m-%d', errors='coerce').to_numpy().astype('datetime64[D]')
+
+
+def _ids(series):
+    return pd.to_numeric(series, errors='coerce').fillna(0).astype(np.int64).to_numpy()
+
+
+def _parse_chunk(chunk):
+    chunk = chunk.rename(columns=RENAMES)
+    # As before: the older layout names the underlier Underlying Asset ID
+    column = "Underlying Asset ID" if "Primary Asset Class" in chunk.columns or "Action Type" in chunk.columns else "Underlier ID-Leg 1"
+    if column not in chunk.columns:
+        column = "Underlier ID-Leg 1" if column == "Underlying Asset ID" else "Underlying Asset ID"
+    empty = pd.Series('', index=chunk.index, dtype=object)
+    get = lambda name: chunk[name] if name in chunk.columns else empty
+    return {
+        'ticker': get(column).fillna('').str.split('.').str[0].to_numpy(dtype=object),
+        'effective': _dates(get("Effective Date")),
+        'expiration': _dates(get("Expiration Date")),
+        'notional': _amounts(get("Notional amount-Leg 1")),
+        'quantity': _amounts(get("Total notional quantity-Leg 1")),
+        'id': _ids(get("Dissemination Identifier")),
+        'original_id': _ids(get("Original Dissemination Identifier")),
+        'action': get("Action Type").fillna('').str[:4].to_numpy(dtype=DTYPES['action']),
+    }
+
+
+def parse_report(path, chunk_size=CHUNK_SIZE):
+    """
+    Typed columns (plus `ticker`) of every row of a DTCC cumulative report
+    zip, read `chunk_size` rows at a time with only the columns used.
+    """
+    parts = []
+    with ZipFile(path, 'r') as archive:
+        with archive.open(archive.namelist()[0]) as file:
+            for chunk in pd.read_csv(file, chunksize=chunk_size, dtype=str, on_bad_lines='skip',
+                                     usecols=lambda name: name in REPORT_COLUMNS):
+                if not chunk.empty:
+                    parts.append(_parse_chunk(chunk))
+    if not parts:
+        return {'ticker': np.empty(0, dtype=object), **{name: np.empty(0, dtype=DTYPES[name]) for name in COLUMNS}}
+    return {name: np.concatenate([part[name] for part in parts]) for name in ['ticker', *COLUMNS]}
+
+
+def write_partition(columns, out_path):
+    """
+    Write parsed report columns as a partition: rows grouped by ticker
+    (report order kept within a ticker), rows without a ticker dropped.
+    """
+    tickers = columns['ticker']
+    keep = np.flatnonzero(tickers != '')
+    order = keep[np.argsort(tickers[keep].astype(str), kind='stable')]
+    names, starts, lengths = np.unique(tickers[order].astype(str), return_index=True, return_counts=True)
+
+    tmp_path = out_path + '.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name in COLUMNS:
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(columns[name][order], dtype=DTYPES[name]))
+    with open(os.path.join(tmp_path, 'index.json'), 'wb') as file:
+        file.write(orjson.dumps({
+            'version': STORE_VERSION,
+            'columns': COLUMNS,
+            'tickers': {ticker: [int(start), int(length)] for ticker, start, length in zip(names.tolist(), starts, lengths)},
+        }))
+    shutil.rmtree(out_path, ignore_errors=True)
+    os.rename(tmp_path, out_path)
+    return len(order), len(names)
+
+
+class SwapPartition:
+    """
+    Read-only view of one parsed report; column files are memory mapped.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, 'index.json'), 'rb') as file:
+            meta = orjson.loads(file.read())
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported swap partition version {meta.get('version')} in {path}")
+        self.index = meta['tickers']
+        self.columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in COLUMNS}
+        # Ticker of every row, from the slice bounds
+        self.starts = np.array([offset for offset, _ in self.index.values()], dtype=np.int64)
+        self.names = list(self.index)
+
+    def get(self, ticker):
+        offset, length = self.index.get(ticker, (0, 0))
+        return {name: self.columns[name][offset:offset + length] for name in COLUMNS}
+
+    def tickers_of(self, ids):
+        """
+        Tickers of the rows whose dissemination ID is in `ids`.
+        """
+        rows = np.flatnonzero(np.isin(self.columns['id'], ids))
+        return {self.names[i] for i in (np.searchsorted(self.starts, rows, side='right') - 1).tolist()}
+
+
+def resolve(rows, superseded_ids):
+    """
+    Mask of the rows still standing: rows whose dissemination ID a later row
+    references as its original (modified, corrected or terminated since)
+    and cancellations are dropped.
+    """
+    superseded = (rows['id'] > 0) & np.isin(rows['id'], superseded_ids)
+    return ~superseded & (rows['action'] != CANCEL_ACTION)
+
+
+def _date_strings(values):
+    return [None if text == 'NaT' else text for text in np.datetime_as_string(values, unit='D').tolist()]
+
+
+def company_rows(rows):
+    """
+    Per-company JSON rows, in the shape the rebuild wrote them.
+    """
+    return [
+        {"Effective Date": effective, "Notional amount-Leg 1": notional,
+         "Expiration Date": expiration, "Total notional quantity-Leg 1": quantity}
+        for effective, notional, expiration, quantity in zip(
+            _date_strings(rows['effective']), rows['notional'].tolist(),
+            _date_strings(rows['expiration']), rows['quantity'].tolist())
+    ]
+
+
+class SwapStore:
+    """
+    DTCC equity swap reports, each parsed once into a partition of typed
+    columns grouped by ticker, with a manifest of the reports processed
+    (and the ones that don't exist, so they aren't requested again).
+
+    `emit` writes per-company JSON over the latest REPORT_WINDOW reports and
+    only for the tickers whose rows changed since the previous emit.
+    """
+
+    def __init__(self, path=SWAP_STORE_PATH):
+        self.path = path
+        self.manifest_path = os.path.join(path, 'manifest.json')
+        try:
+            with open(self.manifest_path, 'rb') as file:
+                self.manifest = orjson.loads(file.read())
+        except (OSError, ValueError):
+            self.manifest = {}
+        self.manifest.setdefault('reports', {})
+        self.manifest.setdefault('missing', [])
+        self.manifest.setdefault('emitted', None)
+        self.partitions = {}
+
+    def save_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'wb') as file:
+            file.write(orjson.dumps(self.manifest))
+        os.replace(tmp, self.manifest_path)
+
+    def has(self, name):
+        name = os.path.basename(name)
+        return name in self.manifest['reports'] or name in self.manifest['missing']
+
+    def add_report(self, name, zip_path, chunk_size=CHUNK_SIZE):
+        """
+        Parse a report zip into its partition and record it.
+        """
+        name = os.path.basename(name)
+        rows, tickers = write_partition(parse_report(zip_path, chunk_size), self._partition_path(name))
+        self.manifest['reports'][name] = {'rows': rows, 'tickers': tickers,
+                                          'parsed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        self.partitions.pop(name, None)
+        self.save_manifest()
+        return rows
+
+    def mark_missing(self, name):
+        name = os.path.basename(name)
+        if name not in self.manifest['missing']:
+            self.manifest['missing'].append(name)
+            self.save_manifest()
+
+    def _partition_path(self, name):
+        return os.path.join(self.path, os.path.splitext(name)[0])
+
+    def partition(self, name):
+        if name not in self.partitions:
+            self.partitions[name] = SwapPartition(self._partition_path(name))
+        return self.partitions[name]
+
+    def window(self, size=REPORT_WINDOW):
+        """
+        Latest `size` reports, newest first.
+        """
+        return sorted(self.manifest['reports'], key=report_date, reverse=True)[:size]
+
+    def ticker_rows(self, ticker, window, superseded_ids):
+        parts = [self.partition(name).get(ticker) for name in window]
+        rows = {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+        keep = resolve(rows, superseded_ids)
+        return {name: values[keep] for name, values in rows.items()}
+
+    def emit(self, symbols, out_path=COMPANIES_PATH, size=REPORT_WINDOW):
+        """
+        Write {out_path}/{symbol}.json for the symbols with rows in the
+        window (newest report first), removing files of symbols left without
+        any. Returns the number of files written.
+        """
+        symbols = set(symbols)
+        window = self.window(size)
+        previous = self.manifest['emitted']
+        superseded_ids = np.unique(np.concatenate([np.empty(0, dtype=np.int64)] + [
+            np.asarray(part.columns['original_id'][part.columns['original_id'] > 0])
+            for part in map(self.partition, window)]))
+
+        if previous is None or not os.path.isdir(out_path):
+            # Files of a previous rebuild are replaced or removed too
+            existing = os.listdir(out_path) if os.path.isdir(out_path) else []
+            targets = symbols | {os.path.splitext(name)[0] for name in existing if name.endswith('.json')}
+        else:
+            changed = set(window) ^ set(previous['window'])
+            targets = symbols ^ set(previous['symbols'])
+            new_originals = []
+            for name in changed:
+                if name in self.manifest['reports']:
+                    targets |= set(self.partition(name).index)
+                    if name in window:
+                        original_id = self.partition(name).columns['original_id']
+                        new_originals.append(np.asarray(original_id[original_id > 0]))
+            # Rows superseded from another ticker's slice
+            if new_originals:
+                new_originals = np.concatenate(new_originals)
+                for name in window:
+                    targets |= self.partition(name).tickers_of(new_originals)
+
+        os.makedirs(out_path, exist_ok=True)
+        written = 0
+        for symbol in sorted(targets):
+            file_path = os.path.join(out_path, f"{symbol}.json")
+            rows = self.ticker_rows(symbol, window, superseded_ids) if symbol in symbols else None
+            if rows is not None and len(rows['id']):
+                with open(file_path, 'wb') as file:
+                    file.write(orjson.dumps(company_rows(rows)))
+                written += 1
+            elif os.path.exists(file_path):
+                os.remove(file_path)
+
+        self.manifest['emitted'] = {'window': window, 'symbols': sorted(symbols)}
+        self.save_manifest()
+        return written
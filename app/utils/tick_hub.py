@@ -0,0 +1,221 @@
+import asyncio
+import time
+import zoneinfo
+from collections import defaultdict
+from datetime import datetime
+
+import orjson
+
+
+NY_TZ = zoneinfo.ZoneInfo('America/New_York')
+PRICE_TYPES = ('Q', 'T')
+
+
+def format_timestamp_ny(timestamp):
+    """
+    FMP nanosecond timestamp as 'YYYY-MM-DD HH:MM' New York time, the format
+    fastify's formatTimestampNewYork used to send.
+    """
+    return datetime.fromtimestamp(timestamp / 1e9, NY_TZ).strftime('%Y-%m-%d %H:%M')
+
+
+def price_update(symbol, tick):
+    """
+    Client payload of a raw FMP tick, or None when the tick carries no usable
+    price. Same rules as the former fastify /price-data poller: quote and
+    trade ticks only, and ticks whose bid is more than 1% away from the
+    average of ask/bid/last are skipped.
+    """
+    try:
+        if tick.get('type') not in PRICE_TYPES or tick.get('t') is None:
+            return None
+        ap, bp, lp = float(tick['ap']), float(tick['bp']), float(tick['lp'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if bp == 0:
+        return None
+
+    avg_price = (ap + bp + lp) / 3
+    if abs(avg_price - bp) / bp > 0.01:
+        return None
+
+    return {
+        'symbol': symbol,
+        'ap': tick['ap'],
+        'bp': tick['bp'],
+        'lp': tick['lp'],
+        'avgPrice': avg_price,
+        'type': tick['type'],
+        'time': format_timestamp_ny(tick['t']),
+    }
+
+
+class Subscriber:
+    """
+    One client connection. `send` is an async callable taking the text frame,
+    `close` an optional async callable used when the hub drops the client.
+
+    Updates are coalesced per symbol while a send is in flight, so a client
+    never holds more than one pending update per subscribed symbol.
+    """
+
+    def __init__(self, send, close=None, max_lag=5.0, send_timeout=5.0):
+        self.send = send
+        self.close = close
+        self.max_lag = max_lag
+        self.send_timeout = send_timeout
+        self.symbols = set()
+        self.pending = {}
+        self.pending_since = None
+        self.wakeup = asyncio.Event()
+        self.closed = False
+
+
+class TickHub:
+    """
+    In-process pub/sub for the FMP tick feed: keeps the last tick and the last
+    pushed price per symbol and fans price changes out to the subscribers of
+    that symbol's topic.
+
+    Backpressure: each subscriber has one writer task sending batches of its
+    pending updates. A subscriber whose oldest pending update is older than
+    `max_lag` seconds, or whose send does not finish within `send_timeout`,
+    is dropped instead of buffering without bound.
+    """
+
+    def __init__(self):
+        self.last = {}
+        self.prices = {}
+        self.topics = defaultdict(set)
+        self.subscribers = set()
+        self.stats = {'ticks': 0, 'published': 0, 'delivered': 0, 'coalesced': 0, 'dropped': 0}
+
+    def publish(self, tick):
+        symbol = tick.get('s')
+        if not symbol:
+            return
+        symbol = symbol.upper()
+        self.last[symbol] = tick
+        self.stats['ticks'] += 1
+
+        update = price_update(symbol, tick)
+        if update is None:
+            return
+        previous = self.prices.get(symbol)
+        if previous is not None and previous['avgPrice'] == update['avgPrice']:
+            return
+        self.prices[symbol] = update
+        self.stats['published'] += 1
+
+        for subscriber in list(self.topics.get(symbol, ())):
+            self._offer(subscriber, symbol, update)
+
+    def _offer(self, subscriber, symbol, update):
+        now = time.monotonic()
+        if subscriber.pending_since is not None and now - subscriber.pending_since > subscriber.max_lag:
+            self.drop(subscriber)
+            return
+        if symbol in subscriber.pending:
+            self.stats['coalesced'] += 1
+        elif not subscriber.pending:
+            subscriber.pending_since = now
+        subscriber.pending[symbol] = update
+        subscriber.wakeup.set()
+
+    def subscribe(self, subscriber, symbols):
+        """
+        Replace the topics of `subscriber` with `symbols` and queue the
+        current price of each one so the client starts from a full snapshot.
+        """
+        symbols = {symbol.upper() for symbol in symbols if isinstance(symbol, str)}
+        self._unsubscribe(subscriber, subscriber.symbols - symbols)
+        for symbol in symbols - subscriber.symbols:
+            self.topics[symbol].add(subscriber)
+        subscriber.symbols = symbols
+        for symbol in symbols:
+            if symbol in self.prices:
+                self._offer(subscriber, symbol, self.prices[symbol])
+
+    def _unsubscribe(self, subscriber, symbols):
+        for symbol in symbols:
+            topic = self.topics.get(symbol)
+            if topic is not None:
+                topic.discard(subscriber)
+                if not topic:
+                    del self.topics[symbol]
+
+    def drop(self, subscriber):
+        """
+        Disconnect a slow or broken subscriber.
+        """
+        if subscriber.closed:
+            return
+        subscriber.closed = True
+        subscriber.wakeup.set()
+        self.stats['dropped'] += 1
+        self.remove(subscriber)
+        if subscriber.close is not None:
+            asyncio.ensure_future(subscriber.close())
+
+    def remove(self, subscriber):
+        self._unsubscribe(subscriber, subscriber.symbols)
+        subscriber.symbols = set()
+        subscriber.pending.clear()
+        self.subscribers.discard(subscriber)
+
+    async def serve(self, subscriber):
+        """
+        Writer loop of one subscriber; returns once it is dropped or removed.
+        """
+        self.subscribers.add(subscriber)
+        try:
+            while not subscriber.closed:
+                await subscriber.wakeup.wait()
+                subscriber.wakeup.clear()
+                if subscriber.closed or not subscriber.pending:
+                    continue
+                batch = list(subscriber.pending.values())
+                subscriber.pending.clear()
+                subscriber.pending_since = None
+                try:
+                    await asyncio.wait_for(subscriber.send(orjson.dumps(batch).decode()), subscriber.send_timeout)
+                    self.stats['delivered'] += len(batch)
+                except Exception:
+                    self.drop(subscriber)
+        finally:
+            subscriber.closed = True
+            self.remove(subscriber)
+
+
+async def replay_ticks(hub, path, speed=1.0):
+    """
+    Drive `hub` from a recorded tick file: one raw FMP message per line, as
+    written by cron_websocket.py --record. Lines carry the receive time in
+    `_recv`; with speed > 0 the original spacing is replayed `speed` times
+    faster, with speed 0 as fast as possible. Returns the number of ticks.
+    """
+    count = 0
+    start = time.monotonic()
+    first_recv = None
+    with open(path, 'rb') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                tick = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            recv = tick.pop('_recv', None)
+            if speed > 0 and recv is not None:
+                if first_recv is None:
+                    first_recv = recv
+                delay = (recv - first_recv) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif count % 1000 == 0:
+                # Let the subscriber writers run between bursts
+                await asyncio.sleep(0)
+            hub.publish(tick)
+            count += 1
+    return count
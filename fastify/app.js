@@ -70,23 +70,6 @@ const WebSocket = require("ws");
 let isSend = false;
 let sendInterval;
 
-function formatTimestampNewYork(timestamp) {
-  const d = new Date(timestamp / 1e6);
-  return new Intl.DateTimeFormat("en-US", {
-    timeZone: "America/New_York",
-    year: "numeric",
-    month: "2-digit",
-    day: "2-digit",
-    hour: "2-digit",
-    minute: "2-digit",
-    hour12: false,
-  })
-    .format(d)
-    .replace(/(\d+)\/(\d+)\/(\d+),/, "$3-$1-$2")
-    .replace(",", "");
-}
-
-
 fastify.register(async function (fastify) {
   fastify.get(
     "/realtime-crypto-data",
@@ -254,151 +237,54 @@ fastify.register(async function (fastify) {
 });
 
 
+// Price updates are pushed by the tick hub (app/cron_websocket.py), which keeps
+// the last quote per symbol in memory. This route only relays: the client's
+// ticker list goes to the hub, the hub's update batches go to the client.
+const tickHubUrl = `ws://${process.env.TICK_HUB_HOST || "127.0.0.1"}:${process.env.TICK_HUB_PORT || 2001}/price-data`;
+
 fastify.register(async function (fastify) {
   fastify.get(
     "/price-data",
     { websocket: true },
     (connection, req) => {
-      let tickers = [];
-      let sendInterval;
-      // Store the last sent data for each ticker
-      const lastSentData = {};
-      
-      // Function to send data for all tickers as a list
-const sendData = async () => {
-  const dataToSend = [];
-
-  for (const symbol of tickers) {
-    const filePath = path?.join(
-      __dirname,
-      `../app/json/websocket/companies/${symbol?.toUpperCase()}.json`
-    );
-
-    try {
-      if (fs?.existsSync(filePath)) {
-        const fileData = fs?.readFileSync(filePath, "utf8");
-
-        if (!fileData) {
-          console.error(`File is empty for ticker: ${symbol}`);
-          continue;
-        }
+      const upstream = new WebSocket(tickHubUrl);
+      // Subscriptions sent before the hub connection is open
+      const queued = [];
 
-        let jsonData;
-        try {
-          jsonData = JSON?.parse(fileData);
-        } catch (parseError) {
-          //console.error(`Invalid JSON format for ticker: ${symbol}`, parseError);
-          //console.error(`File content: ${fileData}`);
-          continue;
-        }
+      upstream.on("open", () => {
+        queued.splice(0).forEach((message) => upstream.send(message));
+      });
 
-        // Only send data if conditions are met and data has changed
-        if (
-          jsonData?.lp != null &&
-          jsonData?.ap != null &&
-          jsonData?.bp != null &&
-          jsonData?.t != null &&
-          ["Q", "T"]?.includes(jsonData?.type) &&
-          connection.socket.readyState === WebSocket.OPEN
-        ) {
-          const avgPrice = (
-            parseFloat(jsonData?.ap) +
-            parseFloat(jsonData?.bp) +
-            parseFloat(jsonData?.lp)
-          ) / 3;
-
-          const finalPrice = Math.abs(avgPrice - jsonData?.bp) / jsonData?.bp > 0.01
-            ? jsonData.bp 
-            : avgPrice;
-
-          // Check if finalPrice is equal to avgPrice before sending data
-          if (finalPrice - avgPrice === 0) {
-            const currentDataSignature = `${finalPrice}`;
-            const lastSentSignature = lastSentData[symbol];
-
-            if (currentDataSignature !== lastSentSignature) {
-              dataToSend?.push({
-                symbol,
-                ap: jsonData?.ap,
-                bp: jsonData?.bp,
-                lp: jsonData?.lp,
-                avgPrice: finalPrice,
-                type: jsonData?.type,
-                time: formatTimestampNewYork(jsonData?.t),
-              });
-
-              lastSentData[symbol] = currentDataSignature;
-            }
-          }
+      upstream.on("message", (data) => {
+        if (connection.socket.readyState === WebSocket.OPEN) {
+          connection.socket.send(data.toString("utf-8"));
         }
-      } else {
-        //console.error("File not found for ticker:", symbol);
-      }
-    } catch (err) {
-      //console.error("Error processing data for ticker:", symbol, err);
-    }
-  }
+      });
 
-  // Send all collected data as a single message
-  if (dataToSend.length > 0 && connection.socket.readyState === WebSocket.OPEN) {
-    connection.socket.send(JSON.stringify(dataToSend));
-    // console.log(dataToSend);
-  }
-};
+      upstream.on("close", () => {
+        connection.socket.close();
+      });
 
+      upstream.on("error", (err) => {
+        console.error("Tick hub connection error:", err?.message);
+        connection.socket.close();
+      });
 
-      
       // Start receiving messages from the client
       connection.socket.on("message", (message) => {
-        try {
-          // Parse message as JSON to get tickers array
-          tickers = JSON.parse(message.toString("utf-8"));
-          //console.log("Received tickers from client:", tickers);
-          
-          // Reset last sent data for new tickers
-          tickers?.forEach((ticker) => {
-            lastSentData[ticker] = null;
-          });
-          
-          // Start periodic data sending if not already started
-          if (!sendInterval) {
-            sendInterval = setInterval(sendData, 1000);
-          }
-        } catch (err) {
-          console.error("Failed to parse tickers from client message:", err);
+        const tickers = message.toString("utf-8");
+        if (upstream.readyState === WebSocket.OPEN) {
+          upstream.send(tickers);
+        } else {
+          queued.push(tickers);
         }
       });
-      
+
       // Handle client disconnect
       connection.socket.on("close", () => {
         console.log("Client disconnected");
-        clearInterval(sendInterval);
-        removeProcessListeners();
+        upstream.close();
       });
-      
-      // Handle server crash cleanup
-      const closeHandler = () => {
-        console.log("Server is closing. Cleaning up resources...");
-        clearInterval(sendInterval);
-        connection.socket.close();
-        removeProcessListeners();
-      };
-      
-      // Add close handler to process events
-      process.on("exit", closeHandler);
-      process.on("SIGINT", closeHandler);
-      process.on("SIGTERM", closeHandler);
-      process.on("uncaughtException", closeHandler);
-      process.on("unhandledRejection", closeHandler);
-      
-      // Function to remove process listeners to avoid memory leaks
-      const removeProcessListeners = () => {
-        process.off("exit", closeHandler);
-        process.off("SIGINT", closeHandler);
-        process.off("SIGTERM", closeHandler);
-        process.off("uncaughtException", closeHandler);
-        process.off("unhandledRejection", closeHandler);
-      };
     }
   );
 });